@@ -0,0 +1,12 @@
+"""Benchmarking tools for TelemetryX Python Brain.
+
+Run with: python -m telemetryx.bench --help
+
+- ``load``: open-loop gRPC load test against a running server
+- ``micro``: in-process microbenchmarks of the DSL, handlers and interceptors
+- ``history``: record results and flag regressions against a baseline
+"""
+
+from telemetryx.bench.histogram import LatencyHistogram
+
+__all__ = ["LatencyHistogram"]
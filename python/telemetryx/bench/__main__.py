@@ -0,0 +1,163 @@
+"""Benchmark CLI.
+
+Examples:
+    python -m telemetryx.bench load --rpc evaluate --rate 2000 --duration 30
+    python -m telemetryx.bench load --rpc detect --batch-size 500 --rate 50 -o run.json
+    python -m telemetryx.bench micro --quick
+    python -m telemetryx.bench micro --filter dsl -o dsl.json
+    python -m telemetryx.bench history record micro.json --label main
+    python -m telemetryx.bench history compare --baseline main --candidate latest
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Any
+
+
+def _write_json(data: dict[str, Any], output: str | None) -> None:
+    """Write results (plus git SHA and machine details) to a file or stdout."""
+    from telemetryx.bench.history import environment
+
+    data = {**data, "environment": environment()}
+    text = json.dumps(data, indent=2, sort_keys=True)
+    if output is None:
+        print(text)
+        return
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(text + "\n")
+    print(f"Results written to {output}", file=sys.stderr)
+
+
+def _run_load(args: argparse.Namespace) -> None:
+    from telemetryx.bench.loadgen import LoadConfig, LoadGenerator, synthetic_events
+    from telemetryx.bench.workload import Workload, WorkloadConfig
+
+    config = LoadConfig(
+        target=args.target,
+        rpc=args.rpc,
+        rate=args.rate,
+        duration=args.duration,
+        warmup=args.warmup,
+        channels=args.channels,
+        batch_size=args.batch_size,
+        timeout=args.timeout,
+        max_outstanding=args.max_outstanding,
+        seed=args.seed,
+    )
+    if args.workload == "realistic":
+        events = Workload(WorkloadConfig(seed=args.seed)).event_generator()
+    else:
+        events = synthetic_events(seed=args.seed)
+    result = asyncio.run(LoadGenerator(config, events).run())
+    _write_json(result.to_dict(), args.output)
+
+
+def _run_micro(args: argparse.Namespace) -> None:
+    import structlog
+
+    from telemetryx.bench.micro import run_suite
+
+    # Sampled handler logs are still rendered (their cost is part of the hot
+    # path being measured) but written nowhere
+    devnull = open(os.devnull, "w")
+    structlog.configure(logger_factory=structlog.PrintLoggerFactory(devnull))
+    results = run_suite(
+        quick=args.quick,
+        name_filter=args.filter,
+        repeat=args.repeat,
+        min_time=args.min_time,
+    )
+    for result in results:
+        params = ",".join(f"{k}={v}" for k, v in result.params.items())
+        print(
+            f"{result.name:28} {params:14} {result.ns_per_event:12,.0f} ns/event "
+            f"{result.alloc_bytes_per_event:10,.0f} B/event",
+            file=sys.stderr,
+        )
+    _write_json({"benchmarks": [r.to_dict() for r in results]}, args.output)
+
+
+def _run_history(args: argparse.Namespace) -> None:
+    from telemetryx.bench.history import BenchHistory
+
+    history = BenchHistory(args.db)
+    try:
+        if args.action == "record":
+            with open(args.file, encoding="utf-8") as f:
+                run_id = history.record(json.load(f), label=args.label)
+            print(f"Recorded run #{run_id}")
+        elif args.action == "list":
+            for run in history.runs(args.limit):
+                sha = (run.git_sha or "-")[:12]
+                print(f"#{run.id:<5} {run.label or '-':16} {sha:12} {run.machine}")
+        else:
+            report = history.compare(
+                baseline=history.resolve(args.baseline),
+                candidate=history.resolve(args.candidate),
+                min_threshold=args.threshold,
+                sigma=args.sigma,
+            )
+            print(report.format())
+            if report.regressions:
+                sys.exit(1)
+    finally:
+        history.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Entry point for the benchmark CLI."""
+    parser = argparse.ArgumentParser(prog="python -m telemetryx.bench")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    load = commands.add_parser("load", help="Open-loop gRPC load test")
+    load.add_argument("--target", default="localhost:50051", help="Server address")
+    load.add_argument("--rpc", choices=("evaluate", "detect"), default="evaluate")
+    load.add_argument("--rate", type=float, default=1000.0, help="Requests per second")
+    load.add_argument("--duration", type=float, default=10.0, help="Measured seconds")
+    load.add_argument("--warmup", type=float, default=1.0, help="Unmeasured seconds first")
+    load.add_argument("--channels", type=int, default=4, help="Concurrent gRPC channels")
+    load.add_argument("--batch-size", type=int, default=100, help="Events per detect call")
+    load.add_argument("--timeout", type=float, default=5.0, help="Per-request deadline (s)")
+    load.add_argument("--max-outstanding", type=int, default=10_000)
+    load.add_argument("--seed", type=int, default=0)
+    load.add_argument(
+        "--workload",
+        choices=("realistic", "uniform"),
+        default="realistic",
+        help="Event generator (see telemetryx.bench.workload)",
+    )
+    load.add_argument("-o", "--output", help="Write JSON results to this file")
+    load.set_defaults(run=_run_load)
+
+    micro = commands.add_parser("micro", help="In-process handler and DSL microbenchmarks")
+    micro.add_argument("--quick", action="store_true", help="Skip the largest sizes")
+    micro.add_argument("--filter", help="Only benchmarks whose name contains this")
+    micro.add_argument("--repeat", type=int, default=5, help="Timed repeats per benchmark")
+    micro.add_argument("--min-time", type=float, default=0.05, help="Seconds per repeat")
+    micro.add_argument("-o", "--output", help="Write JSON results to this file")
+    micro.set_defaults(run=_run_micro)
+
+    history = commands.add_parser("history", help="Store and compare benchmark results")
+    history.add_argument("--db", default=".bench/history.sqlite", help="History database")
+    actions = history.add_subparsers(dest="action", required=True)
+    record = actions.add_parser("record", help="Store a benchmark JSON output")
+    record.add_argument("file", help="Output of the load or micro command")
+    record.add_argument("--label", help="Name to refer to this run by (e.g. main)")
+    listing = actions.add_parser("list", help="Show recent runs")
+    listing.add_argument("--limit", type=int, default=20)
+    compare = actions.add_parser("compare", help="Flag regressions against a baseline")
+    compare.add_argument("--baseline", required=True, help="Run id, label or 'latest'")
+    compare.add_argument("--candidate", default="latest", help="Run id, label or 'latest'")
+    compare.add_argument("--threshold", type=float, default=0.05, help="Minimum flagged change")
+    compare.add_argument("--sigma", type=float, default=3.0, help="Noise multiplier")
+    history.set_defaults(run=_run_history)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
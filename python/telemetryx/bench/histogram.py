@@ -0,0 +1,111 @@
+"""Compact HDR-style latency histogram.
+
+Values (integer microseconds) are recorded into log-linear buckets: each
+power-of-two range is split into ``2 ** precision_bits`` equal sub-buckets,
+so every recorded value is kept to within a fixed relative error
+(``2 ** -precision_bits``, about 0.8% with the default 7 bits) whatever its
+magnitude. Recording is O(1) and memory is fixed by the value range rather
+than the number of samples, so millions of samples fit in a few KB.
+
+Example:
+    histogram = LatencyHistogram()
+    histogram.record(1250)  # 1.25 ms
+    histogram.percentile(99.9)
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class LatencyHistogram:
+    """Log-linear histogram of non-negative integer values.
+
+    Attributes:
+        precision_bits: Sub-buckets per power of two, as a power of two
+        max_value: Largest trackable value (larger values are clamped)
+    """
+
+    precision_bits: int = 7
+    max_value: int = 60_000_000  # 60 s in microseconds
+
+    def __post_init__(self) -> None:
+        self._sub_buckets = 1 << self.precision_bits
+        magnitude = max(0, self.max_value.bit_length() - self.precision_bits)
+        self._counts = [0] * ((magnitude + 1) * self._sub_buckets)
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        """Bucket index for a value."""
+        if value < self._sub_buckets:
+            return value
+        shift = value.bit_length() - self.precision_bits - 1
+        # Each magnitude above the first covers [2^(shift+p), 2^(shift+p+1))
+        # with half as many new sub-buckets (the lower half overlaps)
+        return (shift + 1) * self._sub_buckets + (value >> shift) - self._sub_buckets
+
+    def _value_at(self, index: int) -> int:
+        """Highest value that maps to a bucket index."""
+        if index < self._sub_buckets:
+            return index
+        magnitude, offset = divmod(index, self._sub_buckets)
+        shift = magnitude - 1
+        return ((offset + self._sub_buckets) << shift) + (1 << shift) - 1
+
+    def record(self, value: int, count: int = 1) -> None:
+        """Record a value (negative values count as 0, large ones are clamped)."""
+        value = min(max(0, int(value)), self.max_value)
+        self._counts[self._index(value)] += count
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += count
+        self.total += value * count
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram's samples (must have the same layout)."""
+        if (other.precision_bits, other.max_value) != (self.precision_bits, self.max_value):
+            raise ValueError("Cannot merge histograms with different layouts")
+        if other.count == 0:
+            return
+        for i, bucket_count in enumerate(other._counts):
+            if bucket_count:
+                self._counts[i] += bucket_count
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    @property
+    def mean(self) -> float:
+        """Mean of recorded values."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> int:
+        """Value at or below which ``percentile`` percent of samples fall."""
+        if self.count == 0:
+            return 0
+        rank = max(1, round(percentile / 100 * self.count))
+        cumulative = 0
+        for i, bucket_count in enumerate(self._counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return min(self._value_at(i), self.max)
+        return self.max
+
+    def summary(self, scale: float = 1e-3) -> dict[str, Any]:
+        """Count plus common percentiles, multiplied by ``scale`` (µs to ms by default)."""
+        return {
+            "count": self.count,
+            "min": self.min * scale,
+            "mean": self.mean * scale,
+            "p50": self.percentile(50) * scale,
+            "p90": self.percentile(90) * scale,
+            "p99": self.percentile(99) * scale,
+            "p999": self.percentile(99.9) * scale,
+            "max": self.max * scale,
+        }
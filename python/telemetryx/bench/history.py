@@ -0,0 +1,357 @@
+"""Benchmark result history and regression comparison.
+
+Benchmark outputs (``python -m telemetryx.bench micro`` / ``load``) are
+recorded as runs in a local SQLite database together with the git SHA and
+a machine fingerprint. A run can then be compared against a baseline run:
+each metric's relative change is checked against a noise threshold, which
+is the larger of a fixed floor and ``sigma`` times the metric's coefficient
+of variation across earlier runs on the same machine. Only changes in the
+bad direction beyond the threshold are flagged as regressions.
+
+Example:
+    history = BenchHistory(".bench/history.sqlite")
+    run_id = history.record(json.load(open("micro.json")), label="main")
+    report = history.compare(baseline=history.resolve("main"), candidate=run_id)
+    print(report.format())
+"""
+
+import hashlib
+import json
+import os
+import platform
+import resource
+import sqlite3
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+DEFAULT_DB = ".bench/history.sqlite"
+
+# Metrics where larger values are better; every other metric is a cost
+HIGHER_IS_BETTER = frozenset({"throughput_rps", "events_per_s"})
+
+# Metrics extracted from each benchmark result entry
+_MICRO_METRICS = ("ns_per_event", "alloc_bytes_per_event")
+_LOAD_METRICS = ("throughput_rps", "latency_ms.p50", "latency_ms.p99", "latency_ms.p999")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    label TEXT,
+    git_sha TEXT,
+    machine TEXT NOT NULL,
+    environment TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    benchmark TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (run_id, benchmark, metric)
+);
+"""
+
+
+def _git_sha() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def environment() -> dict[str, Any]:
+    """Describe where a benchmark ran (attached to benchmark outputs)."""
+    machine = {
+        "cpu": _cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+    }
+    fingerprint = hashlib.sha256(json.dumps(machine, sort_keys=True).encode()).hexdigest()[:16]
+    return {
+        "git_sha": _git_sha(),
+        "machine": machine,
+        "fingerprint": fingerprint,
+        # ru_maxrss is KiB on Linux
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def _benchmark_key(name: str, params: dict[str, Any]) -> str:
+    """Stable identifier for a benchmark and its parameters."""
+    if not params:
+        return name
+    return name + "[" + ",".join(f"{k}={params[k]}" for k in sorted(params)) + "]"
+
+
+def _lookup(data: dict[str, Any], dotted: str) -> Any:
+    for key in dotted.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)  # type: ignore[assignment]
+    return data
+
+
+def extract_metrics(output: dict[str, Any]) -> dict[str, dict[str, float]]:
+    """Flatten a benchmark output into ``{benchmark key: {metric: value}}``.
+
+    Understands the micro suite (``{"benchmarks": [...]}``) and load test
+    (``{"benchmark": "grpc.*", ...}``) formats.
+    """
+    metrics: dict[str, dict[str, float]] = {}
+    for entry in output.get("benchmarks", []):
+        key = _benchmark_key(entry["benchmark"], entry.get("params", {}))
+        metrics[key] = {m: float(entry[m]) for m in _MICRO_METRICS if m in entry}
+
+    if "benchmark" in output:
+        config = output.get("config", {})
+        params = {k: config[k] for k in ("rate", "batch_size", "channels") if k in config}
+        key = _benchmark_key(output["benchmark"], params)
+        metrics[key] = {
+            m: float(value)
+            for m in _LOAD_METRICS
+            if isinstance(value := _lookup(output, m), int | float)
+        }
+
+    max_rss = _lookup(output, "environment.max_rss_kb")
+    if isinstance(max_rss, int | float):
+        metrics["process"] = {"max_rss_kb": float(max_rss)}
+    return metrics
+
+
+@dataclass(frozen=True)
+class Run:
+    """A recorded benchmark run."""
+
+    id: int
+    created_at: float
+    label: str | None
+    git_sha: str | None
+    machine: str
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """Change of one metric between a baseline and a candidate run."""
+
+    benchmark: str
+    metric: str
+    baseline: float
+    candidate: float
+    threshold: float
+
+    @property
+    def change(self) -> float:
+        """Relative change (candidate vs baseline)."""
+        if self.baseline == 0:
+            return 0.0 if self.candidate == 0 else float("inf")
+        return (self.candidate - self.baseline) / abs(self.baseline)
+
+    @property
+    def worse(self) -> float:
+        """Relative change in the bad direction (negative means improved)."""
+        return -self.change if self.metric in HIGHER_IS_BETTER else self.change
+
+    @property
+    def status(self) -> str:
+        """``regression``, ``improvement`` or ``unchanged``."""
+        if self.worse > self.threshold:
+            return "regression"
+        if self.worse < -self.threshold:
+            return "improvement"
+        return "unchanged"
+
+
+@dataclass(frozen=True)
+class ComparisonReport:
+    """All metric comparisons between two runs."""
+
+    baseline: Run
+    candidate: Run
+    comparisons: list[Comparison]
+
+    @property
+    def regressions(self) -> list[Comparison]:
+        """Comparisons flagged as regressions."""
+        return [c for c in self.comparisons if c.status == "regression"]
+
+    def format(self) -> str:
+        """Human-readable table of the comparison."""
+        lines = [
+            f"Baseline  #{self.baseline.id} {self.baseline.label or ''} "
+            f"({(self.baseline.git_sha or 'unknown')[:12]})",
+            f"Candidate #{self.candidate.id} {self.candidate.label or ''} "
+            f"({(self.candidate.git_sha or 'unknown')[:12]})",
+        ]
+        if self.baseline.machine != self.candidate.machine:
+            lines.append("WARNING: runs are from different machines")
+        lines.append("")
+        for c in sorted(self.comparisons, key=lambda c: (c.benchmark, c.metric)):
+            lines.append(
+                f"{c.status:11} {c.benchmark:48} {c.metric:22} "
+                f"{c.baseline:14.2f} -> {c.candidate:14.2f} "
+                f"{c.change:+8.1%} (noise ±{c.threshold:.1%})"
+            )
+        lines.append("")
+        lines.append(f"{len(self.regressions)} regression(s) in {len(self.comparisons)} metrics")
+        return "\n".join(lines)
+
+
+class BenchHistory:
+    """SQLite-backed store of benchmark runs."""
+
+    def __init__(self, path: str | Path = DEFAULT_DB) -> None:
+        path = Path(path)
+        if str(path) != ":memory:":
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path))
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database."""
+        self._db.close()
+
+    def record(self, output: dict[str, Any], label: str | None = None) -> int:
+        """Store a benchmark output as a new run.
+
+        Returns:
+            The new run's id
+        """
+        env = output.get("environment") or environment()
+        metrics = extract_metrics(output)
+        if not metrics:
+            raise ValueError("No benchmark results found in output")
+
+        with self._db:
+            cursor = self._db.execute(
+                "INSERT INTO runs (created_at, label, git_sha, machine, environment) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (time.time(), label, env.get("git_sha"), env["fingerprint"], json.dumps(env)),
+            )
+            run_id = int(cursor.lastrowid or 0)
+            self._db.executemany(
+                "INSERT INTO results (run_id, benchmark, metric, value) VALUES (?, ?, ?, ?)",
+                [
+                    (run_id, benchmark, metric, value)
+                    for benchmark, values in metrics.items()
+                    for metric, value in values.items()
+                ],
+            )
+        return run_id
+
+    def runs(self, limit: int = 20) -> list[Run]:
+        """Most recent runs, newest first."""
+        rows = self._db.execute(
+            "SELECT id, created_at, label, git_sha, machine FROM runs ORDER BY id DESC LIMIT ?",
+            (limit,),
+        )
+        return [Run(*row) for row in rows]
+
+    def get(self, run_id: int) -> Run:
+        """Look up a run by id."""
+        row = self._db.execute(
+            "SELECT id, created_at, label, git_sha, machine FROM runs WHERE id = ?", (run_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"No run with id {run_id}")
+        return Run(*row)
+
+    def resolve(self, ref: str) -> int:
+        """Resolve a run id, ``latest``, or the newest run with a label."""
+        if ref.isdigit():
+            return self.get(int(ref)).id
+        if ref == "latest":
+            row = self._db.execute("SELECT MAX(id) FROM runs").fetchone()
+        else:
+            row = self._db.execute("SELECT MAX(id) FROM runs WHERE label = ?", (ref,)).fetchone()
+        if row is None or row[0] is None:
+            raise KeyError(f"No run matching {ref!r}")
+        return int(row[0])
+
+    def results(self, run_id: int) -> dict[tuple[str, str], float]:
+        """All metric values of a run, keyed by (benchmark, metric)."""
+        rows = self._db.execute(
+            "SELECT benchmark, metric, value FROM results WHERE run_id = ?", (run_id,)
+        )
+        return {(benchmark, metric): value for benchmark, metric, value in rows}
+
+    def _noise(self, machine: str, before: int, window: int) -> dict[tuple[str, str], float]:
+        """Coefficient of variation of each metric over recent runs on a machine."""
+        run_ids = [
+            row[0]
+            for row in self._db.execute(
+                "SELECT id FROM runs WHERE machine = ? AND id < ? ORDER BY id DESC LIMIT ?",
+                (machine, before, window),
+            )
+        ]
+        samples: dict[tuple[str, str], list[float]] = {}
+        for run_id in run_ids:
+            for key, value in self.results(run_id).items():
+                samples.setdefault(key, []).append(value)
+
+        noise = {}
+        for key, values in samples.items():
+            mean = statistics.fmean(values)
+            if len(values) >= 3 and mean:
+                noise[key] = statistics.stdev(values) / abs(mean)
+        return noise
+
+    def compare(
+        self,
+        baseline: int,
+        candidate: int,
+        min_threshold: float = 0.05,
+        sigma: float = 3.0,
+        window: int = 10,
+    ) -> ComparisonReport:
+        """Compare two runs metric by metric.
+
+        Args:
+            baseline: Baseline run id
+            candidate: Candidate run id
+            min_threshold: Smallest relative change ever flagged
+            sigma: Multiple of the historical coefficient of variation
+                treated as noise
+            window: Number of earlier runs used to estimate noise
+        """
+        base_run, cand_run = self.get(baseline), self.get(candidate)
+        base_results, cand_results = self.results(baseline), self.results(candidate)
+        noise = self._noise(cand_run.machine, cand_run.id, window)
+
+        comparisons = [
+            Comparison(
+                benchmark=benchmark,
+                metric=metric,
+                baseline=base_results[(benchmark, metric)],
+                candidate=value,
+                threshold=max(min_threshold, sigma * noise.get((benchmark, metric), 0.0)),
+            )
+            for (benchmark, metric), value in cand_results.items()
+            if (benchmark, metric) in base_results
+        ]
+        return ComparisonReport(base_run, cand_run, comparisons)
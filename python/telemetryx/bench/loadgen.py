@@ -0,0 +1,240 @@
+"""Open-loop gRPC load generator.
+
+Requests are sent on a fixed schedule (``rate`` per second) regardless of
+how quickly earlier requests complete, and each latency is measured from
+the request's *scheduled* send time rather than the actual one. A closed
+loop (send, wait, send) slows down when the server does and so hides
+queueing delay ("coordinated omission"); an open loop keeps pressure on
+and charges any delay, including the generator falling behind, to the
+latency distribution.
+
+Requests are spread round-robin over ``channels`` independent
+``grpc.aio`` channels (separate HTTP/2 connections).
+"""
+
+import asyncio
+import random
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import grpc
+
+from telemetryx.bench.histogram import LatencyHistogram
+from telemetryx.proto import (
+    analytics_pb2,
+    analytics_pb2_grpc,
+    common_pb2,
+    rules_pb2,
+    rules_pb2_grpc,
+)
+
+RPCS = ("evaluate", "detect")
+
+# Builds the event with a given sequence number
+EventGenerator = Callable[[int], common_pb2.Event]
+
+
+def synthetic_events(
+    seed: int = 0,
+    sources: int = 10,
+    error_rate: float = 0.05,
+    event_types: tuple[str, ...] = ("page_view", "click", "metric"),
+) -> EventGenerator:
+    """Simple uniform event generator.
+
+    Args:
+        seed: Random seed (the same seed yields the same events)
+        sources: Number of distinct ``source`` values
+        error_rate: Fraction of events with ``event_type == "error"``
+        event_types: Event types used for non-error events
+    """
+    rng = random.Random(seed)
+
+    def generate(i: int) -> common_pb2.Event:
+        is_error = rng.random() < error_rate
+        return common_pb2.Event(
+            id=f"bench-{i}",
+            event_type="error" if is_error else rng.choice(event_types),
+            timestamp=int(time.time() * 1000),
+            source=f"source-{rng.randrange(sources)}",
+            value=rng.gauss(100.0, 15.0),
+        )
+
+    return generate
+
+
+@dataclass
+class LoadConfig:
+    """Load test parameters.
+
+    Attributes:
+        target: Server address (host:port)
+        rpc: ``"evaluate"`` (RulesService.EvaluateEvent) or ``"detect"``
+            (AnalyticsService.DetectAnomalies)
+        rate: Requests per second to send
+        duration: Seconds to send for (excluding warmup)
+        warmup: Seconds to send before recording results
+        channels: Number of independent gRPC channels
+        batch_size: Events per DetectAnomalies request
+        timeout: Per-request deadline in seconds
+        max_outstanding: Requests allowed in flight before sends are skipped
+            (skipped sends are counted, keeping the generator bounded)
+        seed: Seed for the synthetic event generator
+    """
+
+    target: str = "localhost:50051"
+    rpc: str = "evaluate"
+    rate: float = 1000.0
+    duration: float = 10.0
+    warmup: float = 1.0
+    channels: int = 4
+    batch_size: int = 100
+    timeout: float = 5.0
+    max_outstanding: int = 10_000
+    seed: int = 0
+
+
+@dataclass
+class LoadResult:
+    """Outcome of a load test."""
+
+    config: LoadConfig
+    elapsed: float
+    sent: int = 0
+    skipped: int = 0
+    codes: Counter[str] = field(default_factory=Counter)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def completed(self) -> int:
+        """Requests that finished (successfully or not)."""
+        return sum(self.codes.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable summary (latencies in milliseconds)."""
+        config = self.config
+        events_per_request = config.batch_size if config.rpc == "detect" else 1
+        ok = self.codes.get("OK", 0)
+        return {
+            "benchmark": f"grpc.{config.rpc}",
+            "config": {
+                "target": config.target,
+                "rpc": config.rpc,
+                "rate": config.rate,
+                "duration": config.duration,
+                "channels": config.channels,
+                "batch_size": events_per_request,
+                "timeout": config.timeout,
+            },
+            "elapsed_s": self.elapsed,
+            "sent": self.sent,
+            "skipped": self.skipped,
+            "completed": self.completed,
+            "codes": dict(self.codes),
+            "throughput_rps": ok / self.elapsed if self.elapsed else 0.0,
+            "events_per_s": ok * events_per_request / self.elapsed if self.elapsed else 0.0,
+            "latency_ms": self.latency.summary(),
+        }
+
+
+class LoadGenerator:
+    """Drives one RPC at a fixed open-loop rate."""
+
+    def __init__(self, config: LoadConfig, events: EventGenerator | None = None) -> None:
+        if config.rpc not in RPCS:
+            raise ValueError(f"Unknown rpc {config.rpc!r}, expected one of {RPCS}")
+        if config.rate <= 0:
+            raise ValueError("rate must be positive")
+        self._config = config
+        self._events = events or synthetic_events(seed=config.seed)
+        self._outstanding = 0
+
+    def _build_request(self, i: int) -> Any:
+        if self._config.rpc == "evaluate":
+            return rules_pb2.EvaluateRequest(event=self._events(i))
+        return analytics_pb2.DetectAnomaliesRequest(
+            events=[
+                self._events(i * self._config.batch_size + j)
+                for j in range(self._config.batch_size)
+            ]
+        )
+
+    def _make_call(self, channel: grpc.aio.Channel) -> Callable[..., Any]:
+        if self._config.rpc == "evaluate":
+            return rules_pb2_grpc.RulesServiceStub(channel).EvaluateEvent
+        return analytics_pb2_grpc.AnalyticsServiceStub(channel).DetectAnomalies
+
+    async def run(self) -> LoadResult:
+        """Run warmup plus the measured duration and return the results."""
+        config = self._config
+        channels = [grpc.aio.insecure_channel(config.target) for _ in range(config.channels)]
+        calls = [self._make_call(channel) for channel in channels]
+        tasks: set[asyncio.Task[None]] = set()
+
+        try:
+            # Warmup results are discarded
+            await self._send_for(calls, config.warmup, LoadResult(config, 0.0), tasks)
+            result = LoadResult(config, 0.0)
+            start = time.perf_counter()
+            await self._send_for(calls, config.duration, result, tasks)
+            if tasks:
+                await asyncio.wait(tasks, timeout=config.timeout + 1)
+            result.elapsed = time.perf_counter() - start
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*(channel.close() for channel in channels))
+        return result
+
+    async def _send_for(
+        self,
+        calls: list[Callable[..., Any]],
+        duration: float,
+        result: LoadResult,
+        tasks: set[asyncio.Task[None]],
+    ) -> None:
+        """Send requests on schedule for ``duration`` seconds."""
+        config = self._config
+        interval = 1.0 / config.rate
+        total = int(duration * config.rate)
+        start = time.perf_counter()
+
+        for i in range(total):
+            scheduled = start + i * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if self._outstanding >= config.max_outstanding:
+                result.skipped += 1
+                continue
+
+            request = self._build_request(result.sent)
+            task = asyncio.create_task(
+                self._call(calls[i % len(calls)], request, scheduled, result)
+            )
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            result.sent += 1
+
+    async def _call(
+        self,
+        call: Callable[..., Any],
+        request: Any,
+        scheduled: float,
+        result: LoadResult,
+    ) -> None:
+        """Send one request and record its latency from the scheduled time."""
+        self._outstanding += 1
+        try:
+            await call(request, timeout=self._config.timeout)
+            code = "OK"
+        except grpc.aio.AioRpcError as e:
+            code = e.code().name
+        finally:
+            self._outstanding -= 1
+        result.latency.record(int((time.perf_counter() - scheduled) * 1_000_000))
+        result.codes[code] += 1
@@ -0,0 +1,317 @@
+"""In-process microbenchmarks for hot paths.
+
+Calls the rule DSL, the service handlers and the logging interceptor
+directly (no network, no serialization) so regressions in per-event cost
+show up before they reach production. Each benchmark reports:
+
+- ``ns_per_event``: median wall time per event over several repeats
+- ``alloc_bytes_per_event``: peak traced allocation per event (tracemalloc)
+- ``retained_blocks_per_event``: memory blocks still allocated after the
+  run, per event (non-zero values usually mean a cache or a leak)
+
+Timing and allocation tracking run in separate passes because tracemalloc
+slows allocation-heavy code down by several times.
+
+Example:
+    results = run_suite(quick=True)
+    print([r.to_dict() for r in results])
+"""
+
+import asyncio
+import gc
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from telemetryx.bench.workload import EventBatch, Workload, WorkloadConfig
+from telemetryx.grpc_server.handlers import AnalyticsServiceHandler, RulesServiceHandler
+from telemetryx.grpc_server.interceptors import LoggingInterceptor
+from telemetryx.ml.anomaly import EwmaDetector
+from telemetryx.ml.features import FeatureBatch
+from telemetryx.ml.forest import IsolationForest, IsolationForestDetector
+from telemetryx.proto import analytics_pb2, rules_pb2
+from telemetryx.rules import Condition, Operator, evaluate_condition
+
+RULE_COUNTS = (10, 100, 1_000, 10_000, 100_000)
+BATCH_SIZES = (1, 10, 100, 1_000, 10_000)
+
+# Upper bound on condition evaluations per rule-set benchmark run
+_RULE_EVALUATIONS = 200_000
+
+_EVENT_TYPES = ("page_view", "click", "metric", "error")
+
+
+@dataclass(frozen=True)
+class MicroResult:
+    """Result of one microbenchmark."""
+
+    name: str
+    params: dict[str, int]
+    events: int
+    ns_per_event: float
+    ns_per_event_min: float
+    alloc_bytes_per_event: float
+    retained_blocks_per_event: float
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form."""
+        return {
+            "benchmark": self.name,
+            "params": self.params,
+            "events": self.events,
+            "ns_per_event": self.ns_per_event,
+            "ns_per_event_min": self.ns_per_event_min,
+            "alloc_bytes_per_event": self.alloc_bytes_per_event,
+            "retained_blocks_per_event": self.retained_blocks_per_event,
+        }
+
+
+@dataclass
+class Benchmark:
+    """A benchmark body processing ``events`` events per call."""
+
+    name: str
+    body: Callable[[], Awaitable[None]]
+    events: int
+    params: dict[str, int] = field(default_factory=dict)
+
+
+def synthetic_rules(count: int, seed: int = 0) -> list[Condition]:
+    """A mix of simple and compound conditions over all operator kinds."""
+    rng = random.Random(seed)
+
+    def comparison() -> Condition:
+        kind = rng.randrange(6)
+        if kind == 0:
+            return Condition(field="event_type", op=Operator.EQ, value=rng.choice(_EVENT_TYPES))
+        if kind == 1:
+            return Condition(field="value", op=Operator.GT, value=rng.uniform(50, 200))
+        if kind == 2:
+            return Condition(field="source", op=Operator.STARTSWITH, value="service-1")
+        if kind == 3:
+            return Condition(
+                field="attributes.region", op=Operator.IN, value=["region-0", "region-1"]
+            )
+        if kind == 4:
+            return Condition(field="attributes.user_id", op=Operator.REGEX, value=r"^user-9\d+$")
+        return Condition(field="source", op=Operator.CONTAINS, value=str(rng.randrange(10)))
+
+    rules = []
+    for _ in range(count):
+        if rng.random() < 0.3:
+            rules.append(Condition(and_=[comparison(), comparison()]))
+        elif rng.random() < 0.1:
+            rules.append(Condition(or_=[comparison(), comparison(), comparison()]))
+        else:
+            rules.append(comparison())
+    return rules
+
+
+def workload_batch(count: int, seed: int = 0) -> EventBatch:
+    """Realistic events (Zipf keys, injected anomalies) for benchmarks."""
+    return Workload(WorkloadConfig(seed=seed)).batch(count)
+
+
+def dsl_benchmark(rule_count: int) -> Benchmark:
+    """Evaluate every rule in a rule set against each event."""
+    rules = synthetic_rules(rule_count)
+    event_count = max(1, min(100, _RULE_EVALUATIONS // rule_count))
+    events = workload_batch(event_count).to_dicts()
+
+    async def body() -> None:
+        for event in events:
+            for rule in rules:
+                evaluate_condition(rule, event)
+
+    return Benchmark("dsl.evaluate_condition", body, event_count, {"rules": rule_count})
+
+
+def evaluate_event_benchmark(batch_size: int) -> Benchmark:
+    """Call RulesServiceHandler.EvaluateEvent once per event."""
+    handler = RulesServiceHandler()
+    events = workload_batch(batch_size).to_events()
+    requests = [rules_pb2.EvaluateRequest(event=e) for e in events]
+
+    async def body() -> None:
+        for request in requests:
+            await handler.EvaluateEvent(request, None)  # type: ignore[arg-type]
+
+    return Benchmark("handler.evaluate_event", body, batch_size, {"events": batch_size})
+
+
+def detect_anomalies_benchmark(batch_size: int) -> Benchmark:
+    """Call AnalyticsServiceHandler.DetectAnomalies on one batch."""
+    handler = AnalyticsServiceHandler()
+    request = analytics_pb2.DetectAnomaliesRequest(events=workload_batch(batch_size).to_events())
+
+    async def body() -> None:
+        await handler.DetectAnomalies(request, None)  # type: ignore[arg-type]
+
+    return Benchmark("handler.detect_anomalies", body, batch_size, {"events": batch_size})
+
+
+def score_batch_benchmark(batch_size: int) -> Benchmark:
+    """Score one pre-extracted batch with the EWMA detector (no protobuf work)."""
+    detector = EwmaDetector()
+    batch = workload_batch(batch_size)
+    features = FeatureBatch.from_arrays(
+        batch.values, list(zip(batch.sources, batch.event_types)), batch.timestamps
+    )
+    threshold = detector.threshold(0.5)
+
+    async def body() -> None:
+        detector.score_batch(features, threshold)
+
+    return Benchmark("ml.score_batch", body, batch_size, {"events": batch_size})
+
+
+def isolation_forest_benchmark(batch_size: int) -> Benchmark:
+    """Score one pre-extracted batch with a 100-tree isolation forest."""
+    features = ["signed_log", "hour_sin", "hour_cos"]
+    training = workload_batch(10_000, seed=1)
+    matrix = FeatureBatch.from_arrays(
+        training.values, list(zip(training.sources, training.event_types)), training.timestamps
+    ).matrix(features)
+    forest = IsolationForest.fit(matrix, trees=100)
+    detector = IsolationForestDetector(forest, features, np.sort(forest.scores(matrix)))
+    batch = workload_batch(batch_size)
+    events = FeatureBatch.from_arrays(
+        batch.values, list(zip(batch.sources, batch.event_types)), batch.timestamps
+    )
+    threshold = detector.threshold(0.5)
+
+    async def body() -> None:
+        detector.score_batch(events, threshold)
+
+    return Benchmark("ml.isolation_forest", body, batch_size, {"events": batch_size})
+
+
+class _CallDetails:
+    """Minimal grpc.HandlerCallDetails for driving interceptors in-process."""
+
+    def __init__(self, method: str) -> None:
+        self.method = method
+        self.invocation_metadata = ()
+
+
+def logging_interceptor_benchmark(calls: int) -> Benchmark:
+    """Call a no-op behavior through the LoggingInterceptor wrapper."""
+    import grpc
+
+    async def behavior(request: Any, context: Any) -> None:
+        return None
+
+    async def continuation(details: Any) -> grpc.RpcMethodHandler:
+        return grpc.unary_unary_rpc_method_handler(behavior)
+
+    wrapped: list[Callable[..., Awaitable[Any]]] = []
+
+    async def body() -> None:
+        if not wrapped:
+            handler = await LoggingInterceptor().intercept_service(
+                continuation, _CallDetails("/telemetryx.RulesService/EvaluateEvent")
+            )
+            wrapped.append(handler.unary_unary)
+        wrapper = wrapped[0]
+        for _ in range(calls):
+            await wrapper(None, None)
+
+    return Benchmark("interceptor.logging", body, calls, {"calls": calls})
+
+
+def default_suite(quick: bool = False, name_filter: str | None = None) -> Iterator[Benchmark]:
+    """All benchmarks over the standard parameter grid.
+
+    Benchmarks are built lazily, so filtered-out ones cost nothing.
+
+    Args:
+        quick: Skip the largest rule sets and batches (for smoke runs)
+        name_filter: Only benchmarks whose name contains this string
+    """
+    rule_counts = RULE_COUNTS[:3] if quick else RULE_COUNTS
+    batch_sizes = BATCH_SIZES[:3] if quick else BATCH_SIZES
+    grid: list[tuple[str, Callable[[int], Benchmark], tuple[int, ...]]] = [
+        ("dsl.evaluate_condition", dsl_benchmark, rule_counts),
+        ("handler.evaluate_event", evaluate_event_benchmark, batch_sizes),
+        ("handler.detect_anomalies", detect_anomalies_benchmark, batch_sizes),
+        ("ml.score_batch", score_batch_benchmark, batch_sizes),
+        ("ml.isolation_forest", isolation_forest_benchmark, batch_sizes),
+        ("interceptor.logging", logging_interceptor_benchmark, (1_000,)),
+    ]
+    for name, factory, sizes in grid:
+        if name_filter and name_filter not in name:
+            continue
+        for size in sizes:
+            yield factory(size)
+
+
+async def measure(benchmark: Benchmark, repeat: int = 5, min_time: float = 0.05) -> MicroResult:
+    """Time a benchmark and measure its allocations.
+
+    Each repeat calls the body until at least ``min_time`` seconds have
+    passed; the reported time per event is the median across repeats.
+    """
+    await benchmark.body()  # warm caches and lazy initialization
+
+    samples = []
+    for _ in range(repeat):
+        runs = 0
+        gc.disable()
+        try:
+            start = time.perf_counter_ns()
+            while True:
+                await benchmark.body()
+                runs += 1
+                elapsed = time.perf_counter_ns() - start
+                if elapsed >= min_time * 1e9:
+                    break
+        finally:
+            gc.enable()
+        samples.append(elapsed / (runs * benchmark.events))
+
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await benchmark.body()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    gc.collect()
+    retained = sys.getallocatedblocks() - blocks_before
+
+    return MicroResult(
+        name=benchmark.name,
+        params=benchmark.params,
+        events=benchmark.events,
+        ns_per_event=statistics.median(samples),
+        ns_per_event_min=min(samples),
+        alloc_bytes_per_event=max(0, peak - base) / benchmark.events,
+        retained_blocks_per_event=max(0, retained) / benchmark.events,
+    )
+
+
+def run_suite(
+    quick: bool = False,
+    name_filter: str | None = None,
+    repeat: int = 5,
+    min_time: float = 0.05,
+) -> list[MicroResult]:
+    """Run the default suite, optionally only benchmarks whose name contains a filter."""
+
+    async def run() -> list[MicroResult]:
+        results = []
+        for benchmark in default_suite(quick, name_filter):
+            results.append(await measure(benchmark, repeat=repeat, min_time=min_time))
+        return results
+
+    return asyncio.run(run())
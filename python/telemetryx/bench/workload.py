@@ -0,0 +1,273 @@
+"""Realistic synthetic event workloads.
+
+Uniform random events make caches look useless and every series equally
+busy, which is not what production traffic looks like. ``Workload``
+generates events with:
+
+- Zipf-distributed ``source`` and ``attributes.user_id`` (a few hot keys,
+  a long tail of cold ones)
+- Diurnal arrival rates with random bursts (a non-homogeneous Poisson
+  process)
+- Per-source value baselines that follow the diurnal cycle
+- Injected value anomalies (spikes and dips) with ground-truth labels
+- Extra attributes with configurable cardinality
+
+Generation is seeded: the same config always yields the same events.
+Events are produced column-wise and can be converted to dicts or
+``common_pb2.Event`` messages.
+
+Example:
+    workload = Workload(WorkloadConfig(seed=42, sources=500))
+    batch = workload.batch(10_000)
+    events = batch.to_events()
+    labels = batch.is_anomaly
+"""
+
+import itertools
+import math
+import random
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from telemetryx.proto import common_pb2
+
+ANOMALY_SPIKE = "spike"
+ANOMALY_DIP = "dip"
+
+
+@dataclass(frozen=True)
+class WorkloadConfig:
+    """Shape of a synthetic workload.
+
+    Attributes:
+        seed: Random seed
+        start_ms: Timestamp of the first event (Unix milliseconds)
+        sources: Number of distinct ``source`` values
+        source_skew: Zipf exponent for sources (0 = uniform, ~1 = web-like)
+        users: Number of distinct ``attributes.user_id`` values
+        user_skew: Zipf exponent for users
+        event_types: Event types with relative weights
+        base_rate: Mean arrival rate in events/second
+        diurnal_amplitude: Relative swing of the rate over a period (0-1)
+        diurnal_period_s: Length of a cycle in seconds
+        burst_rate: Expected bursts per hour
+        burst_factor: Rate multiplier during a burst
+        burst_duration_s: Mean burst length in seconds
+        anomaly_rate: Fraction of metric events replaced by anomalies
+        anomaly_magnitude: Anomaly distance from the baseline, in std devs
+        attribute_cardinality: Extra attributes and their distinct values
+    """
+
+    seed: int = 0
+    start_ms: int = 1_700_000_000_000
+    sources: int = 200
+    source_skew: float = 1.1
+    users: int = 100_000
+    user_skew: float = 1.2
+    event_types: tuple[tuple[str, float], ...] = (
+        ("page_view", 0.55),
+        ("click", 0.2),
+        ("metric", 0.2),
+        ("error", 0.05),
+    )
+    base_rate: float = 1_000.0
+    diurnal_amplitude: float = 0.5
+    diurnal_period_s: float = 86_400.0
+    burst_rate: float = 2.0
+    burst_factor: float = 5.0
+    burst_duration_s: float = 30.0
+    anomaly_rate: float = 0.01
+    anomaly_magnitude: float = 6.0
+    attribute_cardinality: dict[str, int] = field(
+        default_factory=lambda: {"region": 8, "device": 50}
+    )
+
+
+def zipf_cum_weights(n: int, skew: float) -> list[float]:
+    """Cumulative Zipf weights for ranks 1..n (for ``random.choices``)."""
+    return list(itertools.accumulate(1.0 / (rank**skew) for rank in range(1, n + 1)))
+
+
+@dataclass
+class EventBatch:
+    """Column-oriented batch of generated events plus ground truth."""
+
+    ids: list[str]
+    event_types: list[str]
+    timestamps: list[int]
+    sources: list[str]
+    values: list[float]
+    attributes: list[dict[str, str]]
+    is_anomaly: list[bool]
+    anomaly_kinds: list[str]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def columns(self) -> dict[str, list[Any]]:
+        """Columns by name (event fields plus ``is_anomaly``/``anomaly_kind``)."""
+        return {
+            "id": self.ids,
+            "event_type": self.event_types,
+            "timestamp": self.timestamps,
+            "source": self.sources,
+            "value": self.values,
+            "attributes": self.attributes,
+            "is_anomaly": self.is_anomaly,
+            "anomaly_kind": self.anomaly_kinds,
+        }
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        """Events as dicts (the shape rules are evaluated against), without labels."""
+        return [
+            {
+                "id": event_id,
+                "event_type": event_type,
+                "timestamp": timestamp,
+                "source": source,
+                "value": value,
+                "attributes": attributes,
+            }
+            for event_id, event_type, timestamp, source, value, attributes in zip(
+                self.ids,
+                self.event_types,
+                self.timestamps,
+                self.sources,
+                self.values,
+                self.attributes,
+            )
+        ]
+
+    def to_events(self) -> list[common_pb2.Event]:
+        """Events as protobuf messages, without labels."""
+        return [
+            common_pb2.Event(
+                id=event_id,
+                event_type=event_type,
+                timestamp=timestamp,
+                source=source,
+                value=value,
+                attributes=attributes,
+            )
+            for event_id, event_type, timestamp, source, value, attributes in zip(
+                self.ids,
+                self.event_types,
+                self.timestamps,
+                self.sources,
+                self.values,
+                self.attributes,
+            )
+        ]
+
+
+class Workload:
+    """Seeded generator of realistic event streams.
+
+    Successive ``batch`` calls continue the same stream (time keeps
+    advancing and ids keep counting up).
+    """
+
+    def __init__(self, config: WorkloadConfig | None = None) -> None:
+        self.config = config = config or WorkloadConfig()
+        self._rng = random.Random(config.seed)
+        rng = self._rng
+
+        self._source_names = [f"service-{i}" for i in range(config.sources)]
+        self._source_weights = zipf_cum_weights(config.sources, config.source_skew)
+        self._user_weights = zipf_cum_weights(config.users, config.user_skew)
+        self._type_names = [name for name, _ in config.event_types]
+        self._type_weights = list(itertools.accumulate(w for _, w in config.event_types))
+
+        # Per-source value baseline: log-normal means, 10% relative noise
+        self._baselines = [rng.lognormvariate(4.0, 1.0) for _ in range(config.sources)]
+        self._attribute_values = {
+            name: [f"{name}-{i}" for i in range(cardinality)]
+            for name, cardinality in config.attribute_cardinality.items()
+        }
+
+        self._next_id = 0
+        self._time_s = 0.0
+        self._burst_until = -1.0
+        self._next_burst = self._draw_next_burst(0.0)
+
+    def _draw_next_burst(self, now: float) -> float:
+        if self.config.burst_rate <= 0:
+            return math.inf
+        return now + self._rng.expovariate(self.config.burst_rate / 3600.0)
+
+    def _diurnal(self, t: float) -> float:
+        """Diurnal factor in [-1, 1] (peaks a quarter period after start)."""
+        return math.sin(2 * math.pi * t / self.config.diurnal_period_s)
+
+    def rate_at(self, t: float) -> float:
+        """Arrival rate (events/second) at ``t`` seconds into the stream."""
+        config = self.config
+        rate = config.base_rate * (1 + config.diurnal_amplitude * self._diurnal(t))
+        if t < self._burst_until:
+            rate *= config.burst_factor
+        return max(rate, 1e-9)
+
+    def _advance_time(self) -> float:
+        """Draw the next arrival time from the current rate."""
+        t = self._time_s
+        if t >= self._next_burst:
+            duration = self._rng.expovariate(1 / self.config.burst_duration_s)
+            self._burst_until = t + duration
+            self._next_burst = self._draw_next_burst(t)
+        self._time_s = t + self._rng.expovariate(self.rate_at(t))
+        return self._time_s
+
+    def batch(self, count: int) -> EventBatch:
+        """Generate the next ``count`` events of the stream."""
+        config = self.config
+        rng = self._rng
+        source_idx = rng.choices(range(config.sources), cum_weights=self._source_weights, k=count)
+        user_idx = rng.choices(range(config.users), cum_weights=self._user_weights, k=count)
+        types = rng.choices(self._type_names, cum_weights=self._type_weights, k=count)
+
+        batch = EventBatch([], [], [], [], [], [], [], [])
+        for i in range(count):
+            t = self._advance_time()
+            source = source_idx[i]
+            event_type = types[i]
+
+            baseline = self._baselines[source] * (1 + 0.2 * self._diurnal(t))
+            std = 0.1 * baseline
+            value = rng.gauss(baseline, std)
+            kind = ""
+            if event_type == "metric" and rng.random() < config.anomaly_rate:
+                kind = ANOMALY_SPIKE if rng.random() < 0.7 else ANOMALY_DIP
+                sign = 1 if kind == ANOMALY_SPIKE else -1
+                value = baseline + sign * config.anomaly_magnitude * std
+
+            attributes = {"user_id": f"user-{user_idx[i]}"}
+            for name, values in self._attribute_values.items():
+                attributes[name] = values[rng.randrange(len(values))]
+
+            batch.ids.append(f"evt-{self._next_id}")
+            batch.event_types.append(event_type)
+            batch.timestamps.append(config.start_ms + int(t * 1000))
+            batch.sources.append(self._source_names[source])
+            batch.values.append(value)
+            batch.attributes.append(attributes)
+            batch.is_anomaly.append(bool(kind))
+            batch.anomaly_kinds.append(kind)
+            self._next_id += 1
+        return batch
+
+    def batches(self, count: int, batch_size: int) -> Iterator[EventBatch]:
+        """Generate ``count`` consecutive batches."""
+        for _ in range(count):
+            yield self.batch(batch_size)
+
+    def event_generator(self, chunk: int = 1024) -> Callable[[int], common_pb2.Event]:
+        """Adapter for ``telemetryx.bench.loadgen`` (ignores the sequence number)."""
+        buffer: list[common_pb2.Event] = []
+
+        def generate(i: int) -> common_pb2.Event:
+            if not buffer:
+                buffer.extend(reversed(self.batch(chunk).to_events()))
+            return buffer.pop()
+
+        return generate
@@ -20,17 +20,133 @@ class Settings(BaseSettings):
     # Server configuration
     grpc_host: str = "0.0.0.0"
     grpc_port: int = 50051
+    grpc_max_workers: int = 10
 
     # Environment
     python_env: str = "development"
     log_level: str = "INFO"
 
+    # Hot-path logging: sample 1 in N calls (errors and slow calls always
+    # logged) and rate limit each logger with a token bucket
+    log_sample_every: int = 100
+    log_slow_ms: float = 250.0
+    log_rate_limit: float = 200.0  # events/second per logger, 0 disables
+    log_rate_burst: int = 500
+    log_summary_interval_s: float = 60.0
+
+    # Production logs are written by a background thread from a bounded
+    # queue; events are dropped (and counted) when the queue is full
+    log_async: bool = True
+    log_queue_size: int = 10_000
+
     # Database
     database_url: str = ""
 
     # Redis
     redis_url: str = ""
 
+    # Metrics (Prometheus /metrics endpoint, served on the gRPC event loop)
+    metrics_enabled: bool = True
+    metrics_port: int = 9090
+
+    # Debug endpoints on the metrics HTTP server (/debug/profile). SIGUSR1
+    # always triggers a profile, written to profiler_output_dir
+    debug_endpoints_enabled: bool = False
+    profiler_interval_ms: float = 5.0
+    profiler_default_seconds: float = 10.0
+    profiler_max_seconds: float = 60.0
+    profiler_output_dir: str = "/tmp/telemetryx-profiles"
+
+    # Load tracking: capacities at which each signal counts as fully
+    # utilized; sustained utilization >= 1.0 flips health to NOT_SERVING
+    load_sample_interval_s: float = 0.5
+    load_max_in_flight: int = 512
+    load_max_loop_lag_ms: float = 100.0
+    load_max_queue_depth: int = 1000
+    load_overload_samples: int = 6
+
+    # Event-loop monitor: heartbeat lag histogram, plus a watchdog thread
+    # that logs the loop's stack when a callback blocks past the threshold
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval_ms: float = 20.0
+    loop_stall_threshold_ms: float = 100.0
+
+    # Admission control (per-method adaptive concurrency limits)
+    admission_enabled: bool = True
+    admission_initial_limit: int = 32
+    admission_min_limit: int = 4
+    admission_max_limit: int = 256
+
+    # Priority lanes: separate concurrency budgets and queues for health
+    # checks, interactive calls and bulk batches (>= lane_bulk_min_events)
+    lane_health_concurrency: int = 16
+    lane_health_queue: int = 64
+    lane_interactive_concurrency: int = 128
+    lane_interactive_queue: int = 1024
+    lane_bulk_concurrency: int = 4
+    lane_bulk_queue: int = 64
+    lane_bulk_min_events: int = 100
+
+    # Per-stage timing breakdown in responses (stage_timings_us) and in
+    # telemetryx-server-timing trailing metadata
+    timing_enabled: bool = True
+
+    # Distributed tracing: exporter is "none", "file" (OTLP/JSON lines) or
+    # "otlp" (OTLP/HTTP collector). Calls with a traceparent follow the
+    # caller's sampling decision; others start a trace at the sample rate
+    tracing_exporter: str = "none"
+    tracing_file: str = "traces.jsonl"
+    tracing_otlp_endpoint: str = "http://localhost:4318"
+    tracing_sample_rate: float = 0.01
+    tracing_service_name: str = "telemetryx-python"
+
+    # Streaming anomaly detection: per-(source, event_type) EWMA mean and
+    # variance. Series are not flagged before detector_warmup values, and
+    # events of series beyond detector_max_series are not scored
+    detector_alpha: float = 0.05
+    detector_warmup: int = 30
+    detector_max_series: int = 1_000_000
+
+    # Quantile-band detection (model_name "quantile"): a DDSketch per series
+    # with at most quantile_max_bins bins per sign. Counts are halved every
+    # quantile_window values so bands follow recent history (0 keeps all)
+    quantile_relative_accuracy: float = 0.01
+    quantile_max_bins: int = 512
+    quantile_warmup: int = 100
+    quantile_window: int = 10_000
+
+    # Seasonal detection (model_name "seasonal"): per-series Holt-Winters
+    # with seasonal_buckets offsets per seasonal_period_s cycle (hourly
+    # buckets over a day by default), taken from each event's timestamp
+    seasonal_period_s: int = 86_400
+    seasonal_buckets: int = 24
+    seasonal_alpha: float = 0.05
+    seasonal_gamma: float = 0.1
+    seasonal_warmup: int = 50
+
+    # Event-rate detection (model_name "rate"): events per series counted
+    # in rate_window_s tumbling windows of event time, against an hourly
+    # seasonal rate. Events more than rate_lateness_s behind the latest
+    # timestamp seen, or more than rate_max_skew_s ahead of the server's
+    # clock (0 for no limit), are not counted
+    rate_window_s: int = 60
+    rate_lateness_s: int = 60
+    rate_max_skew_s: int = 300
+    rate_alpha: float = 0.1
+    rate_warmup: int = 10
+
+    # Stored models (any other model_name): <models_dir>/<name>/<version>/,
+    # memory-mapped on first use. At most models_max_loaded models (and
+    # models_max_bytes of weights, 0 for no limit) stay loaded; loaded
+    # models are checked for new versions every models_refresh_interval_s.
+    # Names that are not stored keep failing without a disk scan for
+    # models_missing_ttl_s
+    models_dir: str = "models"
+    models_max_loaded: int = 8
+    models_max_bytes: int = 0
+    models_refresh_interval_s: float = 30.0
+    models_missing_ttl_s: float = 5.0
+
     @property
     def is_production(self) -> bool:
         """Check if running in production environment."""
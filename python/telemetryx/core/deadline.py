@@ -0,0 +1,100 @@
+"""Request deadline propagation.
+
+The deadline of the request being handled is kept in a context variable,
+so downstream calls (Postgres, Redis) can bound their own work by the
+caller's remaining budget without threading the gRPC context through
+every function.
+
+Example:
+    with deadline_scope(context.time_remaining()):
+        async with bounded("postgres.execute"):
+            await cur.execute(query)
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+from telemetryx.core import metrics
+from telemetryx.core.exceptions import DeadlineExceededError
+
+# Absolute deadline (time.monotonic() seconds) of the current request
+_deadline: ContextVar[float | None] = ContextVar("telemetryx_deadline", default=None)
+
+ABANDONED = metrics.counter(
+    "telemetryx_deadline_abandoned_total",
+    "Units of work abandoned because their deadline expired",
+    ["stage"],
+)
+
+
+@contextmanager
+def deadline_scope(timeout: float | None) -> Iterator[None]:
+    """Set the deadline for the enclosed block.
+
+    Args:
+        timeout: Seconds remaining, or None for no deadline. A nested scope
+            can only tighten an outer deadline, never extend it.
+    """
+    current = _deadline.get()
+    deadline = current
+    if timeout is not None:
+        candidate = time.monotonic() + timeout
+        deadline = candidate if current is None else min(current, candidate)
+
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_remaining() -> float | None:
+    """Seconds left before the current deadline, or None if unbounded."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def expired() -> bool:
+    """Check if the current deadline has passed."""
+    deadline = _deadline.get()
+    return deadline is not None and time.monotonic() >= deadline
+
+
+@asynccontextmanager
+async def bounded(operation: str) -> AsyncIterator[None]:
+    """Bound the enclosed async work by the current deadline.
+
+    Raises:
+        DeadlineExceededError: If the deadline has already passed or
+            expires while the block is running
+    """
+    remaining = time_remaining()
+    if remaining is None:
+        yield
+        return
+
+    if remaining <= 0:
+        record_abandoned(operation)
+        raise DeadlineExceededError("Deadline exceeded", {"operation": operation})
+
+    try:
+        async with asyncio.timeout(remaining):
+            yield
+    except TimeoutError as e:
+        record_abandoned(operation)
+        raise DeadlineExceededError("Deadline exceeded", {"operation": operation}) from e
+
+
+def record_abandoned(stage: str, count: int = 1) -> None:
+    """Record units of work skipped because their deadline expired."""
+    ABANDONED.labels(stage).inc(count)
+
+
+def abandoned_counts() -> dict[str, int]:
+    """Get abandoned work counts per stage since process start."""
+    return {values[0]: int(child.value) for values, child in ABANDONED.children()}
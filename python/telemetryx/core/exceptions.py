@@ -49,6 +49,18 @@ class AnomalyDetectionError(ServiceError):
     pass
 
 
+class ModelNotFoundError(AnomalyDetectionError):
+    """Raised when a model name does not resolve to a stored model."""
+
+    pass
+
+
+class DeadlineExceededError(ServiceError):
+    """Raised when a request's deadline expires before its work completes."""
+
+    pass
+
+
 class DatabaseError(TelemetryXError):
     """Raised when database operations fail."""
 
@@ -0,0 +1,172 @@
+"""Non-blocking log sink for production JSON logging.
+
+structlog's default setup renders JSON and writes to stdout synchronously
+on the calling thread, so a slow stdout consumer stalls the event loop.
+``AsyncLogSink`` instead:
+- Enqueues event dicts into a bounded in-memory queue (O(1), no I/O).
+- Renders and writes them in batches from a background thread, using
+  ``orjson`` when installed (``pip install telemetryx[fast]``).
+- Drops events, and counts them, when the queue is full rather than
+  blocking the caller.
+
+Example:
+    sink = AsyncLogSink(max_queue=10_000)
+    sink.start()
+    structlog.configure(
+        processors=[..., enqueue_renderer],
+        logger_factory=sink.logger_factory,
+    )
+"""
+
+import sys
+import threading
+from collections import deque
+from collections.abc import MutableMapping
+from typing import Any, BinaryIO
+
+from telemetryx.core import metrics
+
+try:
+    import orjson
+
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize to compact JSON bytes (orjson)."""
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS)
+
+except ImportError:  # pragma: no cover - depends on optional dependency
+    import json
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize to compact JSON bytes (stdlib fallback)."""
+        return json.dumps(obj, default=str, separators=(",", ":")).encode()
+
+
+LOG_EVENTS_DROPPED = metrics.counter(
+    "telemetryx_log_events_dropped_total",
+    "Log events dropped because the async log queue was full",
+)
+
+
+def enqueue_renderer(
+    logger: Any,
+    method_name: str,
+    event_dict: MutableMapping[str, Any],
+) -> tuple[tuple[MutableMapping[str, Any]], dict[str, Any]]:
+    """Final structlog processor: pass the event dict through unrendered.
+
+    Rendering happens on the sink's writer thread instead.
+    """
+    return (event_dict,), {}
+
+
+class QueueLogger:
+    """structlog logger that hands event dicts to an ``AsyncLogSink``."""
+
+    def __init__(self, sink: "AsyncLogSink") -> None:
+        self._sink = sink
+
+    def msg(self, event_dict: MutableMapping[str, Any]) -> None:
+        """Enqueue an event (all log levels behave the same)."""
+        self._sink.enqueue(event_dict)
+
+    log = debug = info = warn = warning = msg
+    error = exception = critical = fatal = failure = msg
+
+
+class AsyncLogSink:
+    """Bounded queue plus background writer thread for log events."""
+
+    def __init__(
+        self,
+        stream: BinaryIO | None = None,
+        max_queue: int = 10_000,
+        batch_size: int = 512,
+        flush_interval: float = 0.05,
+    ) -> None:
+        self._stream = stream if stream is not None else sys.stdout.buffer
+        self._max_queue = max_queue
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: deque[MutableMapping[str, Any]] = deque()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+        self.dropped = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of events waiting to be written."""
+        return len(self._queue)
+
+    def logger_factory(self, *args: Any) -> QueueLogger:
+        """structlog logger factory producing queue loggers."""
+        return QueueLogger(self)
+
+    def enqueue(self, event_dict: MutableMapping[str, Any]) -> None:
+        """Add an event to the queue, dropping it if the queue is full."""
+        if len(self._queue) >= self._max_queue:
+            self.dropped += 1
+            LOG_EVENTS_DROPPED.inc()
+            return
+        self._queue.append(event_dict)
+        if len(self._queue) == self._batch_size:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        """Start the background writer thread."""
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="telemetryx-log-writer", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the writer thread after flushing queued events."""
+        if self._thread is None:
+            while self._queue:
+                self._write_batch()
+            return
+        self._stopping = True
+        self._wakeup.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        """Writer loop: drain the queue in batches until stopped."""
+        while True:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            while self._queue:
+                self._write_batch()
+            if self._stopping:
+                return
+
+    def _write_batch(self) -> None:
+        """Render and write up to one batch of queued events."""
+        lines: list[bytes] = []
+        popleft = self._queue.popleft
+        try:
+            for _ in range(self._batch_size):
+                lines.append(_render(popleft()))
+        except IndexError:
+            pass
+        if not lines:
+            return
+
+        lines.append(b"")
+        try:
+            self._stream.write(b"\n".join(lines))
+            self._stream.flush()
+        except (OSError, ValueError):
+            # stdout closed or broken; nothing sensible left to do with logs
+            pass
+
+
+def _render(event_dict: MutableMapping[str, Any]) -> bytes:
+    """Render one event, falling back to repr for unserializable values."""
+    try:
+        return dumps(event_dict)
+    except (TypeError, ValueError):
+        return dumps({key: repr(value) for key, value in event_dict.items()})
@@ -1,37 +1,211 @@
 """Structured logging setup using structlog.
 
 Provides JSON logging for production and pretty console output for development.
+
+Hot paths should not log every call. Two mechanisms keep logging cheap:
+- ``LogSampler``: per-call-site sampling (1 in N), always letting errors
+  and slow calls through.
+- ``RateLimitProcessor``: a token bucket per logger applied to every event
+  below error level.
+
+Dropped events are counted and periodically summarized in a single log line
+(see ``run_drop_summaries``).
+
+In production, events are rendered and written by a background thread
+(see ``telemetryx.core.log_sink``) so a slow stdout never blocks the event
+loop. Call ``shutdown_logging`` on exit to flush queued events.
 """
 
+import asyncio
+import atexit
 import logging
 import sys
+import time
+import weakref
+from collections import Counter
+from collections.abc import Callable, MutableMapping
 from typing import Any
 
 import structlog
 from structlog.typing import Processor
 
 from telemetryx.core.config import get_settings
+from telemetryx.core.log_sink import AsyncLogSink, enqueue_renderer
+
+# Levels that are never sampled or rate limited
+_ALWAYS_LOG_LEVELS = frozenset({"error", "exception", "critical"})
+
+# Active samplers, for drop summaries
+_samplers: "weakref.WeakSet[LogSampler]" = weakref.WeakSet()
+
+# Rate limiter installed by setup_logging (None if disabled)
+_rate_limiter: "RateLimitProcessor | None" = None
+
+# Async sink installed by setup_logging (None when writing synchronously)
+_sink: AsyncLogSink | None = None
+
+
+class LogSampler:
+    """Per-call-site log sampler.
+
+    Lets 1 in ``every`` calls through, plus every error and every call
+    slower than ``slow_ms``. Create one sampler per call site and keep it
+    (e.g. as a handler attribute).
+
+    Example:
+        sampler = LogSampler("evaluate-complete", every=100, slow_ms=50)
+        if sampler.should_log(duration_ms=elapsed_ms):
+            logger.info("Evaluation complete", sampled_every=sampler.every)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        every: int | None = None,
+        slow_ms: float | None = None,
+    ) -> None:
+        settings = get_settings()
+        self.name = name
+        self.every = max(1, every if every is not None else settings.log_sample_every)
+        self.slow_ms = slow_ms if slow_ms is not None else settings.log_slow_ms
+        self.dropped = 0
+        self._countdown = 1  # log the first call
+        _samplers.add(self)
+
+    def should_log(self, *, error: bool = False, duration_ms: float | None = None) -> bool:
+        """Decide whether this call should be logged."""
+        if error or (duration_ms is not None and duration_ms >= self.slow_ms):
+            return True
+        self._countdown -= 1
+        if self._countdown <= 0:
+            self._countdown = self.every
+            return True
+        self.dropped += 1
+        return False
+
+
+class RateLimitProcessor:
+    """structlog processor applying a token bucket per logger.
+
+    The logger is identified by the ``logger`` key bound by ``get_logger``.
+    Events at error level and above are never dropped.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._rate = rate
+        self._burst = float(burst)
+        self._clock = clock
+        # logger -> [tokens, last refill time]
+        self._buckets: dict[str, list[float]] = {}
+        self.dropped: Counter[str] = Counter()
+
+    def __call__(
+        self,
+        logger: Any,
+        method_name: str,
+        event_dict: MutableMapping[str, Any],
+    ) -> MutableMapping[str, Any]:
+        if method_name in _ALWAYS_LOG_LEVELS:
+            return event_dict
+
+        key = str(event_dict.get("logger", ""))
+        now = self._clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self._burst, now]
+
+        tokens = min(self._burst, bucket[0] + (now - bucket[1]) * self._rate)
+        bucket[1] = now
+        if tokens < 1.0:
+            bucket[0] = tokens
+            self.dropped[key] += 1
+            raise structlog.DropEvent
+        bucket[0] = tokens - 1.0
+        return event_dict
+
+
+def take_dropped_counts() -> dict[str, int]:
+    """Get and reset the number of dropped log events per sampler/logger."""
+    counts: dict[str, int] = {}
+    for sampler in list(_samplers):
+        if sampler.dropped:
+            key = f"sampler:{sampler.name}"
+            counts[key] = counts.get(key, 0) + sampler.dropped
+            sampler.dropped = 0
+    if _rate_limiter is not None:
+        for key, dropped in _rate_limiter.dropped.items():
+            counts[f"rate_limit:{key}"] = dropped
+        _rate_limiter.dropped.clear()
+    if _sink is not None and _sink.dropped:
+        counts["queue_full"] = _sink.dropped
+        _sink.dropped = 0
+    return counts
+
+
+def emit_drop_summary() -> None:
+    """Log one summary line of dropped log events since the last summary."""
+    counts = take_dropped_counts()
+    if counts:
+        get_logger(__name__).info("Log events dropped", total=sum(counts.values()), dropped=counts)
+
+
+async def run_drop_summaries(interval_s: float) -> None:
+    """Emit drop summaries every ``interval_s`` seconds until cancelled."""
+    try:
+        while True:
+            await asyncio.sleep(interval_s)
+            emit_drop_summary()
+    except asyncio.CancelledError:
+        emit_drop_summary()
+        raise
 
 
 def setup_logging() -> None:
     """Configure structured logging for the application."""
+    global _rate_limiter, _sink
+
     settings = get_settings()
+    shutdown_logging()
 
     # Determine the environment
     is_production = settings.is_production
     log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
 
-    # Shared processors for all environments
-    shared_processors: list[Processor] = [
+    # Shared processors for all environments. Rate limiting runs first so
+    # dropped events cost as little as possible.
+    shared_processors: list[Processor] = []
+    _rate_limiter = None
+    if settings.log_rate_limit > 0:
+        _rate_limiter = RateLimitProcessor(settings.log_rate_limit, settings.log_rate_burst)
+        shared_processors.append(_rate_limiter)
+    shared_processors += [
         structlog.contextvars.merge_contextvars,
         structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
     ]
 
-    if is_production:
-        # Production: JSON output for log aggregators
+    logger_factory: Any = structlog.PrintLoggerFactory()
+
+    if is_production and settings.log_async:
+        # Production: JSON output for log aggregators, rendered and written
+        # off the event loop by a background thread
+        _sink = AsyncLogSink(max_queue=settings.log_queue_size)
+        _sink.start()
+        logger_factory = _sink.logger_factory
         processors: list[Processor] = [
+            *shared_processors,
+            structlog.processors.format_exc_info,
+            enqueue_renderer,
+        ]
+    elif is_production:
+        # Production: JSON output for log aggregators
+        processors = [
             *shared_processors,
             structlog.processors.format_exc_info,
             structlog.processors.JSONRenderer(),
@@ -48,7 +222,7 @@ def setup_logging() -> None:
         processors=processors,
         wrapper_class=structlog.make_filtering_bound_logger(log_level),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
@@ -60,6 +234,18 @@ def setup_logging() -> None:
     )
 
 
+def shutdown_logging() -> None:
+    """Flush and stop the async log sink, if one is running."""
+    global _sink
+
+    if _sink is not None:
+        _sink.close()
+        _sink = None
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: str | None = None, **initial_context: Any) -> structlog.BoundLogger:
     """Get a logger instance with optional initial context.
 
@@ -67,6 +253,8 @@ def get_logger(name: str | None = None, **initial_context: Any) -> structlog.Bou
         logger = get_logger(__name__, service="rules-engine")
         logger.info("Starting evaluation", rule_count=42)
     """
+    if name:
+        initial_context.setdefault("logger", name)
     logger = structlog.get_logger(name)
     if initial_context:
         logger = logger.bind(**initial_context)
@@ -0,0 +1,370 @@
+"""Process memory accounting.
+
+Provides:
+- ``resident_memory_bytes``: current RSS (from ``/proc/self/statm``)
+- ``GcMonitor``: collection counts and pause times per GC generation,
+  exported as the ``telemetryx_gc_pause_seconds`` histogram
+- A registry of size providers for large in-process structures (rule
+  snapshots, detector state, caches) so they can be reported together
+- ``AllocationTracker``: on-demand ``tracemalloc`` snapshots and diffs
+  grouped by module
+
+Example:
+    register_size_provider("detector.state", lambda: store.nbytes)
+    sizes = structure_sizes()  # {"detector.state": 1048576, ...}
+
+    tracker = AllocationTracker()
+    base = tracker.snapshot()
+    ...
+    for entry in tracker.diff(base):
+        print(entry.module, entry.size_diff)
+"""
+
+import gc
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from telemetryx.core import metrics
+
+# GC pauses are usually well under a millisecond; full collections of a
+# large heap can take hundreds
+GC_PAUSE_BUCKETS: tuple[float, ...] = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+GC_PAUSE = metrics.histogram(
+    "telemetryx_gc_pause_seconds",
+    "Time spent in garbage collection, by generation",
+    ["generation"],
+    buckets=GC_PAUSE_BUCKETS,
+)
+GC_COLLECTED = metrics.counter(
+    "telemetryx_gc_collected_objects_total",
+    "Unreachable objects collected by the garbage collector, by generation",
+    ["generation"],
+)
+RESIDENT_MEMORY = metrics.gauge(
+    "telemetryx_process_resident_memory_bytes",
+    "Resident set size of the process",
+)
+STRUCTURE_SIZE = metrics.gauge(
+    "telemetryx_structure_size_bytes",
+    "Approximate size of registered in-process structures",
+    ["structure"],
+)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def resident_memory_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def peak_resident_memory_bytes() -> int:
+    """Peak resident set size since process start."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+RESIDENT_MEMORY.set_function(resident_memory_bytes)
+
+
+@dataclass
+class GenerationStats:
+    """Collections and pause times of one GC generation."""
+
+    collections: int = 0
+    collected: int = 0
+    pause_total: float = 0.0
+    pause_max: float = 0.0
+
+
+class GcMonitor:
+    """Times garbage collections through ``gc.callbacks``."""
+
+    def __init__(self) -> None:
+        self._start: float | None = None
+        self._installed = False
+        self.generations = [GenerationStats() for _ in range(3)]
+        self._pause = [GC_PAUSE.labels(str(g)) for g in range(3)]
+        self._collected = [GC_COLLECTED.labels(str(g)) for g in range(3)]
+
+    def install(self) -> None:
+        """Start timing collections."""
+        if not self._installed:
+            gc.callbacks.append(self._callback)
+            self._installed = True
+
+    def uninstall(self) -> None:
+        """Stop timing collections."""
+        if self._installed:
+            gc.callbacks.remove(self._callback)
+            self._installed = False
+
+    def _callback(self, phase: str, info: dict[str, int]) -> None:
+        if phase == "start":
+            self._start = time.perf_counter()
+            return
+        if self._start is None:
+            return
+        pause = time.perf_counter() - self._start
+        self._start = None
+
+        generation = info.get("generation", 2)
+        stats = self.generations[generation]
+        stats.collections += 1
+        stats.collected += info.get("collected", 0)
+        stats.pause_total += pause
+        stats.pause_max = max(stats.pause_max, pause)
+        self._pause[generation].observe(pause)
+        self._collected[generation].inc(info.get("collected", 0))
+
+    def report(self) -> dict[str, Any]:
+        """GC counters, thresholds and pause statistics."""
+        return {
+            "enabled": gc.isenabled(),
+            "counts": list(gc.get_count()),
+            "thresholds": list(gc.get_threshold()),
+            "objects_tracked": len(gc.get_objects()),
+            "generations": [
+                {
+                    "generation": g,
+                    "collections": stats.collections,
+                    "collected": stats.collected,
+                    "pause_total_ms": round(stats.pause_total * 1000, 3),
+                    "pause_max_ms": round(stats.pause_max * 1000, 3),
+                }
+                for g, stats in enumerate(self.generations)
+            ],
+        }
+
+
+# ============================================
+# Structure sizes
+# ============================================
+
+SizeProvider = Callable[[], int]
+
+_size_providers: dict[str, SizeProvider] = {}
+_size_lock = threading.Lock()
+
+
+def register_size_provider(name: str, provider: SizeProvider) -> None:
+    """Report ``provider()`` (approximate bytes) as the size of structure ``name``.
+
+    Registering a name again replaces its provider.
+    """
+    with _size_lock:
+        _size_providers[name] = provider
+    STRUCTURE_SIZE.labels(name).set_function(lambda: float(_size_or_zero(name)))
+
+
+def unregister_size_provider(name: str) -> None:
+    """Stop reporting a structure."""
+    with _size_lock:
+        _size_providers.pop(name, None)
+
+
+def _size_or_zero(name: str) -> int:
+    provider = _size_providers.get(name)
+    if provider is None:
+        return 0
+    try:
+        return int(provider())
+    except Exception:
+        return 0
+
+
+def structure_sizes() -> dict[str, int]:
+    """Current size of every registered structure, in bytes."""
+    with _size_lock:
+        names = sorted(_size_providers)
+    return {name: _size_or_zero(name) for name in names}
+
+
+def approximate_size(obj: Any, limit: int = 1_000_000) -> int:
+    """Approximate deep size of a container in bytes.
+
+    Follows references (``gc.get_referents``) breadth-first, counting each
+    object once and skipping modules, types and functions. Stops after
+    ``limit`` objects, so very large structures are under-reported rather
+    than stalling the caller.
+    """
+    seen: set[int] = set()
+    pending = [obj]
+    total = 0
+    while pending and len(seen) < limit:
+        batch = []
+        for item in pending:
+            if id(item) in seen or isinstance(item, _SKIP_TYPES):
+                continue
+            seen.add(id(item))
+            total += sys.getsizeof(item, 0)
+            batch.append(item)
+        pending = gc.get_referents(*batch)
+    return total
+
+
+_SKIP_TYPES = (type, type(sys), type(approximate_size), type(len))
+
+
+# ============================================
+# Allocation snapshots
+# ============================================
+
+
+@dataclass(frozen=True)
+class ModuleAllocation:
+    """Traced allocations of one module (or a change between snapshots)."""
+
+    module: str
+    size: int
+    count: int
+    size_diff: int = 0
+    count_diff: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form."""
+        return {
+            "module": self.module,
+            "size": self.size,
+            "count": self.count,
+            "size_diff": self.size_diff,
+            "count_diff": self.count_diff,
+        }
+
+
+class AllocationTracker:
+    """Takes ``tracemalloc`` snapshots and diffs them by module.
+
+    Tracing starts with the first snapshot (so the process only pays for
+    tracemalloc once someone asks) and runs until ``stop()``.
+    """
+
+    def __init__(self, frames: int = 1, max_snapshots: int = 8) -> None:
+        self._frames = frames
+        self._max_snapshots = max_snapshots
+        self._snapshots: dict[int, tracemalloc.Snapshot] = {}
+        self._next_id = 1
+        self._modules: dict[str, str] = {}
+
+    @property
+    def tracing(self) -> bool:
+        """Whether tracemalloc is running."""
+        return tracemalloc.is_tracing()
+
+    @property
+    def snapshot_ids(self) -> list[int]:
+        """Ids of the snapshots kept, oldest first."""
+        return sorted(self._snapshots)
+
+    def snapshot(self) -> int:
+        """Take a snapshot (starting tracemalloc if needed) and return its id."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self._frames)
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<unknown>"),
+            )
+        )
+        snapshot_id = self._next_id
+        self._next_id += 1
+        self._snapshots[snapshot_id] = snapshot
+        while len(self._snapshots) > self._max_snapshots:
+            del self._snapshots[min(self._snapshots)]
+        return snapshot_id
+
+    def stop(self) -> None:
+        """Stop tracing and drop all snapshots."""
+        self._snapshots.clear()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def top(self, snapshot_id: int, limit: int = 20) -> list[ModuleAllocation]:
+        """Largest allocating modules in a snapshot."""
+        totals = self._by_module(self._get(snapshot_id))
+        entries = [
+            ModuleAllocation(module, size, count) for module, (size, count) in totals.items()
+        ]
+        entries.sort(key=lambda e: e.size, reverse=True)
+        return entries[:limit]
+
+    def diff(
+        self, base_id: int, snapshot_id: int | None = None, limit: int = 20
+    ) -> list[ModuleAllocation]:
+        """Per-module growth from ``base_id`` to ``snapshot_id`` (default: a new snapshot).
+
+        Sorted by absolute size change, largest first.
+        """
+        base = self._by_module(self._get(base_id))
+        if snapshot_id is None:
+            snapshot_id = self.snapshot()
+        current = self._by_module(self._get(snapshot_id))
+
+        entries = []
+        for module in base.keys() | current.keys():
+            size, count = current.get(module, (0, 0))
+            base_size, base_count = base.get(module, (0, 0))
+            if size != base_size or count != base_count:
+                entries.append(
+                    ModuleAllocation(module, size, count, size - base_size, count - base_count)
+                )
+        entries.sort(key=lambda e: abs(e.size_diff), reverse=True)
+        return entries[:limit]
+
+    def _get(self, snapshot_id: int) -> tracemalloc.Snapshot:
+        snapshot = self._snapshots.get(snapshot_id)
+        if snapshot is None:
+            raise KeyError(f"No snapshot with id {snapshot_id} (have {self.snapshot_ids})")
+        return snapshot
+
+    def _by_module(self, snapshot: tracemalloc.Snapshot) -> dict[str, tuple[int, int]]:
+        """Total (size, count) per module of the allocating frame."""
+        totals: dict[str, tuple[int, int]] = {}
+        for stat in snapshot.statistics("filename"):
+            module = self._module_name(stat.traceback[0].filename)
+            size, count = totals.get(module, (0, 0))
+            totals[module] = (size + stat.size, count + stat.count)
+        return totals
+
+    def _module_name(self, filename: str) -> str:
+        """Map a source file to its module name (the file name if unknown)."""
+        module = self._modules.get(filename)
+        if module is None:
+            for name, loaded in list(sys.modules.items()):
+                path = getattr(loaded, "__file__", None)
+                if path:
+                    self._modules.setdefault(path, name)
+            module = self._modules.setdefault(filename, filename)
+        return module
@@ -0,0 +1,361 @@
+"""Lightweight in-process metrics with Prometheus text exposition.
+
+Provides counters, gauges and fixed-bucket histograms designed for hot
+paths:
+- Label lookups are done once; callers keep the returned child and
+  update it directly (a single attribute increment per observation).
+- Histogram buckets are preallocated when the child is created, so
+  observing a value never grows a data structure.
+
+Example:
+    from telemetryx.core import metrics
+
+    REQUESTS = metrics.counter("telemetryx_requests_total", "Requests", ["method"])
+    LATENCY = metrics.histogram("telemetryx_latency_seconds", "Latency", ["method"])
+
+    requests = REQUESTS.labels("EvaluateEvent")  # do this once
+    latency = LATENCY.labels("EvaluateEvent")
+
+    requests.inc()
+    latency.observe(0.0012)
+
+    text = metrics.REGISTRY.render()  # Prometheus text format
+
+Metrics are updated from the event loop thread; updates from other
+threads rely on the GIL and may occasionally lose an increment.
+"""
+
+import math
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+from typing import Generic, TypeVar
+
+# Default latency buckets in seconds (100µs to 10s)
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class CounterChild:
+    """A single labelled counter time series."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the counter (amount must be non-negative)."""
+        self.value += amount
+
+
+class GaugeChild:
+    """A single labelled gauge time series."""
+
+    __slots__ = ("value", "_function")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._function: Callable[[], float] | None = None
+
+    def set(self, value: float) -> None:
+        """Set the gauge to a value."""
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the gauge."""
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the gauge."""
+        self.value -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Compute the gauge value lazily at collection time."""
+        self._function = function
+
+    def get(self) -> float:
+        """Get the current value."""
+        if self._function is not None:
+            return float(self._function())
+        return self.value
+
+
+class HistogramChild:
+    """A single labelled histogram time series with preallocated buckets."""
+
+    __slots__ = ("_upper_bounds", "counts", "sum", "count")
+
+    def __init__(self, upper_bounds: tuple[float, ...]) -> None:
+        self._upper_bounds = upper_bounds
+        # One slot per bucket plus the +Inf overflow slot
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record an observation."""
+        self.counts[bisect_left(self._upper_bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation within its bucket."""
+        if self.count == 0:
+            return math.nan
+        rank = q * self.count
+        cumulative = 0
+        lower = 0.0
+        for i, bucket_count in enumerate(self.counts):
+            upper = self._upper_bounds[i] if i < len(self._upper_bounds) else lower
+            if cumulative + bucket_count >= rank and bucket_count > 0:
+                if i == len(self._upper_bounds):
+                    return lower
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+            lower = upper
+        return lower
+
+
+ChildT = TypeVar("ChildT", CounterChild, GaugeChild, HistogramChild)
+
+
+class _Metric(Generic[ChildT]):
+    """Base class for a metric family with optional labels."""
+
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], ChildT] = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self) -> ChildT:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> ChildT:
+        """Get (or create) the child for a set of label values."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {len(values)} values"
+                )
+            child = self._children[values] = self._new_child()
+        return child
+
+    def children(self) -> Iterable[tuple[tuple[str, ...], ChildT]]:
+        """Iterate over (label values, child) pairs."""
+        return list(self._children.items())
+
+    def render(self) -> list[str]:
+        """Render this metric family in Prometheus text format."""
+        lines = [
+            f"# HELP {self.name} {_escape_help(self.documentation)}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        for values, child in self.children():
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: tuple[str, ...], child: ChildT) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric[CounterChild]):
+    """Monotonically increasing counter."""
+
+    metric_type = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment an unlabelled counter."""
+        self._children[()].inc(amount)
+
+    def _render_child(self, values: tuple[str, ...], child: CounterChild) -> list[str]:
+        labels = _format_labels(self.labelnames, values)
+        return [f"{self.name}{labels} {_format_value(child.value)}"]
+
+
+class Gauge(_Metric[GaugeChild]):
+    """Value that can go up and down."""
+
+    metric_type = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def set(self, value: float) -> None:
+        """Set an unlabelled gauge."""
+        self._children[()].set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Compute an unlabelled gauge lazily at collection time."""
+        self._children[()].set_function(function)
+
+    def _render_child(self, values: tuple[str, ...], child: GaugeChild) -> list[str]:
+        labels = _format_labels(self.labelnames, values)
+        return [f"{self.name}{labels} {_format_value(child.get())}"]
+
+
+class Histogram(_Metric[HistogramChild]):
+    """Fixed-bucket histogram."""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.upper_bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float) -> None:
+        """Record an observation on an unlabelled histogram."""
+        self._children[()].observe(value)
+
+    def _render_child(self, values: tuple[str, ...], child: HistogramChild) -> list[str]:
+        labels = _format_labels(self.labelnames, values)
+        bucket_labelnames = (*self.labelnames, "le")
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip((*self.upper_bounds, math.inf), child.counts):
+            cumulative += bucket_count
+            le = _format_labels(bucket_labelnames, (*values, _format_value(bound)))
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class Registry:
+    """Collection of metric families rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}  # type: ignore[type-arg]
+
+    def register(self, metric: "_Metric[ChildT]") -> "_Metric[ChildT]":
+        """Register a metric family (names must be unique)."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> "_Metric | None":  # type: ignore[type-arg]
+        """Get a registered metric family by name."""
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide default registry
+REGISTRY = Registry()
+
+
+def counter(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    registry: Registry = REGISTRY,
+) -> Counter:
+    """Get or create a counter in the registry."""
+    existing = registry.get(name)
+    if existing is not None:
+        return _check_type(existing, Counter)
+    metric = Counter(name, documentation, labelnames)
+    registry.register(metric)
+    return metric
+
+
+def gauge(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    registry: Registry = REGISTRY,
+) -> Gauge:
+    """Get or create a gauge in the registry."""
+    existing = registry.get(name)
+    if existing is not None:
+        return _check_type(existing, Gauge)
+    metric = Gauge(name, documentation, labelnames)
+    registry.register(metric)
+    return metric
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = LATENCY_BUCKETS,
+    registry: Registry = REGISTRY,
+) -> Histogram:
+    """Get or create a histogram in the registry."""
+    existing = registry.get(name)
+    if existing is not None:
+        return _check_type(existing, Histogram)
+    metric = Histogram(name, documentation, labelnames, buckets)
+    registry.register(metric)
+    return metric
+
+
+MetricT = TypeVar("MetricT", Counter, Gauge, Histogram)
+
+
+def _check_type(metric: object, expected: type[MetricT]) -> MetricT:
+    if not isinstance(metric, expected):
+        raise ValueError(f"Metric {getattr(metric, 'name', '?')} is not a {expected.__name__}")
+    return metric
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", r"\\").replace("\n", r"\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape_label(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
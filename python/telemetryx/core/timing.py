@@ -0,0 +1,95 @@
+"""Per-request stage timing.
+
+Each RPC gets a ``StageTimer`` (created by ``TimingInterceptor`` when the
+request is deserialized) that accumulates nanoseconds per stage:
+
+- ``deserialize``: request protobuf parsing
+- ``queue``: waiting for admission and a priority lane slot
+- ``features`` / ``lookup``: preparing inputs (feature extraction, rule lookup)
+- ``evaluate``: the handler's core work
+- ``serialize``: response protobuf encoding
+
+The timer is found through a context variable, so code anywhere on the
+request path can add to it without threading it through arguments. When
+no timer is active (e.g. handlers called directly in tests), timing calls
+are no-ops.
+
+Example:
+    with stage("evaluate"):
+        matches = evaluate(event)
+
+    timer = current_timer()
+    if timer is not None:
+        response.stage_timings_us.update(timer.as_us())
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Trailing metadata key for the per-stage breakdown (Server-Timing syntax)
+SERVER_TIMING_KEY = "telemetryx-server-timing"
+
+_current: ContextVar["StageTimer | None"] = ContextVar("telemetryx_stage_timer", default=None)
+
+
+class StageTimer:
+    """Accumulated nanoseconds per stage for one request."""
+
+    __slots__ = ("start_ns", "stages")
+
+    def __init__(self, start_ns: int | None = None) -> None:
+        self.start_ns = time.perf_counter_ns() if start_ns is None else start_ns
+        self.stages: dict[str, int] = {}
+
+    def add(self, stage: str, elapsed_ns: int) -> None:
+        """Add time to a stage."""
+        self.stages[stage] = self.stages.get(stage, 0) + elapsed_ns
+
+    def total_ns(self) -> int:
+        """Nanoseconds since the timer started."""
+        return time.perf_counter_ns() - self.start_ns
+
+    def as_us(self) -> dict[str, int]:
+        """Stage durations in whole microseconds."""
+        return {name: ns // 1000 for name, ns in self.stages.items()}
+
+    def server_timing(self) -> str:
+        """Render as a Server-Timing header value (durations in milliseconds)."""
+        parts = [f"{name};dur={ns / 1e6:.3f}" for name, ns in self.stages.items()]
+        parts.append(f"total;dur={self.total_ns() / 1e6:.3f}")
+        return ", ".join(parts)
+
+
+def start_timer(start_ns: int | None = None) -> StageTimer:
+    """Create a timer and make it current for this request."""
+    timer = StageTimer(start_ns)
+    _current.set(timer)
+    return timer
+
+
+def current_timer() -> StageTimer | None:
+    """Timer of the request being handled, if any."""
+    return _current.get()
+
+
+def record_stage(name: str, elapsed_ns: int) -> None:
+    """Add time to a stage of the current request (no-op without a timer)."""
+    timer = _current.get()
+    if timer is not None:
+        timer.add(name, elapsed_ns)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the enclosed block as a stage of the current request."""
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        timer.add(name, time.perf_counter_ns() - start)
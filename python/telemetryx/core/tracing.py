@@ -0,0 +1,511 @@
+"""Distributed tracing with W3C trace context.
+
+The Rust gateway sends a ``traceparent`` header with each gRPC call.
+``TracingInterceptor`` continues that trace: it makes the call's server
+span current (in a context variable), and code on the request path adds
+child spans with ``span()``, e.g. handler stages and database calls.
+
+Sampling is decided once per trace, at the head:
+- Calls with a ``traceparent`` follow the caller's sampled flag, so a
+  trace is either complete on both sides of the boundary or absent.
+- Calls without one start a new trace with probability ``sample_rate``.
+
+Unsampled calls never create span objects; ``span()`` then costs one
+context variable lookup. Finished spans are queued to a
+``BatchSpanProcessor``, which exports them in batches from a background
+thread as OTLP/JSON, either to a local file (one export request per line)
+or to a collector's OTLP/HTTP endpoint.
+
+Example:
+    tracer = Tracer(BatchSpanProcessor(FileSpanExporter("traces.jsonl")), sample_rate=0.01)
+    configure_tracing(tracer)
+
+    with span("postgres.execute", {"db.system": "postgresql"}, kind=SpanKind.CLIENT):
+        await cur.execute(query)
+"""
+
+import json
+import random
+import threading
+import time
+import urllib.request
+from collections import deque
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from pathlib import Path
+from typing import Any, Protocol
+
+from telemetryx.core import metrics
+from telemetryx.core.config import Settings
+from telemetryx.core.exceptions import ConfigurationError
+
+TRACEPARENT_KEY = "traceparent"
+
+SPANS_DROPPED = metrics.counter(
+    "telemetryx_trace_spans_dropped_total",
+    "Finished spans dropped because the export queue was full",
+)
+SPANS_EXPORTED = metrics.counter(
+    "telemetryx_trace_spans_exported_total",
+    "Spans handed to the trace exporter",
+)
+
+AttributeValue = str | bool | int | float
+
+
+class SpanKind(IntEnum):
+    """OTLP span kinds."""
+
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+
+
+@dataclass(frozen=True, slots=True)
+class SpanContext:
+    """Identity of a span as carried in ``traceparent``."""
+
+    trace_id: str  # 32 lowercase hex digits
+    span_id: str  # 16 lowercase hex digits
+    sampled: bool
+
+    @property
+    def traceparent(self) -> str:
+        """Render as a W3C ``traceparent`` value."""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+_HEX = frozenset("0123456789abcdef")
+
+
+def parse_traceparent(value: str | None) -> SpanContext | None:
+    """Parse a W3C ``traceparent`` value (None if missing or malformed)."""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4:
+        return None
+    version, trace_id, span_id, flags = parts[:4]
+    if (
+        len(version) != 2
+        or version == "ff"
+        or (version == "00" and len(parts) != 4)
+        or len(trace_id) != 32
+        or len(span_id) != 16
+        or len(flags) != 2
+        or not _HEX.issuperset(version + trace_id + span_id + flags)
+        or trace_id == "0" * 32
+        or span_id == "0" * 16
+    ):
+        return None
+    return SpanContext(trace_id, span_id, sampled=bool(int(flags, 16) & 0x01))
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Span:
+    """A timed operation within a sampled trace."""
+
+    __slots__ = (
+        "name",
+        "context",
+        "parent_span_id",
+        "kind",
+        "attributes",
+        "start_ns",
+        "end_ns",
+        "error",
+        "_processor",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        context: SpanContext,
+        parent_span_id: str | None,
+        kind: SpanKind,
+        attributes: Mapping[str, AttributeValue] | None,
+        processor: "SpanProcessor",
+    ) -> None:
+        self.name = name
+        self.context = context
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.attributes: dict[str, AttributeValue] = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.error: str | None = None
+        self._processor = processor
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        """Set an attribute on the span."""
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        """Mark the span as failed."""
+        self.error = message
+
+    def end(self) -> None:
+        """Finish the span and hand it to the processor (idempotent)."""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        self._processor.on_end(self)
+
+    def to_otlp(self) -> dict[str, Any]:
+        """OTLP/JSON representation of the span."""
+        otlp: dict[str, Any] = {
+            "traceId": self.context.trace_id,
+            "spanId": self.context.span_id,
+            "name": self.name,
+            "kind": int(self.kind),
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_span_id:
+            otlp["parentSpanId"] = self.parent_span_id
+        return otlp
+
+
+def _otlp_attributes(attributes: Mapping[str, AttributeValue]) -> list[dict[str, Any]]:
+    result = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            encoded: dict[str, Any] = {"boolValue": value}
+        elif isinstance(value, int):
+            encoded = {"intValue": str(value)}
+        elif isinstance(value, float):
+            encoded = {"doubleValue": value}
+        else:
+            encoded = {"stringValue": str(value)}
+        result.append({"key": key, "value": encoded})
+    return result
+
+
+class SpanProcessor(Protocol):
+    """Receives finished spans."""
+
+    def on_end(self, span: Span) -> None:
+        """Called once when a span ends."""
+
+
+class SpanExporter(Protocol):
+    """Sends batches of finished spans somewhere."""
+
+    def export(self, spans: list[Span]) -> None:
+        """Export one batch (called from the processor's thread)."""
+
+    def close(self) -> None:
+        """Release resources."""
+
+
+def otlp_request(spans: list[Span], service_name: str) -> dict[str, Any]:
+    """Wrap spans in an OTLP/JSON ``ExportTraceServiceRequest``."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "telemetryx"},
+                        "spans": [s.to_otlp() for s in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class FileSpanExporter:
+    """Appends each batch to a file as one OTLP/JSON request per line."""
+
+    def __init__(self, path: str | Path, service_name: str = "telemetryx-python") -> None:
+        self._path = Path(path)
+        self._service_name = service_name
+        self._file = self._path.open("a", encoding="utf-8")
+
+    def export(self, spans: list[Span]) -> None:
+        """Write one batch."""
+        self._file.write(json.dumps(otlp_request(spans, self._service_name)) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+
+class OtlpHttpExporter:
+    """POSTs batches as OTLP/JSON to a collector (``{endpoint}/v1/traces``)."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str = "telemetryx-python",
+        timeout: float = 5.0,
+    ) -> None:
+        self._url = endpoint.rstrip("/") + "/v1/traces"
+        self._service_name = service_name
+        self._timeout = timeout
+
+    def export(self, spans: list[Span]) -> None:
+        """Send one batch; failures drop the batch rather than retrying."""
+        body = json.dumps(otlp_request(spans, self._service_name)).encode()
+        request = urllib.request.Request(
+            self._url, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self._timeout) as response:
+                response.read()
+        except OSError:
+            SPANS_DROPPED.inc(len(spans))
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class InMemorySpanExporter:
+    """Keeps exported spans in a list (for tests and debugging)."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def export(self, spans: list[Span]) -> None:
+        """Store one batch."""
+        self.spans.extend(spans)
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class BatchSpanProcessor:
+    """Bounded queue plus background export thread for finished spans.
+
+    Ending a span is an O(1) append; spans are dropped (and counted) when
+    the queue is full rather than blocking the request.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_queue: int = 2048,
+        batch_size: int = 512,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self._exporter = exporter
+        self._max_queue = max_queue
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: deque[Span] = deque()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+        self.dropped = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of spans waiting to be exported."""
+        return len(self._queue)
+
+    def on_end(self, span: Span) -> None:
+        """Queue a finished span, dropping it if the queue is full."""
+        if len(self._queue) >= self._max_queue:
+            self.dropped += 1
+            SPANS_DROPPED.inc()
+            return
+        self._queue.append(span)
+        if len(self._queue) == self._batch_size:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        """Start the background export thread."""
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name="telemetryx-span-exporter", daemon=True
+        )
+        self._thread.start()
+
+    def flush(self) -> None:
+        """Export everything queued, on the calling thread."""
+        while self._queue:
+            self._export_batch()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the export thread after flushing queued spans."""
+        if self._thread is not None:
+            self._stopping = True
+            self._wakeup.set()
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+        self._exporter.close()
+
+    def _run(self) -> None:
+        """Export loop: drain the queue in batches until stopped."""
+        while True:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            self.flush()
+            if self._stopping:
+                return
+
+    def _export_batch(self) -> None:
+        """Export up to one batch of queued spans."""
+        batch: list[Span] = []
+        popleft = self._queue.popleft
+        try:
+            for _ in range(self._batch_size):
+                batch.append(popleft())
+        except IndexError:
+            pass
+        if not batch:
+            return
+        try:
+            self._exporter.export(batch)
+        except Exception:
+            # Tracing must never take the service down
+            SPANS_DROPPED.inc(len(batch))
+            return
+        SPANS_EXPORTED.inc(len(batch))
+
+
+# Span of the operation currently running (None when not traced or unsampled)
+_current_span: ContextVar[Span | None] = ContextVar("telemetryx_current_span", default=None)
+
+
+class Tracer:
+    """Makes head-based sampling decisions and creates spans."""
+
+    def __init__(self, processor: BatchSpanProcessor, sample_rate: float = 0.01) -> None:
+        self.processor = processor
+        self.sample_rate = sample_rate
+
+    def start(self) -> None:
+        """Start exporting finished spans."""
+        self.processor.start()
+
+    def shutdown(self) -> None:
+        """Export queued spans and stop the exporter."""
+        self.processor.close()
+
+    def should_sample(self, parent: SpanContext | None) -> bool:
+        """Head sampling: follow the caller's decision, else sample at ``sample_rate``."""
+        if parent is not None:
+            return parent.sampled
+        return random.random() < self.sample_rate
+
+    def start_span(
+        self,
+        name: str,
+        parent: SpanContext | None = None,
+        kind: SpanKind = SpanKind.SERVER,
+        attributes: Mapping[str, AttributeValue] | None = None,
+    ) -> Span | None:
+        """Start a local root span continuing ``parent`` (None if not sampled)."""
+        if not self.should_sample(parent):
+            return None
+        trace_id = parent.trace_id if parent is not None else _new_id(128)
+        context = SpanContext(trace_id, _new_id(64), sampled=True)
+        return Span(
+            name,
+            context,
+            parent.span_id if parent is not None else None,
+            kind,
+            attributes,
+            self.processor,
+        )
+
+
+def tracer_from_settings(settings: Settings) -> Tracer | None:
+    """Build a tracer from the ``tracing_*`` settings (None when disabled).
+
+    Raises:
+        ConfigurationError: If ``tracing_exporter`` is not a known exporter
+    """
+    exporter: SpanExporter
+    if settings.tracing_exporter == "none":
+        return None
+    if settings.tracing_exporter == "file":
+        exporter = FileSpanExporter(settings.tracing_file, settings.tracing_service_name)
+    elif settings.tracing_exporter == "otlp":
+        exporter = OtlpHttpExporter(settings.tracing_otlp_endpoint, settings.tracing_service_name)
+    else:
+        raise ConfigurationError(
+            f"Unknown tracing exporter {settings.tracing_exporter!r}",
+            {"expected": ["none", "file", "otlp"]},
+        )
+    return Tracer(BatchSpanProcessor(exporter), sample_rate=settings.tracing_sample_rate)
+
+
+_tracer: Tracer | None = None
+
+
+def configure_tracing(tracer: Tracer | None) -> None:
+    """Install (or with None, remove) the process-wide tracer."""
+    global _tracer
+    _tracer = tracer
+
+
+def get_tracer() -> Tracer | None:
+    """The process-wide tracer, if tracing is enabled."""
+    return _tracer
+
+
+def current_span() -> Span | None:
+    """Span of the operation currently running, if sampled."""
+    return _current_span.get()
+
+
+@contextmanager
+def activate(span: Span | None) -> Iterator[Span | None]:
+    """Make a span current for the enclosed block and end it afterwards.
+
+    Exceptions mark the span as failed and are re-raised.
+    """
+    if span is None:
+        yield None
+        return
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.set_error(f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+
+
+@contextmanager
+def span(
+    name: str,
+    attributes: Mapping[str, AttributeValue] | None = None,
+    kind: SpanKind = SpanKind.INTERNAL,
+) -> Iterator[Span | None]:
+    """Trace the enclosed block as a child of the current span.
+
+    Does nothing (and yields None) when the current operation is not
+    being traced.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(
+        name,
+        SpanContext(parent.context.trace_id, _new_id(64), sampled=True),
+        parent.context.span_id,
+        kind,
+        attributes,
+        parent._processor,
+    )
+    with activate(child):
+        yield child
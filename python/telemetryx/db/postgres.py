@@ -5,18 +5,29 @@ This module provides:
 - Async query execution
 - Transaction support
 - Health checks
+
+Queries are bounded by the deadline of the request being handled
+(see ``telemetryx.core.deadline``) and traced as client spans when the
+request is sampled (see ``telemetryx.core.tracing``).
+
+The driver (``psycopg_pool``) is imported on first use, so processes
+without ``DATABASE_URL`` never pay for loading it.
 """
 
+from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
-from typing import Any
-
-from psycopg_pool import AsyncConnectionPool
+from typing import TYPE_CHECKING, Any
 
 from telemetryx.core import get_logger, get_settings
+from telemetryx.core.deadline import bounded
 from telemetryx.core.exceptions import DatabaseError
+from telemetryx.core.tracing import SpanKind, span
+
+if TYPE_CHECKING:
+    from psycopg_pool import AsyncConnectionPool
 
 # Module-level pool instance (initialized on startup)
-_pool: AsyncConnectionPool | None = None
+_pool: "AsyncConnectionPool | None" = None
 
 
 async def init_pool() -> None:
@@ -30,6 +41,8 @@ async def init_pool() -> None:
         logger.warning("DATABASE_URL not set, PostgreSQL disabled")
         return
 
+    from psycopg_pool import AsyncConnectionPool
+
     try:
         _pool = AsyncConnectionPool(
             conninfo=settings.database_url,
@@ -59,13 +72,21 @@ async def close_pool() -> None:
         get_logger(__name__).info("PostgreSQL pool closed")
 
 
-def get_pool() -> AsyncConnectionPool:
+def get_pool() -> "AsyncConnectionPool":
     """Get the connection pool."""
     if _pool is None:
         raise DatabaseError("PostgreSQL pool not initialized. Call init_pool() first.")
     return _pool
 
 
+@asynccontextmanager
+async def _operation(name: str, query: str) -> AsyncIterator[None]:
+    """Trace a query and bound it by the current deadline."""
+    with span(name, {"db.system": "postgresql", "db.statement": query}, kind=SpanKind.CLIENT):
+        async with bounded(name):
+            yield
+
+
 @asynccontextmanager
 async def get_connection():
     """Get a connection from the pool.
@@ -103,7 +124,7 @@ async def execute(
             {"name": "Alice"}
         )
     """
-    async with get_connection() as conn:
+    async with _operation("postgres.execute", query), get_connection() as conn:
         async with conn.cursor() as cur:
             await cur.execute(query, params)
 
@@ -137,7 +158,7 @@ async def execute_many(
             ]
         )
     """
-    async with get_connection() as conn:
+    async with _operation("postgres.execute_many", query), get_connection() as conn:
         async with conn.cursor() as cur:
             await cur.executemany(query, params_list)
             return cur.rowcount
@@ -161,6 +182,21 @@ async def transaction():
             yield conn
 
 
+def pool_utilization() -> float:
+    """Fraction of the pool's capacity in use (0.0 when PostgreSQL is disabled).
+
+    Clients waiting for a connection count as extra load, so the result
+    can exceed 1.0 when the pool is saturated.
+    """
+    if _pool is None:
+        return 0.0
+
+    stats = _pool.get_stats()
+    in_use = stats.get("pool_size", 0) - stats.get("pool_available", 0)
+    waiting = stats.get("requests_waiting", 0)
+    return (in_use + waiting) / _pool.max_size
+
+
 async def health_check() -> bool:
     """Check if PostgreSQL is healthy."""
     if _pool is None:
@@ -6,17 +6,29 @@ This module provides:
 - Atomic counters
 - Pub/Sub messaging
 - Health checks
-"""
 
-from collections.abc import Awaitable, Callable
+Operations are bounded by the deadline of the request being handled
+(see ``telemetryx.core.deadline``) and traced as client spans when the
+request is sampled (see ``telemetryx.core.tracing``).
+
+The driver (``redis.asyncio``) is imported on first use, so processes
+without ``REDIS_URL`` never pay for loading it.
+"""
 
-from redis.asyncio import Redis
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
 
 from telemetryx.core import get_logger, get_settings
+from telemetryx.core.deadline import bounded
 from telemetryx.core.exceptions import ConnectionError
+from telemetryx.core.tracing import SpanKind, span
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
 
 # Module-level client instance
-_client: Redis | None = None
+_client: "Redis | None" = None
 
 
 async def init_client() -> None:
@@ -30,6 +42,8 @@ async def init_client() -> None:
         logger.warning("REDIS_URL not set, Redis disabled")
         return
 
+    from redis.asyncio import Redis
+
     try:
         _client = Redis.from_url(
             settings.redis_url,
@@ -53,13 +67,21 @@ async def close_client() -> None:
         get_logger(__name__).info("Redis client closed")
 
 
-def get_client() -> Redis:
+def get_client() -> "Redis":
     """Get the Redis client."""
     if _client is None:
         raise ConnectionError("Redis client not initialized. Call init_client() first.")
     return _client
 
 
+@asynccontextmanager
+async def _operation(name: str) -> AsyncIterator[None]:
+    """Trace a command and bound it by the current deadline."""
+    with span(name, {"db.system": "redis"}, kind=SpanKind.CLIENT):
+        async with bounded(name):
+            yield
+
+
 # ============================================
 # Caching Operations
 # ============================================
@@ -68,7 +90,8 @@ def get_client() -> Redis:
 async def cache_get(key: str) -> str | None:
     """Get a cached value."""
     client = get_client()
-    return await client.get(key)
+    async with _operation("redis.get"):
+        return await client.get(key)
 
 
 async def cache_set(
@@ -83,13 +106,15 @@ async def cache_set(
         await cache_set("user:123:profile", json_data, ttl_seconds=300)
     """
     client = get_client()
-    await client.set(key, value, ex=ttl_seconds)
+    async with _operation("redis.set"):
+        await client.set(key, value, ex=ttl_seconds)
 
 
 async def cache_delete(key: str) -> None:
     """Delete a cached value."""
     client = get_client()
-    await client.delete(key)
+    async with _operation("redis.delete"):
+        await client.delete(key)
 
 
 async def cache_get_or_set(
@@ -137,11 +162,12 @@ async def counter_increment(
             raise RateLimitExceeded()
     """
     client = get_client()
-    new_value = await client.incrby(key, amount)
+    async with _operation("redis.incrby"):
+        new_value = await client.incrby(key, amount)
 
-    # Set TTL only if this is a new key (value equals increment)
-    if ttl_seconds and new_value == amount:
-        await client.expire(key, ttl_seconds)
+        # Set TTL only if this is a new key (value equals increment)
+        if ttl_seconds and new_value == amount:
+            await client.expire(key, ttl_seconds)
 
     return new_value
 
@@ -149,13 +175,16 @@ async def counter_increment(
 async def counter_get(key: str) -> int:
     """Get current counter value."""
     client = get_client()
-    value = await client.get(key)
+    async with _operation("redis.get"):
+        value = await client.get(key)
     return int(value) if value else 0
 
 
 async def counter_reset(key: str) -> None:
     """Reset a counter to 0."""
-    await cache_delete(key)
+    client = get_client()
+    async with _operation("redis.delete"):
+        await client.delete(key)
 
 
 # ============================================
@@ -166,13 +195,15 @@ async def counter_reset(key: str) -> None:
 async def hash_get(key: str, field: str) -> str | None:
     """Get a field from a hash."""
     client = get_client()
-    return await client.hget(key, field)
+    async with _operation("redis.hget"):
+        return await client.hget(key, field)
 
 
 async def hash_get_all(key: str) -> dict[str, str]:
     """Get all fields from a hash."""
     client = get_client()
-    return await client.hgetall(key)
+    async with _operation("redis.hgetall"):
+        return await client.hgetall(key)
 
 
 async def hash_set(key: str, mapping: dict[str, str]) -> None:
@@ -186,13 +217,15 @@ async def hash_set(key: str, mapping: dict[str, str]) -> None:
         })
     """
     client = get_client()
-    await client.hset(key, mapping=mapping)
+    async with _operation("redis.hset"):
+        await client.hset(key, mapping=mapping)
 
 
 async def hash_delete(key: str, *fields: str) -> None:
     """Delete fields from a hash."""
     client = get_client()
-    await client.hdel(key, *fields)
+    async with _operation("redis.hdel"):
+        await client.hdel(key, *fields)
 
 
 # ============================================
@@ -210,7 +243,8 @@ async def publish(channel: str, message: str) -> int:
         await publish("rules:updated", json.dumps({"rule_id": "123"}))
     """
     client = get_client()
-    return await client.publish(channel, message)
+    async with _operation("redis.publish"):
+        return await client.publish(channel, message)
 
 
 # ============================================
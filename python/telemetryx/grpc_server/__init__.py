@@ -1,6 +1,29 @@
-"""gRPC server for TelemetryX Python Brain."""
+"""gRPC server for TelemetryX Python Brain.
 
-from telemetryx.grpc_server.handlers import AnalyticsServiceHandler, RulesServiceHandler
-from telemetryx.grpc_server.server import GrpcServer, serve
+Submodules are imported on first attribute access, so running
+``python -m telemetryx.grpc_server --import-profile`` (or importing a single
+submodule) does not load the whole server.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from telemetryx.grpc_server.handlers import AnalyticsServiceHandler, RulesServiceHandler
+    from telemetryx.grpc_server.server import GrpcServer, serve
 
 __all__ = ["GrpcServer", "serve", "RulesServiceHandler", "AnalyticsServiceHandler"]
+
+_LAZY_ATTRIBUTES = {
+    "GrpcServer": "telemetryx.grpc_server.server",
+    "serve": "telemetryx.grpc_server.server",
+    "RulesServiceHandler": "telemetryx.grpc_server.handlers",
+    "AnalyticsServiceHandler": "telemetryx.grpc_server.handlers",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module), name)
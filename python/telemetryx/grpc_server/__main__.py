@@ -1,15 +1,38 @@
 """TelemetryX Python Brain - gRPC Server Entry Point.
 
 Run with: python -m telemetryx.grpc_server
+Startup time report: python -m telemetryx.grpc_server --import-profile
 """
 
-import asyncio
-
-from telemetryx.grpc_server.server import serve
+import argparse
 
 
 def main() -> None:
     """Entry point for the gRPC server."""
+    parser = argparse.ArgumentParser(prog="python -m telemetryx.grpc_server")
+    parser.add_argument(
+        "--import-profile",
+        action="store_true",
+        help="Report import and initialization time instead of serving",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="Number of packages/modules to list in the import profile",
+    )
+    args = parser.parse_args()
+
+    if args.import_profile:
+        from telemetryx.grpc_server import import_profile
+
+        import_profile.main(top=args.top)
+        return
+
+    import asyncio
+
+    from telemetryx.grpc_server.server import serve
+
     asyncio.run(serve())
 
 
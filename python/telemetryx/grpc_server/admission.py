@@ -0,0 +1,130 @@
+"""Adaptive admission control for gRPC methods.
+
+Each RPC method gets its own concurrency limiter. The limit adapts to
+observed latency using a gradient algorithm:
+
+- While latency stays close to the long-term baseline the limit grows
+  (additively, by roughly ``sqrt(limit)`` per sample).
+- When latency rises above ``tolerance * baseline`` the limit shrinks
+  in proportion to the latency gradient.
+- Failed calls that indicate overload (deadline exceeded, resource
+  exhausted) trigger a multiplicative decrease.
+
+Calls beyond the current limit are rejected immediately instead of being
+queued, so the server sheds load before latency degrades for everyone.
+
+Example:
+    limiter = AdaptiveConcurrencyLimiter(max_limit=128)
+    if limiter.try_acquire():
+        start = time.perf_counter()
+        try:
+            ...
+        finally:
+            limiter.release(time.perf_counter() - start)
+"""
+
+import math
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class LimiterConfig:
+    """Tuning parameters for an adaptive concurrency limiter.
+
+    Attributes:
+        initial_limit: Concurrency limit before any latency samples exist
+        min_limit: Lower bound for the adaptive limit
+        max_limit: Hard cap on in-flight calls (never exceeded)
+        smoothing: Weight of each new limit estimate (0.0 to 1.0)
+        tolerance: Latency ratio over baseline tolerated before shrinking
+        backoff_ratio: Multiplicative decrease applied on overload errors
+        baseline_window: Number of samples in the long-term latency average
+    """
+
+    initial_limit: int = 32
+    min_limit: int = 4
+    max_limit: int = 256
+    smoothing: float = 0.2
+    tolerance: float = 2.0
+    backoff_ratio: float = 0.9
+    baseline_window: int = 600
+
+
+class AdaptiveConcurrencyLimiter:
+    """Gradient-based concurrency limiter for a single method.
+
+    Not thread-safe: all calls are expected to come from the event loop.
+    """
+
+    def __init__(self, config: LimiterConfig | None = None) -> None:
+        self._config = config or LimiterConfig()
+        self._limit = float(
+            min(max(self._config.initial_limit, self._config.min_limit), self._config.max_limit)
+        )
+        self._in_flight = 0
+        self._baseline_rtt = 0.0
+        self._baseline_alpha = 2.0 / (self._config.baseline_window + 1)
+        self.rejected = 0
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls currently admitted."""
+        return self._in_flight
+
+    @property
+    def baseline_rtt(self) -> float:
+        """Long-term average latency in seconds (0.0 until the first sample)."""
+        return self._baseline_rtt
+
+    def try_acquire(self) -> bool:
+        """Admit a call if the limit allows it.
+
+        Returns:
+            True if admitted (caller must call ``release``), False if rejected
+        """
+        if self._in_flight >= int(self._limit):
+            self.rejected += 1
+            return False
+        self._in_flight += 1
+        return True
+
+    def release(self, rtt: float, overloaded: bool = False) -> None:
+        """Release an admitted call and update the limit.
+
+        Args:
+            rtt: Observed call latency in seconds
+            overloaded: True if the call failed with an overload signal
+        """
+        in_flight = self._in_flight
+        self._in_flight -= 1
+        config = self._config
+
+        if overloaded:
+            self._limit = max(config.min_limit, self._limit * config.backoff_ratio)
+            return
+
+        if self._baseline_rtt == 0.0:
+            self._baseline_rtt = rtt
+        else:
+            self._baseline_rtt += self._baseline_alpha * (rtt - self._baseline_rtt)
+
+        # Don't grow the limit while the method is not actually using it
+        if in_flight < self._limit / 2:
+            return
+
+        gradient = 1.0
+        if rtt > 0.0:
+            gradient = max(0.5, min(1.0, config.tolerance * self._baseline_rtt / rtt))
+        queue_size = math.sqrt(self._limit)
+        estimate = self._limit * gradient + queue_size
+        new_limit = self._limit * (1.0 - config.smoothing) + estimate * config.smoothing
+        self._limit = max(config.min_limit, min(config.max_limit, new_limit))
+
+    def retry_after_ms(self) -> int:
+        """Suggested client back-off for a rejected call, in milliseconds."""
+        return max(10, int(self._baseline_rtt * 1000 * 2))
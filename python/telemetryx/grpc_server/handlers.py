@@ -3,15 +3,78 @@
 These classes implement the RPC methods defined in the proto files.
 """
 
+import asyncio
 import time
+from collections.abc import Sequence
+from typing import Any, NoReturn
 
 import grpc
+import numpy as np
 
 from telemetryx.core import get_logger
+from telemetryx.core.deadline import deadline_scope, expired, record_abandoned
+from telemetryx.core.exceptions import (
+    AnomalyDetectionError,
+    DeadlineExceededError,
+    ModelNotFoundError,
+)
+from telemetryx.core.logging import LogSampler
+from telemetryx.core.timing import stage
+from telemetryx.core.tracing import span
+from telemetryx.grpc_server.health import HealthState
+from telemetryx.ml.anomaly import (
+    BatchDetections,
+    Detector,
+    EwmaDetector,
+    QuantileDetector,
+    WindowedDetector,
+)
+from telemetryx.ml.features import FeatureBatch
+from telemetryx.ml.rate import RateDetector, RateWindows
+from telemetryx.ml.registry import ModelRegistry
+from telemetryx.ml.seasonal import SeasonalDetector
 from telemetryx.proto import analytics_pb2, common_pb2, rules_pb2
 from telemetryx.proto.analytics_pb2_grpc import AnalyticsServiceServicer
 from telemetryx.proto.rules_pb2_grpc import RulesServiceServicer
 
+# Batch handlers score events in vectorized chunks of this size (about a
+# millisecond of work), yielding to the event loop and checking the deadline
+# between chunks so large batches cannot starve health checks and
+# interactive calls
+_BATCH_CHUNK_SIZE = 4096
+
+
+def _time_remaining(context: grpc.aio.ServicerContext | None) -> float | None:
+    """Get the caller's remaining deadline budget in seconds (None if unbounded)."""
+    if context is None:
+        return None
+    return context.time_remaining()
+
+
+async def _abandon(
+    context: grpc.aio.ServicerContext | None,
+    stage: str,
+    count: int = 1,
+) -> NoReturn:
+    """Record abandoned work and fail the RPC with DEADLINE_EXCEEDED."""
+    record_abandoned(stage, count)
+    get_logger(__name__).warning("Deadline exceeded, abandoning work", stage=stage, count=count)
+    if context is not None:
+        await context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, f"Deadline exceeded in {stage}")
+    raise DeadlineExceededError("Deadline exceeded", {"stage": stage, "abandoned": count})
+
+
+def _health_response(health: HealthState | None) -> common_pb2.HealthCheckResponse:
+    """Build a health check response from the shared health state."""
+    serving = health is None or health.serving
+    return common_pb2.HealthCheckResponse(
+        status=(
+            common_pb2.HealthCheckResponse.SERVING
+            if serving
+            else common_pb2.HealthCheckResponse.NOT_SERVING
+        ),
+    )
+
 
 class RulesServiceHandler(RulesServiceServicer):
     """Handler for RulesService RPCs.
@@ -19,55 +82,76 @@ class RulesServiceHandler(RulesServiceServicer):
     Implements rule evaluation against incoming events.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, health: HealthState | None = None) -> None:
+        self._health = health
         self._logger = get_logger(__name__, service="RulesService")
+        self._log_sampler = LogSampler("RulesService.EvaluateEvent")
 
     async def EvaluateEvent(
         self,
         request: rules_pb2.EvaluateRequest,
         context: grpc.aio.ServicerContext,
     ) -> rules_pb2.EvaluateResponse:
-        """Evaluate an event against all active rules."""
-        start_time = time.perf_counter()
+        """Evaluate an event against all active rules.
+
+        Requests whose deadline already passed are dropped without evaluation.
+        """
+        start_ns = time.perf_counter_ns()
+
+        timeout = _time_remaining(context)
+        if timeout is not None and timeout <= 0:
+            await _abandon(context, "RulesService.EvaluateEvent")
 
+        with deadline_scope(timeout):
+            return self._evaluate(request, start_ns)
+
+    def _evaluate(
+        self,
+        request: rules_pb2.EvaluateRequest,
+        start_ns: int,
+    ) -> rules_pb2.EvaluateResponse:
+        """Evaluate the request's event (runs inside the request's deadline scope)."""
         event = request.event
-        self._logger.info(
-            "Evaluating event",
-            event_id=event.id,
-            event_type=event.event_type,
-        )
 
         # TODO: Implement actual rule evaluation
         # For now, return empty matches
         matches: list[rules_pb2.RuleMatch] = []
 
         # Example: Add a dummy match for testing
-        if event.event_type == "error":
-            match = rules_pb2.RuleMatch(
-                rule_id="rule-001",
-                rule_name="Error Event Alert",
-                severity=rules_pb2.WARNING,
-                actions=[
-                    rules_pb2.Action(
-                        action_type="log",
-                        config='{"level": "warning"}',
-                    )
-                ],
-            )
-            matches.append(match)
+        with stage("evaluate"), span("rules.evaluate"):
+            if event.event_type == "error":
+                match = rules_pb2.RuleMatch(
+                    rule_id="rule-001",
+                    rule_name="Error Event Alert",
+                    severity=rules_pb2.WARNING,
+                    actions=[
+                        rules_pb2.Action(
+                            action_type="log",
+                            config='{"level": "warning"}',
+                        )
+                    ],
+                )
+                matches.append(match)
 
-        elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+        elapsed_ns = time.perf_counter_ns() - start_ns
+        elapsed = elapsed_ns / 1e6
+        elapsed_ms = int(elapsed)
 
-        self._logger.info(
-            "Evaluation complete",
-            event_id=event.id,
-            matches_count=len(matches),
-            elapsed_ms=elapsed_ms,
-        )
+        # Per-event logging would cost more than the evaluation itself
+        if self._log_sampler.should_log(duration_ms=elapsed):
+            self._logger.info(
+                "Evaluation complete",
+                event_id=event.id,
+                event_type=event.event_type,
+                matches_count=len(matches),
+                elapsed_ms=elapsed_ms,
+                sampled_every=self._log_sampler.every,
+            )
 
         return rules_pb2.EvaluateResponse(
             matches=matches,
             evaluation_time_ms=elapsed_ms,
+            evaluation_time_us=elapsed_ns // 1000,
         )
 
     async def HealthCheck(
@@ -75,78 +159,204 @@ class RulesServiceHandler(RulesServiceServicer):
         request: common_pb2.HealthCheckRequest,
         context: grpc.aio.ServicerContext,
     ) -> common_pb2.HealthCheckResponse:
-        """Health check for RulesService."""
-        return common_pb2.HealthCheckResponse(
-            status=common_pb2.HealthCheckResponse.SERVING,
+        """Health check for RulesService (NOT_SERVING while overloaded)."""
+        return _health_response(self._health)
+
+
+def _add_anomaly_results(
+    results: Any,
+    events: Sequence[common_pb2.Event],
+    detections: BatchDetections,
+) -> None:
+    """Append per-event results to a response (explanations only for anomalies)."""
+    # results.add() builds each message in place, about twice as fast as
+    # constructing AnomalyResult objects and copying them in
+    add = results.add
+    flags = detections.is_anomaly.tolist()
+    for i, (event, score, is_anomaly) in enumerate(
+        zip(events, detections.score.tolist(), flags, strict=True)
+    ):
+        if is_anomaly:
+            add(
+                event_id=event.id,
+                is_anomaly=True,
+                anomaly_score=score,
+                explanation=detections.detection(i).explain(event.value),
+            )
+        else:
+            add(event_id=event.id, anomaly_score=score)
+
+
+def _add_rate_anomalies(anomalies: Any, windows: RateWindows) -> None:
+    """Append anomalous event-rate windows to a response."""
+    add = anomalies.add
+    columns = zip(
+        windows.start.tolist(),
+        windows.end.tolist(),
+        windows.count.tolist(),
+        windows.expected.tolist(),
+        windows.score.tolist(),
+        strict=True,
+    )
+    for i, ((source, event_type), (start, end, count, expected, score)) in enumerate(
+        zip(windows.keys, columns, strict=True)
+    ):
+        add(
+            source=source,
+            event_type=event_type,
+            window_start=start,
+            window_end=end,
+            count=count,
+            expected=expected,
+            anomaly_score=score,
+            explanation=windows.explain(i),
         )
 
 
 class AnalyticsServiceHandler(AnalyticsServiceServicer):
     """Handler for AnalyticsService RPCs.
 
-    Implements anomaly detection on event batches.
+    Implements streaming anomaly detection on event batches: every event is
+    scored against, then folded into, the state of its (source, event_type)
+    series. ``model_name`` selects a streaming detector by name (the first
+    detector is the default), or else a stored model from ``models``.
+    Windowed detectors (the rate detector) also report whole windows whose
+    event count deviated in ``rate_anomalies``.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        health: HealthState | None = None,
+        detectors: Sequence[Detector] | None = None,
+        models: ModelRegistry | None = None,
+    ) -> None:
+        self._health = health
+        if not detectors:
+            detectors = [EwmaDetector(), QuantileDetector(), SeasonalDetector(), RateDetector()]
+        self._detectors: dict[str, Detector] = {"default": detectors[0]}
+        self._detectors.update((detector.name, detector) for detector in detectors)
+        self._models = models
         self._logger = get_logger(__name__, service="AnalyticsService")
+        self._log_sampler = LogSampler("AnalyticsService.DetectAnomalies")
+
+    def reset_state(self) -> None:
+        """Forget all learned series state."""
+        for detector in self._detectors.values():
+            detector.clear()
 
     async def DetectAnomalies(
         self,
         request: analytics_pb2.DetectAnomaliesRequest,
         context: grpc.aio.ServicerContext,
     ) -> analytics_pb2.DetectAnomaliesResponse:
-        """Detect anomalies in a batch of events."""
-        start_time = time.perf_counter()
+        """Detect anomalies in a batch of events.
+
+        Requests whose deadline already passed are dropped, and the remaining
+        events of a batch are abandoned as soon as the deadline expires.
+        Unknown model names fail with INVALID_ARGUMENT, and stored models
+        that cannot be loaded (unknown kind, corrupt manifest or weights)
+        with FAILED_PRECONDITION.
+        """
+        start_ns = time.perf_counter_ns()
+
+        timeout = _time_remaining(context)
+        if timeout is not None and timeout <= 0:
+            await _abandon(context, "AnalyticsService.DetectAnomalies", len(request.events))
+
+        model_name = request.model_name or "default"
+        detector = self._detectors.get(model_name)
+        if detector is None and self._models is not None:
+            try:
+                detector = await self._models.get(model_name)
+            except ModelNotFoundError:
+                pass
+            except AnomalyDetectionError as e:
+                if context is not None:
+                    await context.abort(
+                        grpc.StatusCode.FAILED_PRECONDITION,
+                        f"Model {model_name} cannot be loaded: {e.message}",
+                    )
+                raise
+        if detector is None:
+            message = f"Unknown model: {model_name}"
+            if context is not None:
+                await context.abort(grpc.StatusCode.INVALID_ARGUMENT, message)
+            raise AnomalyDetectionError(message, {"model": model_name})
+
+        with deadline_scope(timeout):
+            return await self._detect(request, detector, context, start_ns)
 
+    async def _detect(
+        self,
+        request: analytics_pb2.DetectAnomaliesRequest,
+        detector: Detector,
+        context: grpc.aio.ServicerContext | None,
+        start_ns: int,
+    ) -> analytics_pb2.DetectAnomaliesResponse:
+        """Score the request's events (runs inside the request's deadline scope)."""
         events = request.events
         model_name = request.model_name or "default"
         sensitivity = request.sensitivity or 0.5
+        threshold = detector.threshold(sensitivity)
 
-        self._logger.info(
-            "Detecting anomalies",
-            event_count=len(events),
-            model=model_name,
-            sensitivity=sensitivity,
-        )
+        response = analytics_pb2.DetectAnomaliesResponse()
+        anomaly_count = 0
+        window_anomaly_count = 0
 
-        # TODO: Implement actual ML inference
-        # For now, return dummy results
-        results: list[analytics_pb2.AnomalyResult] = []
+        with stage("evaluate"), span("analytics.detect", {"events": len(events)}):
+            for start in range(0, len(events), _BATCH_CHUNK_SIZE):
+                if start:
+                    await asyncio.sleep(0)
+                    if expired():
+                        await _abandon(
+                            context, "AnalyticsService.DetectAnomalies", len(events) - start
+                        )
 
-        for event in events:
-            # Placeholder: mark events with "error" type as anomalies
-            is_anomaly = event.event_type == "error"
-            score = 0.9 if is_anomaly else 0.1
+                chunk = events[start : start + _BATCH_CHUNK_SIZE]
+                batch = FeatureBatch.from_events(chunk)
+                if not isinstance(detector, WindowedDetector):
+                    detections = detector.score_batch(batch, threshold)
+                    anomaly_count += int(np.count_nonzero(detections.is_anomaly))
+                    _add_anomaly_results(response.results, chunk, detections)
+                    continue
 
-            result = analytics_pb2.AnomalyResult(
-                event_id=event.id,
-                is_anomaly=is_anomaly,
-                anomaly_score=score,
-                explanation="Placeholder detection" if is_anomaly else "",
-            )
-            results.append(result)
+                # Closing windows scans every series: a batch spanning much
+                # event time is observed in parts, yielding between them
+                begin = 0
+                for end in detector.parts(batch):
+                    if begin:
+                        await asyncio.sleep(0)
+                    detections, windows = detector.observe(batch[begin:end], threshold)
+                    window_anomaly_count += len(windows)
+                    _add_rate_anomalies(response.rate_anomalies, windows)
+                    anomaly_count += int(np.count_nonzero(detections.is_anomaly))
+                    _add_anomaly_results(response.results, chunk[begin:end], detections)
+                    begin = end
 
-        elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+        elapsed_ns = time.perf_counter_ns() - start_ns
+        elapsed = elapsed_ns / 1e6
+        elapsed_ms = int(elapsed)
 
-        anomaly_count = sum(1 for r in results if r.is_anomaly)
-        self._logger.info(
-            "Detection complete",
-            event_count=len(events),
-            anomaly_count=anomaly_count,
-            elapsed_ms=elapsed_ms,
-        )
+        if self._log_sampler.should_log(duration_ms=elapsed):
+            self._logger.info(
+                "Detection complete",
+                event_count=len(events),
+                anomaly_count=anomaly_count,
+                window_anomaly_count=window_anomaly_count,
+                model=model_name,
+                sensitivity=sensitivity,
+                elapsed_ms=elapsed_ms,
+                sampled_every=self._log_sampler.every,
+            )
 
-        return analytics_pb2.DetectAnomaliesResponse(
-            results=results,
-            inference_time_ms=elapsed_ms,
-        )
+        response.inference_time_ms = elapsed_ms
+        response.inference_time_us = elapsed_ns // 1000
+        return response
 
     async def HealthCheck(
         self,
         request: common_pb2.HealthCheckRequest,
         context: grpc.aio.ServicerContext,
     ) -> common_pb2.HealthCheckResponse:
-        """Health check for AnalyticsService."""
-        return common_pb2.HealthCheckResponse(
-            status=common_pb2.HealthCheckResponse.SERVING,
-        )
+        """Health check for AnalyticsService (NOT_SERVING while overloaded)."""
+        return _health_response(self._health)
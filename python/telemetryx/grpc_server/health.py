@@ -0,0 +1,72 @@
+"""Aggregated serving status for health checks.
+
+Several independent conditions can take the server out of rotation (for
+example sustained overload). Each one is recorded as a named reason; the
+server reports ``SERVING`` only while no reasons are set.
+
+Example:
+    health = HealthState()
+    health.add_listener(lambda serving: print("serving" if serving else "draining"))
+    health.set_not_serving("overload")
+    health.clear("overload")
+"""
+
+from collections.abc import Callable
+
+from telemetryx.core import get_logger, metrics
+
+SERVING = metrics.gauge(
+    "telemetryx_serving",
+    "1 if the server reports SERVING to health checks, 0 otherwise",
+)
+
+
+def is_health_check(method: str) -> bool:
+    """Check if an RPC method is a health check (standard or service-level)."""
+    return method.startswith("/grpc.health.v1.Health/") or method.endswith("/HealthCheck")
+
+
+class HealthState:
+    """Serving status derived from a set of not-serving reasons."""
+
+    def __init__(self) -> None:
+        self._reasons: set[str] = set()
+        self._listeners: list[Callable[[bool], None]] = []
+        self._logger = get_logger(__name__, component="health")
+        SERVING.set_function(lambda: 1.0 if self.serving else 0.0)
+
+    @property
+    def serving(self) -> bool:
+        """True if no not-serving reason is set."""
+        return not self._reasons
+
+    @property
+    def reasons(self) -> frozenset[str]:
+        """Reasons currently keeping the server out of rotation."""
+        return frozenset(self._reasons)
+
+    def add_listener(self, listener: Callable[[bool], None]) -> None:
+        """Call ``listener(serving)`` whenever the serving status flips."""
+        self._listeners.append(listener)
+
+    def set_not_serving(self, reason: str) -> None:
+        """Take the server out of rotation for a reason."""
+        was_serving = self.serving
+        self._reasons.add(reason)
+        if was_serving:
+            self._logger.warning("Health status NOT_SERVING", reason=reason)
+            self._notify()
+
+    def clear(self, reason: str) -> None:
+        """Remove a not-serving reason."""
+        if reason not in self._reasons:
+            return
+        self._reasons.discard(reason)
+        if self.serving:
+            self._logger.info("Health status SERVING", cleared=reason)
+            self._notify()
+
+    def _notify(self) -> None:
+        serving = self.serving
+        for listener in self._listeners:
+            listener(serving)
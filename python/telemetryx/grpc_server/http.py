@@ -0,0 +1,147 @@
+"""Minimal HTTP server for metrics and admin endpoints.
+
+Runs on the same asyncio event loop as the gRPC server, so serving
+``/metrics`` needs no extra threads or dependencies. Only ``GET`` requests
+with small headers are supported; this is not a general purpose web
+server.
+
+Example:
+    server = HttpServer("0.0.0.0", 9090)
+    server.add_route("/metrics", metrics_route)
+    await server.start()
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from urllib.parse import parse_qs, urlsplit
+
+from telemetryx.core import get_logger
+from telemetryx.core.metrics import REGISTRY
+
+# Maximum size of the request line plus headers
+_MAX_HEADER_BYTES = 16 * 1024
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+}
+
+
+@dataclass
+class HttpResponse:
+    """Response returned by a route handler."""
+
+    body: bytes | str
+    status: int = 200
+    content_type: str = "text/plain; charset=utf-8"
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+# Route handlers receive the parsed query string
+RouteHandler = Callable[[dict[str, list[str]]], Awaitable[HttpResponse]]
+
+
+async def metrics_route(query: dict[str, list[str]]) -> HttpResponse:
+    """Serve the default metrics registry in Prometheus text format."""
+    return HttpResponse(
+        body=REGISTRY.render(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+class HttpServer:
+    """Tiny asyncio HTTP/1.1 server with exact-path routing."""
+
+    def __init__(self, host: str, port: int) -> None:
+        self._host = host
+        self._port = port
+        self._routes: dict[str, RouteHandler] = {}
+        self._server: asyncio.Server | None = None
+        self._logger = get_logger(__name__, component="http-server")
+
+    @property
+    def port(self) -> int:
+        """Bound port (useful when started with port 0)."""
+        if self._server is not None and self._server.sockets:
+            return int(self._server.sockets[0].getsockname()[1])
+        return self._port
+
+    def add_route(self, path: str, handler: RouteHandler) -> None:
+        """Register a handler for an exact path."""
+        self._routes[path] = handler
+
+    async def start(self) -> None:
+        """Start listening."""
+        self._server = await asyncio.start_server(self._handle, self._host, self._port)
+        self._logger.info(
+            "HTTP server started",
+            address=f"{self._host}:{self.port}",
+            routes=sorted(self._routes),
+        )
+
+    async def stop(self) -> None:
+        """Stop listening and close the server."""
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Handle a single connection (one request, then close)."""
+        try:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                return
+            if len(head) > _MAX_HEADER_BYTES:
+                await self._write(writer, HttpResponse("Request too large", status=400))
+                return
+
+            request_line = head.split(b"\r\n", 1)[0].decode("latin-1")
+            parts = request_line.split(" ")
+            if len(parts) != 3:
+                await self._write(writer, HttpResponse("Bad request", status=400))
+                return
+
+            method, target, _ = parts
+            url = urlsplit(target)
+            handler = self._routes.get(url.path)
+            if handler is None:
+                await self._write(writer, HttpResponse("Not found", status=404))
+                return
+            if method != "GET":
+                await self._write(writer, HttpResponse("Method not allowed", status=405))
+                return
+
+            try:
+                response = await handler(parse_qs(url.query))
+            except Exception as e:
+                self._logger.exception("HTTP handler failed", path=url.path, error=str(e))
+                response = HttpResponse(f"Error: {e}", status=500)
+            await self._write(writer, response)
+        finally:
+            writer.close()
+
+    async def _write(self, writer: asyncio.StreamWriter, response: HttpResponse) -> None:
+        """Serialize a response onto the connection."""
+        body = response.body.encode() if isinstance(response.body, str) else response.body
+        reason = _REASONS.get(response.status, "Internal Server Error")
+        headers = {
+            "Content-Type": response.content_type,
+            "Content-Length": str(len(body)),
+            "Connection": "close",
+            **response.headers,
+        }
+        head = f"HTTP/1.1 {response.status} {reason}\r\n" + "".join(
+            f"{name}: {value}\r\n" for name, value in headers.items()
+        )
+        writer.write(head.encode("latin-1") + b"\r\n" + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
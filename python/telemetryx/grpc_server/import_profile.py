@@ -0,0 +1,158 @@
+"""Startup time report: import cost plus initialization phases.
+
+Run with: python -m telemetryx.grpc_server --import-profile
+
+Import times come from ``python -X importtime`` in a fresh interpreter, so
+they are not skewed by modules this process has already loaded. The
+initialization phases (settings, logging, server construction, bind and
+warmup) are then timed in-process against an ephemeral port.
+
+This module only imports the standard library at module level; everything
+else is imported inside the functions being measured.
+"""
+
+import asyncio
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+# Module whose import cost is the server's startup import cost
+SERVER_MODULE = "telemetryx.grpc_server.server"
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    """Import cost of one module, in seconds."""
+
+    module: str
+    self_time: float
+    cumulative: float
+    depth: int
+
+
+@dataclass(frozen=True)
+class ImportProfile:
+    """Imports performed by a fresh interpreter loading a module."""
+
+    timings: list[ImportTiming]
+    wall_time: float
+
+    @property
+    def total(self) -> float:
+        """Total time spent importing (sum of self times)."""
+        return sum(t.self_time for t in self.timings)
+
+    def by_package(self) -> dict[str, float]:
+        """Self time summed per top-level package, most expensive first."""
+        totals: dict[str, float] = defaultdict(float)
+        for timing in self.timings:
+            totals[timing.module.split(".")[0]] += timing.self_time
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def modules(self) -> set[str]:
+        """Names of all imported modules."""
+        return {t.module for t in self.timings}
+
+
+def profile_imports(module: str = SERVER_MODULE) -> ImportProfile:
+    """Import a module in a fresh interpreter and collect per-module timings."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    wall_time = time.perf_counter() - start
+
+    timings = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            timings.append(
+                ImportTiming(
+                    module=name,
+                    self_time=int(self_us) / 1e6,
+                    cumulative=int(cumulative_us) / 1e6,
+                    depth=len(indent) // 2,
+                )
+            )
+    return ImportProfile(timings=timings, wall_time=wall_time)
+
+
+async def profile_init() -> dict[str, float]:
+    """Time each initialization phase of a server on ephemeral ports.
+
+    Returns:
+        Seconds spent in each phase, in the order they ran
+    """
+    phases: dict[str, float] = {}
+
+    start = time.perf_counter()
+    from telemetryx.grpc_server.server import GrpcServer
+
+    phases["import"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from telemetryx.core import get_settings, setup_logging
+
+    settings = get_settings().model_copy(update={"grpc_port": 0, "metrics_port": 0})
+    phases["settings"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    setup_logging()
+    phases["logging"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    server = GrpcServer(settings)
+    phases["server_init"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await server.start()
+    phases["server_start"] = time.perf_counter() - start
+
+    try:
+        for name, elapsed in (await server.warm_up()).items():
+            phases[f"warmup.{name}"] = elapsed
+    finally:
+        await server.stop(grace_period=0)
+
+    return phases
+
+
+def format_report(imports: ImportProfile, init: dict[str, float], top: int = 15) -> str:
+    """Render the startup report as plain text."""
+    lines = [
+        f"Imports ({len(imports.timings)} modules, {imports.total * 1000:.1f} ms, "
+        f"{imports.wall_time * 1000:.1f} ms including interpreter startup)",
+        "",
+        "  By package:",
+    ]
+    for package, seconds in list(imports.by_package().items())[:top]:
+        lines.append(f"    {seconds * 1000:9.1f} ms  {package}")
+
+    lines += ["", "  Slowest modules (self time):"]
+    slowest = sorted(imports.timings, key=lambda t: t.self_time, reverse=True)[:top]
+    for timing in slowest:
+        lines.append(f"    {timing.self_time * 1000:9.1f} ms  {timing.module}")
+
+    lines += ["", f"Initialization ({sum(init.values()) * 1000:.1f} ms)", ""]
+    for phase, seconds in init.items():
+        lines.append(f"    {seconds * 1000:9.1f} ms  {phase}")
+
+    return "\n".join(lines)
+
+
+def main(top: int = 15) -> None:
+    """Print the startup report to stdout."""
+    imports = profile_imports()
+    init = asyncio.run(profile_init())
+    print(format_report(imports, init, top=top))
@@ -3,26 +3,87 @@
 Interceptors handle logging, metrics, and other middleware functionality.
 """
 
+import asyncio
+import sys
 import time
 from typing import Any, Awaitable, Callable
 
 import grpc
 
-from telemetryx.core import get_logger
+from telemetryx.core import get_logger, metrics
+from telemetryx.core.logging import LogSampler
+from telemetryx.core.timing import SERVER_TIMING_KEY, current_timer, record_stage, start_timer
+from telemetryx.core.tracing import (
+    TRACEPARENT_KEY,
+    SpanKind,
+    Tracer,
+    activate,
+    parse_traceparent,
+    span,
+)
+from telemetryx.grpc_server.admission import AdaptiveConcurrencyLimiter, LimiterConfig
+from telemetryx.grpc_server.health import is_health_check
+from telemetryx.grpc_server.load import LOAD_METRICS_KEY
+from telemetryx.grpc_server.rpc_context import enter_rpc, exit_rpc
+from telemetryx.grpc_server.scheduler import LaneFullError, PriorityScheduler
+
+# Status codes that indicate the server (or its callers) are overloaded
+_OVERLOAD_CODES = frozenset({grpc.StatusCode.DEADLINE_EXCEEDED, grpc.StatusCode.RESOURCE_EXHAUSTED})
+
+RPC_REQUESTS = metrics.counter(
+    "telemetryx_grpc_requests_total",
+    "gRPC requests handled, by method and status code",
+    ["method", "code"],
+)
+RPC_DURATION = metrics.histogram(
+    "telemetryx_grpc_request_duration_seconds",
+    "gRPC request handling latency in seconds",
+    ["method"],
+)
+RPC_IN_FLIGHT = metrics.gauge(
+    "telemetryx_grpc_requests_in_flight",
+    "gRPC requests currently being handled",
+    ["method"],
+)
+ADMISSION_REJECTED = metrics.counter(
+    "telemetryx_admission_rejected_total",
+    "gRPC requests rejected by admission control",
+    ["method"],
+)
+ADMISSION_LIMIT = metrics.gauge(
+    "telemetryx_admission_limit",
+    "Current adaptive concurrency limit",
+    ["method"],
+)
+
+
+def total_in_flight() -> int:
+    """Number of RPCs currently being handled, across all methods."""
+    return int(sum(child.value for _, child in RPC_IN_FLIGHT.children()))
+
+
+def total_requests() -> float:
+    """Number of RPCs completed since process start, across all methods."""
+    return sum(child.value for _, child in RPC_REQUESTS.children())
 
 
 class LoggingInterceptor(grpc.aio.ServerInterceptor):
-    """Interceptor that logs all RPC requests and responses.
+    """Interceptor that logs RPC requests and responses.
 
     Logs:
     - Method name
     - Request duration
     - Status code
     - Any errors
+
+    Successful calls are sampled per method (see ``LogSampler``); failed
+    and slow calls are always logged. Use the metrics interceptor for
+    rates and latency distributions.
     """
 
     def __init__(self) -> None:
         self._logger = get_logger(__name__, component="grpc-interceptor")
+        self._samplers: dict[str, LogSampler] = {}
 
     async def intercept_service(
         self,
@@ -74,6 +135,9 @@ class LoggingInterceptor(grpc.aio.ServerInterceptor):
         Returns:
             Wrapped handler function
         """
+        sampler = self._samplers.get(method)
+        if sampler is None:
+            sampler = self._samplers[method] = LogSampler(method)
 
         async def wrapper(
             request: Any,
@@ -91,22 +155,597 @@ class LoggingInterceptor(grpc.aio.ServerInterceptor):
                 error_msg = str(e.details())
                 raise
             except Exception as e:
-                status = "INTERNAL"
-                error_msg = str(e)
+                # Aborts set the status and details on the context
+                status = _context_code(context)
+                error_msg = (context.details() if context is not None else None) or str(e)
                 raise
             finally:
                 elapsed_ms = (time.perf_counter() - start_time) * 1000
 
-                log_data = {
-                    "method": method,
-                    "status": status,
-                    "duration_ms": round(elapsed_ms, 2),
-                }
-
-                if error_msg:
-                    log_data["error"] = error_msg
-                    self._logger.error("RPC failed", **log_data)
-                else:
-                    self._logger.info("RPC completed", **log_data)
+                if sampler.should_log(error=error_msg is not None, duration_ms=elapsed_ms):
+                    log_data = {
+                        "method": method,
+                        "status": status,
+                        "duration_ms": round(elapsed_ms, 2),
+                    }
+
+                    if error_msg:
+                        log_data["error"] = error_msg
+                        self._logger.error("RPC failed", **log_data)
+                    else:
+                        self._logger.info("RPC completed", sampled_every=sampler.every, **log_data)
+
+        return wrapper
+
+
+class AdmissionControlInterceptor(grpc.aio.ServerInterceptor):
+    """Interceptor that sheds load before the server becomes overloaded.
+
+    Each method gets an adaptive concurrency limit (see
+    ``telemetryx.grpc_server.admission``). Calls beyond the limit are
+    rejected immediately with ``RESOURCE_EXHAUSTED`` and a
+    ``grpc-retry-pushback-ms`` trailer telling the client when to retry.
+
+    Health checks always bypass the limiter so orchestrators keep getting
+    answers while the server is shedding load.
+    """
+
+    def __init__(self, config: LimiterConfig | None = None) -> None:
+        self._config = config or LimiterConfig()
+        self._limiters: dict[str, AdaptiveConcurrencyLimiter] = {}
+        self._logger = get_logger(__name__, component="admission-control")
+
+    @property
+    def limiters(self) -> dict[str, AdaptiveConcurrencyLimiter]:
+        """Per-method limiters created so far."""
+        return self._limiters
+
+    def in_flight(self) -> int:
+        """Total number of admitted calls across all methods."""
+        return sum(limiter.in_flight for limiter in self._limiters.values())
+
+    async def intercept_service(
+        self,
+        continuation: Callable[
+            [grpc.HandlerCallDetails],
+            Awaitable[grpc.RpcMethodHandler],
+        ],
+        handler_call_details: grpc.HandlerCallDetails,
+    ) -> grpc.RpcMethodHandler:
+        """Wrap unary-unary handlers with an admission check."""
+        method = handler_call_details.method
+        handler = await continuation(handler_call_details)
+
+        if handler is None or is_health_check(method):
+            return handler
+
+        if handler.unary_unary:
+            limiter = self._limiters.get(method)
+            if limiter is None:
+                limiter = self._limiters[method] = AdaptiveConcurrencyLimiter(self._config)
+                ADMISSION_LIMIT.labels(method).set_function(lambda: limiter.limit)
+            return grpc.unary_unary_rpc_method_handler(
+                self._wrap_unary_unary(handler.unary_unary, method, limiter),
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+        return handler
+
+    def _wrap_unary_unary(
+        self,
+        behavior: Callable[..., Any],
+        method: str,
+        limiter: AdaptiveConcurrencyLimiter,
+    ) -> Callable[..., Awaitable[Any]]:
+        """Wrap a unary-unary handler with admission control.
+
+        Args:
+            behavior: The original handler function
+            method: The RPC method name
+            limiter: The limiter for this method
+
+        Returns:
+            Wrapped handler function
+        """
+
+        rejected = ADMISSION_REJECTED.labels(method)
+
+        async def wrapper(
+            request: Any,
+            context: grpc.aio.ServicerContext,
+        ) -> Any:
+            if not limiter.try_acquire():
+                rejected.inc()
+                retry_after_ms = limiter.retry_after_ms()
+                if limiter.rejected % 1000 == 1:
+                    self._logger.warning(
+                        "Shedding load",
+                        method=method,
+                        limit=limiter.limit,
+                        rejected_total=limiter.rejected,
+                    )
+                await context.abort(
+                    grpc.StatusCode.RESOURCE_EXHAUSTED,
+                    f"Server overloaded, concurrency limit {limiter.limit} reached for {method}",
+                    trailing_metadata=(("grpc-retry-pushback-ms", str(retry_after_ms)),),
+                )
+
+            start_time = time.perf_counter()
+            overloaded = False
+            try:
+                return await behavior(request, context)
+            except Exception:
+                # Aborts raise grpc.aio.AbortError, not an RpcError; the
+                # status they set is on the context
+                overloaded = context.code() in _OVERLOAD_CODES
+                raise
+            except asyncio.CancelledError:
+                # Client gave up (deadline or cancellation) while we were working
+                overloaded = True
+                raise
+            finally:
+                limiter.release(time.perf_counter() - start_time, overloaded=overloaded)
+
+        return wrapper
+
+
+class MetricsInterceptor(grpc.aio.ServerInterceptor):
+    """Interceptor that records per-method request rate, latency and status.
+
+    Metric children are resolved once per method, so the per-call cost is a
+    few attribute updates and a bucket search.
+    """
+
+    def __init__(self) -> None:
+        self._children: dict[str, tuple[metrics.CounterChild, metrics.HistogramChild]] = {}
+
+    async def intercept_service(
+        self,
+        continuation: Callable[
+            [grpc.HandlerCallDetails],
+            Awaitable[grpc.RpcMethodHandler],
+        ],
+        handler_call_details: grpc.HandlerCallDetails,
+    ) -> grpc.RpcMethodHandler:
+        """Wrap unary-unary handlers with metrics recording."""
+        method = handler_call_details.method
+        handler = await continuation(handler_call_details)
+
+        if handler is None:
+            return handler
+
+        if handler.unary_unary:
+            return grpc.unary_unary_rpc_method_handler(
+                self._wrap_unary_unary(handler.unary_unary, method),
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+        return handler
+
+    def _wrap_unary_unary(
+        self,
+        behavior: Callable[..., Any],
+        method: str,
+    ) -> Callable[..., Awaitable[Any]]:
+        """Wrap a unary-unary handler with metrics recording.
+
+        Args:
+            behavior: The original handler function
+            method: The RPC method name
+
+        Returns:
+            Wrapped handler function
+        """
+        ok = RPC_REQUESTS.labels(method, "OK")
+        duration = RPC_DURATION.labels(method)
+        in_flight = RPC_IN_FLIGHT.labels(method)
+
+        async def wrapper(
+            request: Any,
+            context: grpc.aio.ServicerContext,
+        ) -> Any:
+            start_time = time.perf_counter()
+            in_flight.value += 1
+            try:
+                response = await behavior(request, context)
+                ok.value += 1
+                return response
+            except grpc.RpcError as e:
+                RPC_REQUESTS.labels(method, e.code().name).inc()
+                raise
+            except asyncio.CancelledError:
+                RPC_REQUESTS.labels(method, "CANCELLED").inc()
+                raise
+            except Exception:
+                RPC_REQUESTS.labels(method, _context_code(context)).inc()
+                raise
+            finally:
+                in_flight.value -= 1
+                duration.observe(time.perf_counter() - start_time)
+
+        return wrapper
+
+
+def _context_code(context: grpc.aio.ServicerContext | None) -> str:
+    """Get the status code set on a context (e.g. by abort), defaulting to INTERNAL."""
+    code = context.code() if context is not None else None
+    if isinstance(code, grpc.StatusCode) and code != grpc.StatusCode.OK:
+        return str(code.name)
+    return "INTERNAL"
+
+
+class LoadReportingInterceptor(grpc.aio.ServerInterceptor):
+    """Interceptor that attaches the latest load report to every response.
+
+    Adds ORCA-style ``endpoint-load-metrics`` trailing metadata (utilization,
+    request rate, in-flight and queue depth) so clients can balance across
+    instances by load. The report is precomputed by the load monitor, so the
+    per-call cost is one metadata append.
+    """
+
+    def __init__(self, report: Callable[[], str]) -> None:
+        self._report = report
+
+    async def intercept_service(
+        self,
+        continuation: Callable[
+            [grpc.HandlerCallDetails],
+            Awaitable[grpc.RpcMethodHandler],
+        ],
+        handler_call_details: grpc.HandlerCallDetails,
+    ) -> grpc.RpcMethodHandler:
+        """Wrap unary-unary handlers with load reporting."""
+        handler = await continuation(handler_call_details)
+
+        if handler is None:
+            return handler
+
+        if handler.unary_unary:
+            return grpc.unary_unary_rpc_method_handler(
+                self._wrap_unary_unary(handler.unary_unary),
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+        return handler
+
+    def _wrap_unary_unary(self, behavior: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+        """Wrap a unary-unary handler with load reporting."""
+        report = self._report
+
+        async def wrapper(
+            request: Any,
+            context: grpc.aio.ServicerContext,
+        ) -> Any:
+            response = await behavior(request, context)
+            add_trailing_metadata(context, LOAD_METRICS_KEY, report())
+            return response
+
+        return wrapper
+
+
+def add_trailing_metadata(context: grpc.aio.ServicerContext, key: str, value: str) -> None:
+    """Append a trailing metadata entry, keeping entries set by other layers."""
+    existing = tuple(context.trailing_metadata() or ())
+    context.set_trailing_metadata((*existing, (key, value)))
+
+
+class SchedulingInterceptor(grpc.aio.ServerInterceptor):
+    """Interceptor that runs each call in its priority lane.
+
+    Health checks, interactive calls and bulk batches get separate
+    concurrency budgets and queues (see ``telemetryx.grpc_server.scheduler``),
+    so bulk work cannot delay health checks or single-event evaluations.
+    Calls arriving at a full lane are rejected with ``RESOURCE_EXHAUSTED``.
+    """
+
+    def __init__(self, scheduler: PriorityScheduler) -> None:
+        self._scheduler = scheduler
+
+    async def intercept_service(
+        self,
+        continuation: Callable[
+            [grpc.HandlerCallDetails],
+            Awaitable[grpc.RpcMethodHandler],
+        ],
+        handler_call_details: grpc.HandlerCallDetails,
+    ) -> grpc.RpcMethodHandler:
+        """Wrap unary-unary handlers with lane scheduling."""
+        method = handler_call_details.method
+        handler = await continuation(handler_call_details)
+
+        if handler is None:
+            return handler
+
+        if handler.unary_unary:
+            return grpc.unary_unary_rpc_method_handler(
+                self._wrap_unary_unary(handler.unary_unary, method),
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+        return handler
+
+    def _wrap_unary_unary(
+        self,
+        behavior: Callable[..., Any],
+        method: str,
+    ) -> Callable[..., Awaitable[Any]]:
+        """Wrap a unary-unary handler with lane scheduling.
+
+        Args:
+            behavior: The original handler function
+            method: The RPC method name
+
+        Returns:
+            Wrapped handler function
+        """
+        scheduler = self._scheduler
+
+        async def wrapper(
+            request: Any,
+            context: grpc.aio.ServicerContext,
+        ) -> Any:
+            lane = scheduler.classify(method, request)
+            queued_ns = time.perf_counter_ns()
+            try:
+                with span("scheduler.queue", {"lane": lane.value}):
+                    await scheduler.acquire(lane)
+                record_stage("queue", time.perf_counter_ns() - queued_ns)
+            except LaneFullError:
+                await context.abort(
+                    grpc.StatusCode.RESOURCE_EXHAUSTED,
+                    f"Server overloaded, {lane.value} lane queue is full",
+                    trailing_metadata=(("grpc-retry-pushback-ms", "100"),),
+                )
+
+            try:
+                return await behavior(request, context)
+            finally:
+                scheduler.release(lane)
+
+        return wrapper
+
+
+class TimingInterceptor(grpc.aio.ServerInterceptor):
+    """Interceptor that reports a per-stage server timing breakdown.
+
+    Starts a ``StageTimer`` (see ``telemetryx.core.timing``) when the
+    request is deserialized, so inner layers and handlers can record their
+    stages. After the handler returns, the timer's stages are copied into
+    the response's ``stage_timings_us`` field (when it has one), the
+    response is serialized here so encoding time can be measured, and the
+    full breakdown is attached as ``telemetryx-server-timing`` trailing
+    metadata in Server-Timing syntax.
+
+    Must be the outermost interceptor so its timer covers the whole call.
+    """
+
+    async def intercept_service(
+        self,
+        continuation: Callable[
+            [grpc.HandlerCallDetails],
+            Awaitable[grpc.RpcMethodHandler],
+        ],
+        handler_call_details: grpc.HandlerCallDetails,
+    ) -> grpc.RpcMethodHandler:
+        """Wrap unary-unary handlers with stage timing."""
+        handler = await continuation(handler_call_details)
+
+        if handler is None:
+            return handler
+
+        if handler.unary_unary:
+            return grpc.unary_unary_rpc_method_handler(
+                self._wrap_unary_unary(handler.unary_unary, handler.response_serializer),
+                request_deserializer=_timed_deserializer(handler.request_deserializer),
+                # The wrapper returns already-serialized bytes
+                response_serializer=None,
+            )
+
+        return handler
+
+    def _wrap_unary_unary(
+        self,
+        behavior: Callable[..., Any],
+        serializer: Callable[[Any], bytes] | None,
+    ) -> Callable[..., Awaitable[Any]]:
+        """Wrap a unary-unary handler with stage timing.
+
+        Args:
+            behavior: The original handler function
+            serializer: The method's response serializer
+
+        Returns:
+            Wrapped handler function
+        """
+
+        async def wrapper(
+            request: Any,
+            context: grpc.aio.ServicerContext,
+        ) -> Any:
+            timer = current_timer() or start_timer()
+            response = await behavior(request, context)
+
+            stage_timings = getattr(response, "stage_timings_us", None)
+            if stage_timings is not None:
+                stage_timings.update(timer.as_us())
+
+            if serializer is not None:
+                serialize_start = time.perf_counter_ns()
+                response = serializer(response)
+                timer.add("serialize", time.perf_counter_ns() - serialize_start)
+
+            add_trailing_metadata(context, SERVER_TIMING_KEY, timer.server_timing())
+            return response
+
+        return wrapper
+
+
+def _timed_deserializer(
+    deserializer: Callable[[bytes], Any] | None,
+) -> Callable[[bytes], Any] | None:
+    """Wrap a request deserializer to start the call's timer.
+
+    grpc.aio deserializes in the same task that then runs the handler, so
+    the timer set here is visible to every interceptor and the handler.
+    """
+    if deserializer is None:
+        return None
+
+    def deserialize(data: bytes) -> Any:
+        start_ns = time.perf_counter_ns()
+        request = deserializer(data)
+        start_timer(start_ns).add("deserialize", time.perf_counter_ns() - start_ns)
+        return request
+
+    return deserialize
+
+
+class TracingInterceptor(grpc.aio.ServerInterceptor):
+    """Interceptor that continues the caller's trace on this server.
+
+    Reads W3C ``traceparent`` from the invocation metadata and, if the
+    trace is sampled (see ``Tracer.should_sample``), runs the call inside
+    a server span so handler stages and database calls become its
+    children. Unsampled calls run unwrapped apart from the sampling check.
+    """
+
+    def __init__(self, tracer: Tracer) -> None:
+        self._tracer = tracer
+
+    async def intercept_service(
+        self,
+        continuation: Callable[
+            [grpc.HandlerCallDetails],
+            Awaitable[grpc.RpcMethodHandler],
+        ],
+        handler_call_details: grpc.HandlerCallDetails,
+    ) -> grpc.RpcMethodHandler:
+        """Wrap unary-unary handlers with a server span."""
+        method = handler_call_details.method
+        handler = await continuation(handler_call_details)
+
+        if handler is None:
+            return handler
+
+        if handler.unary_unary:
+            traceparent = None
+            for key, value in handler_call_details.invocation_metadata or ():
+                if key == TRACEPARENT_KEY:
+                    traceparent = value
+                    break
+            return grpc.unary_unary_rpc_method_handler(
+                self._wrap_unary_unary(handler.unary_unary, method, traceparent),
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+        return handler
+
+    def _wrap_unary_unary(
+        self,
+        behavior: Callable[..., Any],
+        method: str,
+        traceparent: str | None,
+    ) -> Callable[..., Awaitable[Any]]:
+        """Wrap a unary-unary handler with a server span.
+
+        Args:
+            behavior: The original handler function
+            method: The RPC method name
+            traceparent: The caller's ``traceparent`` header, if any
+
+        Returns:
+            Wrapped handler function
+        """
+        tracer = self._tracer
+        service, _, name = method.lstrip("/").rpartition("/")
+        attributes = {"rpc.system": "grpc", "rpc.service": service, "rpc.method": name}
+
+        async def wrapper(
+            request: Any,
+            context: grpc.aio.ServicerContext,
+        ) -> Any:
+            server_span = tracer.start_span(
+                method, parse_traceparent(traceparent), SpanKind.SERVER, attributes
+            )
+            if server_span is None:
+                return await behavior(request, context)
+
+            with activate(server_span):
+                try:
+                    return await behavior(request, context)
+                finally:
+                    server_span.set_attribute("rpc.grpc.status_code", _context_code_value(context))
+
+        return wrapper
+
+
+def _context_code_value(context: grpc.aio.ServicerContext | None) -> int:
+    """Numeric status code set on a context (0 when none was set)."""
+    code = context.code() if context is not None else None
+    return code.value[0] if isinstance(code, grpc.StatusCode) else 0
+
+
+class RpcContextInterceptor(grpc.aio.ServerInterceptor):
+    """Interceptor that records which RPC method is being handled.
+
+    Makes the method available to code inside the call and to threads
+    inspecting the event loop's stack (see
+    ``telemetryx.grpc_server.rpc_context``), e.g. the loop monitor.
+    """
+
+    async def intercept_service(
+        self,
+        continuation: Callable[
+            [grpc.HandlerCallDetails],
+            Awaitable[grpc.RpcMethodHandler],
+        ],
+        handler_call_details: grpc.HandlerCallDetails,
+    ) -> grpc.RpcMethodHandler:
+        """Wrap unary-unary handlers with the RPC context."""
+        method = handler_call_details.method
+        handler = await continuation(handler_call_details)
+
+        if handler is None:
+            return handler
+
+        if handler.unary_unary:
+            return grpc.unary_unary_rpc_method_handler(
+                self._wrap_unary_unary(handler.unary_unary, method),
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+        return handler
+
+    def _wrap_unary_unary(
+        self,
+        behavior: Callable[..., Any],
+        method: str,
+    ) -> Callable[..., Awaitable[Any]]:
+        """Wrap a unary-unary handler with the RPC context.
+
+        Args:
+            behavior: The original handler function
+            method: The RPC method name
+
+        Returns:
+            Wrapped handler function
+        """
+
+        async def wrapper(
+            request: Any,
+            context: grpc.aio.ServicerContext,
+        ) -> Any:
+            frame = sys._getframe()
+            token = enter_rpc(method, frame)
+            try:
+                return await behavior(request, context)
+            finally:
+                exit_rpc(frame, token)
 
         return wrapper
@@ -0,0 +1,190 @@
+"""Live load tracking for health status and client-side load balancing.
+
+``LoadMonitor`` samples load signals periodically:
+- In-flight RPCs
+- Event-loop lag (how late a timer fires)
+- Queue depth (work admitted but not yet started)
+- PostgreSQL pool saturation
+
+Each signal is normalized against its configured capacity and the maximum
+becomes the instance's utilization. Utilization at or above 1.0 for
+``overload_samples`` consecutive samples flips health to ``NOT_SERVING``;
+it flips back once utilization stays below ``recover_utilization`` for the
+same number of samples.
+
+The latest sample is also attached to every response as ORCA-style
+``endpoint-load-metrics`` trailing metadata (see ``LoadReportingInterceptor``)
+so the Rust router can do weighted least-loaded balancing.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from telemetryx.core import get_logger, metrics
+from telemetryx.db import postgres
+from telemetryx.grpc_server.health import HealthState
+
+# Trailing metadata key for per-response load reports (ORCA text format)
+LOAD_METRICS_KEY = "endpoint-load-metrics"
+
+UTILIZATION = metrics.gauge(
+    "telemetryx_load_utilization",
+    "Utilization derived from the most saturated load signal (1.0 = at capacity)",
+)
+LOOP_LAG = metrics.gauge(
+    "telemetryx_load_event_loop_lag_seconds",
+    "Event-loop lag observed by the load monitor",
+)
+
+
+@dataclass(frozen=True)
+class LoadConfig:
+    """Capacities and thresholds for load tracking.
+
+    Attributes:
+        sample_interval: Seconds between samples
+        max_in_flight: In-flight RPCs considered full capacity
+        max_loop_lag: Event-loop lag (seconds) considered full capacity
+        max_queue_depth: Queued requests considered full capacity
+        overload_samples: Consecutive samples before changing health status
+        recover_utilization: Utilization below which an overloaded server recovers
+    """
+
+    sample_interval: float = 0.5
+    max_in_flight: int = 512
+    max_loop_lag: float = 0.1
+    max_queue_depth: int = 1000
+    overload_samples: int = 6
+    recover_utilization: float = 0.8
+
+
+@dataclass(frozen=True)
+class LoadSample:
+    """One snapshot of the load signals."""
+
+    in_flight: int = 0
+    loop_lag: float = 0.0
+    queue_depth: int = 0
+    db_utilization: float = 0.0
+    rps: float = 0.0
+    utilization: float = 0.0
+
+    def to_orca_text(self) -> str:
+        """Render as an ORCA ``TEXT`` load report."""
+        return (
+            f"TEXT application_utilization={self.utilization:.4f}, "
+            f"rps_fractional={self.rps:.2f}, "
+            f"named_metrics.in_flight={self.in_flight}, "
+            f"named_metrics.queue_depth={self.queue_depth}, "
+            f"named_metrics.loop_lag_ms={self.loop_lag * 1000:.2f}, "
+            f"named_metrics.db_utilization={self.db_utilization:.4f}"
+        )
+
+
+def _zero() -> int:
+    return 0
+
+
+class LoadMonitor:
+    """Periodically samples load and drives health status under overload."""
+
+    def __init__(
+        self,
+        health: HealthState,
+        config: LoadConfig | None = None,
+        in_flight: Callable[[], int] = _zero,
+        queue_depth: Callable[[], int] = _zero,
+        db_utilization: Callable[[], float] = postgres.pool_utilization,
+        requests_total: Callable[[], float] = _zero,
+    ) -> None:
+        self._health = health
+        self._config = config or LoadConfig()
+        self._in_flight = in_flight
+        self._queue_depth = queue_depth
+        self._db_utilization = db_utilization
+        self._requests_total = requests_total
+        self._logger = get_logger(__name__, component="load-monitor")
+
+        self._sample = LoadSample()
+        self._report = self._sample.to_orca_text()
+        self._overloaded_streak = 0
+        self._healthy_streak = 0
+        self._last_requests = 0.0
+        self._last_time = time.monotonic()
+
+        UTILIZATION.set_function(lambda: self._sample.utilization)
+        LOOP_LAG.set_function(lambda: self._sample.loop_lag)
+
+    @property
+    def sample(self) -> LoadSample:
+        """Most recent load sample."""
+        return self._sample
+
+    @property
+    def report(self) -> str:
+        """Most recent load sample rendered as ORCA text."""
+        return self._report
+
+    def record(self, loop_lag: float) -> LoadSample:
+        """Take a sample of all signals and update health status.
+
+        Args:
+            loop_lag: Event-loop lag observed for this sample, in seconds
+        """
+        config = self._config
+        now = time.monotonic()
+        requests = float(self._requests_total())
+        elapsed = now - self._last_time
+        rps = (requests - self._last_requests) / elapsed if elapsed > 0 else 0.0
+        self._last_requests, self._last_time = requests, now
+
+        in_flight = self._in_flight()
+        queue_depth = self._queue_depth()
+        db_utilization = self._db_utilization()
+        utilization = max(
+            in_flight / config.max_in_flight,
+            loop_lag / config.max_loop_lag,
+            queue_depth / config.max_queue_depth,
+            db_utilization,
+        )
+
+        self._sample = LoadSample(
+            in_flight=in_flight,
+            loop_lag=loop_lag,
+            queue_depth=queue_depth,
+            db_utilization=db_utilization,
+            rps=rps,
+            utilization=utilization,
+        )
+        self._report = self._sample.to_orca_text()
+        self._update_health(utilization)
+        return self._sample
+
+    def _update_health(self, utilization: float) -> None:
+        """Apply hysteresis to flip health status on sustained overload."""
+        config = self._config
+        if utilization >= 1.0:
+            self._overloaded_streak += 1
+            self._healthy_streak = 0
+        elif utilization < config.recover_utilization:
+            self._healthy_streak += 1
+            self._overloaded_streak = 0
+        else:
+            self._overloaded_streak = 0
+            self._healthy_streak = 0
+
+        if self._overloaded_streak == config.overload_samples:
+            self._logger.warning("Sustained overload", sample=self._sample.to_orca_text())
+            self._health.set_not_serving("overload")
+        elif self._healthy_streak == config.overload_samples:
+            self._health.clear("overload")
+
+    async def run(self) -> None:
+        """Sample load every ``sample_interval`` seconds until cancelled."""
+        interval = self._config.sample_interval
+        while True:
+            expected = time.monotonic() + interval
+            await asyncio.sleep(interval)
+            self.record(loop_lag=max(0.0, time.monotonic() - expected))
@@ -0,0 +1,150 @@
+"""Event-loop lag monitoring with stack capture for blocking callbacks.
+
+Every RPC shares one asyncio loop, so a single blocking call (a slow
+regex, building a huge protobuf) delays everything queued behind it.
+``LoopMonitor`` runs two cooperating pieces:
+
+- A heartbeat task on the loop that wakes every ``interval`` seconds and
+  records how late it woke up in the
+  ``telemetryx_event_loop_lag_seconds`` histogram.
+- A watchdog thread that notices when the heartbeat has not run for
+  longer than ``interval + stall_threshold``. The loop is blocked at
+  that moment, so the watchdog captures the loop thread's current stack
+  (``sys._current_frames``) and logs it with the RPC method being
+  handled (see ``telemetryx.grpc_server.rpc_context``).
+
+Each stall is captured once, while it is still in progress, so the
+logged stack is the code that is actually blocking.
+
+Example:
+    monitor = LoopMonitor(LoopMonitorConfig(stall_threshold=0.1))
+    task = asyncio.create_task(monitor.run())
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+
+from telemetryx.core import get_logger, metrics
+from telemetryx.grpc_server.rpc_context import method_for_frame
+
+LOOP_LAG = metrics.histogram(
+    "telemetryx_event_loop_lag_seconds",
+    "How late the event-loop heartbeat ran (time the loop was busy or blocked)",
+)
+LOOP_STALLS = metrics.counter(
+    "telemetryx_event_loop_stalls_total",
+    "Event-loop stalls longer than the threshold, by RPC method in flight",
+    ["method"],
+)
+
+
+@dataclass(frozen=True)
+class LoopMonitorConfig:
+    """Loop monitor settings.
+
+    Attributes:
+        interval: Seconds between heartbeats
+        stall_threshold: Heartbeat delay (seconds) reported as a stall
+        max_stack_depth: Innermost frames kept per captured stack
+        history: Stalls kept in memory (see ``LoopMonitor.stalls``)
+    """
+
+    interval: float = 0.02
+    stall_threshold: float = 0.1
+    max_stack_depth: int = 50
+    history: int = 50
+
+
+@dataclass(frozen=True)
+class Stall:
+    """A captured event-loop stall."""
+
+    blocked_for: float  # Seconds since the last heartbeat, when captured
+    method: str | None
+    stack: list[str]  # "file:line in function", outermost first
+
+    def format(self) -> str:
+        """Multi-line rendering for logs and debugging."""
+        return "\n".join(self.stack)
+
+
+class LoopMonitor:
+    """Measures event-loop lag and captures stacks of blocking callbacks."""
+
+    def __init__(self, config: LoopMonitorConfig | None = None) -> None:
+        self._config = config or LoopMonitorConfig()
+        self._logger = get_logger(__name__, component="loop-monitor")
+        self._heartbeat = time.monotonic()
+        self._reported = 0.0
+        self._loop_thread: int | None = None
+        self._stop = threading.Event()
+        self._stalls: deque[Stall] = deque(maxlen=self._config.history)
+
+    @property
+    def stalls(self) -> list[Stall]:
+        """Most recent stalls, oldest first."""
+        return list(self._stalls)
+
+    async def run(self) -> None:
+        """Run the heartbeat (and its watchdog thread) until cancelled."""
+        interval = self._config.interval
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        watchdog = threading.Thread(
+            target=self._watch, name="telemetryx-loop-watchdog", daemon=True
+        )
+        watchdog.start()
+        try:
+            while True:
+                expected = time.monotonic() + interval
+                await asyncio.sleep(interval)
+                now = time.monotonic()
+                LOOP_LAG.observe(max(0.0, now - expected))
+                self._heartbeat = now
+        finally:
+            self._stop.set()
+            watchdog.join(1.0)
+
+    def _watch(self) -> None:
+        """Watchdog loop: capture the loop's stack when the heartbeat stalls."""
+        config = self._config
+        limit = config.interval + config.stall_threshold
+        check_every = max(0.005, min(config.interval, config.stall_threshold / 4))
+        while not self._stop.wait(check_every):
+            heartbeat = self._heartbeat
+            blocked_for = time.monotonic() - heartbeat
+            if blocked_for > limit and heartbeat != self._reported:
+                self._reported = heartbeat
+                self.capture(blocked_for)
+
+    def capture(self, blocked_for: float) -> Stall | None:
+        """Capture, record and log the loop thread's current stack."""
+        if self._loop_thread is None:
+            return None
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return None
+
+        summary = traceback.extract_stack(frame, limit=self._config.max_stack_depth)
+        stall = Stall(
+            blocked_for=blocked_for,
+            method=method_for_frame(frame),
+            stack=[f"{f.filename}:{f.lineno} in {f.name}" for f in summary],
+        )
+        del frame
+
+        self._stalls.append(stall)
+        LOOP_STALLS.labels(stall.method or "none").inc()
+        self._logger.warning(
+            "Event loop blocked",
+            blocked_ms=round(blocked_for * 1000, 1),
+            method=stall.method,
+            stack=stall.format(),
+        )
+        return stall
@@ -0,0 +1,119 @@
+"""Memory admin endpoints for the HTTP server.
+
+Served under ``/debug/memory`` when debug endpoints are enabled (see
+``telemetryx.core.memory`` for the accounting itself):
+
+- ``/debug/memory``: RSS, GC counts and pause times, registered
+  structure sizes and tracemalloc status
+- ``/debug/memory/snapshot``: take a tracemalloc snapshot (starting
+  tracemalloc on first use); returns its id and top modules
+- ``/debug/memory/diff?base=ID[&to=ID][&top=N]``: per-module growth
+  between two snapshots (``to`` defaults to a new snapshot)
+- ``/debug/memory/stop``: stop tracemalloc and drop snapshots
+
+Example:
+    for path, route in memory_routes(GcMonitor(), AllocationTracker()).items():
+        http_server.add_route(path, route)
+"""
+
+import asyncio
+import json
+from typing import Any
+
+from telemetryx.core.memory import (
+    AllocationTracker,
+    GcMonitor,
+    ModuleAllocation,
+    peak_resident_memory_bytes,
+    resident_memory_bytes,
+    structure_sizes,
+)
+from telemetryx.grpc_server.http import HttpResponse, RouteHandler
+
+
+def _json(data: Any, status: int = 200) -> HttpResponse:
+    return HttpResponse(json.dumps(data, indent=2), status=status, content_type="application/json")
+
+
+def _int_param(query: dict[str, list[str]], name: str, default: int | None) -> int | None:
+    values = query.get(name)
+    if not values:
+        return default
+    return int(values[0])
+
+
+def memory_routes(gc_monitor: GcMonitor, tracker: AllocationTracker) -> dict[str, RouteHandler]:
+    """Routes of the memory admin API, keyed by path.
+
+    Snapshots and their statistics walk every traced allocation, so they
+    run on a worker thread, one at a time, to keep the event loop serving.
+    """
+    tracker_lock = asyncio.Lock()
+
+    async def report(query: dict[str, list[str]]) -> HttpResponse:
+        # Walking the heap and sizing structures can take a while on big processes
+        gc_report, sizes = await asyncio.to_thread(lambda: (gc_monitor.report(), structure_sizes()))
+        return _json(
+            {
+                "rss_bytes": resident_memory_bytes(),
+                "peak_rss_bytes": peak_resident_memory_bytes(),
+                "gc": gc_report,
+                "structures": sizes,
+                "tracemalloc": {
+                    "tracing": tracker.tracing,
+                    "snapshots": tracker.snapshot_ids,
+                },
+            }
+        )
+
+    async def snapshot(query: dict[str, list[str]]) -> HttpResponse:
+        try:
+            top = _int_param(query, "top", 20)
+        except ValueError:
+            return _json({"error": "top must be an integer"}, status=400)
+        if top is None or top < 1:
+            return _json({"error": "top must be positive"}, status=400)
+
+        def take() -> tuple[int, list[ModuleAllocation]]:
+            snapshot_id = tracker.snapshot()
+            return snapshot_id, tracker.top(snapshot_id, top)
+
+        async with tracker_lock:
+            snapshot_id, entries = await asyncio.to_thread(take)
+        return _json({"snapshot": snapshot_id, "top": [entry.to_dict() for entry in entries]})
+
+    async def diff(query: dict[str, list[str]]) -> HttpResponse:
+        try:
+            base = _int_param(query, "base", None)
+            to = _int_param(query, "to", None)
+            top = _int_param(query, "top", 20)
+        except ValueError:
+            return _json({"error": "base, to and top must be integers"}, status=400)
+        if base is None:
+            return _json({"error": "base snapshot id is required"}, status=400)
+        if top is None or top < 1:
+            return _json({"error": "top must be positive"}, status=400)
+        try:
+            async with tracker_lock:
+                entries = await asyncio.to_thread(tracker.diff, base, to, top)
+        except KeyError as e:
+            return _json({"error": str(e.args[0])}, status=404)
+        return _json(
+            {
+                "base": base,
+                "to": to if to is not None else tracker.snapshot_ids[-1],
+                "modules": [entry.to_dict() for entry in entries],
+            }
+        )
+
+    async def stop(query: dict[str, list[str]]) -> HttpResponse:
+        async with tracker_lock:
+            tracker.stop()
+        return _json({"tracing": False})
+
+    return {
+        "/debug/memory": report,
+        "/debug/memory/snapshot": snapshot,
+        "/debug/memory/diff": diff,
+        "/debug/memory/stop": stop,
+    }
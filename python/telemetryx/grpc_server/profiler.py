@@ -0,0 +1,202 @@
+"""On-demand statistical profiler for the running server.
+
+``SamplingProfiler`` samples the stacks of every thread from a background
+thread (``sys._current_frames``) at a fixed interval and aggregates them
+into collapsed stacks: one line per distinct stack, frames separated by
+``;`` and followed by the sample count. That is the input format of
+``flamegraph.pl``, speedscope and inferno.
+
+Each stack is rooted at its thread name. Event-loop stacks running inside
+an RPC get an extra ``rpc:<method>`` frame, taken from the method recorded
+by ``RpcContextInterceptor`` (see ``telemetryx.grpc_server.rpc_context``),
+so a flame graph splits loop time by RPC.
+
+The server exposes the profiler two ways (see ``GrpcServer``):
+- ``GET /debug/profile?seconds=10`` on the HTTP server returns the
+  collapsed stacks (when debug endpoints are enabled)
+- ``SIGUSR1`` profiles for the default duration and writes the collapsed
+  stacks to a file in ``PROFILER_OUTPUT_DIR``
+
+Example:
+    profile = await SamplingProfiler(interval=0.005).profile(seconds=5)
+    Path("server.folded").write_text(profile.collapsed())
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import CodeType, FrameType
+
+from telemetryx.core.exceptions import ServiceError
+from telemetryx.grpc_server.http import HttpResponse, RouteHandler
+from telemetryx.grpc_server.rpc_context import method_for_frame
+
+
+class ProfilerBusyError(ServiceError):
+    """Raised when a profile is requested while another one is running."""
+
+
+@dataclass
+class Profile:
+    """Aggregated samples from one profiling run."""
+
+    duration: float = 0.0
+    samples: int = 0  # Sampling rounds (each samples every thread)
+    stacks: Counter[str] = field(default_factory=Counter)
+
+    def collapsed(self) -> str:
+        """Collapsed-stack text, most frequent stacks first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class SamplingProfiler:
+    """Samples all threads' stacks at a fixed interval.
+
+    Only one profile runs at a time; concurrent requests raise
+    ``ProfilerBusyError``.
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 128) -> None:
+        self._interval = interval
+        self._max_depth = max_depth
+        self._lock = threading.Lock()
+        self._labels: dict[CodeType, str] = {}
+
+    @property
+    def running(self) -> bool:
+        """Whether a profile is in progress."""
+        return self._lock.locked()
+
+    async def profile(self, seconds: float) -> Profile:
+        """Profile for ``seconds`` without blocking the event loop.
+
+        Sampling runs on its own thread, which releases the profiler when it
+        finishes. Cancelling the call stops sampling at the next interval,
+        so the profiler stays busy until the thread has actually stopped.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+        loop = asyncio.get_running_loop()
+        done: asyncio.Future[Profile] = loop.create_future()
+        stop = threading.Event()
+
+        def run() -> None:
+            try:
+                profile = self._sample_for(seconds, stop)
+            except Exception as e:
+                outcome: tuple[Profile | None, Exception | None] = (None, e)
+            else:
+                outcome = (profile, None)
+            finally:
+                self._lock.release()
+            try:
+                loop.call_soon_threadsafe(_resolve, done, *outcome)
+            except RuntimeError:
+                pass  # The loop closed while sampling
+
+        threading.Thread(target=run, name="telemetryx-profiler", daemon=True).start()
+        try:
+            return await done
+        except asyncio.CancelledError:
+            stop.set()
+            raise
+
+    def _sample_for(self, seconds: float, stop: threading.Event) -> Profile:
+        """Sampling loop (runs on the profiler thread until ``seconds`` or ``stop``)."""
+        profile = Profile()
+        me = threading.get_ident()
+        start = time.monotonic()
+        deadline = start + seconds
+        next_sample = start
+        while not stop.is_set():
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != me:
+                    profile.stacks[self._collapse(names.get(thread_id, str(thread_id)), frame)] += 1
+            profile.samples += 1
+
+            next_sample += self._interval
+            now = time.monotonic()
+            if next_sample >= deadline:
+                break
+            if next_sample > now:
+                stop.wait(next_sample - now)
+        profile.duration = time.monotonic() - start
+        return profile
+
+    def _collapse(self, thread_name: str, frame: FrameType) -> str:
+        """Render one stack as ``thread;[rpc:method;]outer;...;inner``."""
+        labels = []
+        current: FrameType | None = frame
+        while current is not None and len(labels) < self._max_depth:
+            labels.append(self._label(current.f_code))
+            current = current.f_back
+        labels.reverse()
+
+        root = thread_name.replace(";", ":")
+        method = method_for_frame(frame)
+        if method is not None:
+            return f"{root};rpc:{method};" + ";".join(labels)
+        return f"{root};" + ";".join(labels)
+
+    def _label(self, code: CodeType) -> str:
+        """Frame label ``qualname (file:line)``, cached per code object."""
+        label = self._labels.get(code)
+        if label is None:
+            filename = os.path.basename(code.co_filename)
+            label = f"{code.co_qualname} ({filename}:{code.co_firstlineno})".replace(";", ":")
+            self._labels[code] = label
+        return label
+
+
+def _resolve(
+    future: "asyncio.Future[Profile]", profile: Profile | None, error: Exception | None
+) -> None:
+    """Complete a profile's future on the event loop (unless it was cancelled)."""
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    elif profile is not None:
+        future.set_result(profile)
+
+
+def write_profile(profile: Profile, directory: str | Path) -> Path:
+    """Write collapsed stacks to ``profile-<pid>-<timestamp>.folded``."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"profile-{os.getpid()}-{time.strftime('%Y%m%dT%H%M%S')}.folded"
+    path.write_text(profile.collapsed(), encoding="utf-8")
+    return path
+
+
+def profile_route(
+    profiler: SamplingProfiler,
+    default_seconds: float = 10.0,
+    max_seconds: float = 60.0,
+) -> RouteHandler:
+    """HTTP route profiling for ``?seconds=N`` (capped) and returning collapsed stacks."""
+
+    async def handler(query: dict[str, list[str]]) -> HttpResponse:
+        try:
+            seconds = float(query.get("seconds", [str(default_seconds)])[0])
+        except ValueError:
+            return HttpResponse("seconds must be a number", status=400)
+        if not 0 < seconds <= max_seconds:
+            return HttpResponse(f"seconds must be in (0, {max_seconds}]", status=400)
+
+        try:
+            profile = await profiler.profile(seconds)
+        except ProfilerBusyError as e:
+            return HttpResponse(str(e), status=409)
+        return HttpResponse(
+            profile.collapsed(),
+            headers={"X-Profile-Samples": str(profile.samples)},
+        )
+
+    return handler
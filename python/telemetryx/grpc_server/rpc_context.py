@@ -0,0 +1,51 @@
+"""Which RPC a piece of code is running for.
+
+``RpcContextInterceptor`` records the method of every call in two places:
+
+- A context variable, for code running inside the call (``current_method``)
+- A registry of the interceptor wrappers' frames, for other threads
+  inspecting the event loop thread's stack (``method_for_frame``). A
+  thread cannot read another thread's context variables, but while a
+  coroutine runs its awaiting callers stay on the frame chain, so walking
+  ``f_back`` from the loop's current frame reaches the wrapper.
+
+Example:
+    frame = sys._current_frames()[loop_thread_id]
+    method = method_for_frame(frame)  # e.g. "/telemetryx.RulesService/EvaluateEvent"
+"""
+
+from contextvars import ContextVar, Token
+from types import FrameType
+
+_method: ContextVar[str | None] = ContextVar("telemetryx_rpc_method", default=None)
+
+# Frames of running RPC wrappers (only touched on the event loop thread;
+# other threads only read it)
+_frames: dict[FrameType, str] = {}
+
+
+def enter_rpc(method: str, frame: FrameType) -> Token[str | None]:
+    """Mark ``frame`` (the caller's own frame) as running ``method``."""
+    _frames[frame] = method
+    return _method.set(method)
+
+
+def exit_rpc(frame: FrameType, token: Token[str | None]) -> None:
+    """Undo ``enter_rpc``."""
+    _frames.pop(frame, None)
+    _method.reset(token)
+
+
+def current_method() -> str | None:
+    """Method of the RPC the calling code is handling, if any."""
+    return _method.get()
+
+
+def method_for_frame(frame: FrameType | None) -> str | None:
+    """Method of the innermost RPC found on a stack, if any."""
+    while frame is not None:
+        method = _frames.get(frame)
+        if method is not None:
+            return method
+        frame = frame.f_back
+    return None
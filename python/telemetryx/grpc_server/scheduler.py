@@ -0,0 +1,179 @@
+"""Priority lanes for RPC scheduling.
+
+All RPCs share one event loop, so without separation a flood of large
+``DetectAnomalies`` batches can delay health checks and single-event
+evaluations past their callers' timeouts. The scheduler sorts each call
+into a lane:
+
+- ``HEALTH``: health checks
+- ``INTERACTIVE``: unary calls on a single event or a small batch
+- ``BULK``: batches with at least ``bulk_min_events`` events
+
+Each lane has its own concurrency budget and bounded FIFO queue, so bulk
+work can only ever occupy the bulk lane's slots. Calls arriving at a full
+queue are rejected immediately.
+
+Example:
+    scheduler = PriorityScheduler()
+    lane = scheduler.classify(method, request)
+    await scheduler.acquire(lane)
+    try:
+        ...
+    finally:
+        scheduler.release(lane)
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+from telemetryx.core import metrics
+from telemetryx.core.exceptions import ServiceError
+from telemetryx.grpc_server.health import is_health_check
+
+LANE_ACTIVE = metrics.gauge(
+    "telemetryx_lane_active",
+    "Calls currently running in each priority lane",
+    ["lane"],
+)
+LANE_QUEUE_DEPTH = metrics.gauge(
+    "telemetryx_lane_queue_depth",
+    "Calls waiting for a slot in each priority lane",
+    ["lane"],
+)
+LANE_QUEUE_WAIT = metrics.histogram(
+    "telemetryx_lane_queue_wait_seconds",
+    "Time calls spent waiting for a lane slot",
+    ["lane"],
+)
+LANE_REJECTED = metrics.counter(
+    "telemetryx_lane_rejected_total",
+    "Calls rejected because their lane queue was full",
+    ["lane"],
+)
+
+
+class Lane(str, Enum):
+    """Priority lanes, highest priority first."""
+
+    HEALTH = "health"
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
+
+
+@dataclass(frozen=True)
+class LaneConfig:
+    """Budget for one lane.
+
+    Attributes:
+        concurrency: Calls allowed to run at once
+        max_queue: Calls allowed to wait for a slot (excess is rejected)
+    """
+
+    concurrency: int
+    max_queue: int
+
+
+DEFAULT_LANES: dict[Lane, LaneConfig] = {
+    Lane.HEALTH: LaneConfig(concurrency=16, max_queue=64),
+    Lane.INTERACTIVE: LaneConfig(concurrency=128, max_queue=1024),
+    Lane.BULK: LaneConfig(concurrency=4, max_queue=64),
+}
+
+
+class LaneFullError(ServiceError):
+    """Raised when a lane's queue is full."""
+
+    pass
+
+
+class _LaneState:
+    """Slots and waiters for a single lane."""
+
+    def __init__(self, lane: Lane, config: LaneConfig) -> None:
+        self.config = config
+        self.active = 0
+        self.waiters: deque[asyncio.Future[None]] = deque()
+        LANE_ACTIVE.labels(lane.value).set_function(lambda: self.active)
+        LANE_QUEUE_DEPTH.labels(lane.value).set_function(lambda: len(self.waiters))
+
+
+class PriorityScheduler:
+    """Per-lane concurrency budgets with bounded FIFO queues.
+
+    Not thread-safe: all calls are expected to come from the event loop.
+    """
+
+    def __init__(
+        self,
+        lanes: dict[Lane, LaneConfig] | None = None,
+        bulk_min_events: int = 100,
+    ) -> None:
+        configs = {**DEFAULT_LANES, **(lanes or {})}
+        self._lanes = {lane: _LaneState(lane, configs[lane]) for lane in Lane}
+        self._bulk_min_events = bulk_min_events
+        self._queue_wait = {lane: LANE_QUEUE_WAIT.labels(lane.value) for lane in Lane}
+
+    def classify(self, method: str, request: Any) -> Lane:
+        """Pick the lane for a call from its method and request."""
+        if is_health_check(method):
+            return Lane.HEALTH
+        events = getattr(request, "events", None)
+        if events is not None and len(events) >= self._bulk_min_events:
+            return Lane.BULK
+        return Lane.INTERACTIVE
+
+    def queue_depth(self, include_health: bool = False) -> int:
+        """Total calls waiting for a slot."""
+        return sum(
+            len(state.waiters)
+            for lane, state in self._lanes.items()
+            if include_health or lane is not Lane.HEALTH
+        )
+
+    def active(self, lane: Lane) -> int:
+        """Calls currently running in a lane."""
+        return self._lanes[lane].active
+
+    async def acquire(self, lane: Lane) -> None:
+        """Wait for a slot in a lane.
+
+        Raises:
+            LaneFullError: If the lane's queue is already full
+        """
+        state = self._lanes[lane]
+        if state.active < state.config.concurrency and not state.waiters:
+            state.active += 1
+            return
+
+        if len(state.waiters) >= state.config.max_queue:
+            LANE_REJECTED.labels(lane.value).inc()
+            raise LaneFullError("Lane queue full", {"lane": lane.value})
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        state.waiters.append(waiter)
+        start = time.perf_counter()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled; pass it on
+                self.release(lane)
+            elif waiter in state.waiters:
+                state.waiters.remove(waiter)
+            raise
+        finally:
+            self._queue_wait[lane].observe(time.perf_counter() - start)
+
+    def release(self, lane: Lane) -> None:
+        """Release a slot, handing it directly to the next waiter if any."""
+        state = self._lanes[lane]
+        while state.waiters:
+            waiter = state.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        state.active -= 1
@@ -4,24 +4,75 @@ This module provides the main server class that handles:
 - Server startup and binding
 - Graceful shutdown on SIGTERM/SIGINT
 - Health check service registration
+- Load-driven health status and per-response load reports
+- Priority lanes for health, interactive and bulk calls
+- Event-loop lag monitoring with stack capture for blocking callbacks
+- Memory accounting (GC pauses, structure sizes, allocation snapshots)
+- On-demand sampling profiles (SIGUSR1 or ``/debug/profile``)
+- Trace context propagation from the caller (see ``telemetryx.core.tracing``)
+- Stored models, memory-mapped and hot-swapped (see ``telemetryx.ml.registry``)
+- Warmup before reporting SERVING (see ``telemetryx.grpc_server.startup``)
 """
 
 import asyncio
 import signal
 from concurrent import futures
+from functools import partial
 
 import grpc
 from grpc_health.v1 import health, health_pb2, health_pb2_grpc
-from grpc_reflection.v1alpha import reflection
 
 from telemetryx.core import Settings, get_logger, get_settings, setup_logging
+from telemetryx.core.logging import run_drop_summaries, shutdown_logging
+from telemetryx.core.memory import (
+    AllocationTracker,
+    GcMonitor,
+    approximate_size,
+    register_size_provider,
+)
+from telemetryx.core.tracing import Tracer, configure_tracing, tracer_from_settings
+from telemetryx.db import close_databases
+from telemetryx.grpc_server.admission import LimiterConfig
 from telemetryx.grpc_server.handlers import AnalyticsServiceHandler, RulesServiceHandler
-from telemetryx.grpc_server.interceptors import LoggingInterceptor
+from telemetryx.grpc_server.health import HealthState
+from telemetryx.grpc_server.http import HttpServer, metrics_route
+from telemetryx.grpc_server.interceptors import (
+    AdmissionControlInterceptor,
+    LoadReportingInterceptor,
+    LoggingInterceptor,
+    MetricsInterceptor,
+    RpcContextInterceptor,
+    SchedulingInterceptor,
+    TimingInterceptor,
+    TracingInterceptor,
+    total_in_flight,
+    total_requests,
+)
+from telemetryx.grpc_server.load import LoadConfig, LoadMonitor
+from telemetryx.grpc_server.loop_monitor import LoopMonitor, LoopMonitorConfig
+from telemetryx.grpc_server.memory import memory_routes
+from telemetryx.grpc_server.profiler import (
+    ProfilerBusyError,
+    SamplingProfiler,
+    profile_route,
+    write_profile,
+)
+from telemetryx.grpc_server.scheduler import Lane, LaneConfig, PriorityScheduler
+from telemetryx.grpc_server.startup import StartupPipeline, open_databases, warm_handlers
+from telemetryx.ml.anomaly import DETECTOR_SERIES, Detector, EwmaDetector, QuantileDetector
+from telemetryx.ml.rate import RateDetector
+from telemetryx.ml.registry import MODELS_LOADED, ModelRegistry
+from telemetryx.ml.seasonal import SeasonalDetector
 
 # Import generated proto services (we'll register handlers later)
 from telemetryx.proto import analytics_pb2, analytics_pb2_grpc, rules_pb2, rules_pb2_grpc
 
 
+def _nbytes(detector: Detector) -> int:
+    """State size of a detector (for the structure-size registry)."""
+    return detector.nbytes
+
+
 class GrpcServer:
     """Async gRPC server for TelemetryX Python Brain.
 
@@ -30,6 +81,7 @@ class GrpcServer:
     Example:
         server = GrpcServer()
         await server.start()
+        await server.warm_up()
         await server.wait_for_termination()
     """
 
@@ -37,69 +89,307 @@ class GrpcServer:
         """Initialize the server."""
         self._settings = settings or get_settings()
         self._server: grpc.aio.Server | None = None
+        self._http_server: HttpServer | None = None
         self._logger = get_logger(__name__, component="grpc-server")
         self._shutdown_event = asyncio.Event()
+        self._background_tasks: list[asyncio.Task[None]] = []
+        self._health_updates: set[asyncio.Task[None]] = set()
+        self._port = self._settings.grpc_port
+        self._tracer: Tracer | None = None
+        self._health = HealthState()
+        self._scheduler = PriorityScheduler(
+            {
+                Lane.HEALTH: LaneConfig(
+                    concurrency=self._settings.lane_health_concurrency,
+                    max_queue=self._settings.lane_health_queue,
+                ),
+                Lane.INTERACTIVE: LaneConfig(
+                    concurrency=self._settings.lane_interactive_concurrency,
+                    max_queue=self._settings.lane_interactive_queue,
+                ),
+                Lane.BULK: LaneConfig(
+                    concurrency=self._settings.lane_bulk_concurrency,
+                    max_queue=self._settings.lane_bulk_queue,
+                ),
+            },
+            bulk_min_events=self._settings.lane_bulk_min_events,
+        )
+        self._load_monitor = LoadMonitor(
+            self._health,
+            LoadConfig(
+                sample_interval=self._settings.load_sample_interval_s,
+                max_in_flight=self._settings.load_max_in_flight,
+                max_loop_lag=self._settings.load_max_loop_lag_ms / 1000,
+                max_queue_depth=self._settings.load_max_queue_depth,
+                overload_samples=self._settings.load_overload_samples,
+            ),
+            in_flight=total_in_flight,
+            queue_depth=self._scheduler.queue_depth,
+            requests_total=total_requests,
+        )
+        self._loop_monitor = LoopMonitor(
+            LoopMonitorConfig(
+                interval=self._settings.loop_monitor_interval_ms / 1000,
+                stall_threshold=self._settings.loop_stall_threshold_ms / 1000,
+            )
+        )
+        self._profiler = SamplingProfiler(interval=self._settings.profiler_interval_ms / 1000)
+        self._profile_task: asyncio.Task[None] | None = None
+        self._gc_monitor = GcMonitor()
+        self._allocations = AllocationTracker()
+        register_size_provider(
+            "loop_monitor.stalls", lambda: approximate_size(self._loop_monitor.stalls)
+        )
+        self._rules_handler = RulesServiceHandler(self._health)
+        self._detector = EwmaDetector(
+            alpha=self._settings.detector_alpha,
+            warmup=self._settings.detector_warmup,
+            max_series=self._settings.detector_max_series,
+        )
+        self._quantile_detector = QuantileDetector(
+            relative_accuracy=self._settings.quantile_relative_accuracy,
+            max_bins=self._settings.quantile_max_bins,
+            warmup=self._settings.quantile_warmup,
+            max_series=self._settings.detector_max_series,
+            window=self._settings.quantile_window,
+        )
+        self._seasonal_detector = SeasonalDetector(
+            period=self._settings.seasonal_period_s * 1000,
+            buckets=self._settings.seasonal_buckets,
+            alpha=self._settings.seasonal_alpha,
+            gamma=self._settings.seasonal_gamma,
+            warmup=self._settings.seasonal_warmup,
+            max_series=self._settings.detector_max_series,
+        )
+        self._rate_detector = RateDetector(
+            window=self._settings.rate_window_s * 1000,
+            lateness=self._settings.rate_lateness_s * 1000,
+            max_skew=self._settings.rate_max_skew_s * 1000,
+            alpha=self._settings.rate_alpha,
+            warmup=self._settings.rate_warmup,
+            max_series=self._settings.detector_max_series,
+        )
+        detectors: list[Detector] = [
+            self._detector,
+            self._quantile_detector,
+            self._seasonal_detector,
+            self._rate_detector,
+        ]
+        for detector in detectors:
+            DETECTOR_SERIES.labels(detector.name).set_function(partial(len, detector))
+            register_size_provider(f"ml.{detector.name}", partial(_nbytes, detector))
+        self._models = ModelRegistry(
+            self._settings.models_dir,
+            max_models=self._settings.models_max_loaded,
+            max_bytes=self._settings.models_max_bytes,
+            refresh_interval=self._settings.models_refresh_interval_s,
+            missing_ttl=self._settings.models_missing_ttl_s,
+        )
+        MODELS_LOADED.set_function(partial(len, self._models))
+        register_size_provider("ml.models", lambda: self._models.nbytes)
+        self._analytics_handler = AnalyticsServiceHandler(self._health, detectors, self._models)
+
+        # Health reports NOT_SERVING until every startup phase has run
+        self._startup = StartupPipeline(self._health)
+        self._startup.add_phase("databases", open_databases)
+        self._startup.add_phase("models", self._models.preload)
+        self._startup.add_phase(
+            "handlers", lambda: warm_handlers(self._rules_handler, self._analytics_handler)
+        )
+
+    @property
+    def health(self) -> HealthState:
+        """Shared serving status (reported by all health check endpoints)."""
+        return self._health
+
+    @property
+    def load_monitor(self) -> LoadMonitor:
+        """Live load tracking for this server."""
+        return self._load_monitor
+
+    @property
+    def loop_monitor(self) -> LoopMonitor:
+        """Event-loop lag and stall tracking for this server."""
+        return self._loop_monitor
+
+    @property
+    def profiler(self) -> SamplingProfiler:
+        """On-demand sampling profiler for this process."""
+        return self._profiler
+
+    @property
+    def gc_monitor(self) -> GcMonitor:
+        """Garbage collection pause tracking for this process."""
+        return self._gc_monitor
+
+    @property
+    def models(self) -> ModelRegistry:
+        """Stored models served by ``DetectAnomalies``."""
+        return self._models
+
+    @property
+    def scheduler(self) -> PriorityScheduler:
+        """Priority lanes shared by all services."""
+        return self._scheduler
+
+    @property
+    def startup(self) -> StartupPipeline:
+        """Startup phases run by ``warm_up``."""
+        return self._startup
 
     @property
     def address(self) -> str:
         """Get the server bind address."""
         return f"{self._settings.grpc_host}:{self._settings.grpc_port}"
 
+    @property
+    def port(self) -> int:
+        """Bound port (assigned by the OS once started if ``grpc_port`` is 0)."""
+        return self._port
+
     async def start(self) -> None:
         """Start the gRPC server.
 
         Binds to the configured host:port and registers all services.
         """
+        # Metrics wrap everything (so shed load is counted), then admission
+        # control runs before any other work so rejected calls stay cheap.
+        # Admitted calls then wait for a slot in their priority lane. Timing
+        # is outermost so its breakdown covers every other layer, and the
+        # server span of sampled traces covers everything after it.
+        interceptors: list[grpc.aio.ServerInterceptor] = []
+        if self._settings.timing_enabled:
+            interceptors.append(TimingInterceptor())
+        self._tracer = tracer_from_settings(self._settings)
+        if self._tracer is not None:
+            self._tracer.start()
+            configure_tracing(self._tracer)
+            interceptors.append(TracingInterceptor(self._tracer))
+        interceptors.append(RpcContextInterceptor())
+        interceptors.append(MetricsInterceptor())
+        interceptors.append(LoadReportingInterceptor(lambda: self._load_monitor.report))
+        if self._settings.admission_enabled:
+            interceptors.append(
+                AdmissionControlInterceptor(
+                    LimiterConfig(
+                        initial_limit=self._settings.admission_initial_limit,
+                        min_limit=self._settings.admission_min_limit,
+                        max_limit=self._settings.admission_max_limit,
+                    )
+                )
+            )
+        interceptors.append(SchedulingInterceptor(self._scheduler))
+        interceptors.append(LoggingInterceptor())
+
         # Create the async server
         self._server = grpc.aio.server(
-            futures.ThreadPoolExecutor(max_workers=10),
-            interceptors=[LoggingInterceptor()],
+            futures.ThreadPoolExecutor(max_workers=self._settings.grpc_max_workers),
+            interceptors=interceptors,
             options=[
                 ("grpc.max_receive_message_length", 50 * 1024 * 1024),  # 50MB
                 ("grpc.max_send_message_length", 50 * 1024 * 1024),
             ],
         )
 
-        # Register health check service
-        health_servicer = health.HealthServicer()
+        # Register health check service (the asyncio servicer: the
+        # interceptors await every handler they wrap)
+        health_servicer = health.aio.HealthServicer()
         health_pb2_grpc.add_HealthServicer_to_server(health_servicer, self._server)
 
-        # Set initial health status
-        health_servicer.set("", health_pb2.HealthCheckResponse.SERVING)
-        health_servicer.set("telemetryx.RulesService", health_pb2.HealthCheckResponse.SERVING)
-        health_servicer.set("telemetryx.AnalyticsService", health_pb2.HealthCheckResponse.SERVING)
+        # Health status follows the shared health state (e.g. sustained overload)
+        async def publish_health() -> None:
+            status = (
+                health_pb2.HealthCheckResponse.SERVING
+                if self._health.serving
+                else health_pb2.HealthCheckResponse.NOT_SERVING
+            )
+            for service in ("", "telemetryx.RulesService", "telemetryx.AnalyticsService"):
+                await health_servicer.set(service, status)
+
+        loop = asyncio.get_running_loop()
+
+        def set_health_status(serving: bool) -> None:
+            # Listeners are synchronous; each update publishes the status
+            # current when it runs, so out-of-order updates still converge
+            task = loop.create_task(publish_health())
+            self._health_updates.add(task)
+            task.add_done_callback(self._health_updates.discard)
+
+        await publish_health()
+        self._health.add_listener(set_health_status)
 
         # Register service handlers
-        rules_pb2_grpc.add_RulesServiceServicer_to_server(RulesServiceHandler(), self._server)
+        rules_pb2_grpc.add_RulesServiceServicer_to_server(self._rules_handler, self._server)
         analytics_pb2_grpc.add_AnalyticsServiceServicer_to_server(
-            AnalyticsServiceHandler(), self._server
+            self._analytics_handler, self._server
         )
 
-        # Enable reflection for debugging with grpcurl
-        service_names = (
+        service_names = [
             rules_pb2.DESCRIPTOR.services_by_name["RulesService"].full_name,
             analytics_pb2.DESCRIPTOR.services_by_name["AnalyticsService"].full_name,
-            reflection.SERVICE_NAME,
             health.SERVICE_NAME,
-        )
-        reflection.enable_server_reflection(service_names, self._server)
+        ]
+
+        # Enable reflection for debugging with grpcurl (development only, so
+        # production never imports grpc_reflection)
+        if self._settings.is_development:
+            from grpc_reflection.v1alpha import reflection
+
+            service_names.append(reflection.SERVICE_NAME)
+            reflection.enable_server_reflection(service_names, self._server)
 
         # Bind to address
-        self._server.add_insecure_port(self.address)
+        self._port = self._server.add_insecure_port(self.address)
 
         # Start serving
         await self._server.start()
         self._logger.info(
             "gRPC server started",
             address=self.address,
-            services=list(service_names),
+            services=service_names,
         )
 
+        if self._settings.metrics_enabled:
+            self._http_server = HttpServer(self._settings.grpc_host, self._settings.metrics_port)
+            self._http_server.add_route("/metrics", metrics_route)
+            if self._settings.debug_endpoints_enabled:
+                self._http_server.add_route(
+                    "/debug/profile",
+                    profile_route(
+                        self._profiler,
+                        default_seconds=self._settings.profiler_default_seconds,
+                        max_seconds=self._settings.profiler_max_seconds,
+                    ),
+                )
+                for path, route in memory_routes(self._gc_monitor, self._allocations).items():
+                    self._http_server.add_route(path, route)
+            await self._http_server.start()
+
+        self._gc_monitor.install()
+        self._background_tasks += [
+            asyncio.create_task(run_drop_summaries(self._settings.log_summary_interval_s)),
+            asyncio.create_task(self._load_monitor.run()),
+            asyncio.create_task(self._models.run()),
+        ]
+        if self._settings.loop_monitor_enabled:
+            self._background_tasks.append(asyncio.create_task(self._loop_monitor.run()))
+
         # Setup signal handlers for graceful shutdown
         self._setup_signal_handlers()
 
+    async def warm_up(self) -> dict[str, float]:
+        """Run the startup phases, then report SERVING.
+
+        Call after ``start()``: the port is already bound, so orchestrators
+        see ``NOT_SERVING`` rather than connection errors while warming up.
+
+        Returns:
+            Seconds spent in each phase
+        """
+        return await self._startup.run()
+
     def _setup_signal_handlers(self) -> None:
-        """Register signal handlers for graceful shutdown."""
+        """Register signal handlers for graceful shutdown and profiling."""
         loop = asyncio.get_running_loop()
 
         for sig in (signal.SIGTERM, signal.SIGINT):
@@ -107,6 +397,29 @@ class GrpcServer:
                 sig,
                 lambda s=sig: asyncio.create_task(self._handle_signal(s)),
             )
+        loop.add_signal_handler(signal.SIGUSR1, self._start_profile)
+
+    def _start_profile(self) -> None:
+        """Handle SIGUSR1: profile in the background (ignored if one is running)."""
+        if self._profile_task is None or self._profile_task.done():
+            self._profile_task = asyncio.create_task(self.profile_to_file())
+
+    async def profile_to_file(self, seconds: float | None = None) -> None:
+        """Profile for ``seconds`` (default from settings) and write collapsed stacks."""
+        seconds = seconds or self._settings.profiler_default_seconds
+        self._logger.info("Profiling", seconds=seconds)
+        try:
+            profile = await self._profiler.profile(seconds)
+        except ProfilerBusyError:
+            self._logger.warning("Profile already running, ignoring request")
+            return
+        directory = self._settings.profiler_output_dir
+        try:
+            path = await asyncio.to_thread(write_profile, profile, directory)
+        except OSError as e:
+            self._logger.error("Failed to write profile", directory=directory, error=str(e))
+            return
+        self._logger.info("Profile written", path=str(path), samples=profile.samples)
 
     async def _handle_signal(self, sig: signal.Signals) -> None:
         """Handle shutdown signal."""
@@ -123,6 +436,26 @@ class GrpcServer:
         # Stop accepting new requests and wait for existing ones
         await self._server.stop(grace_period)
 
+        if self._http_server is not None:
+            await self._http_server.stop()
+
+        if self._profile_task is not None:
+            self._profile_task.cancel()
+        for task in self._background_tasks:
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        self._background_tasks.clear()
+
+        await close_databases()
+
+        self._gc_monitor.uninstall()
+        self._allocations.stop()
+
+        if self._tracer is not None:
+            configure_tracing(None)
+            await asyncio.to_thread(self._tracer.shutdown)
+            self._tracer = None
+
         self._logger.info("gRPC server stopped")
         self._shutdown_event.set()
 
@@ -140,7 +473,8 @@ async def serve() -> None:
     This function:
     1. Sets up logging
     2. Creates and starts the server
-    3. Waits for termination signal
+    3. Opens databases and warms up handlers, then reports SERVING
+    4. Waits for termination signal
     """
     # Initialize logging
     setup_logging()
@@ -159,9 +493,12 @@ async def serve() -> None:
 
     try:
         await server.start()
+        await server.warm_up()
         await server.wait_for_termination()
     except Exception as e:
         logger.exception("Server error", error=str(e))
+        await server.stop()
         raise
     finally:
         logger.info("Server shutdown complete")
+        shutdown_logging()
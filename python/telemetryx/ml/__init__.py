@@ -1 +1,55 @@
-"""ML Models - TODO: Implement anomaly detection here"""
+"""Machine learning for TelemetryX.
+
+Streaming anomaly detectors that score telemetry events as they arrive,
+and a registry of stored, memory-mapped models (isolation forests
+trained offline with ``python -m telemetryx.ml train``).
+"""
+
+from telemetryx.ml.anomaly import (
+    BatchDetections,
+    Detection,
+    Detector,
+    EwmaDetector,
+    QuantileDetector,
+    SeriesIndex,
+    anomaly_score,
+    sensitivity_tail,
+    sensitivity_threshold,
+)
+from telemetryx.ml.features import FEATURES, FeatureBatch
+from telemetryx.ml.forest import IsolationForest, IsolationForestDetector
+from telemetryx.ml.rate import RateDetector, RateWindows
+from telemetryx.ml.registry import (
+    ModelArtifact,
+    ModelRegistry,
+    load_artifact,
+    register_model_kind,
+    save_model,
+)
+from telemetryx.ml.seasonal import SeasonalDetector
+from telemetryx.ml.sketch import DDSketch
+
+__all__ = [
+    "BatchDetections",
+    "DDSketch",
+    "Detection",
+    "Detector",
+    "EwmaDetector",
+    "FEATURES",
+    "FeatureBatch",
+    "IsolationForest",
+    "IsolationForestDetector",
+    "ModelArtifact",
+    "ModelRegistry",
+    "QuantileDetector",
+    "RateDetector",
+    "RateWindows",
+    "SeasonalDetector",
+    "SeriesIndex",
+    "anomaly_score",
+    "load_artifact",
+    "register_model_kind",
+    "save_model",
+    "sensitivity_tail",
+    "sensitivity_threshold",
+]
@@ -0,0 +1,65 @@
+"""Model training CLI.
+
+Examples:
+    python -m telemetryx.ml train --name checkout --event-type checkout_latency --days 14
+    python -m telemetryx.ml train --name api --source api --features value,hour_sin,hour_cos
+"""
+
+import argparse
+import asyncio
+import time
+
+
+def _run_train(args: argparse.Namespace) -> None:
+    from telemetryx.core import get_settings, setup_logging
+    from telemetryx.ml.training import train_from_database
+
+    setup_logging()
+    since_ms = int((time.time() - args.days * 86_400) * 1000)
+    version = asyncio.run(
+        train_from_database(
+            args.models_dir or get_settings().models_dir,
+            args.name,
+            since_ms,
+            source=args.source,
+            event_type=args.event_type,
+            limit=args.limit,
+            features=args.features.split(","),
+            trees=args.trees,
+            sample_size=args.sample_size,
+            seed=args.seed,
+        )
+    )
+    print(f"Stored {args.name}@{version}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Entry point for the model CLI."""
+    from telemetryx.ml.training import DEFAULT_FEATURES
+
+    parser = argparse.ArgumentParser(prog="python -m telemetryx.ml")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train = commands.add_parser("train", help="Train an isolation forest on stored events")
+    train.add_argument("--name", required=True, help="Model name (model_name in requests)")
+    train.add_argument("--source", help="Only events from this source")
+    train.add_argument("--event-type", help="Only events of this type")
+    train.add_argument("--days", type=float, default=7.0, help="History to train on")
+    train.add_argument("--limit", type=int, default=100_000, help="Most recent events used")
+    train.add_argument(
+        "--features",
+        default=",".join(DEFAULT_FEATURES),
+        help="Comma-separated feature names (see telemetryx.ml.features.FEATURES)",
+    )
+    train.add_argument("--trees", type=int, default=100)
+    train.add_argument("--sample-size", type=int, default=256, help="Events per tree")
+    train.add_argument("--seed", type=int, default=0)
+    train.add_argument("--models-dir", help="Model directory (default: MODELS_DIR)")
+    train.set_defaults(run=_run_train)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,777 @@
+"""Streaming anomaly detection.
+
+Detectors keep state per series, keyed by ``(source, event_type)``, and
+score each event's ``value`` as it arrives in O(1) time. Per-series
+numbers live in flat ``array`` columns indexed by a dense series slot
+rather than in one Python object per series, so millions of series stay
+compact and scoring never touches more than one slot.
+
+Detectors:
+- ``EwmaDetector``: exponentially weighted mean and variance per series,
+  flagging values whose z-score exceeds a threshold
+- ``QuantileDetector``: a DDSketch per series, flagging values outside a
+  quantile band; robust to heavy-tailed metrics such as latency
+- ``SeasonalDetector`` (``telemetryx.ml.seasonal``): Holt-Winters level,
+  trend and daily/weekly seasonal offsets per series
+- ``RateDetector`` (``telemetryx.ml.rate``): event counts per series in
+  tumbling windows against a seasonal Poisson rate, for volume anomalies
+
+Trained, stored models (e.g. ``telemetryx.ml.forest``) implement the same
+``Detector`` protocol and are served through ``telemetryx.ml.registry``.
+Detectors that also judge whole windows of events (``RateDetector``)
+implement ``WindowedDetector``.
+
+The request's ``sensitivity`` (0.0 to 1.0, higher flags more) maps to each
+detector's threshold through ``Detector.threshold``.
+
+Example:
+    detector = EwmaDetector(alpha=0.05, warmup=30)
+    threshold = detector.threshold(request.sensitivity)
+    for event in request.events:
+        detection = detector.score(event.source, event.event_type, event.value, threshold)
+"""
+
+import math
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from itertools import repeat
+from typing import TYPE_CHECKING, Protocol, runtime_checkable
+
+import numpy as np
+
+from telemetryx.core import metrics
+from telemetryx.ml.features import FeatureBatch, SeriesKey, segment
+from telemetryx.ml.sketch import MIN_VALUE, DDSketch, read_sketch
+
+if TYPE_CHECKING:
+    from telemetryx.ml.rate import RateWindows
+
+DETECTOR_SERIES = metrics.gauge(
+    "telemetryx_detector_series",
+    "Series tracked by each streaming detector",
+    ["detector"],
+)
+SERIES_REJECTED = metrics.counter(
+    "telemetryx_detector_series_rejected_total",
+    "Events not scored because the detector's series capacity was full",
+    ["detector"],
+)
+
+# z-score thresholds at sensitivity 0.0 and 1.0
+STRICT_THRESHOLD = 5.0
+LOOSE_THRESHOLD = 1.0
+
+# Tail probabilities beyond each quantile band edge at sensitivity 0.0 and 1.0
+STRICT_TAIL = 0.0001
+LOOSE_TAIL = 0.05
+
+_CHECKPOINT_MAGIC = b"TXQC"
+_CHECKPOINT_VERSION = 1
+_CHECKPOINT_HEADER = struct.Struct("<4sBI")  # magic, version, series
+_KEY_HEADER = struct.Struct("<HH")  # source and event_type lengths
+
+
+def sensitivity_threshold(
+    sensitivity: float,
+    strict: float = STRICT_THRESHOLD,
+    loose: float = LOOSE_THRESHOLD,
+) -> float:
+    """Map a sensitivity in [0, 1] linearly onto a z-score threshold.
+
+    0.0 gives ``strict`` (fewest anomalies), 1.0 gives ``loose``; the default
+    sensitivity of 0.5 gives a threshold of 3 standard deviations.
+    """
+    sensitivity = min(max(sensitivity, 0.0), 1.0)
+    return strict - sensitivity * (strict - loose)
+
+
+def finite_slots(slots: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """``slots`` with events whose value is NaN or infinite untracked (-1).
+
+    Such values are not scored and never reach a series' state, where a
+    single NaN would turn every later mean, variance and score into NaN.
+    """
+    return np.where(np.isfinite(values), slots, -1)
+
+
+def anomaly_score(z: float, threshold: float) -> float:
+    """Squash ``|z|`` into [0, 1), crossing 0.5 exactly at the threshold."""
+    z = abs(z)
+    return z / (z + threshold)
+
+
+@dataclass(frozen=True, slots=True)
+class Detection:
+    """Result of scoring one value against its series."""
+
+    score: float
+    is_anomaly: bool
+    z: float = 0.0  # Deviation from expected, in units of the detector's threshold scale
+    expected: float = 0.0  # EWMA mean or sketch median
+    std: float = 0.0
+    low: float | None = None  # Quantile band, for band-based detectors
+    high: float | None = None
+    path: float | None = None  # Mean isolation depth, for tree-ensemble detectors
+    count: float | None = None  # Events in the series' latest window, for rate detectors
+
+    def explain(self, value: float) -> str:
+        """Human-readable explanation of an anomaly."""
+        if self.count is not None:
+            return (
+                f"{self.count:g} events in the latest window, {self.z:+.1f} deviations "
+                f"from the expected {self.expected:.3g}"
+            )
+        if self.path is not None:
+            return (
+                f"value {value:g} is isolated after {self.path:.1f} splits on average "
+                f"(typical {self.expected:.1f}, isolation score {self.z:.2f})"
+            )
+        if self.low is not None and self.high is not None:
+            return (
+                f"value {value:g} is outside the expected range "
+                f"[{self.low:g}, {self.high:g}] (median {self.expected:g})"
+            )
+        return (
+            f"value {value:g} is {self.z:+.1f} standard deviations from "
+            f"the expected {self.expected:g} (std {self.std:.3g})"
+        )
+
+
+# Returned for values that cannot be scored (warming up, capacity full)
+NOT_SCORED = Detection(score=0.0, is_anomaly=False)
+
+
+@dataclass(frozen=True, slots=True)
+class BatchDetections:
+    """Column form of ``Detection`` for a whole batch, in batch order."""
+
+    score: np.ndarray
+    is_anomaly: np.ndarray
+    z: np.ndarray
+    expected: np.ndarray
+    std: np.ndarray
+    low: np.ndarray | None = None
+    high: np.ndarray | None = None
+    path: np.ndarray | None = None
+    count: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self.score)
+
+    @classmethod
+    def empty(cls, count: int, /, **columns: np.ndarray) -> "BatchDetections":
+        """Unscored detections for ``count`` events.
+
+        Detectors that report ``low``/``high``, ``path`` or ``count``
+        allocate those columns themselves and pass them in, keeping a
+        non-optional reference to fill.
+        """
+        return cls(
+            score=np.zeros(count),
+            is_anomaly=np.zeros(count, dtype=bool),
+            z=np.zeros(count),
+            expected=np.zeros(count),
+            std=np.zeros(count),
+            **columns,
+        )
+
+    def detection(self, i: int) -> Detection:
+        """``Detection`` of event ``i``."""
+        return Detection(
+            score=float(self.score[i]),
+            is_anomaly=bool(self.is_anomaly[i]),
+            z=float(self.z[i]),
+            expected=float(self.expected[i]),
+            std=float(self.std[i]),
+            low=None if self.low is None else float(self.low[i]),
+            high=None if self.high is None else float(self.high[i]),
+            path=None if self.path is None else float(self.path[i]),
+            count=None if self.count is None else float(self.count[i]),
+        )
+
+
+class Detector(Protocol):
+    """A streaming detector keyed by ``(source, event_type)``.
+
+    ``threshold`` is computed once per request from its sensitivity and
+    passed to every ``score`` call of that request.
+    """
+
+    name: str
+
+    def __len__(self) -> int: ...
+
+    @property
+    def nbytes(self) -> int: ...
+
+    def threshold(self, sensitivity: float) -> float: ...
+
+    def score(self, source: str, event_type: str, value: float, threshold: float) -> Detection: ...
+
+    def score_batch(self, batch: FeatureBatch, threshold: float) -> BatchDetections: ...
+
+    def clear(self) -> None: ...
+
+
+@runtime_checkable
+class WindowedDetector(Detector, Protocol):
+    """A ``Detector`` that also reports anomalous windows of events.
+
+    ``observe`` does the work of ``score_batch`` and additionally returns
+    the anomalous windows the batch closed, which are anomalies in their
+    own right rather than properties of any one event. Closing a window
+    costs work over every series, so ``parts`` splits a batch into
+    consecutive parts that each close a bounded number of windows; async
+    callers yield to the event loop between them.
+    """
+
+    def observe(
+        self, batch: FeatureBatch, threshold: float
+    ) -> tuple[BatchDetections, "RateWindows"]: ...
+
+    def parts(self, batch: FeatureBatch) -> list[int]: ...
+
+
+class SeriesIndex:
+    """Assigns dense slot numbers to series keys, up to ``capacity`` series."""
+
+    def __init__(self, capacity: int) -> None:
+        self._capacity = capacity
+        self._slots: dict[SeriesKey, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of series."""
+        return self._capacity
+
+    def get(self, key: SeriesKey) -> int | None:
+        """Slot of an existing series."""
+        return self._slots.get(key)
+
+    def slot(self, key: SeriesKey) -> int | None:
+        """Slot of a series, allocating the next one for new keys (None when full)."""
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = len(self._slots)
+            if slot >= self._capacity:
+                return None
+            self._slots[key] = slot
+        return slot
+
+    def slots(self, keys: list[SeriesKey]) -> np.ndarray:
+        """Slots of many keys, allocating new ones (-1 where the index is full)."""
+        # map() over the bound dict method keeps known keys out of Python code
+        slots = np.fromiter(map(self._slots.get, keys, repeat(-1)), np.int64, len(keys))
+        for i in np.flatnonzero(slots < 0).tolist():
+            slot = self.slot(keys[i])
+            slots[i] = -1 if slot is None else slot
+        return slots
+
+    def keys(self) -> list[SeriesKey]:
+        """Series keys in slot order."""
+        return list(self._slots)
+
+    def clear(self) -> None:
+        """Forget every series."""
+        self._slots.clear()
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size of the index (the dict plus its keys)."""
+        if not self._slots:
+            return sys.getsizeof(self._slots)
+        # Keys are similar in size; sample one instead of walking millions
+        key = next(iter(self._slots))
+        per_key = sys.getsizeof(key) + sum(sys.getsizeof(part) for part in key)
+        return sys.getsizeof(self._slots) + per_key * len(self._slots)
+
+
+class EwmaDetector:
+    """Per-series exponentially weighted mean/variance z-score detector.
+
+    Each value is scored against the series' state before that state is
+    updated with it. Updates use the incremental EWMA variance recurrence
+    with weight ``max(alpha, 1/n)``, so the first observations produce the
+    exact running mean and variance and the estimate then settles into an
+    EWMA with a memory of roughly ``1/alpha`` events. Series are not
+    flagged until they have seen ``warmup`` values. NaN and infinite
+    values are not scored and leave the state untouched.
+
+    Args:
+        alpha: Weight of the newest value (0 < alpha <= 1)
+        warmup: Values a series must see before it can be flagged
+        max_series: Series capacity; events of further series are not scored
+        min_std: Standard deviation floor, so constant series do not divide by zero
+    """
+
+    name = "ewma"
+
+    def __init__(
+        self,
+        alpha: float = 0.05,
+        warmup: int = 30,
+        max_series: int = 1_000_000,
+        min_std: float = 1e-9,
+    ) -> None:
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError(f"alpha must be in (0, 1], got {alpha}")
+        if warmup < 1:
+            raise ValueError(f"warmup must be at least 1, got {warmup}")
+        self._alpha = alpha
+        self._warmup = warmup
+        self._min_std = min_std
+        self._index = SeriesIndex(max_series)
+        self._mean = array("d")
+        self._var = array("d")
+        self._count = array("Q")
+        self._rejected = SERIES_REJECTED.labels(self.name)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the detector's state."""
+        columns = (self._mean, self._var, self._count)
+        return self._index.nbytes + sum(c.buffer_info()[1] * c.itemsize for c in columns)
+
+    def threshold(self, sensitivity: float) -> float:
+        """z-score threshold for a request sensitivity."""
+        return sensitivity_threshold(sensitivity)
+
+    def score(self, source: str, event_type: str, value: float, threshold: float) -> Detection:
+        """Score ``value`` against its series, then fold it into the series' state."""
+        if not math.isfinite(value):
+            return NOT_SCORED
+        slot = self._index.slot((source, event_type))
+        if slot is None:
+            self._rejected.inc()
+            return NOT_SCORED
+        if slot == len(self._count):
+            self._mean.append(0.0)
+            self._var.append(0.0)
+            self._count.append(0)
+
+        n = self._count[slot]
+        mean = self._mean[slot]
+        var = self._var[slot]
+
+        detection = NOT_SCORED
+        if n >= self._warmup:
+            std = math.sqrt(var)
+            z = (value - mean) / max(std, self._min_std)
+            detection = Detection(
+                score=anomaly_score(z, threshold),
+                is_anomaly=abs(z) > threshold,
+                z=z,
+                expected=mean,
+                std=std,
+            )
+
+        n += 1
+        weight = max(self._alpha, 1.0 / n)
+        diff = value - mean
+        increment = weight * diff
+        self._count[slot] = n
+        self._mean[slot] = mean + increment
+        self._var[slot] = (1.0 - weight) * (var + diff * increment)
+        return detection
+
+    def score_batch(self, batch: FeatureBatch, threshold: float) -> BatchDetections:
+        """Score and fold in a whole batch with vectorized operations.
+
+        Equivalent to calling ``score`` for each event in (series, timestamp)
+        order. Events are grouped into per-series runs; within a run the
+        mean and second moment follow the affine recurrences
+        ``m' = (1 - w) m + w x``, which are evaluated for every event at once
+        with a segmented parallel prefix scan (log2 of the longest run
+        vectorized steps). Values are shifted by each series' prior mean so
+        the variance ``E[x^2] - m^2`` does not cancel catastrophically.
+        """
+        result = BatchDetections.empty(len(batch))
+        slots = self._index.slots(batch.keys)
+        rejected = int(np.count_nonzero(slots < 0))
+        if rejected:
+            self._rejected.inc(rejected)
+        slots = finite_slots(slots, batch.values)
+        runs = segment(slots, batch.timestamps)
+        if not len(runs.order):
+            return result
+        self._grow(len(self._index))
+
+        mean = np.frombuffer(self._mean, dtype=np.float64)
+        var = np.frombuffer(self._var, dtype=np.float64)
+        count = np.frombuffer(self._count, dtype=np.uint64)
+        series, run, rank = runs.series, runs.segment, runs.rank
+        x = batch.values[runs.order]
+
+        # Per run: prior count, shift (prior mean, or the first value of a
+        # new series, whose weight of 1 makes it the starting mean) and variance
+        prior = count[series].astype(np.float64)
+        shift = np.where(prior > 0, mean[series], x[runs.starts])
+        prior_var = var[series]
+
+        seen = prior[run] + rank  # Values each event's series saw before it
+        weight = np.maximum(self._alpha, 1.0 / (seen + 1.0))
+        y = x - shift[run]
+        decay = 1.0 - weight
+        first = weight * y
+        second = first * y
+        _segmented_affine_scan(rank, decay, first, second)
+
+        # State before each event is the scan result of the previous event
+        has_prev = rank > 0
+        m = np.zeros_like(y)
+        m[1:] = first[:-1]
+        m = np.where(has_prev, m, 0.0)
+        m2 = np.empty_like(y)
+        m2[1:] = decay[:-1] * prior_var[run[1:]] + second[:-1]
+        m2 = np.where(has_prev, m2, prior_var[run])
+        std = np.sqrt(np.maximum(m2 - m * m, 0.0))
+        z = (y - m) / np.maximum(std, self._min_std)
+
+        scored = seen >= self._warmup
+        abs_z = np.abs(z)
+        order = runs.order
+        result.z[order] = np.where(scored, z, 0.0)
+        result.score[order] = np.where(scored, abs_z / (abs_z + threshold), 0.0)
+        result.is_anomaly[order] = scored & (abs_z > threshold)
+        result.expected[order] = np.where(scored, m + shift[run], 0.0)
+        result.std[order] = np.where(scored, std, 0.0)
+
+        ends = runs.ends
+        mean[series] = shift + first[ends]
+        var[series] = np.maximum(decay[ends] * prior_var + second[ends] - first[ends] ** 2, 0.0)
+        count[series] += runs.lengths.astype(np.uint64)
+        return result
+
+    def _grow(self, series: int) -> None:
+        """Extend the state columns to ``series`` slots."""
+        missing = series - len(self._count)
+        if missing > 0:
+            zeros = bytes(8 * missing)
+            self._mean.frombytes(zeros)
+            self._var.frombytes(zeros)
+            self._count.frombytes(zeros)
+
+    def state(self, source: str, event_type: str) -> tuple[int, float, float] | None:
+        """``(count, mean, std)`` of a series, or None if it is unknown."""
+        slot = self._index.get((source, event_type))
+        if slot is None:
+            return None
+        return self._count[slot], self._mean[slot], math.sqrt(self._var[slot])
+
+    def clear(self) -> None:
+        """Forget every series."""
+        self._index.clear()
+        del self._mean[:]
+        del self._var[:]
+        del self._count[:]
+
+
+def _segmented_affine_scan(rank: np.ndarray, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> None:
+    """Compose the maps ``v -> a v + b`` (and ``a v + c``) along each run, in place.
+
+    Afterwards ``(a[i], b[i], c[i])`` is the composition of every map from
+    the start of element ``i``'s run up to and including ``i``. Uses the
+    Hillis-Steele doubling scan, restricted to partners in the same run
+    (``rank >= step``); fancy indexing reads a copy, so every step sees the
+    previous step's values.
+    """
+    step = 1
+    longest = int(rank.max()) if len(rank) else 0
+    while step <= longest:
+        index = np.flatnonzero(rank >= step)
+        partner = index - step
+        a_index = a[index]
+        b[index] += a_index * b[partner]
+        c[index] += a_index * c[partner]
+        a[index] = a_index * a[partner]
+        step *= 2
+
+
+def sensitivity_tail(
+    sensitivity: float,
+    strict: float = STRICT_TAIL,
+    loose: float = LOOSE_TAIL,
+) -> float:
+    """Map a sensitivity in [0, 1] onto the probability mass outside each quantile band edge.
+
+    Interpolates geometrically from ``strict`` at 0.0 to ``loose`` at 1.0;
+    the default sensitivity of 0.5 flags values beyond roughly the 0.2nd
+    and 99.8th percentiles.
+    """
+    sensitivity = min(max(sensitivity, 0.0), 1.0)
+    return strict * (loose / strict) ** sensitivity
+
+
+class QuantileDetector:
+    """Per-series quantile-band detector backed by DDSketches.
+
+    Each series keeps a ``DDSketch`` of its values. A value is flagged when
+    it falls outside the band between the ``tail`` and ``1 - tail``
+    quantiles of its series (``tail`` comes from the request sensitivity);
+    its deviation is measured from the median in units of the band's half
+    width, so the score crosses 0.5 at the band edge. Unlike mean/variance,
+    quantiles are not dragged around by a heavy tail.
+
+    NaN and infinite values are not scored or added to the sketches.
+
+    Bands are cached per series and recomputed every ``refresh`` values
+    (or when the tail changes), keeping the amortized cost per event
+    constant. When a series' sketch reaches ``2 * window`` values its
+    counts are halved, so bands follow roughly the last ``window`` to
+    ``2 * window`` values (``window=0`` keeps all history).
+
+    Sketches are mergeable and serializable: ``merge`` combines detectors
+    from different worker processes and ``checkpoint``/``restore`` move
+    the whole state through bytes.
+
+    Args:
+        relative_accuracy: Relative error of the sketches' quantiles
+        max_bins: Bins per sign per series (bounds memory per series)
+        warmup: Values a series must see before it can be flagged
+        max_series: Series capacity; events of further series are not scored
+        window: Values after which a series' history is halved (0 disables)
+        refresh: Values between band recomputations
+    """
+
+    name = "quantile"
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        max_bins: int = 512,
+        warmup: int = 100,
+        max_series: int = 1_000_000,
+        window: int = 10_000,
+        refresh: int = 32,
+    ) -> None:
+        if warmup < 1:
+            raise ValueError(f"warmup must be at least 1, got {warmup}")
+        # Validates relative_accuracy and max_bins
+        DDSketch(relative_accuracy, max_bins)
+        self._relative_accuracy = relative_accuracy
+        self._max_bins = max_bins
+        self._warmup = warmup
+        self._window = window
+        self._refresh = refresh
+        self._index = SeriesIndex(max_series)
+        self._sketches: list[DDSketch] = []
+        self._tail = array("d")
+        self._low = array("d")
+        self._median = array("d")
+        self._high = array("d")
+        self._since = array("I")
+        self._rejected = SERIES_REJECTED.labels(self.name)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the detector's state.
+
+        Sketch sizes are estimated from a sample of at most 100 series.
+        """
+        sketches = self._sketches
+        columns = (self._tail, self._low, self._median, self._high, self._since)
+        total = self._index.nbytes + sys.getsizeof(sketches)
+        total += sum(c.buffer_info()[1] * c.itemsize for c in columns)
+        if sketches:
+            step = max(1, len(sketches) // 100)
+            sample = sketches[::step]
+            total += sum(sketch.nbytes for sketch in sample) * len(sketches) // len(sample)
+        return total
+
+    def threshold(self, sensitivity: float) -> float:
+        """Tail probability for a request sensitivity."""
+        return sensitivity_tail(sensitivity)
+
+    def _slot(self, source: str, event_type: str) -> int | None:
+        slot = self._index.slot((source, event_type))
+        if slot is None:
+            self._rejected.inc()
+            return None
+        self._grow(slot + 1)
+        return slot
+
+    def score(self, source: str, event_type: str, value: float, threshold: float) -> Detection:
+        """Score ``value`` against its series' quantile band, then add it to the sketch."""
+        if not math.isfinite(value):
+            return NOT_SCORED
+        slot = self._slot(source, event_type)
+        if slot is None:
+            return NOT_SCORED
+
+        detection = NOT_SCORED
+        if self._band(slot, threshold):
+            low, median, high = self._low[slot], self._median[slot], self._high[slot]
+            # Widths within the sketch's resolution are not meaningful
+            floor = max(abs(median) * self._relative_accuracy, MIN_VALUE)
+            if value >= median:
+                deviation = (value - median) / max(high - median, floor)
+            else:
+                deviation = (value - median) / max(median - low, floor)
+            detection = Detection(
+                score=anomaly_score(deviation, 1.0),
+                is_anomaly=abs(deviation) > 1.0,
+                z=deviation,
+                expected=median,
+                low=low,
+                high=high,
+            )
+
+        self._sketches[slot].add(value)
+        self._added(slot, 1)
+        return detection
+
+    def score_batch(self, batch: FeatureBatch, threshold: float) -> BatchDetections:
+        """Score a whole batch against each series' band, then add it to the sketches.
+
+        Every event is scored against the band its series had at the start
+        of the batch (bands are refreshed at most every ``refresh`` values
+        anyway), so a series only becomes eligible once it had ``warmup``
+        values before the batch. Deviations are computed with vectorized
+        operations; the per-series work is one band refresh and one
+        vectorized sketch update per series in the batch.
+        """
+        band_low = np.full(len(batch), np.nan)
+        band_high = np.full(len(batch), np.nan)
+        result = BatchDetections.empty(len(batch), low=band_low, high=band_high)
+        slots = self._index.slots(batch.keys)
+        rejected = int(np.count_nonzero(slots < 0))
+        if rejected:
+            self._rejected.inc(rejected)
+        slots = finite_slots(slots, batch.values)
+        runs = segment(slots, batch.timestamps)
+        if not len(runs.order):
+            return result
+        self._grow(len(self._index))
+
+        series = runs.series.tolist()
+        warm = np.fromiter(
+            (self._band(slot, threshold) for slot in series), dtype=bool, count=len(series)
+        )
+        low = np.frombuffer(self._low, dtype=np.float64)[runs.series]
+        median = np.frombuffer(self._median, dtype=np.float64)[runs.series]
+        high = np.frombuffer(self._high, dtype=np.float64)[runs.series]
+
+        run = runs.segment
+        x = batch.values[runs.order]
+        scored = warm[run]
+        event_low, event_median, event_high = low[run], median[run], high[run]
+        floor = np.maximum(np.abs(event_median) * self._relative_accuracy, MIN_VALUE)
+        with np.errstate(invalid="ignore"):
+            above = x >= event_median
+            width = np.where(above, event_high - event_median, event_median - event_low)
+            deviation = (x - event_median) / np.maximum(width, floor)
+        deviation = np.where(scored, deviation, 0.0)
+        abs_deviation = np.abs(deviation)
+
+        order = runs.order
+        result.z[order] = deviation
+        result.score[order] = abs_deviation / (abs_deviation + 1.0)
+        result.is_anomaly[order] = scored & (abs_deviation > 1.0)
+        result.expected[order] = np.where(scored, event_median, 0.0)
+        band_low[order] = np.where(scored, event_low, np.nan)
+        band_high[order] = np.where(scored, event_high, np.nan)
+
+        for slot, start, length in zip(
+            series, runs.starts.tolist(), runs.lengths.tolist(), strict=True
+        ):
+            self._sketches[slot].add_many(x[start : start + length])
+            self._added(slot, length)
+        return result
+
+    def _grow(self, series: int) -> None:
+        """Create sketches and band columns up to ``series`` slots."""
+        while len(self._sketches) < series:
+            self._sketches.append(DDSketch(self._relative_accuracy, self._max_bins))
+            for column in (self._tail, self._low, self._median, self._high):
+                column.append(math.nan)
+            self._since.append(self._refresh)
+
+    def _band(self, slot: int, tail: float) -> bool:
+        """Refresh a series' cached band if stale; False while it is warming up."""
+        sketch = self._sketches[slot]
+        if sketch.count < self._warmup:
+            return False
+        if self._since[slot] >= self._refresh or self._tail[slot] != tail:
+            low, median, high = sketch.quantiles((tail, 0.5, 1.0 - tail))
+            self._tail[slot] = tail
+            self._low[slot] = low
+            self._median[slot] = median
+            self._high[slot] = high
+            self._since[slot] = 0
+        return True
+
+    def _added(self, slot: int, count: int) -> None:
+        """Account for ``count`` values added to a sketch, aging it past the window."""
+        self._since[slot] = min(self._since[slot] + count, self._refresh)
+        sketch = self._sketches[slot]
+        if self._window and sketch.count >= 2 * self._window:
+            sketch.scale(0.5)
+            self._since[slot] = self._refresh
+
+    def sketch(self, source: str, event_type: str) -> DDSketch | None:
+        """Sketch of a series, or None if it is unknown."""
+        slot = self._index.get((source, event_type))
+        return None if slot is None else self._sketches[slot]
+
+    def merge(self, other: "QuantileDetector") -> None:
+        """Merge another detector's sketches into this one, series by series."""
+        for key, sketch in zip(other._index.keys(), other._sketches, strict=True):
+            self._merge_sketch(key, sketch)
+
+    def _merge_sketch(self, key: SeriesKey, sketch: DDSketch) -> None:
+        slot = self._slot(*key)
+        if slot is not None:
+            self._sketches[slot].merge(sketch)
+            self._since[slot] = self._refresh
+
+    def checkpoint(self) -> bytes:
+        """Serialize every series' key and sketch (see ``restore``)."""
+        keys = self._index.keys()
+        parts = [_CHECKPOINT_HEADER.pack(_CHECKPOINT_MAGIC, _CHECKPOINT_VERSION, len(keys))]
+        for (source, event_type), sketch in zip(keys, self._sketches, strict=True):
+            source_bytes = source.encode()
+            event_type_bytes = event_type.encode()
+            parts.append(_KEY_HEADER.pack(len(source_bytes), len(event_type_bytes)))
+            parts.append(source_bytes)
+            parts.append(event_type_bytes)
+            parts.append(sketch.to_bytes())
+        return b"".join(parts)
+
+    def restore(self, data: bytes) -> None:
+        """Merge a ``checkpoint`` into this detector (into an empty one to restore it)."""
+        view = memoryview(data)
+        if len(view) < _CHECKPOINT_HEADER.size:
+            raise ValueError("Truncated checkpoint")
+        magic, version, series = _CHECKPOINT_HEADER.unpack_from(view)
+        if magic != _CHECKPOINT_MAGIC or version != _CHECKPOINT_VERSION:
+            raise ValueError("Not a quantile detector checkpoint (bad magic or version)")
+
+        offset = _CHECKPOINT_HEADER.size
+        for _ in range(series):
+            source_len, event_type_len = _KEY_HEADER.unpack_from(view, offset)
+            offset += _KEY_HEADER.size
+            source = bytes(view[offset : offset + source_len]).decode()
+            offset += source_len
+            event_type = bytes(view[offset : offset + event_type_len]).decode()
+            offset += event_type_len
+            sketch, size = read_sketch(view[offset:])
+            offset += size
+            self._merge_sketch((source, event_type), sketch)
+
+    def clear(self) -> None:
+        """Forget every series."""
+        self._index.clear()
+        self._sketches.clear()
+        for column in (self._tail, self._low, self._median, self._high, self._since):
+            del column[:]
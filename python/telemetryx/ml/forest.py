@@ -0,0 +1,414 @@
+"""Isolation forest: batch outlier scoring over flattened, array-based trees.
+
+An isolation forest separates points with random axis-aligned splits.
+Outliers are isolated after few splits, so a short average path length
+across the trees means anomalous. The score of ``x`` is
+``2 ** (-E[h(x)] / c(psi))``, where ``c(psi)`` is the average path length
+of an unsuccessful search in a binary search tree over the ``psi``
+samples each tree was grown from: about 0.5 for typical points, close to
+1.0 for outliers.
+
+Trees are not Python objects. Every node of every tree lives in one set
+of flat arrays (``feature``, ``threshold``, ``left``, ``right``,
+``depth``, ``size``) and ``roots`` holds each tree's first node.
+Inference walks all (event, tree) pairs together, one tree level per
+vectorized step (leaves loop back to themselves, so no masking is
+needed), so a batch costs ``max_depth`` rounds of NumPy gathers instead
+of events x trees recursive calls. The packed node table and leaf path
+lengths the walk reads are stored next to the node arrays, so served
+forests walk memory-mapped pages (see ``telemetryx.ml.registry``) shared
+by every worker instead of per-process copies.
+
+Forests are trained offline (``IsolationForest.fit``, usually through
+``python -m telemetryx.ml train`` over events stored in PostgreSQL). A
+sample of training scores is stored with the forest, and a request's
+sensitivity maps to the score at the same tail probability the quantile
+detector uses.
+
+Example:
+    features = ["value", "hour_sin", "hour_cos"]
+    matrix = batch.matrix(features)
+    forest = IsolationForest.fit(matrix, trees=100, sample_size=256)
+    save_isolation_forest("models", "checkout", forest, features, forest.scores(matrix))
+    detections = (await registry.get("checkout")).score_batch(batch, threshold)
+"""
+
+import math
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from telemetryx.ml.anomaly import NOT_SCORED, BatchDetections, Detection, sensitivity_tail
+from telemetryx.ml.features import FeatureBatch
+from telemetryx.ml.registry import ModelArtifact, register_model_kind, save_model
+
+KIND = "isolation_forest"
+
+EULER_GAMMA = 0.5772156649015329
+
+# Training scores stored for threshold calibration
+CALIBRATION_SIZE = 10_000
+
+# Rows walked through the trees together: small enough that the (row, tree)
+# pairs of one level stay in cache (measured fastest at 128-256 rows)
+_WALK_ROWS = 256
+
+_NODE = np.dtype([("threshold", np.float64), ("feature", np.int32), ("left", np.int32)])
+
+
+def average_path_length(n: np.ndarray | float) -> np.ndarray:
+    """``c(n)``: mean depth of an unsuccessful search in a BST of ``n`` points."""
+    n = np.asarray(n, dtype=np.float64)
+    result = np.zeros_like(n)
+    large = n > 2
+    m = n[large] - 1.0
+    result[large] = 2.0 * (np.log(m) + EULER_GAMMA) - 2.0 * m / n[large]
+    result[n == 2] = 1.0
+    return result
+
+
+class IsolationForest:
+    """Tree ensemble stored as flat node arrays.
+
+    Node arrays (one entry per node of every tree):
+        feature: int32 split feature, -1 at leaves
+        threshold: float64; rows with ``x[feature] < threshold`` go left
+        left, right: int32 child node indices, -1 at leaves (children
+            are allocated in pairs, so ``right == left + 1``)
+        depth: int32 depth of the node (roots are 0)
+        size: int32 training samples that reached the node
+    plus ``roots`` (int32 first node of each tree) and ``sample_size``,
+    the samples each tree was grown from.
+
+    Inference arrays (derived from the node arrays when not given):
+        table: ``_NODE`` records (threshold, feature, left) in which
+            leaves loop back to themselves
+        leaf_path: float64 depth plus expected remaining depth of each node
+    """
+
+    ARRAYS = ("feature", "threshold", "left", "right", "depth", "size", "roots")
+    INFERENCE_ARRAYS = ("table", "leaf_path")
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        depth: np.ndarray,
+        size: np.ndarray,
+        roots: np.ndarray,
+        sample_size: int,
+        table: np.ndarray | None = None,
+        leaf_path: np.ndarray | None = None,
+    ) -> None:
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.depth = depth
+        self.size = size
+        self.roots = roots
+        self.sample_size = sample_size
+        internal = feature >= 0
+        if not np.array_equal(right[internal], left[internal] + 1):
+            raise ValueError("Children must be allocated in pairs (right == left + 1)")
+        nodes = len(feature)
+        if table is None:
+            # Leaves loop back to themselves (x >= inf is never true), so
+            # every walk can run the same number of levels unmasked, and
+            # one take() per level fetches a node's whole split
+            table = np.empty(nodes, dtype=_NODE)
+            table["threshold"] = np.where(internal, threshold, np.inf)
+            table["feature"] = np.where(internal, feature, 0)
+            table["left"] = np.where(internal, left, np.arange(nodes))
+        if table.dtype != _NODE or len(table) != nodes:
+            raise ValueError(f"table must hold {nodes} {_NODE} records")
+        if leaf_path is None:
+            # Expected remaining depth below each leaf, from the samples it held
+            leaf_path = depth + average_path_length(size)
+        if len(leaf_path) != nodes:
+            raise ValueError(f"leaf_path must hold {nodes} path lengths")
+        self.table = table
+        self.leaf_path = leaf_path
+        self._levels = int(depth.max()) if nodes else 0
+        self._normalizer = max(float(average_path_length(sample_size)), 1.0)
+
+    def __len__(self) -> int:
+        """Number of trees."""
+        return len(self.roots)
+
+    @property
+    def nodes(self) -> int:
+        """Nodes across all trees."""
+        return len(self.feature)
+
+    @property
+    def features(self) -> int:
+        """Columns the forest splits on (one past the highest feature index)."""
+        return int(self.feature.max()) + 1 if self.nodes else 0
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the node and inference arrays."""
+        return sum(array.nbytes for array in self.arrays().values())
+
+    @property
+    def expected_path(self) -> float:
+        """Average path length of a typical point, ``c(sample_size)``."""
+        return self._normalizer
+
+    @classmethod
+    def fit(
+        cls,
+        x: np.ndarray,
+        trees: int = 100,
+        sample_size: int = 256,
+        seed: int = 0,
+    ) -> "IsolationForest":
+        """Grow ``trees`` trees, each from ``sample_size`` rows of ``x`` drawn at random.
+
+        Rows with non-finite values are ignored. Trees stop splitting at
+        depth ``ceil(log2(sample_size))``, the average depth of a BST of
+        that size; deeper paths only separate normal points from each other.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if x.ndim != 2:
+            raise ValueError(f"x must be a 2-D (rows, features) matrix, got shape {x.shape}")
+        if trees < 1:
+            raise ValueError(f"trees must be at least 1, got {trees}")
+        x = x[np.isfinite(x).all(axis=1)]
+        if not len(x):
+            raise ValueError("x has no rows with finite values")
+
+        rng = np.random.default_rng(seed)
+        psi = min(sample_size, len(x))
+        max_depth = math.ceil(math.log2(max(psi, 2)))
+        feature: list[int] = []
+        threshold: list[float] = []
+        left: list[int] = []
+        right: list[int] = []
+        depth: list[int] = []
+        size: list[int] = []
+        roots: list[int] = []
+
+        def add_node(node_depth: int, node_size: int) -> int:
+            feature.append(-1)
+            threshold.append(math.nan)
+            left.append(-1)
+            right.append(-1)
+            depth.append(node_depth)
+            size.append(node_size)
+            return len(feature) - 1
+
+        for _ in range(trees):
+            sample = x[rng.choice(len(x), psi, replace=False)]
+            root = add_node(0, psi)
+            roots.append(root)
+            stack = [(root, sample)]
+            while stack:
+                node, rows = stack.pop()
+                if depth[node] >= max_depth or len(rows) <= 1:
+                    continue
+                low = rows.min(axis=0)
+                high = rows.max(axis=0)
+                splittable = np.flatnonzero(high > low)
+                if not len(splittable):
+                    continue
+                column = int(rng.choice(splittable))
+                # uniform() draws from [low, high): keep at least one row on each side
+                split = max(
+                    float(rng.uniform(low[column], high[column])),
+                    float(np.nextafter(low[column], high[column])),
+                )
+                goes_left = rows[:, column] < split
+                feature[node] = column
+                threshold[node] = split
+                left_rows, right_rows = rows[goes_left], rows[~goes_left]
+                left[node] = add_node(depth[node] + 1, len(left_rows))
+                right[node] = add_node(depth[node] + 1, len(right_rows))
+                stack.append((left[node], left_rows))
+                stack.append((right[node], right_rows))
+
+        return cls(
+            feature=np.array(feature, dtype=np.int32),
+            threshold=np.array(threshold, dtype=np.float64),
+            left=np.array(left, dtype=np.int32),
+            right=np.array(right, dtype=np.int32),
+            depth=np.array(depth, dtype=np.int32),
+            size=np.array(size, dtype=np.int32),
+            roots=np.array(roots, dtype=np.int32),
+            sample_size=psi,
+        )
+
+    def path_lengths(self, x: np.ndarray) -> np.ndarray:
+        """Mean path length of each row of ``x`` over all trees.
+
+        Walks every (row, tree) pair one level at a time, ``_WALK_ROWS``
+        rows at a time; NaN features go left.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        result = np.empty(len(x))
+        for start in range(0, len(x), _WALK_ROWS):
+            result[start : start + _WALK_ROWS] = self._walk(x[start : start + _WALK_ROWS])
+        return result
+
+    def _walk(self, x: np.ndarray) -> np.ndarray:
+        rows, columns = x.shape
+        trees = len(self.roots)
+        flat = np.ascontiguousarray(x).ravel()
+        table = self.table
+        node = np.tile(self.roots, rows)  # Pair i * trees + t: row i in tree t
+        offset = np.repeat(np.arange(rows, dtype=np.int32) * columns, trees)
+        for _ in range(self._levels):
+            split = table.take(node)
+            goes_right = flat.take(offset + split["feature"]) >= split["threshold"]
+            node = split["left"] + goes_right
+        return self.leaf_path.take(node).reshape(rows, trees).mean(axis=1)
+
+    def scores(self, x: np.ndarray) -> np.ndarray:
+        """Anomaly score of each row: near 0.5 for typical rows, toward 1.0 for outliers."""
+        return np.exp2(-self.path_lengths(x) / self._normalizer)
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        """Node and inference arrays by name (what ``save_isolation_forest`` stores)."""
+        return {name: getattr(self, name) for name in self.ARRAYS + self.INFERENCE_ARRAYS}
+
+    @classmethod
+    def from_artifact(cls, artifact: ModelArtifact) -> "IsolationForest":
+        """Forest walking a stored model's memory-mapped arrays.
+
+        Versions stored without the inference arrays derive them on load.
+        """
+        arrays = {name: artifact.array(name) for name in cls.ARRAYS}
+        for name in cls.INFERENCE_ARRAYS:
+            if name in artifact.arrays:
+                arrays[name] = artifact.array(name)
+        return cls(**arrays, sample_size=int(artifact.params["sample_size"]))
+
+
+class IsolationForestDetector:
+    """``Detector`` scoring events with a stored isolation forest.
+
+    Stateless: events are scored from the forest alone, so the same model
+    can serve any number of requests concurrently. Events are turned into
+    the feature matrix the forest was trained on; a row is flagged when its
+    score exceeds the training score at quantile ``1 - tail``, with the
+    tail from the request sensitivity (see ``sensitivity_tail``).
+
+    Args:
+        forest: Trained forest
+        features: ``FEATURES`` names, in the forest's column order
+        calibration: Sorted sample of training scores
+    """
+
+    name = KIND
+
+    def __init__(
+        self,
+        forest: IsolationForest,
+        features: Sequence[str],
+        calibration: np.ndarray,
+    ) -> None:
+        if not len(calibration):
+            raise ValueError("calibration must not be empty")
+        if forest.features > len(features):
+            raise ValueError(
+                f"Forest splits on {forest.features} features, got {len(features)} names"
+            )
+        self._forest = forest
+        self._features = list(features)
+        self._calibration = calibration
+
+    @classmethod
+    def from_artifact(cls, artifact: ModelArtifact) -> "IsolationForestDetector":
+        """Detector over a stored ``isolation_forest`` model."""
+        return cls(
+            IsolationForest.from_artifact(artifact),
+            artifact.params["features"],
+            artifact.array("calibration"),
+        )
+
+    def __len__(self) -> int:
+        """Series tracked (none: the model keeps no per-series state)."""
+        return 0
+
+    @property
+    def forest(self) -> IsolationForest:
+        return self._forest
+
+    @property
+    def features(self) -> list[str]:
+        return list(self._features)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the model arrays (memory-mapped when loaded from a stored model)."""
+        return self._forest.nbytes + self._calibration.nbytes
+
+    def threshold(self, sensitivity: float) -> float:
+        """Score threshold: the training score at quantile ``1 - tail``."""
+        calibration = self._calibration
+        rank = (1.0 - sensitivity_tail(sensitivity)) * (len(calibration) - 1)
+        return float(calibration[min(math.ceil(rank), len(calibration) - 1)])
+
+    def score(self, source: str, event_type: str, value: float, threshold: float) -> Detection:
+        """Score one value (time features see the Unix epoch; prefer ``score_batch``)."""
+        detections = self.score_batch(
+            FeatureBatch.from_arrays([value], [(source, event_type)]), threshold
+        )
+        return detections.detection(0) if len(detections) else NOT_SCORED
+
+    def score_batch(self, batch: FeatureBatch, threshold: float) -> BatchDetections:
+        """Score a batch with one level-wise walk over all trees."""
+        paths = np.zeros(len(batch))
+        result = BatchDetections.empty(len(batch), path=paths)
+        if not len(batch):
+            return result
+        path = self._forest.path_lengths(batch.matrix(self._features))
+        score = np.exp2(-path / self._forest.expected_path)
+        paths[:] = path
+        result.z[:] = score
+        result.score[:] = score / (score + threshold)
+        result.is_anomaly[:] = score > threshold
+        result.expected[:] = self._forest.expected_path
+        return result
+
+    def clear(self) -> None:
+        """Nothing to forget (the model is immutable)."""
+
+
+def save_isolation_forest(
+    root: str | Path,
+    name: str,
+    forest: IsolationForest,
+    features: Sequence[str],
+    training_scores: np.ndarray,
+    params: dict[str, Any] | None = None,
+    seed: int = 0,
+) -> int:
+    """Store a forest as a new version of model ``name`` and return the version.
+
+    At most ``CALIBRATION_SIZE`` training scores are kept (sorted) for
+    threshold calibration.
+    """
+    if len(training_scores) > CALIBRATION_SIZE:
+        rng = np.random.default_rng(seed)
+        training_scores = rng.choice(training_scores, CALIBRATION_SIZE, replace=False)
+    return save_model(
+        root,
+        name,
+        KIND,
+        {**forest.arrays(), "calibration": np.sort(training_scores)},
+        {
+            **(params or {}),
+            "features": list(features),
+            "sample_size": forest.sample_size,
+            "trees": len(forest),
+        },
+    )
+
+
+register_model_kind(KIND, IsolationForestDetector.from_artifact)
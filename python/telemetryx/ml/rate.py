@@ -0,0 +1,507 @@
+"""Event-rate anomaly detection over tumbling windows.
+
+Some incidents show up in how many events arrive rather than in their
+values: ``page_view`` events drying up, ``error`` events spiking.
+``RateDetector`` counts each series' events in tumbling windows of
+``window`` milliseconds of event time (``Event.timestamp``) and compares
+every closed window's count with the rate the series usually has at that
+time of day.
+
+Windows close on an event-time watermark: the latest timestamp the
+detector has seen. A window closes once the watermark is ``lateness`` past
+its end, so events up to ``lateness`` late are still counted; later ones
+are dropped and counted in ``telemetryx_rate_late_events_total``. Events
+stamped more than ``max_skew`` ahead of the wall clock are dropped too
+(counted in ``telemetryx_rate_future_events_total``): one bad clock would
+otherwise push the watermark into the future and every later event would
+be late. Only
+the windows still open are kept, in a ring of ``ceil(lateness / window) +
+1`` counters per series. A window closes for every series at once, so
+series that stopped sending entirely are scored too (their count is 0).
+Windows in which no series saw any event are skipped: an empty pipeline
+says nothing about any one series.
+
+The expected count is a per-series Poisson rate for each season bucket
+(hourly over a day by default), learned as a running mean of the bucket's
+window counts that becomes an EWMA with weight ``alpha``; until a bucket
+has seen ``warmup`` windows, the series' rate over all windows stands in.
+Counts are compared on the square-root scale, where Poisson noise has
+unit variance:
+
+    z = 2 * (sqrt(count) - sqrt(rate)) / sqrt(dispersion)
+
+``dispersion`` is an EWMA of the squared unscaled deviation (at least 1),
+so series noisier than Poisson (most real traffic) widen their own band.
+Rates learn from counts clipped to 3 deviations of the expected count, so
+a five-minute outage does not teach the detector that silence is normal
+(the inflated dispersion still lets a lasting change in volume be
+absorbed within a handful of windows). A series' first window is partial
+and is neither scored nor learned from.
+
+Each event's detection reports its series' latest closed window, and
+``observe`` additionally returns every anomalous window closed while
+processing the batch (including series that sent nothing in it), all in
+one pass over the batch.
+
+Closing a window is vectorized work over every series (tens of
+milliseconds at 100k series), and a backfill batch can span hours of
+event time. ``parts`` splits a batch into consecutive parts whose
+watermark advances by at most ``max_windows`` windows each, so a caller
+on the event loop can observe them one at a time and yield in between.
+
+Example:
+    detector = RateDetector(window=60_000, lateness=60_000)
+    detections, windows = detector.observe(FeatureBatch.from_events(events), 3.0)
+    for i in range(len(windows)):
+        print(windows.explain(i))
+"""
+
+import math
+import time
+from array import array
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from telemetryx.core import metrics
+from telemetryx.ml.anomaly import (
+    SERIES_REJECTED,
+    BatchDetections,
+    Detection,
+    SeriesIndex,
+    sensitivity_threshold,
+)
+from telemetryx.ml.features import FeatureBatch, SeriesKey
+
+RATE_LATE_EVENTS = metrics.counter(
+    "telemetryx_rate_late_events_total",
+    "Events not counted by the rate detector because their window had closed",
+)
+RATE_FUTURE_EVENTS = metrics.counter(
+    "telemetryx_rate_future_events_total",
+    "Events not counted by the rate detector because they were too far ahead of the clock",
+)
+
+DAY_MS = 86_400_000
+
+# Season-bucket window counts saturate here (uint16)
+_MAX_FILLED = 65_535
+# Windows learn from counts clipped to this many deviations from the expected count
+_CLIP = 3.0
+# Born window of slots that have no counted event yet
+_UNBORN = 2**62
+# Timestamp of events that cannot move the watermark
+_NO_TIME = np.iinfo(np.int64).min
+
+
+@dataclass(frozen=True, slots=True)
+class RateWindows:
+    """Anomalous windows closed while observing a batch, in closing order."""
+
+    keys: list[SeriesKey]
+    start: np.ndarray  # int64 window start (Unix ms)
+    end: np.ndarray  # int64 window end (exclusive)
+    count: np.ndarray  # int64 events counted in the window
+    expected: np.ndarray  # Expected count
+    z: np.ndarray  # Deviation on the square-root scale
+    score: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def empty(cls) -> "RateWindows":
+        """No windows."""
+        empty = np.empty(0)
+        ms = np.empty(0, dtype=np.int64)
+        return cls([], ms, ms, ms, empty, empty, empty)
+
+    def explain(self, i: int) -> str:
+        """Human-readable explanation of window ``i``."""
+        source, event_type = self.keys[i]
+        return (
+            f"{self.count[i]} {event_type} events from {source} in the window starting "
+            f"{self.start[i]}, {self.z[i]:+.1f} deviations from the expected "
+            f"{self.expected[i]:.3g}"
+        )
+
+
+class RateDetector:
+    """Per-series event-count detector over tumbling event-time windows.
+
+    Args:
+        window: Window length in milliseconds
+        lateness: How late (behind the latest timestamp seen) events may arrive
+        period: Length of the seasonal cycle in milliseconds
+        buckets: Season buckets per period (each a whole number of windows)
+        alpha: Weight of the newest window count in each bucket's rate
+        warmup: Windows a season bucket must see before its series can be flagged
+        max_series: Series capacity; events of further series are not counted
+        max_skew: How far ahead of ``clock`` event timestamps may be, in
+            milliseconds (0 for no limit)
+        max_windows: Windows the watermark may advance per part of ``parts``
+        clock: Wall-clock time in seconds
+    """
+
+    name = "rate"
+
+    def __init__(
+        self,
+        window: int = 60_000,
+        lateness: int = 60_000,
+        period: int = DAY_MS,
+        buckets: int = 24,
+        alpha: float = 0.1,
+        warmup: int = 10,
+        max_series: int = 1_000_000,
+        max_skew: int = 300_000,
+        max_windows: int = 4,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if window < 1 or lateness < 0:
+            raise ValueError(f"window must be positive and lateness non-negative, got {window}")
+        if buckets < 1 or period % buckets or period // buckets % window:
+            raise ValueError(
+                f"period ({period} ms) must split into {buckets} buckets of whole "
+                f"{window} ms windows"
+            )
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError(f"alpha must be in (0, 1], got {alpha}")
+        if warmup < 1:
+            raise ValueError(f"warmup must be at least 1, got {warmup}")
+        if max_skew < 0:
+            raise ValueError(f"max_skew must be non-negative, got {max_skew}")
+        if max_windows < 1:
+            raise ValueError(f"max_windows must be at least 1, got {max_windows}")
+        self._window = window
+        self._lateness = lateness
+        self._open = -(-lateness // window) + 1  # Windows open at once
+        self._period = period
+        self._buckets = buckets
+        self._bucket_ms = period // buckets
+        self._alpha = alpha
+        self._warmup = warmup
+        self._max_skew = max_skew
+        self._max_windows = max_windows
+        self._clock = clock
+        self._index = SeriesIndex(max_series)
+        self._watermark: int | None = None  # Latest event timestamp
+        self._first = 0  # Oldest open window
+        self._totals = array("Q", bytes(8 * self._open))  # Events per open window
+        # Per slot
+        self._ring = array("I")  # Counts of the open windows, at window % open
+        self._born = array("q")  # First counted window
+        self._rate = array("f")  # Expected count per season bucket
+        self._filled = array("H")  # Windows seen per season bucket
+        self._level = array("d")  # Expected count in any window
+        self._seen = array("I")  # Windows seen
+        self._dispersion = array("d")
+        self._last_count = array("d")  # Latest closed window
+        self._last_expected = array("d")
+        self._last_z = array("d")  # NaN unless the window was scored
+        self._rejected = SERIES_REJECTED.labels(self.name)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the detector's state."""
+        return self._index.nbytes + sum(
+            c.buffer_info()[1] * c.itemsize for c in (self._totals, *self._columns())
+        )
+
+    @property
+    def watermark(self) -> int | None:
+        """Latest event timestamp seen (None before the first event)."""
+        return self._watermark
+
+    def threshold(self, sensitivity: float) -> float:
+        """Threshold on the square-root-scale deviation for a request sensitivity."""
+        return sensitivity_threshold(sensitivity)
+
+    def bucket(self, window: int) -> int:
+        """Season bucket of a window number (window start // window length)."""
+        return window * self._window % self._period // self._bucket_ms
+
+    def score(
+        self,
+        source: str,
+        event_type: str,
+        value: float,
+        threshold: float,
+        timestamp: int = 0,
+    ) -> Detection:
+        """Count one event and report its series' latest closed window."""
+        batch = FeatureBatch.from_arrays([value], [(source, event_type)], [timestamp])
+        return self.score_batch(batch, threshold).detection(0)
+
+    def score_batch(self, batch: FeatureBatch, threshold: float) -> BatchDetections:
+        """Count a batch and report each event's series' latest closed window."""
+        return self.observe(batch, threshold)[0]
+
+    def parts(self, batch: FeatureBatch) -> list[int]:
+        """End offsets splitting ``batch`` into parts to ``observe`` one at a time.
+
+        The watermark advances by at most ``max_windows`` windows within a
+        part, so no part closes more than about ``2 * max_windows`` windows
+        (a single event jumping further closes only the open ones). The
+        whole batch is one part unless it spans more event time than that.
+        """
+        timestamps = batch.timestamps
+        if not len(timestamps):
+            return []
+        if self._max_skew:
+            # Events observe() drops as too far ahead do not move the watermark
+            horizon = int(self._clock() * 1000) + self._max_skew
+            timestamps = np.where(timestamps > horizon, _NO_TIME, timestamps)
+        watermark, first = self._watermark, self._first
+        if watermark is None:
+            counted = np.flatnonzero(timestamps > _NO_TIME)
+            if not len(counted):
+                return [len(timestamps)]
+            watermark = int(timestamps[counted[0]])
+            first = (watermark - self._lateness) // self._window
+        marks = np.maximum.accumulate(np.maximum(timestamps, watermark))
+        steps = ((marks - self._lateness) // self._window - first) // self._max_windows
+        ends = np.flatnonzero(np.diff(steps)) + 1
+        return [*ends.tolist(), len(timestamps)]
+
+    def observe(self, batch: FeatureBatch, threshold: float) -> tuple[BatchDetections, RateWindows]:
+        """Count a batch's events, closing and scoring windows the watermark passes.
+
+        One pass over the batch: the watermark before each event is a
+        running maximum, which decides which events are too late; the
+        remaining events are either counted into the open-window ring or,
+        when a later event of the same batch already closed their window,
+        grouped by window and scored with it.
+
+        Returns:
+            Per-event detections (each event reports its series' latest
+            closed window) and the anomalous windows closed by this batch
+        """
+        window_counts = np.zeros(len(batch))
+        result = BatchDetections.empty(len(batch), count=window_counts)
+        slots = self._index.slots(batch.keys)
+        tracked = np.flatnonzero(slots >= 0)
+        rejected = len(slots) - len(tracked)
+        if rejected:
+            self._rejected.inc(rejected)
+        if not len(tracked):
+            return result, RateWindows.empty()
+        self._grow(len(self._index))
+
+        slots = slots[tracked]
+        counted_slots, timestamps = slots, batch.timestamps[tracked]
+        if self._max_skew:
+            future = timestamps > int(self._clock() * 1000) + self._max_skew
+            future_count = int(np.count_nonzero(future))
+            if future_count:
+                RATE_FUTURE_EVENTS.inc(future_count)
+                counted_slots, timestamps = slots[~future], timestamps[~future]
+        if len(counted_slots):
+            windows = self._count(counted_slots, timestamps, threshold)
+        else:
+            windows = RateWindows.empty()
+
+        z = np.frombuffer(self._last_z, dtype=np.float64)[slots]
+        scored = ~np.isnan(z)
+        z = np.where(scored, z, 0.0)
+        abs_z = np.abs(z)
+        expected = np.where(scored, np.frombuffer(self._last_expected)[slots], 0.0)
+        dispersion = np.maximum(np.frombuffer(self._dispersion)[slots], 1.0)
+        result.z[tracked] = z
+        result.score[tracked] = np.where(scored, abs_z / (abs_z + threshold), 0.0)
+        result.is_anomaly[tracked] = scored & (abs_z > threshold)
+        result.expected[tracked] = expected
+        result.std[tracked] = np.sqrt(expected * dispersion)
+        window_counts[tracked] = np.where(scored, np.frombuffer(self._last_count)[slots], 0.0)
+        return result, windows
+
+    def _count(self, slots: np.ndarray, timestamps: np.ndarray, threshold: float) -> RateWindows:
+        """Advance the watermark over a batch, counting events and closing windows."""
+        width, lateness, ring_size = self._window, self._lateness, self._open
+        if self._watermark is None:
+            self._watermark = int(timestamps[0])
+            self._first = (self._watermark - lateness) // width
+
+        marks = np.maximum.accumulate(np.maximum(timestamps, self._watermark))
+        windows = timestamps // width
+        late = windows < (marks - lateness) // width
+        late_count = int(np.count_nonzero(late))
+        if late_count:
+            RATE_LATE_EVENTS.inc(late_count)
+            slots, windows = slots[~late], windows[~late]
+        born = np.frombuffer(self._born, dtype=np.int64)
+        np.minimum.at(born, slots, windows)
+
+        old_first = self._first
+        watermark = int(marks[-1])
+        first = (watermark - lateness) // width
+        ring = np.frombuffer(self._ring, dtype=np.uint32).reshape(-1, ring_size)
+        totals = np.frombuffer(self._totals, dtype=np.uint64)
+
+        # Events whose window a later event of this batch closed skip the ring
+        closing = windows < first
+        closed_slots = slots[closing]
+        closed_windows = windows[closing]
+        by_window = np.argsort(closed_windows, kind="stable")
+        closed_slots = closed_slots[by_window]
+        batch_windows, batch_starts = np.unique(closed_windows[by_window], return_index=True)
+        batch_ends = np.append(batch_starts[1:], len(closed_slots))
+        in_ring = range(old_first, min(old_first + ring_size, first))
+        candidates = {window for window in in_ring if totals[window % ring_size]}
+        candidates.update(batch_windows.tolist())
+
+        series = len(ring)
+        anomalies: list[tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+        for window in sorted(candidates):
+            counts = np.zeros(series, dtype=np.int64)
+            if window in in_ring:
+                counts += ring[:, window % ring_size]
+            i = int(np.searchsorted(batch_windows, window))
+            if i < len(batch_windows) and batch_windows[i] == window:
+                group = closed_slots[batch_starts[i] : batch_ends[i]]
+                counts += np.bincount(group, minlength=series)
+            anomalous = self._close(window, counts, threshold)
+            if anomalous is not None:
+                anomalies.append((window, *anomalous))
+        for window in in_ring:
+            ring[:, window % ring_size] = 0
+            totals[window % ring_size] = 0
+
+        open_slots = slots[~closing]
+        positions = windows[~closing] % ring_size
+        np.add.at(ring.reshape(-1), open_slots * ring_size + positions, 1)
+        totals += np.bincount(positions, minlength=ring_size).astype(np.uint64)
+        self._watermark = watermark
+        self._first = first
+        return self._windows(anomalies, threshold)
+
+    def _close(
+        self, window: int, counts: np.ndarray, threshold: float
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] | None:
+        """Score and learn one closed window of every series.
+
+        Returns:
+            ``(slots, counts, expected, z)`` of the anomalous series, if any
+        """
+        bucket = self.bucket(window)
+        rate_col = np.frombuffer(self._rate, dtype=np.float32).reshape(-1, self._buckets)
+        filled_col = np.frombuffer(self._filled, dtype=np.uint16).reshape(-1, self._buckets)
+        level_col = np.frombuffer(self._level, dtype=np.float64)
+        seen_col = np.frombuffer(self._seen, dtype=np.uint32)
+        dispersion = np.frombuffer(self._dispersion, dtype=np.float64)
+        n = filled_col[:, bucket].astype(np.int64)
+        seen = seen_col.astype(np.int64)
+        rate = rate_col[:, bucket].astype(np.float64)
+        level = level_col.copy()
+
+        # Buckets still warming up fall back to the series-wide rate
+        eligible = np.frombuffer(self._born, dtype=np.int64) < window
+        warm = n >= self._warmup
+        scored = eligible & (warm | (seen >= self._warmup))
+        expected = np.where(warm, rate, level)
+        scale = np.sqrt(np.maximum(dispersion, 1.0))
+        z = 2.0 * (np.sqrt(counts) - np.sqrt(expected)) / scale
+        anomalous = np.flatnonzero(scored & (np.abs(z) > threshold))
+
+        # Learn from counts clipped to the band, so a short outage or burst
+        # moves the rates (and the dispersion) only a bounded step per window
+        clipped = np.clip(z, -_CLIP, _CLIP)
+        learned = np.where(scored, (np.sqrt(expected) + clipped * scale / 2.0) ** 2, counts)
+        alpha = self._alpha
+        bucket_weight = np.maximum(alpha, 1.0 / (n + 1))
+        rate_col[:, bucket] = np.where(eligible, rate + bucket_weight * (learned - rate), rate)
+        filled_col[:, bucket] = np.where(eligible, np.minimum(n + 1, _MAX_FILLED), n)
+        level_weight = np.maximum(alpha, 1.0 / (seen + 1))
+        level_col[:] = np.where(eligible, level + level_weight * (learned - level), level)
+        seen_col[:] = np.where(eligible, seen + 1, seen)
+        dispersion[:] = np.where(
+            scored, dispersion + alpha * ((clipped * scale) ** 2 - dispersion), dispersion
+        )
+        last_count = np.frombuffer(self._last_count, dtype=np.float64)
+        last_expected = np.frombuffer(self._last_expected, dtype=np.float64)
+        last_z = np.frombuffer(self._last_z, dtype=np.float64)
+        last_count[:] = np.where(eligible, counts, last_count)
+        last_expected[:] = np.where(eligible, expected, last_expected)
+        last_z[:] = np.where(scored, z, np.where(eligible, math.nan, last_z))
+
+        if not len(anomalous):
+            return None
+        return anomalous, counts[anomalous], expected[anomalous], z[anomalous]
+
+    def _windows(
+        self,
+        anomalies: list[tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]],
+        threshold: float,
+    ) -> RateWindows:
+        """Collect the anomalous series of closed windows into ``RateWindows``."""
+        if not anomalies:
+            return RateWindows.empty()
+        windows, slots, counts, expected, z = zip(*anomalies, strict=True)
+        keys = self._index.keys()
+        start = np.repeat(np.array(windows, dtype=np.int64) * self._window, [len(s) for s in slots])
+        z = np.concatenate(z)
+        abs_z = np.abs(z)
+        return RateWindows(
+            keys=[keys[slot] for slot in np.concatenate(slots).tolist()],
+            start=start,
+            end=start + self._window,
+            count=np.concatenate(counts),
+            expected=np.concatenate(expected),
+            z=z,
+            score=abs_z / (abs_z + threshold),
+        )
+
+    def _columns(self) -> tuple["array[Any]", ...]:
+        """Per-slot state columns."""
+        return (
+            self._ring,
+            self._born,
+            self._rate,
+            self._filled,
+            self._level,
+            self._seen,
+            self._dispersion,
+            self._last_count,
+            self._last_expected,
+            self._last_z,
+        )
+
+    def _grow(self, series: int) -> None:
+        """Extend the state columns to ``series`` slots."""
+        missing = series - len(self._born)
+        if missing > 0:
+            self._ring.frombytes(bytes(4 * self._open * missing))
+            self._born.extend(array("q", [_UNBORN]) * missing)
+            self._rate.frombytes(bytes(4 * self._buckets * missing))
+            self._filled.frombytes(bytes(2 * self._buckets * missing))
+            self._level.frombytes(bytes(8 * missing))
+            self._seen.frombytes(bytes(4 * missing))
+            self._dispersion.extend(array("d", [1.0]) * missing)
+            self._last_count.frombytes(bytes(8 * missing))
+            self._last_expected.frombytes(bytes(8 * missing))
+            self._last_z.extend(array("d", [math.nan]) * missing)
+
+    def expected(self, source: str, event_type: str, timestamp: int) -> float | None:
+        """Expected events of a series in the window containing ``timestamp``.
+
+        None if the series is unknown or has not seen that season bucket yet.
+        """
+        slot = self._index.get((source, event_type))
+        if slot is None:
+            return None
+        index = slot * self._buckets + self.bucket(timestamp // self._window)
+        return self._rate[index] if self._filled[index] else None
+
+    def clear(self) -> None:
+        """Forget every series and the watermark."""
+        self._index.clear()
+        for column in self._columns():
+            del column[:]
+        self._totals = array("Q", bytes(8 * self._open))
+        self._watermark = None
+        self._first = 0
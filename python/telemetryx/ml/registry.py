@@ -0,0 +1,428 @@
+"""Model registry: versioned on-disk models, memory-mapped and cached.
+
+Models live under a root directory, one directory per model name and one
+subdirectory per integer version:
+
+    models/
+        checkout-forest/
+            1/  manifest.json  feature.npy  threshold.npy  ...
+            2/  ...
+
+``manifest.json`` holds the model ``kind``, which selects the loader that
+builds a detector from it (see ``register_model_kind``), and its
+parameters. Every ``.npy`` file is one weight array, opened with
+``np.load(mmap_mode="r")``: loading only maps the files, pages are read
+on first use, and forked workers serving the same version share a single
+copy in the page cache instead of each holding their own.
+
+``ModelRegistry`` resolves ``DetectAnomaliesRequest.model_name`` to a
+loaded detector. A bare name means the highest version and ``name@3``
+pins version 3. At most ``max_models`` models (and optionally
+``max_bytes`` of mapped weights) stay loaded, least recently used first
+out; cache hits never touch the disk, and neither do repeated requests
+for a name that is not stored (misses are remembered for
+``missing_ttl`` seconds). ``run`` polls the loaded models
+for new versions and swaps them in: requests already scoring keep the
+detector they resolved, and the old mappings are released when the last
+of them finishes.
+
+``save_model`` publishes a version atomically (written to a hidden
+staging directory, then renamed into place), so a polling registry never
+sees a partial model.
+
+Example:
+    save_model("models", "checkout-forest", "isolation_forest", arrays, {"trees": 100})
+    registry = ModelRegistry("models", max_models=8)
+    detector = await registry.get("checkout-forest")
+"""
+
+import asyncio
+import json
+import os
+import re
+import shutil
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from telemetryx.core import get_logger, metrics
+from telemetryx.core.exceptions import AnomalyDetectionError, ModelNotFoundError
+from telemetryx.ml.anomaly import Detector
+
+MODEL_LOADS = metrics.counter(
+    "telemetryx_model_loads_total",
+    "Model versions loaded from disk",
+    ["model"],
+)
+MODELS_LOADED = metrics.gauge(
+    "telemetryx_models_loaded",
+    "Stored models currently loaded by the model registry",
+)
+MODEL_EVICTIONS = metrics.counter(
+    "telemetryx_model_evictions_total",
+    "Loaded models dropped from the registry cache to stay within its bounds",
+)
+
+MANIFEST = "manifest.json"
+
+# Model names are single path components (no separators, no leading dot)
+_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]*")
+
+# Unknown model names remembered at once (oldest forgotten first)
+_MAX_MISSING = 1024
+
+
+@dataclass(frozen=True, slots=True)
+class ModelArtifact:
+    """One stored model version: manifest plus memory-mapped weight arrays."""
+
+    name: str
+    version: int
+    kind: str
+    path: Path
+    params: dict[str, Any] = field(default_factory=dict)
+    arrays: dict[str, np.ndarray] = field(default_factory=dict)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the mapped weight arrays."""
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def array(self, name: str) -> np.ndarray:
+        """Weight array ``name`` (``name.npy`` in the version directory)."""
+        try:
+            return self.arrays[name]
+        except KeyError:
+            raise AnomalyDetectionError(
+                f"Model {self.name}@{self.version} has no array {name!r}",
+                {"model": self.name, "version": self.version, "arrays": sorted(self.arrays)},
+            ) from None
+
+
+ModelLoader = Callable[[ModelArtifact], Detector]
+
+_LOADERS: dict[str, ModelLoader] = {}
+
+
+def register_model_kind(kind: str, loader: ModelLoader) -> None:
+    """Register the function building detectors for models of ``kind``."""
+    _LOADERS[kind] = loader
+
+
+def parse_model_name(model_name: str) -> tuple[str, int | None]:
+    """Split ``name@version`` into the name and version (None for the latest)."""
+    name, _, version = model_name.partition("@")
+    if not _NAME.fullmatch(name) or (version and not version.isdigit()):
+        raise ModelNotFoundError(f"Invalid model name: {model_name}", {"model": model_name})
+    return name, int(version) if version else None
+
+
+def model_versions(root: str | Path, name: str) -> list[int]:
+    """Stored versions of model ``name``, ascending."""
+    try:
+        entries = os.scandir(Path(root) / name)
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    with entries:
+        return sorted(int(entry.name) for entry in entries if entry.name.isdigit())
+
+
+def model_names(root: str | Path) -> list[str]:
+    """Names of the models stored under ``root``."""
+    try:
+        entries = os.scandir(root)
+    except FileNotFoundError:
+        return []
+    with entries:
+        return sorted(
+            entry.name for entry in entries if entry.is_dir() and _NAME.fullmatch(entry.name)
+        )
+
+
+def load_artifact(root: str | Path, name: str, version: int | None = None) -> ModelArtifact:
+    """Read a model version's manifest and memory-map its arrays.
+
+    Raises:
+        ModelNotFoundError: If the model or version does not exist
+        AnomalyDetectionError: If the manifest is unreadable
+    """
+    if version is None:
+        versions = model_versions(root, name)
+        if not versions:
+            raise ModelNotFoundError(f"Unknown model: {name}", {"model": name})
+        version = versions[-1]
+    path = Path(root) / name / str(version)
+    try:
+        with open(path / MANIFEST, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        raise ModelNotFoundError(
+            f"Unknown model: {name}@{version}", {"model": name, "version": version}
+        ) from None
+    except (OSError, ValueError) as e:
+        raise AnomalyDetectionError(
+            f"Unreadable manifest for model {name}@{version}",
+            {"model": name, "version": version, "error": str(e)},
+        ) from e
+
+    arrays = {
+        array_path.stem: np.load(array_path, mmap_mode="r", allow_pickle=False)
+        for array_path in sorted(path.glob("*.npy"))
+    }
+    return ModelArtifact(
+        name=name,
+        version=version,
+        kind=str(manifest.get("kind", "")),
+        path=path,
+        params=dict(manifest.get("params", {})),
+        arrays=arrays,
+    )
+
+
+def build_detector(artifact: ModelArtifact) -> Detector:
+    """Build the detector for an artifact with its kind's registered loader."""
+    loader = _LOADERS.get(artifact.kind)
+    if loader is None:
+        raise AnomalyDetectionError(
+            f"Unknown kind {artifact.kind!r} for model {artifact.name}@{artifact.version}",
+            {"model": artifact.name, "version": artifact.version, "kinds": sorted(_LOADERS)},
+        )
+    return loader(artifact)
+
+
+def save_model(
+    root: str | Path,
+    name: str,
+    kind: str,
+    arrays: Mapping[str, np.ndarray],
+    params: Mapping[str, Any] | None = None,
+    version: int | None = None,
+) -> int:
+    """Store a new model version atomically and return its number.
+
+    ``version`` defaults to one past the highest stored version.
+    """
+    if not _NAME.fullmatch(name):
+        raise ValueError(f"Invalid model name: {name!r}")
+    if version is None:
+        version = max(model_versions(root, name), default=0) + 1
+    directory = Path(root) / name
+    directory.mkdir(parents=True, exist_ok=True)
+
+    staging = directory / f".staging-{version}-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir()
+    try:
+        for array_name, array in arrays.items():
+            np.save(staging / f"{array_name}.npy", np.ascontiguousarray(array), allow_pickle=False)
+        manifest = {"kind": kind, "version": version, "params": dict(params or {})}
+        with open(staging / MANIFEST, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        # Fails rather than replacing an existing version in place
+        os.rename(staging, directory / str(version))
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return version
+
+
+@dataclass(frozen=True, slots=True)
+class _Loaded:
+    artifact: ModelArtifact
+    detector: Detector
+    pinned: bool  # Requested as name@version, so never swapped
+
+
+class ModelRegistry:
+    """Bounded LRU cache of detectors built from stored models.
+
+    Args:
+        root: Directory holding one subdirectory per model
+        max_models: Loaded models kept (least recently used are dropped)
+        max_bytes: Mapped weight bytes kept (0 for no limit); the most
+            recently used model always stays loaded
+        refresh_interval: Seconds between ``run``'s checks for new versions
+        missing_ttl: Seconds a name that is not stored keeps failing
+            without another look at the disk (0 to always look)
+        clock: Monotonic time in seconds
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        max_models: int = 8,
+        max_bytes: int = 0,
+        refresh_interval: float = 30.0,
+        missing_ttl: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_models < 1:
+            raise ValueError(f"max_models must be at least 1, got {max_models}")
+        self._root = Path(root)
+        self._max_models = max_models
+        self._max_bytes = max_bytes
+        self._refresh_interval = refresh_interval
+        self._cache: OrderedDict[str, _Loaded] = OrderedDict()
+        self._pending: dict[str, asyncio.Task[Detector]] = {}
+        self._missing_ttl = missing_ttl
+        self._clock = clock
+        self._missing: dict[str, float] = {}  # Unknown name -> when to look again
+        self._logger = get_logger(__name__, component="model-registry")
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def root(self) -> Path:
+        """Directory holding the stored models."""
+        return self._root
+
+    @property
+    def nbytes(self) -> int:
+        """Mapped weight bytes of the loaded models."""
+        return sum(loaded.artifact.nbytes for loaded in self._cache.values())
+
+    def loaded(self) -> dict[str, int]:
+        """Loaded version of each cached model name, least recently used first."""
+        return {key: loaded.artifact.version for key, loaded in self._cache.items()}
+
+    async def get(self, model_name: str) -> Detector:
+        """Detector for ``model_name`` (``name`` or ``name@version``).
+
+        Cache hits return immediately. Misses map the model in a worker
+        thread; concurrent requests for the same model share one load.
+        Names found not to be stored fail fast for ``missing_ttl`` seconds.
+
+        Raises:
+            ModelNotFoundError: If no such model is stored
+            AnomalyDetectionError: If the stored model cannot be loaded
+        """
+        loaded = self._cache.get(model_name)
+        if loaded is not None:
+            self._cache.move_to_end(model_name)
+            return loaded.detector
+        retry_at = self._missing.get(model_name)
+        if retry_at is not None:
+            if self._clock() < retry_at:
+                raise ModelNotFoundError(f"Unknown model: {model_name}", {"model": model_name})
+            del self._missing[model_name]
+        task = self._pending.get(model_name)
+        if task is None:
+            task = asyncio.create_task(self._load_into_cache(model_name))
+            self._pending[model_name] = task
+        # A cancelled request must not cancel a load other requests wait on
+        return await asyncio.shield(task)
+
+    async def _load_into_cache(self, model_name: str) -> Detector:
+        try:
+            loaded = await asyncio.to_thread(self._load, model_name)
+            self._insert(model_name, loaded)
+            return loaded.detector
+        except ModelNotFoundError:
+            if self._missing_ttl > 0:
+                if len(self._missing) >= _MAX_MISSING:
+                    del self._missing[next(iter(self._missing))]
+                self._missing[model_name] = self._clock() + self._missing_ttl
+            raise
+        finally:
+            del self._pending[model_name]
+
+    def load(self, model_name: str) -> Detector:
+        """Load ``model_name`` into the cache now, blocking on disk access."""
+        loaded = self._load(model_name)
+        self._insert(model_name, loaded)
+        return loaded.detector
+
+    def _load(self, model_name: str) -> _Loaded:
+        name, version = parse_model_name(model_name)
+        artifact = load_artifact(self._root, name, version)
+        detector = build_detector(artifact)
+        MODEL_LOADS.labels(name).inc()
+        self._logger.info(
+            "Model loaded",
+            model=name,
+            version=artifact.version,
+            kind=artifact.kind,
+            mapped_bytes=artifact.nbytes,
+        )
+        return _Loaded(artifact, detector, pinned=version is not None)
+
+    def _insert(self, model_name: str, loaded: _Loaded, touch: bool = True) -> None:
+        """Cache ``loaded`` and evict down to the model and byte budgets.
+
+        ``touch`` marks it most recently used; refresh swaps keep the
+        replaced model's position instead.
+        """
+        self._cache[model_name] = loaded
+        if touch:
+            self._cache.move_to_end(model_name)
+        while len(self._cache) > 1 and (
+            len(self._cache) > self._max_models
+            or (self._max_bytes and self.nbytes > self._max_bytes)
+        ):
+            evicted, _ = self._cache.popitem(last=False)
+            MODEL_EVICTIONS.inc()
+            self._logger.info("Model evicted", model=evicted)
+
+    async def preload(self, names: list[str] | None = None) -> None:
+        """Load ``names`` (default: every stored model, up to ``max_models``).
+
+        A model that fails to load is logged and skipped.
+        """
+        if names is None:
+            names = (await asyncio.to_thread(model_names, self._root))[: self._max_models]
+        for name in names:
+            try:
+                await self.get(name)
+            except Exception as e:
+                self._logger.exception("Model preload failed", model=name, error=str(e))
+
+    async def refresh(self) -> list[str]:
+        """Swap in newer stored versions of loaded models.
+
+        A version that fails to load is logged and the loaded one kept.
+
+        Returns:
+            Names of the models that were swapped
+        """
+        swapped = []
+        for key, current in list(self._cache.items()):
+            if current.pinned:
+                continue
+            name = current.artifact.name
+            try:
+                versions = await asyncio.to_thread(model_versions, self._root, name)
+                if not versions or versions[-1] <= current.artifact.version:
+                    continue
+                loaded = await asyncio.to_thread(self._load, key)
+            except Exception as e:
+                self._logger.exception("Model refresh failed", model=name, error=str(e))
+                continue
+            # Replace in place (keeping the LRU position) unless evicted
+            # meanwhile; a larger version can push others out of max_bytes
+            if key in self._cache:
+                self._insert(key, loaded, touch=False)
+                swapped.append(key)
+                self._logger.info(
+                    "Model swapped",
+                    model=name,
+                    version=loaded.artifact.version,
+                    previous=current.artifact.version,
+                )
+        return swapped
+
+    async def run(self) -> None:
+        """Check for new versions every ``refresh_interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self._refresh_interval)
+            await self.refresh()
+
+    def clear(self) -> None:
+        """Drop every loaded model and forget unknown names."""
+        self._cache.clear()
+        self._missing.clear()
@@ -0,0 +1,427 @@
+"""Seasonal baselines: per-series Holt-Winters with incremental updates.
+
+Metrics with daily or weekly cycles ramp up every morning; a detector
+with a flat baseline flags every ramp. ``SeasonalDetector`` forecasts
+each value from its series' level, trend and the seasonal offset of the
+event's position in the cycle, and flags values whose residual is large
+compared with the series' recent residuals.
+
+The cycle (``period``, one day by default) is split into ``buckets``
+season buckets by ``Event.timestamp`` (UTC), so an event's bucket
+depends on when it happened, not on when it arrived. Every event updates
+its series with the additive Holt-Winters recurrences in error-correction
+form (``e`` is the residual, ``dt`` the buckets since the series' latest
+event):
+
+    forecast = level + trend * dt + season[bucket]
+    level'   = level + trend * dt + alpha * e
+    trend'   = trend + alpha * beta * e
+    season'  = season[bucket] + gamma * (1 - alpha) * e
+
+A bucket's first value initializes its offset instead (NaN marks buckets
+not seen yet), so a series is only scored in buckets it has seen and the
+first cycle calibrates the season rather than producing alarms.
+
+State is a few flat columns indexed by series slot: level, trend and
+residual variance (float64), latest timestamp and count, plus ``buckets``
+float32 offsets per series. With the default 24 hourly buckets a series
+costs about 130 bytes, so hundreds of thousands of series fit in tens of
+megabytes.
+
+Example:
+    detector = SeasonalDetector(period=86_400_000, buckets=24)
+    detections = detector.score_batch(FeatureBatch.from_events(events), detector.threshold(0.5))
+"""
+
+import math
+from array import array
+
+import numpy as np
+
+from telemetryx.ml.anomaly import (
+    NOT_SCORED,
+    SERIES_REJECTED,
+    BatchDetections,
+    Detection,
+    SeriesIndex,
+    anomaly_score,
+    finite_slots,
+    sensitivity_threshold,
+)
+from telemetryx.ml.features import FeatureBatch, segment
+
+DAY_MS = 86_400_000
+
+# score_batch updates series in vectorized layers while at least this many
+# series runs are active, and finishes longer runs one event at a time
+_MIN_LAYER_WIDTH = 32
+
+
+class SeasonalDetector:
+    """Per-series additive Holt-Winters z-score detector.
+
+    NaN and infinite values are not scored and leave the series untouched.
+
+    Args:
+        period: Length of the seasonal cycle in milliseconds
+        buckets: Season buckets per period (``period`` must divide evenly)
+        alpha: Level (and residual variance) smoothing per event
+        beta: Trend smoothing (relative to ``alpha``)
+        gamma: Seasonal smoothing per event
+        warmup: Values a series must see before it can be flagged
+        max_series: Series capacity; events of further series are not scored
+        min_std: Standard deviation floor, so constant series do not divide by zero
+    """
+
+    name = "seasonal"
+
+    def __init__(
+        self,
+        period: int = DAY_MS,
+        buckets: int = 24,
+        alpha: float = 0.05,
+        beta: float = 0.01,
+        gamma: float = 0.1,
+        warmup: int = 50,
+        max_series: int = 1_000_000,
+        min_std: float = 1e-9,
+    ) -> None:
+        if buckets < 1 or period < buckets or period % buckets:
+            raise ValueError(f"period ({period} ms) must split evenly into {buckets} buckets")
+        for label, weight in (("alpha", alpha), ("beta", beta), ("gamma", gamma)):
+            if not 0.0 <= weight <= 1.0:
+                raise ValueError(f"{label} must be in [0, 1], got {weight}")
+        if warmup < 1:
+            raise ValueError(f"warmup must be at least 1, got {warmup}")
+        self._period = period
+        self._buckets = buckets
+        self._bucket_ms = period // buckets
+        self._alpha = alpha
+        self._beta = beta
+        self._gamma = gamma
+        self._warmup = warmup
+        self._min_std = min_std
+        self._index = SeriesIndex(max_series)
+        self._level = array("d")
+        self._trend = array("d")
+        self._var = array("d")
+        self._last = array("q")  # Latest event timestamp (Unix ms)
+        self._count = array("Q")
+        self._season = array("f")  # buckets offsets per slot, NaN until seen
+        self._unseen = array("f", [math.nan]) * buckets
+        self._rejected = SERIES_REJECTED.labels(self.name)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the detector's state."""
+        columns = (self._level, self._trend, self._var, self._last, self._count, self._season)
+        return self._index.nbytes + sum(c.buffer_info()[1] * c.itemsize for c in columns)
+
+    def threshold(self, sensitivity: float) -> float:
+        """z-score threshold for a request sensitivity."""
+        return sensitivity_threshold(sensitivity)
+
+    def bucket(self, timestamp: int) -> int:
+        """Season bucket of a timestamp (Unix ms, UTC)."""
+        return timestamp % self._period // self._bucket_ms
+
+    def score(
+        self,
+        source: str,
+        event_type: str,
+        value: float,
+        threshold: float,
+        timestamp: int = 0,
+    ) -> Detection:
+        """Score ``value`` against its series' seasonal forecast, then update the series."""
+        if not math.isfinite(value):
+            return NOT_SCORED
+        slot = self._index.slot((source, event_type))
+        if slot is None:
+            self._rejected.inc()
+            return NOT_SCORED
+        self._grow(slot + 1)
+        return self._update(slot, value, timestamp, threshold)
+
+    def _update(self, slot: int, value: float, timestamp: int, threshold: float) -> Detection:
+        """One Holt-Winters step for one event (see the module docstring)."""
+        n = self._count[slot]
+        self._count[slot] = n + 1
+        if n == 0:
+            self._level[slot] = value
+            self._last[slot] = timestamp
+            self._season[slot * self._buckets + self.bucket(timestamp)] = 0.0
+            return NOT_SCORED
+
+        steps = min(max(timestamp - self._last[slot], 0) / self._bucket_ms, self._buckets)
+        if timestamp > self._last[slot]:
+            self._last[slot] = timestamp
+        trend = self._trend[slot]
+        level = self._level[slot] + trend * steps
+        index = slot * self._buckets + self.bucket(timestamp)
+        season = self._season[index]
+        if season != season:  # First value of this bucket sets its offset
+            self._season[index] = value - level
+            self._level[slot] = level
+            return NOT_SCORED
+
+        forecast = level + season
+        error = value - forecast
+        var = self._var[slot]
+        detection = NOT_SCORED
+        if n >= self._warmup:
+            std = math.sqrt(var)
+            z = error / max(std, self._min_std)
+            detection = Detection(
+                score=anomaly_score(z, threshold),
+                is_anomaly=abs(z) > threshold,
+                z=z,
+                expected=forecast,
+                std=std,
+            )
+
+        alpha = self._alpha
+        weight = max(alpha, 1.0 / n)
+        self._level[slot] = level + alpha * error
+        self._trend[slot] = trend + alpha * self._beta * error
+        self._season[index] = season + self._gamma * (1.0 - alpha) * error
+        self._var[slot] = (1.0 - weight) * var + weight * error * error
+        return detection
+
+    def score_batch(self, batch: FeatureBatch, threshold: float) -> BatchDetections:
+        """Score and fold in a batch, series by series in timestamp order.
+
+        Equivalent to calling ``score`` for each event in (series,
+        timestamp) order (up to float32 rounding of the seasonal offsets in
+        long runs, which are rounded once per batch rather than per event).
+
+        The recurrence is sequential within a series but independent across
+        series, so the batch is processed in layers: layer ``k`` updates the
+        ``k``-th event of every series run at once with vectorized
+        operations. Layers are used while at least ``_MIN_LAYER_WIDTH`` runs
+        are still active; the remaining tails of the few long runs (hot
+        series) go through a tight scalar loop instead, where NumPy's
+        per-call overhead would exceed the work.
+        """
+        result = BatchDetections.empty(len(batch))
+        slots = self._index.slots(batch.keys)
+        rejected = int(np.count_nonzero(slots < 0))
+        if rejected:
+            self._rejected.inc(rejected)
+        # Non-finite values never reach the layers or tails
+        runs = segment(finite_slots(slots, batch.values), batch.timestamps)
+        if not len(runs.order):
+            return result
+        self._grow(len(self._index))
+
+        order = runs.order
+        values = batch.values[order]
+        timestamps = batch.timestamps[order]
+        buckets = timestamps % self._period // self._bucket_ms
+        count = len(order)
+        z = np.zeros(count)
+        expected = np.zeros(count)
+        std = np.zeros(count)
+        scored = np.zeros(count, dtype=bool)
+
+        lengths = runs.lengths
+        if len(lengths) >= _MIN_LAYER_WIDTH:
+            layers = int(np.partition(lengths, len(lengths) - _MIN_LAYER_WIDTH)[-_MIN_LAYER_WIDTH])
+        else:
+            layers = 0
+        for layer in range(layers):
+            active = np.flatnonzero(lengths > layer)
+            events = runs.starts[active] + layer
+            self._layer(
+                runs.series[active], events, values, timestamps, buckets, z, expected, std, scored
+            )
+
+        tails = np.flatnonzero(lengths > layers)
+        self._tails(
+            runs.series[tails].tolist(),
+            (runs.starts[tails] + layers).tolist(),
+            (lengths[tails] - layers).tolist(),
+            values.tolist(),
+            timestamps.tolist(),
+            buckets.tolist(),
+            z,
+            expected,
+            std,
+            scored,
+        )
+
+        abs_z = np.abs(z)
+        result.z[order] = z
+        result.score[order] = np.where(scored, abs_z / (abs_z + threshold), 0.0)
+        result.is_anomaly[order] = scored & (abs_z > threshold)
+        result.expected[order] = expected
+        result.std[order] = std
+        return result
+
+    def _layer(
+        self,
+        slots: np.ndarray,
+        events: np.ndarray,
+        values: np.ndarray,
+        timestamps: np.ndarray,
+        buckets: np.ndarray,
+        z: np.ndarray,
+        expected: np.ndarray,
+        std: np.ndarray,
+        scored: np.ndarray,
+    ) -> None:
+        """``_update`` for one event of each of several distinct series at once."""
+        level_col = np.frombuffer(self._level, dtype=np.float64)
+        trend_col = np.frombuffer(self._trend, dtype=np.float64)
+        var_col = np.frombuffer(self._var, dtype=np.float64)
+        last_col = np.frombuffer(self._last, dtype=np.int64)
+        count_col = np.frombuffer(self._count, dtype=np.uint64)
+        season_col = np.frombuffer(self._season, dtype=np.float32)
+
+        n = count_col[slots].astype(np.int64)
+        value = values[events]
+        timestamp = timestamps[events]
+        last = last_col[slots]
+        trend = trend_col[slots]
+        var = var_col[slots]
+        steps = np.minimum(np.maximum(timestamp - last, 0) / self._bucket_ms, self._buckets)
+        level = level_col[slots] + trend * steps
+        index = slots * self._buckets + buckets[events]
+        offset = season_col[index].astype(np.float64)
+
+        first = n == 0
+        unseen = ~first & np.isnan(offset)
+        seen = ~first & ~unseen
+        error = np.where(seen, value - level - offset, 0.0)
+        deviation = np.sqrt(var)
+        warm = seen & (n >= self._warmup)
+        z[events] = np.where(warm, error / np.maximum(deviation, self._min_std), 0.0)
+        expected[events] = np.where(warm, level + offset, 0.0)
+        std[events] = np.where(warm, deviation, 0.0)
+        scored[events] = warm
+
+        alpha = self._alpha
+        weight = np.maximum(alpha, 1.0 / np.maximum(n, 1))
+        level_col[slots] = np.where(first, value, level + alpha * error)
+        trend_col[slots] = trend + alpha * self._beta * error
+        var_col[slots] = np.where(seen, (1.0 - weight) * var + weight * error * error, var)
+        gain = self._gamma * (1.0 - alpha)
+        season_col[index] = np.where(
+            first, 0.0, np.where(unseen, value - level, offset + gain * error)
+        )
+        last_col[slots] = np.where(first, timestamp, np.maximum(last, timestamp))
+        count_col[slots] = (n + 1).astype(np.uint64)
+
+    def _tails(
+        self,
+        slots: list[int],
+        starts: list[int],
+        lengths: list[int],
+        values: list[float],
+        times: list[int],
+        buckets: list[int],
+        z: np.ndarray,
+        expected: np.ndarray,
+        std: np.ndarray,
+        scored: np.ndarray,
+    ) -> None:
+        """``_update`` over runs of consecutive events, one series at a time.
+
+        The series' state lives in locals (its seasonal offsets in a list)
+        and is written back once per run.
+        """
+        alpha, beta = self._alpha, self._beta
+        gain = self._gamma * (1.0 - alpha)
+        bucket_ms, max_steps, warmup = self._bucket_ms, float(self._buckets), self._warmup
+        min_std = self._min_std
+        level_col, trend_col, var_col = self._level, self._trend, self._var
+        last_col, count_col, season_col = self._last, self._count, self._season
+        width = self._buckets
+        sqrt = math.sqrt
+
+        for slot, start, length in zip(slots, starts, lengths, strict=True):
+            base = slot * width
+            n = count_col[slot]
+            level, trend, var, last = (
+                level_col[slot],
+                trend_col[slot],
+                var_col[slot],
+                last_col[slot],
+            )
+            season = season_col[base : base + width].tolist()
+            for i in range(start, start + length):
+                value, timestamp, bucket = values[i], times[i], buckets[i]
+                n += 1
+                if n == 1:
+                    level, last = value, timestamp
+                    season[bucket] = 0.0
+                    continue
+                elapsed = timestamp - last
+                if elapsed > 0:
+                    last = timestamp
+                    steps = elapsed / bucket_ms
+                    level += trend * (steps if steps < max_steps else max_steps)
+                offset = season[bucket]
+                if offset != offset:  # First value of this bucket sets its offset
+                    season[bucket] = value - level
+                    continue
+                error = value - level - offset
+                if n > warmup:
+                    deviation = sqrt(var)
+                    z[i] = error / (deviation if deviation > min_std else min_std)
+                    expected[i] = level + offset
+                    std[i] = deviation
+                    scored[i] = True
+                weight = 1.0 / (n - 1)
+                if weight < alpha:
+                    weight = alpha
+                level += alpha * error
+                trend += alpha * beta * error
+                season[bucket] = offset + gain * error
+                var = (1.0 - weight) * var + weight * error * error
+            level_col[slot], trend_col[slot], var_col[slot], last_col[slot] = (
+                level,
+                trend,
+                var,
+                last,
+            )
+            count_col[slot] = n
+            season_col[base : base + width] = array("f", season)
+
+    def _grow(self, series: int) -> None:
+        """Extend the state columns to ``series`` slots."""
+        missing = series - len(self._count)
+        if missing > 0:
+            zeros = bytes(8 * missing)
+            for column in (self._level, self._trend, self._var, self._last, self._count):
+                column.frombytes(zeros)
+            self._season.extend(self._unseen * missing)
+
+    def state(self, source: str, event_type: str) -> tuple[int, float, float, list[float]] | None:
+        """``(count, level, trend, seasonal offsets)`` of a series, or None if unknown."""
+        slot = self._index.get((source, event_type))
+        if slot is None:
+            return None
+        base = slot * self._buckets
+        return (
+            self._count[slot],
+            self._level[slot],
+            self._trend[slot],
+            self._season[base : base + self._buckets].tolist(),
+        )
+
+    def clear(self) -> None:
+        """Forget every series."""
+        self._index.clear()
+        for column in (
+            self._level,
+            self._trend,
+            self._var,
+            self._last,
+            self._count,
+            self._season,
+        ):
+            del column[:]
@@ -0,0 +1,341 @@
+"""DDSketch: mergeable quantile sketch with relative-error guarantees.
+
+Values are mapped to logarithmic bins ``ceil(log_gamma(|x|))`` with
+``gamma = (1 + a) / (1 - a)``, so any quantile is returned within relative
+error ``a`` of the true value (until bins are collapsed, see below). Bins
+for positive and negative values are kept in two dense ``array`` stores
+plus a count of (near-)zero values.
+
+Each store holds at most ``max_bins`` bins. When a store would grow past
+that, its lowest bins are collapsed into one, so the sketch's memory is
+bounded while the upper quantiles (the interesting ones for latency) keep
+their accuracy.
+
+Sketches with the same ``relative_accuracy`` merge exactly (bin counts
+add), so sketches built in different worker processes can be combined,
+and ``to_bytes``/``from_bytes`` give a compact binary form for
+checkpointing and shipping them between processes.
+
+Example:
+    sketch = DDSketch(relative_accuracy=0.01, max_bins=512)
+    for latency in latencies:
+        sketch.add(latency)
+    p50, p99 = sketch.quantiles((0.5, 0.99))
+    other.merge(DDSketch.from_bytes(sketch.to_bytes()))
+"""
+
+import math
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+
+import numpy as np
+
+# Magnitudes below this are counted as zero
+MIN_VALUE = 1e-9
+
+# add_many adds fewer values than this one at a time
+_SCALAR_ADD_LIMIT = 32
+
+_MAGIC = b"TXDD"
+_VERSION = 1
+# magic, version, relative_accuracy, max_bins, count, zero_count, min, max,
+# positive offset and length, negative offset and length
+_HEADER = struct.Struct("<4sBdIdddd iIiI")
+
+
+class _Bins:
+    """Dense bin counts for a contiguous key range, collapsing the lowest keys."""
+
+    __slots__ = ("counts", "offset", "max_bins")
+
+    def __init__(self, max_bins: int) -> None:
+        self.counts = array("d")
+        self.offset = 0
+        self.max_bins = max_bins
+
+    def add(self, key: int, weight: float = 1.0) -> None:
+        """Add ``weight`` to bin ``key``."""
+        counts = self.counts
+        if not counts:
+            self.offset = key
+            counts.append(weight)
+            return
+
+        index = key - self.offset
+        if 0 <= index < len(counts):
+            counts[index] += weight
+        elif index >= len(counts):
+            counts.extend(array("d", bytes(8 * (index - len(counts) + 1))))
+            excess = len(counts) - self.max_bins
+            if excess > 0:
+                collapsed = sum(counts[: excess + 1])
+                del counts[:excess]
+                counts[0] = collapsed
+                self.offset += excess
+            counts[key - self.offset] += weight
+        else:
+            # Below the range: grow downwards as far as max_bins allows and
+            # put keys beyond that into the lowest bin
+            highest = self.offset + len(counts) - 1
+            lowest = max(key, highest - self.max_bins + 1)
+            if lowest < self.offset:
+                counts[0:0] = array("d", bytes(8 * (self.offset - lowest)))
+                self.offset = lowest
+            counts[max(key, lowest) - self.offset] += weight
+
+    def add_many(self, keys: np.ndarray, weights: np.ndarray | None = None) -> None:
+        """Add many keys at once (same result as adding them one by one)."""
+        if not len(keys):
+            return
+        highest = int(keys.max())
+        lowest = int(keys.min())
+        if self.counts:
+            highest = max(highest, self.offset + len(self.counts) - 1)
+            lowest = min(lowest, self.offset)
+        lowest = max(lowest, highest - self.max_bins + 1)
+        size = highest - lowest + 1
+
+        dense = np.bincount(np.maximum(keys, lowest) - lowest, weights=weights, minlength=size)
+        dense = dense.astype(np.float64, copy=False)
+        if self.counts:
+            existing = np.frombuffer(self.counts, dtype=np.float64)
+            positions = np.maximum(np.arange(len(existing)) + self.offset, lowest) - lowest
+            dense += np.bincount(positions, weights=existing, minlength=size)
+        counts = array("d")
+        counts.frombytes(dense.tobytes())
+        self.counts = counts
+        self.offset = lowest
+
+    def scale(self, factor: float) -> None:
+        """Multiply every count by ``factor``."""
+        if self.counts:
+            np.frombuffer(self.counts, dtype=np.float64)[:] *= factor
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.counts) * self.counts.itemsize
+
+
+class DDSketch:
+    """Quantile sketch with relative accuracy ``relative_accuracy``.
+
+    Args:
+        relative_accuracy: Relative error bound of returned quantiles (0 < a < 1)
+        max_bins: Bins per sign; the lowest bins are collapsed beyond it
+    """
+
+    __slots__ = (
+        "relative_accuracy",
+        "max_bins",
+        "count",
+        "zero_count",
+        "min",
+        "max",
+        "_gamma",
+        "_multiplier",
+        "_positive",
+        "_negative",
+    )
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 512) -> None:
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError(f"relative_accuracy must be in (0, 1), got {relative_accuracy}")
+        if max_bins < 1:
+            raise ValueError(f"max_bins must be at least 1, got {max_bins}")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.count = 0.0
+        self.zero_count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._multiplier = 1.0 / math.log(self._gamma)
+        self._positive = _Bins(max_bins)
+        self._negative = _Bins(max_bins)
+
+    def __len__(self) -> int:
+        """Number of bins in use."""
+        return len(self._positive.counts) + len(self._negative.counts)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the sketch."""
+        return sys.getsizeof(self) + self._positive.nbytes + self._negative.nbytes
+
+    def _key(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) * self._multiplier)
+
+    def _value(self, key: int) -> float:
+        """Representative magnitude of a bin (relative error at most ``a``)."""
+        return 2.0 * self._gamma**key / (self._gamma + 1.0)
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        """Add ``value`` with ``weight`` (NaN and infinite values are ignored)."""
+        if not math.isfinite(value):
+            return
+        if value > MIN_VALUE:
+            self._positive.add(self._key(value), weight)
+        elif value < -MIN_VALUE:
+            self._negative.add(self._key(-value), weight)
+        else:
+            self.zero_count += weight
+        self.count += weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def add_many(self, values: np.ndarray) -> None:
+        """Add an array of values, computing their bins with vectorized operations.
+
+        NaN and infinite values are ignored, as in ``add``.
+        """
+        if len(values) < _SCALAR_ADD_LIMIT:
+            # NumPy call overhead outweighs the loop for a handful of values
+            for value in values.tolist():
+                self.add(value)
+            return
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return
+        positive = values[values > MIN_VALUE]
+        negative = -values[values < -MIN_VALUE]
+        for store, magnitudes in ((self._positive, positive), (self._negative, negative)):
+            if len(magnitudes):
+                store.add_many(np.ceil(np.log(magnitudes) * self._multiplier).astype(np.int64))
+        self.zero_count += float(len(values) - len(positive) - len(negative))
+        self.count += float(len(values))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile ``q`` (NaN when empty)."""
+        return self.quantiles((q,))[0]
+
+    def quantiles(self, qs: Sequence[float]) -> list[float]:
+        """Values at quantiles ``qs``, found with one cumulative sum over the bins."""
+        if self.count <= 0:
+            return [math.nan] * len(qs)
+
+        # Bins in ascending value order: negatives (highest key first), zero, positives
+        negative = np.frombuffer(self._negative.counts, dtype=np.float64)
+        positive = np.frombuffer(self._positive.counts, dtype=np.float64)
+        cumulative = np.cumsum(np.concatenate((negative[::-1], [self.zero_count], positive)))
+        ranks = np.clip(np.asarray(qs, dtype=np.float64), 0.0, 1.0) * (self.count - 1)
+        indices = np.searchsorted(cumulative, ranks, side="right").tolist()
+
+        results = []
+        zero_index = len(negative)
+        for index in indices:
+            if index < zero_index:
+                value = -self._value(self._negative.offset + zero_index - 1 - index)
+            elif index == zero_index:
+                value = 0.0
+            elif index < len(cumulative):
+                value = self._value(self._positive.offset + index - zero_index - 1)
+            else:
+                value = self.max
+            results.append(min(max(value, self.min), self.max))
+        return results
+
+    def merge(self, other: "DDSketch") -> None:
+        """Add another sketch's counts into this one."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(
+                "Cannot merge sketches with different relative accuracy "
+                f"({self.relative_accuracy} and {other.relative_accuracy})"
+            )
+        for store, source in ((self._positive, other._positive), (self._negative, other._negative)):
+            if source.counts:
+                counts = np.frombuffer(source.counts, dtype=np.float64)
+                store.add_many(np.arange(len(counts)) + source.offset, counts)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def scale(self, factor: float) -> None:
+        """Multiply every count by ``factor`` (e.g. 0.5 to age out old values)."""
+        self._positive.scale(factor)
+        self._negative.scale(factor)
+        self.zero_count *= factor
+        self.count *= factor
+
+    def to_bytes(self) -> bytes:
+        """Compact little-endian binary form (see ``from_bytes``)."""
+        positive = self._positive.counts
+        negative = self._negative.counts
+        header = _HEADER.pack(
+            _MAGIC,
+            _VERSION,
+            self.relative_accuracy,
+            self.max_bins,
+            self.count,
+            self.zero_count,
+            self.min,
+            self.max,
+            self._positive.offset,
+            len(positive),
+            self._negative.offset,
+            len(negative),
+        )
+        return header + _little_endian(positive) + _little_endian(negative)
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview) -> "DDSketch":
+        """Rebuild a sketch written by ``to_bytes``."""
+        return read_sketch(memoryview(data))[0]
+
+
+def _little_endian(counts: array) -> bytes:
+    if sys.byteorder == "little":
+        return counts.tobytes()
+    swapped = array("d", counts)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+def _read_counts(data: memoryview, length: int) -> array:
+    counts = array("d")
+    counts.frombytes(data[: 8 * length])
+    if sys.byteorder != "little":
+        counts.byteswap()
+    return counts
+
+
+def read_sketch(data: memoryview) -> tuple[DDSketch, int]:
+    """Parse one sketch from the start of ``data``; return it and the bytes consumed."""
+    if len(data) < _HEADER.size:
+        raise ValueError("Truncated sketch")
+    (
+        magic,
+        version,
+        relative_accuracy,
+        max_bins,
+        count,
+        zero_count,
+        minimum,
+        maximum,
+        positive_offset,
+        positive_len,
+        negative_offset,
+        negative_len,
+    ) = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Not a sketch (bad magic or version)")
+    size = _HEADER.size + 8 * (positive_len + negative_len)
+    if len(data) < size:
+        raise ValueError("Truncated sketch")
+
+    sketch = DDSketch(relative_accuracy, max_bins)
+    sketch.count = count
+    sketch.zero_count = zero_count
+    sketch.min = minimum
+    sketch.max = maximum
+    sketch._positive.offset = positive_offset
+    sketch._positive.counts = _read_counts(data[_HEADER.size :], positive_len)
+    sketch._negative.offset = negative_offset
+    sketch._negative.counts = _read_counts(data[_HEADER.size + 8 * positive_len :], negative_len)
+    return sketch, size
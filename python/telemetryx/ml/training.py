@@ -0,0 +1,124 @@
+"""Offline model training over historical events.
+
+Training reads events from PostgreSQL, expecting an ``events`` table with
+the ``Event`` fields the models use:
+
+    CREATE TABLE events (
+        id TEXT PRIMARY KEY,
+        source TEXT NOT NULL,
+        event_type TEXT NOT NULL,
+        timestamp BIGINT NOT NULL,  -- Unix ms, as in Event.timestamp
+        value DOUBLE PRECISION NOT NULL
+    );
+
+Models are written to the model directory as a new version (see
+``telemetryx.ml.registry``), which running servers pick up on their next
+refresh. Run it with ``python -m telemetryx.ml train``.
+
+Example:
+    batch = await fetch_events(since_ms, event_type="checkout_latency")
+    version = train_isolation_forest("models", "checkout", batch, ["value", "hour_sin"])
+"""
+
+import asyncio
+from collections.abc import Sequence
+
+import numpy as np
+
+from telemetryx.core import get_logger
+from telemetryx.db import postgres
+from telemetryx.ml.features import FeatureBatch
+from telemetryx.ml.forest import IsolationForest, save_isolation_forest
+
+DEFAULT_FEATURES = ("signed_log", "hour_sin", "hour_cos")
+
+EVENTS_QUERY = """
+SELECT source, event_type, value, timestamp
+FROM events
+WHERE timestamp >= %(since)s
+  AND (%(source)s::text IS NULL OR source = %(source)s)
+  AND (%(event_type)s::text IS NULL OR event_type = %(event_type)s)
+ORDER BY timestamp DESC
+LIMIT %(limit)s
+"""
+
+
+async def fetch_events(
+    since_ms: int,
+    source: str | None = None,
+    event_type: str | None = None,
+    limit: int = 100_000,
+) -> FeatureBatch:
+    """Most recent events since ``since_ms`` (optionally of one source/event type)."""
+    rows = await postgres.execute(
+        EVENTS_QUERY,
+        {"since": since_ms, "source": source, "event_type": event_type, "limit": limit},
+    )
+    return FeatureBatch.from_arrays(
+        [row["value"] for row in rows],
+        [(row["source"], row["event_type"]) for row in rows],
+        [row["timestamp"] for row in rows],
+    )
+
+
+def train_isolation_forest(
+    root: str,
+    name: str,
+    batch: FeatureBatch,
+    features: Sequence[str] = DEFAULT_FEATURES,
+    trees: int = 100,
+    sample_size: int = 256,
+    seed: int = 0,
+) -> int:
+    """Fit an isolation forest on ``batch`` and store it as a new version of ``name``.
+
+    Returns:
+        The stored version
+    """
+    matrix = batch.matrix(features)
+    forest = IsolationForest.fit(matrix, trees=trees, sample_size=sample_size, seed=seed)
+    finite = matrix[np.isfinite(matrix).all(axis=1)]
+    version = save_isolation_forest(
+        root,
+        name,
+        forest,
+        features,
+        forest.scores(finite),
+        {"training_events": len(finite), "seed": seed},
+        seed=seed,
+    )
+    get_logger(__name__).info(
+        "Model trained",
+        model=name,
+        version=version,
+        kind="isolation_forest",
+        events=len(finite),
+        trees=trees,
+        nodes=forest.nodes,
+    )
+    return version
+
+
+async def train_from_database(
+    root: str,
+    name: str,
+    since_ms: int,
+    source: str | None = None,
+    event_type: str | None = None,
+    limit: int = 100_000,
+    features: Sequence[str] = DEFAULT_FEATURES,
+    trees: int = 100,
+    sample_size: int = 256,
+    seed: int = 0,
+) -> int:
+    """Fetch training events from PostgreSQL and train an isolation forest on them."""
+    await postgres.init_pool()
+    try:
+        batch = await fetch_events(since_ms, source, event_type, limit)
+    finally:
+        await postgres.close_pool()
+    if not len(batch):
+        raise ValueError("No events matched the training query")
+    return await asyncio.to_thread(
+        train_isolation_forest, root, name, batch, features, trees, sample_size, seed
+    )
@@ -25,19 +25,25 @@ _sym_db = _symbol_database.Default()
 from telemetryx.proto import common_pb2 as common__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0f\x61nalytics.proto\x12\ntelemetryx\x1a\x0c\x63ommon.proto\"d\n\x16\x44\x65tectAnomaliesRequest\x12!\n\x06\x65vents\x18\x01 \x03(\x0b\x32\x11.telemetryx.Event\x12\x12\n\nmodel_name\x18\x02 \x01(\t\x12\x13\n\x0bsensitivity\x18\x03 \x01(\x01\"`\n\x17\x44\x65tectAnomaliesResponse\x12*\n\x07results\x18\x01 \x03(\x0b\x32\x19.telemetryx.AnomalyResult\x12\x19\n\x11inference_time_ms\x18\x02 \x01(\x03\"a\n\rAnomalyResult\x12\x10\n\x08\x65vent_id\x18\x01 \x01(\t\x12\x12\n\nis_anomaly\x18\x02 \x01(\x08\x12\x15\n\ranomaly_score\x18\x03 \x01(\x01\x12\x13\n\x0b\x65xplanation\x18\x04 \x01(\t2\xbe\x01\n\x10\x41nalyticsService\x12Z\n\x0f\x44\x65tectAnomalies\x12\".telemetryx.DetectAnomaliesRequest\x1a#.telemetryx.DetectAnomaliesResponse\x12N\n\x0bHealthCheck\x12\x1e.telemetryx.HealthCheckRequest\x1a\x1f.telemetryx.HealthCheckResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0f\x61nalytics.proto\x12\ntelemetryx\x1a\x0c\x63ommon.proto\"d\n\x16\x44\x65tectAnomaliesRequest\x12!\n\x06\x65vents\x18\x01 \x03(\x0b\x32\x11.telemetryx.Event\x12\x12\n\nmodel_name\x18\x02 \x01(\t\x12\x13\n\x0bsensitivity\x18\x03 \x01(\x01\"\xb6\x02\n\x17\x44\x65tectAnomaliesResponse\x12*\n\x07results\x18\x01 \x03(\x0b\x32\x19.telemetryx.AnomalyResult\x12\x19\n\x11inference_time_ms\x18\x02 \x01(\x03\x12\x19\n\x11inference_time_us\x18\x03 \x01(\x03\x12Q\n\x10stage_timings_us\x18\x04 \x03(\x0b\x32\x37.telemetryx.DetectAnomaliesResponse.StageTimingsUsEntry\x12/\n\x0erate_anomalies\x18\x05 \x03(\x0b\x32\x17.telemetryx.RateAnomaly\x1a\x35\n\x13StageTimingsUsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x03:\x02\x38\x01\"a\n\rAnomalyResult\x12\x10\n\x08\x65vent_id\x18\x01 \x01(\t\x12\x12\n\nis_anomaly\x18\x02 \x01(\x08\x12\x15\n\ranomaly_score\x18\x03 \x01(\x01\x12\x13\n\x0b\x65xplanation\x18\x04 \x01(\t\"\xa8\x01\n\x0bRateAnomaly\x12\x0e\n\x06source\x18\x01 \x01(\t\x12\x12\n\nevent_type\x18\x02 \x01(\t\x12\x14\n\x0cwindow_start\x18\x03 \x01(\x03\x12\x12\n\nwindow_end\x18\x04 \x01(\x03\x12\r\n\x05\x63ount\x18\x05 \x01(\x03\x12\x10\n\x08\x65xpected\x18\x06 \x01(\x01\x12\x15\n\ranomaly_score\x18\x07 \x01(\x01\x12\x13\n\x0b\x65xplanation\x18\x08 \x01(\t2\xbe\x01\n\x10\x41nalyticsService\x12Z\n\x0f\x44\x65tectAnomalies\x12\".telemetryx.DetectAnomaliesRequest\x1a#.telemetryx.DetectAnomaliesResponse\x12N\n\x0bHealthCheck\x12\x1e.telemetryx.HealthCheckRequest\x1a\x1f.telemetryx.HealthCheckResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'analytics_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
+  _globals['_DETECTANOMALIESRESPONSE_STAGETIMINGSUSENTRY']._loaded_options = None
+  _globals['_DETECTANOMALIESRESPONSE_STAGETIMINGSUSENTRY']._serialized_options = b'8\001'
   _globals['_DETECTANOMALIESREQUEST']._serialized_start=45
   _globals['_DETECTANOMALIESREQUEST']._serialized_end=145
-  _globals['_DETECTANOMALIESRESPONSE']._serialized_start=147
-  _globals['_DETECTANOMALIESRESPONSE']._serialized_end=243
-  _globals['_ANOMALYRESULT']._serialized_start=245
-  _globals['_ANOMALYRESULT']._serialized_end=342
-  _globals['_ANALYTICSSERVICE']._serialized_start=345
-  _globals['_ANALYTICSSERVICE']._serialized_end=535
+  _globals['_DETECTANOMALIESRESPONSE']._serialized_start=148
+  _globals['_DETECTANOMALIESRESPONSE']._serialized_end=458
+  _globals['_DETECTANOMALIESRESPONSE_STAGETIMINGSUSENTRY']._serialized_start=405
+  _globals['_DETECTANOMALIESRESPONSE_STAGETIMINGSUSENTRY']._serialized_end=458
+  _globals['_ANOMALYRESULT']._serialized_start=460
+  _globals['_ANOMALYRESULT']._serialized_end=557
+  _globals['_RATEANOMALY']._serialized_start=560
+  _globals['_RATEANOMALY']._serialized_end=728
+  _globals['_ANALYTICSSERVICE']._serialized_start=731
+  _globals['_ANALYTICSSERVICE']._serialized_end=921
 # @@protoc_insertion_point(module_scope)
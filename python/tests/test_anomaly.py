@@ -0,0 +1,294 @@
+"""Tests for streaming anomaly detectors."""
+
+import math
+import random
+import statistics
+
+import pytest
+
+from telemetryx.ml.anomaly import (
+    NOT_SCORED,
+    EwmaDetector,
+    QuantileDetector,
+    SeriesIndex,
+    anomaly_score,
+    sensitivity_tail,
+    sensitivity_threshold,
+)
+from telemetryx.ml.features import FeatureBatch
+
+
+class TestSensitivity:
+    """Tests for the sensitivity and score mappings."""
+
+    def test_threshold_range(self) -> None:
+        """Higher sensitivity gives a lower threshold; inputs are clamped to [0, 1]."""
+        assert sensitivity_threshold(0.0) == 5.0
+        assert sensitivity_threshold(0.5) == 3.0
+        assert sensitivity_threshold(1.0) == 1.0
+        assert sensitivity_threshold(7.0) == 1.0
+        assert sensitivity_threshold(-1.0) == 5.0
+
+    def test_tail_range(self) -> None:
+        """Higher sensitivity gives a wider tail, interpolated geometrically."""
+        assert sensitivity_tail(0.0) == pytest.approx(0.0001)
+        assert sensitivity_tail(1.0) == pytest.approx(0.05)
+        assert sensitivity_tail(0.0) < sensitivity_tail(0.5) < sensitivity_tail(1.0)
+
+    def test_score_crosses_half_at_threshold(self) -> None:
+        """Scores are symmetric in z and equal 0.5 exactly at the threshold."""
+        assert anomaly_score(3.0, 3.0) == 0.5
+        assert anomaly_score(-3.0, 3.0) == 0.5
+        assert anomaly_score(1.0, 3.0) < 0.5 < anomaly_score(6.0, 3.0) < 1.0
+
+
+class TestSeriesIndex:
+    """Tests for SeriesIndex."""
+
+    def test_dense_slots_and_capacity(self) -> None:
+        """Slots are allocated in order and new keys are refused when full."""
+        index = SeriesIndex(capacity=2)
+
+        assert index.slot(("a", "x")) == 0
+        assert index.slot(("b", "x")) == 1
+        assert index.slot(("a", "x")) == 0
+        assert index.slot(("c", "x")) is None
+        assert len(index) == 2
+
+
+class TestEwmaDetector:
+    """Tests for EwmaDetector."""
+
+    def test_warmup_is_exact_running_statistics(self) -> None:
+        """Until 1/n drops below alpha, state is the plain mean and population std."""
+        detector = EwmaDetector(alpha=0.01, warmup=100)
+        values = [3.0, 7.0, 1.0, 9.0, 4.0]
+        for value in values:
+            detector.score("api", "latency", value, threshold=3.0)
+
+        count, mean, std = detector.state("api", "latency")
+        assert count == 5
+        assert mean == pytest.approx(statistics.fmean(values))
+        assert std == pytest.approx(statistics.pstdev(values))
+
+    def test_not_flagged_during_warmup(self) -> None:
+        """Series cannot be flagged before they have seen ``warmup`` values."""
+        detector = EwmaDetector(warmup=10)
+        for _ in range(9):
+            detector.score("api", "latency", 1.0, threshold=3.0)
+
+        assert detector.score("api", "latency", 1e6, threshold=3.0).is_anomaly is False
+        assert detector.score("api", "latency", 1e9, threshold=3.0).is_anomaly is True
+
+    def test_flags_spike_against_its_own_series(self) -> None:
+        """Each (source, event_type) pair is scored against its own history only."""
+        detector = EwmaDetector(warmup=20)
+        for i in range(200):
+            detector.score("api", "latency", 100.0 + (i % 10), threshold=3.0)
+            detector.score("db", "latency", 5000.0 + (i % 10), threshold=3.0)
+
+        spike = detector.score("api", "latency", 5000.0, threshold=3.0)
+        normal = detector.score("db", "latency", 5004.0, threshold=3.0)
+
+        assert spike.is_anomaly and spike.z > 3.0
+        assert not normal.is_anomaly
+        assert "standard deviations" in spike.explain(5000.0)
+
+    def test_adapts_to_level_shift(self) -> None:
+        """After a sustained shift the new level stops being anomalous."""
+        detector = EwmaDetector(alpha=0.1, warmup=10)
+        for i in range(100):
+            detector.score("api", "rate", 10.0 + (i % 3), threshold=3.0)
+        for i in range(100):
+            detection = detector.score("api", "rate", 50.0 + (i % 3), threshold=3.0)
+
+        assert not detection.is_anomaly
+        assert math.isclose(detector.state("api", "rate")[1], 51.0, abs_tol=1.0)
+
+    def test_capacity_limits_series(self) -> None:
+        """Events of series beyond capacity are not scored or tracked."""
+        detector = EwmaDetector(warmup=1, max_series=1)
+        detector.score("a", "x", 1.0, threshold=3.0)
+        detection = detector.score("b", "x", 1e9, threshold=3.0)
+
+        assert detection.is_anomaly is False
+        assert len(detector) == 1
+        assert detector.state("b", "x") is None
+
+    def test_clear_and_nbytes(self) -> None:
+        """State size grows with series and clear() forgets them."""
+        detector = EwmaDetector()
+        empty = detector.nbytes
+        for i in range(1000):
+            detector.score(f"source-{i}", "metric", float(i), threshold=3.0)
+
+        assert len(detector) == 1000
+        assert detector.nbytes > empty + 1000 * 24
+
+        detector.clear()
+        assert len(detector) == 0
+        assert detector.state("source-0", "metric") is None
+
+    def test_batch_matches_sequential_scoring(self) -> None:
+        """score_batch gives the same scores and state as scoring events one by one."""
+        rng = random.Random(5)
+        keys = [(f"source-{rng.randrange(20)}", "latency") for _ in range(3_000)]
+        values = [rng.gauss(100.0, 10.0) * (8.0 if rng.random() < 0.01 else 1.0) for _ in keys]
+        sequential = EwmaDetector(alpha=0.1, warmup=5)
+        batched = EwmaDetector(alpha=0.1, warmup=5)
+
+        for half in (slice(0, 1_500), slice(1_500, None)):
+            expected = [
+                sequential.score(*key, value, 3.0) for key, value in zip(keys[half], values[half])
+            ]
+            result = batched.score_batch(FeatureBatch.from_arrays(values[half], keys[half]), 3.0)
+
+            assert result.is_anomaly.tolist() == [d.is_anomaly for d in expected]
+            assert result.z.tolist() == pytest.approx([d.z for d in expected], abs=1e-6)
+
+        for key in set(keys):
+            count, mean, std = batched.state(*key)
+            assert (count, mean) == pytest.approx(sequential.state(*key)[:2])
+            assert std == pytest.approx(sequential.state(*key)[2], rel=1e-6)
+
+    def test_batch_capacity_and_explanations(self) -> None:
+        """Batches count rejected series and rebuild per-event detections."""
+        detector = EwmaDetector(warmup=3, max_series=1)
+        keys = [("a", "x")] * 10 + [("b", "x")]
+        values = [1.0, 2.0, 1.0, 2.0, 1.0, 2.0, 1.0, 2.0, 1.0, 50.0, 7.0]
+
+        result = detector.score_batch(FeatureBatch.from_arrays(values, keys), 3.0)
+
+        assert result.is_anomaly.tolist() == [False] * 9 + [True, False]
+        assert "standard deviations" in result.detection(9).explain(50.0)
+        assert len(detector) == 1
+
+    def test_non_finite_values_are_skipped(self) -> None:
+        """NaN and infinite values are not scored and do not poison the state."""
+        history = [100.0 + i % 5 for i in range(50)]
+        keys = [("api", "latency")] * 54
+        values = [*history, math.nan, math.inf, -math.inf, 100_000.0]
+        sequential = EwmaDetector(warmup=10)
+        batched = EwmaDetector(warmup=10)
+
+        expected = [sequential.score(*key, value, 3.0) for key, value in zip(keys, values)]
+        result = batched.score_batch(FeatureBatch.from_arrays(values, keys), 3.0)
+
+        assert [d.is_anomaly for d in expected[-4:]] == [False, False, False, True]
+        assert result.is_anomaly[-4:].tolist() == [False, False, False, True]
+        assert result.score[-4:-1].tolist() == [0.0, 0.0, 0.0]
+        assert batched.state("api", "latency")[0] == 51
+        assert math.isfinite(batched.state("api", "latency")[1])
+        assert sequential.state("api", "latency") == pytest.approx(batched.state("api", "latency"))
+
+    def test_rejects_invalid_alpha(self) -> None:
+        """alpha must be in (0, 1]."""
+        with pytest.raises(ValueError):
+            EwmaDetector(alpha=0.0)
+
+
+class TestQuantileDetector:
+    """Tests for QuantileDetector."""
+
+    @staticmethod
+    def feed(detector: QuantileDetector, values: list[float], source: str = "api") -> None:
+        tail = detector.threshold(0.5)
+        for value in values:
+            detector.score(source, "latency", value, tail)
+
+    def test_heavy_tail_is_not_flagged(self) -> None:
+        """Values inside a heavy-tailed distribution's band pass; far outliers do not."""
+        rng = random.Random(11)
+        detector = QuantileDetector(warmup=100)
+        self.feed(detector, [rng.paretovariate(1.5) * 10 for _ in range(5_000)])
+        tail = detector.threshold(0.5)
+
+        typical = detector.score("api", "latency", 15.0, tail)
+        outlier = detector.score("api", "latency", 1e6, tail)
+
+        assert not typical.is_anomaly and typical.score < 0.5
+        assert outlier.is_anomaly and outlier.score > 0.5
+        assert outlier.low is not None and outlier.high is not None
+        assert "expected range" in outlier.explain(1e6)
+
+    def test_not_flagged_during_warmup(self) -> None:
+        """Series cannot be flagged before they have seen ``warmup`` values."""
+        detector = QuantileDetector(warmup=50)
+        self.feed(detector, [10.0] * 49)
+
+        assert detector.score("api", "latency", 1e9, 0.01).is_anomaly is False
+        assert detector.score("api", "latency", 1e9, 0.01).is_anomaly is True
+
+    def test_window_halves_counts(self) -> None:
+        """Sketch counts are halved at twice the window, bounding history."""
+        detector = QuantileDetector(window=100)
+        self.feed(detector, [1.0] * 500)
+
+        assert detector.sketch("api", "latency").count < 200
+
+    def test_memory_per_series_bounded(self) -> None:
+        """Each sketch keeps at most max_bins bins per sign."""
+        detector = QuantileDetector(max_bins=32, warmup=1)
+        self.feed(detector, [1.2**i for i in range(300)] + [-(1.2**i) for i in range(300)])
+
+        assert len(detector.sketch("api", "latency")) <= 64
+
+    def test_merge_across_workers(self) -> None:
+        """Detectors from different processes combine series by series."""
+        left, right = QuantileDetector(), QuantileDetector()
+        self.feed(left, [1.0, 2.0, 3.0], source="api")
+        self.feed(right, [4.0, 5.0], source="api")
+        self.feed(right, [7.0], source="db")
+
+        left.merge(right)
+
+        assert left.sketch("api", "latency").count == 5
+        assert left.sketch("db", "latency").count == 1
+
+    def test_checkpoint_round_trip(self) -> None:
+        """restore() rebuilds every series from a checkpoint."""
+        detector = QuantileDetector()
+        self.feed(detector, [float(i) for i in range(1, 200)], source="api")
+        self.feed(detector, [5.0], source="ünïcode")
+
+        restored = QuantileDetector()
+        restored.restore(detector.checkpoint())
+
+        assert len(restored) == 2
+        original = detector.sketch("api", "latency")
+        assert restored.sketch("api", "latency").quantiles((0.5, 0.9)) == original.quantiles(
+            (0.5, 0.9)
+        )
+        assert restored.sketch("ünïcode", "latency").count == 1
+
+    def test_batch_scores_against_band_before_batch(self) -> None:
+        """score_batch flags outliers of warmed-up series and adds every value."""
+        detector = QuantileDetector(warmup=100)
+        self.feed(detector, [10.0 + i % 7 for i in range(200)])
+        keys = [("api", "latency")] * 3 + [("new", "latency")]
+        batch = FeatureBatch.from_arrays([12.0, 1000.0, 11.0, 1e9], keys)
+
+        result = detector.score_batch(batch, detector.threshold(0.5))
+
+        assert result.is_anomaly.tolist() == [False, True, False, False]
+        assert "expected range" in result.detection(1).explain(1000.0)
+        assert detector.sketch("api", "latency").count == 203
+        assert detector.sketch("new", "latency").count == 1
+
+    def test_non_finite_values_are_skipped(self) -> None:
+        """NaN and infinite values are not scored and never reach the sketches."""
+        detector = QuantileDetector(warmup=100)
+        self.feed(detector, [10.0 + i % 7 for i in range(200)])
+        keys = [("api", "latency")] * 4
+        batch = FeatureBatch.from_arrays([math.inf, math.nan, -math.inf, 1000.0], keys)
+
+        result = detector.score_batch(batch, detector.threshold(0.5))
+
+        assert result.is_anomaly.tolist() == [False, False, False, True]
+        assert detector.score("api", "latency", math.inf, 0.01) == NOT_SCORED
+        assert detector.sketch("api", "latency").count == 201
+
+    def test_restore_rejects_garbage(self) -> None:
+        """Data that is not a checkpoint is refused."""
+        with pytest.raises(ValueError):
+            QuantileDetector().restore(b"not a checkpoint")
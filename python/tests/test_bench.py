@@ -0,0 +1,300 @@
+"""Tests for the benchmarking tools."""
+
+import random
+from collections import Counter
+
+import grpc
+import pytest
+
+from telemetryx.bench.histogram import LatencyHistogram
+from telemetryx.bench.history import BenchHistory, extract_metrics
+from telemetryx.bench.loadgen import LoadConfig, LoadGenerator, synthetic_events
+from telemetryx.bench.micro import Benchmark, measure, run_suite, synthetic_rules
+from telemetryx.bench.workload import Workload, WorkloadConfig
+from telemetryx.grpc_server.handlers import AnalyticsServiceHandler, RulesServiceHandler
+from telemetryx.proto import analytics_pb2_grpc, rules_pb2_grpc
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram."""
+
+    def test_percentiles_within_relative_error(self) -> None:
+        """Percentiles are accurate to the configured precision."""
+        rng = random.Random(1)
+        values = sorted(rng.randint(0, 2_000_000) for _ in range(20_000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for percentile in (50, 90, 99, 99.9):
+            exact = values[round(percentile / 100 * len(values)) - 1]
+            assert histogram.percentile(percentile) == pytest.approx(exact, rel=0.01)
+
+    def test_small_values_are_exact(self) -> None:
+        """Values below the sub-bucket count get their own bucket."""
+        histogram = LatencyHistogram()
+        for value in (1, 2, 3, 100):
+            histogram.record(value)
+
+        assert histogram.percentile(50) == 2
+        assert histogram.percentile(100) == 100
+        assert histogram.min == 1
+
+    def test_clamps_large_values(self) -> None:
+        """Values above max_value are clamped rather than dropped."""
+        histogram = LatencyHistogram(max_value=1000)
+        histogram.record(10**9)
+
+        assert histogram.count == 1
+        assert histogram.max == 1000
+
+    def test_merge(self) -> None:
+        """Merging combines counts and extremes."""
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(10)
+        b.record(5000)
+        a.merge(b)
+
+        assert a.count == 2
+        assert (a.min, a.max) == (10, 5000)
+
+    def test_merge_rejects_different_layout(self) -> None:
+        """Histograms with different bucket layouts cannot be merged."""
+        with pytest.raises(ValueError):
+            LatencyHistogram().merge(LatencyHistogram(precision_bits=3))
+
+    def test_empty(self) -> None:
+        """An empty histogram reports zeros."""
+        assert LatencyHistogram().summary()["p99"] == 0
+
+
+class TestLoadGenerator:
+    """Tests for the open-loop load generator."""
+
+    @pytest.fixture
+    async def target(self) -> str:
+        """Serve both services on an ephemeral port."""
+        server = grpc.aio.server()
+        rules_pb2_grpc.add_RulesServiceServicer_to_server(RulesServiceHandler(), server)
+        analytics_pb2_grpc.add_AnalyticsServiceServicer_to_server(AnalyticsServiceHandler(), server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        await server.start()
+        yield f"127.0.0.1:{port}"
+        await server.stop(0)
+
+    @pytest.mark.parametrize("rpc", ["evaluate", "detect"])
+    async def test_sends_at_fixed_rate(self, target: str, rpc: str) -> None:
+        """Every scheduled request is sent and its latency recorded."""
+        config = LoadConfig(
+            target=target, rpc=rpc, rate=200, duration=0.25, warmup=0.05, channels=2, batch_size=10
+        )
+        result = await LoadGenerator(config).run()
+        summary = result.to_dict()
+
+        assert result.sent == 50
+        assert summary["codes"] == {"OK": 50}
+        assert summary["latency_ms"]["count"] == 50
+        assert summary["latency_ms"]["p50"] > 0
+
+    def test_rejects_unknown_rpc(self) -> None:
+        """Only the supported RPCs can be driven."""
+        with pytest.raises(ValueError):
+            LoadGenerator(LoadConfig(rpc="ping"))
+
+    def test_synthetic_events_are_reproducible(self) -> None:
+        """The same seed produces the same events."""
+        first, second = synthetic_events(seed=7), synthetic_events(seed=7)
+
+        assert [first(i).source for i in range(20)] == [second(i).source for i in range(20)]
+
+
+class TestMicrobenchmarks:
+    """Tests for the in-process microbenchmark suite."""
+
+    async def test_measure_reports_per_event_cost(self) -> None:
+        """A benchmark yields time and allocation figures per event."""
+        buffers: list[bytes] = []
+
+        async def body() -> None:
+            buffers.clear()
+            for _ in range(10):
+                buffers.append(bytes(1000))
+
+        result = await measure(Benchmark("test.alloc", body, 10), repeat=2, min_time=0.001)
+
+        assert result.ns_per_event > 0
+        assert result.alloc_bytes_per_event >= 1000
+        assert result.to_dict()["benchmark"] == "test.alloc"
+
+    def test_suite_filter(self) -> None:
+        """Only benchmarks matching the filter are built and run."""
+        results = run_suite(quick=True, name_filter="dsl", repeat=1, min_time=0.001)
+
+        assert [r.params["rules"] for r in results] == [10, 100, 1000]
+        assert all(r.name == "dsl.evaluate_condition" for r in results)
+
+    def test_synthetic_rules_cover_compound_conditions(self) -> None:
+        """Generated rule sets include and/or groups."""
+        rules = synthetic_rules(200)
+
+        assert any(rule.and_ for rule in rules)
+        assert any(rule.or_ for rule in rules)
+
+
+class TestWorkload:
+    """Tests for the realistic workload generator."""
+
+    def test_reproducible(self) -> None:
+        """The same seed yields the same stream."""
+        first = Workload(WorkloadConfig(seed=3)).batch(500)
+        second = Workload(WorkloadConfig(seed=3)).batch(500)
+
+        assert first.columns() == second.columns()
+
+    def test_sources_are_skewed(self) -> None:
+        """Zipf keys concentrate traffic on the hottest source."""
+        batch = Workload(WorkloadConfig(sources=100, source_skew=1.2)).batch(5_000)
+        counts = Counter(batch.sources)
+
+        assert counts.most_common(1)[0][0] == "service-0"
+        assert counts["service-0"] > 10 * counts.get("service-99", 0)
+
+    def test_uniform_when_skew_is_zero(self) -> None:
+        """A zero exponent spreads traffic evenly."""
+        batch = Workload(WorkloadConfig(sources=10, source_skew=0.0)).batch(10_000)
+        counts = Counter(batch.sources)
+
+        assert max(counts.values()) < 1.3 * min(counts.values())
+
+    def test_anomalies_are_labelled_outliers(self) -> None:
+        """Injected anomalies are metric events far from their source baseline."""
+        config = WorkloadConfig(anomaly_rate=0.2, anomaly_magnitude=8.0)
+        batch = Workload(config).batch(5_000)
+        columns = batch.columns()
+
+        anomalies = [i for i, label in enumerate(batch.is_anomaly) if label]
+        assert anomalies
+        assert all(columns["event_type"][i] == "metric" for i in anomalies)
+        assert {columns["anomaly_kind"][i] for i in anomalies} <= {"spike", "dip"}
+
+    def test_timestamps_follow_rate(self) -> None:
+        """Arrivals are ordered and match the configured mean rate."""
+        config = WorkloadConfig(base_rate=100.0, diurnal_amplitude=0.0, burst_rate=0.0)
+        batch = Workload(config).batch(2_000)
+        span_s = (batch.timestamps[-1] - batch.timestamps[0]) / 1000
+
+        assert batch.timestamps == sorted(batch.timestamps)
+        assert span_s == pytest.approx(20.0, rel=0.15)
+
+    def test_output_formats(self) -> None:
+        """Batches convert to dicts and proto events with the same content."""
+        batch = Workload(WorkloadConfig(attribute_cardinality={"region": 3})).batch(10)
+        dicts, events = batch.to_dicts(), batch.to_events()
+
+        assert len(batch) == len(dicts) == len(events) == 10
+        assert events[4].source == dicts[4]["source"]
+        assert set(dicts[0]["attributes"]) == {"user_id", "region"}
+        assert "is_anomaly" not in dicts[0]
+
+    def test_event_generator_continues_stream(self) -> None:
+        """The loadgen adapter yields distinct consecutive events."""
+        generate = Workload().event_generator(chunk=4)
+
+        assert [generate(i).id for i in range(6)] == [f"evt-{i}" for i in range(6)]
+
+
+def micro_output(ns: float, fingerprint: str = "machine-a") -> dict:
+    """A minimal micro suite output."""
+    return {
+        "benchmarks": [
+            {
+                "benchmark": "dsl.evaluate_condition",
+                "params": {"rules": 10},
+                "ns_per_event": ns,
+                "alloc_bytes_per_event": 100.0,
+            }
+        ],
+        "environment": {"git_sha": "abc", "fingerprint": fingerprint, "max_rss_kb": 1000},
+    }
+
+
+def load_output(throughput: float, p99: float) -> dict:
+    """A minimal load test output."""
+    return {
+        "benchmark": "grpc.evaluate",
+        "config": {"rate": 100.0, "batch_size": 1, "channels": 2},
+        "throughput_rps": throughput,
+        "latency_ms": {"p50": 1.0, "p99": p99, "p999": p99 * 2},
+        "environment": {"git_sha": "abc", "fingerprint": "machine-a"},
+    }
+
+
+class TestBenchHistory:
+    """Tests for the benchmark history store."""
+
+    @pytest.fixture
+    def history(self) -> BenchHistory:
+        """In-memory history database."""
+        history = BenchHistory(":memory:")
+        yield history
+        history.close()
+
+    def test_extracts_micro_and_load_metrics(self) -> None:
+        """Both output formats flatten to benchmark/metric pairs."""
+        micro = extract_metrics(micro_output(500.0))
+        load = extract_metrics(load_output(100.0, 5.0))
+
+        assert micro["dsl.evaluate_condition[rules=10]"]["ns_per_event"] == 500.0
+        assert micro["process"]["max_rss_kb"] == 1000.0
+        key = "grpc.evaluate[batch_size=1,channels=2,rate=100.0]"
+        assert load[key]["latency_ms.p99"] == 5.0
+        assert load[key]["throughput_rps"] == 100.0
+
+    def test_flags_regression(self, history: BenchHistory) -> None:
+        """A slowdown beyond the threshold is a regression."""
+        baseline = history.record(micro_output(500.0), label="main")
+        candidate = history.record(micro_output(600.0))
+
+        report = history.compare(history.resolve("main"), history.resolve("latest"))
+
+        assert (baseline, candidate) == (report.baseline.id, report.candidate.id)
+        assert [(c.benchmark, c.metric) for c in report.regressions] == [
+            ("dsl.evaluate_condition[rules=10]", "ns_per_event")
+        ]
+        assert "1 regression(s)" in report.format()
+
+    def test_direction_depends_on_metric(self, history: BenchHistory) -> None:
+        """Lower throughput regresses; lower latency improves."""
+        baseline = history.record(load_output(1000.0, 10.0))
+        candidate = history.record(load_output(800.0, 5.0))
+
+        statuses = {c.metric: c.status for c in history.compare(baseline, candidate).comparisons}
+
+        assert statuses["throughput_rps"] == "regression"
+        assert statuses["latency_ms.p99"] == "improvement"
+
+    def test_noisy_metrics_get_wider_threshold(self, history: BenchHistory) -> None:
+        """Historical variance on the same machine widens the noise band."""
+        for ns in (400.0, 600.0, 450.0, 550.0):
+            history.record(micro_output(ns))
+        baseline = history.record(micro_output(500.0))
+        candidate = history.record(micro_output(600.0))
+
+        comparison = next(
+            c
+            for c in history.compare(baseline, candidate).comparisons
+            if c.metric == "ns_per_event"
+        )
+
+        assert comparison.threshold > 0.2
+        assert comparison.status == "unchanged"
+
+    def test_resolve_unknown(self, history: BenchHistory) -> None:
+        """Unknown run references raise KeyError."""
+        with pytest.raises(KeyError):
+            history.resolve("missing")
+
+    def test_rejects_empty_output(self, history: BenchHistory) -> None:
+        """Outputs without results are not recorded."""
+        with pytest.raises(ValueError):
+            history.record({"environment": {"fingerprint": "x"}})
@@ -0,0 +1,75 @@
+"""Tests for request deadline propagation."""
+
+import asyncio
+
+import pytest
+
+from telemetryx.core import deadline
+from telemetryx.core.exceptions import DeadlineExceededError
+
+
+class TestDeadlineScope:
+    """Tests for deadline_scope and time_remaining."""
+
+    def test_no_deadline_by_default(self) -> None:
+        """Outside any scope there is no deadline."""
+        assert deadline.time_remaining() is None
+        assert deadline.expired() is False
+
+    def test_scope_sets_and_restores_deadline(self) -> None:
+        """The deadline applies only inside the scope."""
+        with deadline.deadline_scope(10.0):
+            remaining = deadline.time_remaining()
+            assert remaining is not None
+            assert 9.0 < remaining <= 10.0
+
+        assert deadline.time_remaining() is None
+
+    def test_none_timeout_means_unbounded(self) -> None:
+        """A None timeout leaves the request unbounded."""
+        with deadline.deadline_scope(None):
+            assert deadline.time_remaining() is None
+
+    def test_nested_scope_cannot_extend_deadline(self) -> None:
+        """Inner scopes only tighten the outer deadline."""
+        with deadline.deadline_scope(1.0):
+            with deadline.deadline_scope(100.0):
+                remaining = deadline.time_remaining()
+                assert remaining is not None
+                assert remaining <= 1.0
+
+    def test_expired(self) -> None:
+        """A non-positive timeout is expired immediately."""
+        with deadline.deadline_scope(0.0):
+            assert deadline.expired() is True
+
+
+class TestBounded:
+    """Tests for bounding async work by the current deadline."""
+
+    async def test_unbounded_work_runs(self) -> None:
+        """Without a deadline the block runs normally."""
+        async with deadline.bounded("test.unbounded"):
+            await asyncio.sleep(0)
+
+    async def test_expired_deadline_skips_work(self) -> None:
+        """An already-expired deadline fails fast and counts abandoned work."""
+        before = deadline.abandoned_counts().get("test.expired", 0)
+        ran = False
+
+        with deadline.deadline_scope(-1.0):
+            with pytest.raises(DeadlineExceededError):
+                async with deadline.bounded("test.expired"):
+                    ran = True
+
+        assert ran is False
+        assert deadline.abandoned_counts()["test.expired"] == before + 1
+
+    async def test_work_cancelled_when_deadline_expires(self) -> None:
+        """Work still running at the deadline is cancelled."""
+        with deadline.deadline_scope(0.01):
+            with pytest.raises(DeadlineExceededError):
+                async with deadline.bounded("test.slow"):
+                    await asyncio.sleep(1.0)
+
+        assert deadline.abandoned_counts()["test.slow"] >= 1
@@ -0,0 +1,75 @@
+"""Tests for event feature extraction."""
+
+import numpy as np
+import pytest
+
+from telemetryx.ml.features import FeatureBatch, segment
+from telemetryx.proto import common_pb2
+
+
+class TestFeatureBatch:
+    """Tests for FeatureBatch."""
+
+    def test_from_events(self) -> None:
+        """Events become value/timestamp columns and (source, event_type) keys."""
+        events = [
+            common_pb2.Event(source="api", event_type="latency", timestamp=5, value=1.5),
+            common_pb2.Event(source="db", event_type="error", timestamp=7),
+        ]
+
+        batch = FeatureBatch.from_events(events)
+
+        assert len(batch) == 2
+        assert batch.values.tolist() == [1.5, 0.0]
+        assert batch.timestamps.tolist() == [5, 7]
+        assert batch.keys == [("api", "latency"), ("db", "error")]
+
+    def test_matrix(self) -> None:
+        """Named features become columns; time features follow the UTC clock."""
+        six_am_monday = 4 * 86_400_000 + 6 * 3_600_000  # 1970-01-05 was a Monday
+        batch = FeatureBatch.from_arrays(
+            [-9.0, 3.0], [("a", "b")] * 2, [six_am_monday, six_am_monday + 12 * 3_600_000]
+        )
+
+        matrix = batch.matrix(["value", "signed_log", "hour_sin", "weekday_sin"])
+
+        assert matrix.shape == (2, 4)
+        assert matrix[:, 0].tolist() == [-9.0, 3.0]
+        assert matrix[:, 1] == pytest.approx([-np.log(10.0), np.log(4.0)])
+        assert matrix[:, 2] == pytest.approx([1.0, -1.0])
+        assert matrix[0, 3] == pytest.approx(np.sin(2 * np.pi * 0.25 / 7))
+
+    def test_matrix_unknown_feature(self) -> None:
+        """Unknown feature names are rejected."""
+        with pytest.raises(ValueError, match="Unknown feature"):
+            FeatureBatch.from_arrays([1.0], [("a", "b")]).matrix(["nope"])
+
+
+class TestSegment:
+    """Tests for segment."""
+
+    def test_groups_by_slot_then_time(self) -> None:
+        """Runs are per slot, ordered by timestamp, skipping untracked events."""
+        slots = np.array([2, 0, 2, -1, 0, 2])
+        timestamps = np.array([30, 20, 10, 0, 10, 20])
+
+        runs = segment(slots, timestamps)
+
+        assert runs.order.tolist() == [4, 1, 2, 5, 0]
+        assert runs.series.tolist() == [0, 2]
+        assert runs.lengths.tolist() == [2, 3]
+        assert runs.rank.tolist() == [0, 1, 0, 1, 2]
+        assert runs.ends.tolist() == [1, 4]
+
+    def test_equal_timestamps_keep_request_order(self) -> None:
+        """The sort is stable."""
+        runs = segment(np.array([1, 1, 1]), np.zeros(3, dtype=np.int64))
+
+        assert runs.order.tolist() == [0, 1, 2]
+
+    def test_empty(self) -> None:
+        """No tracked events give no runs."""
+        runs = segment(np.array([-1, -1]), np.array([1, 2]))
+
+        assert len(runs.order) == 0
+        assert len(runs.series) == 0
@@ -0,0 +1,198 @@
+"""Tests for the isolation forest."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from telemetryx.grpc_server.handlers import AnalyticsServiceHandler
+from telemetryx.ml.features import FeatureBatch
+from telemetryx.ml.forest import (
+    IsolationForest,
+    IsolationForestDetector,
+    average_path_length,
+    save_isolation_forest,
+)
+from telemetryx.ml.registry import ModelRegistry, load_artifact, save_model
+from telemetryx.ml.training import fetch_events, train_isolation_forest
+from telemetryx.proto import analytics_pb2, common_pb2
+
+
+def recursive_path(forest: IsolationForest, row: np.ndarray, node: int, depth: int = 0) -> float:
+    """Reference path length of one row in one tree."""
+    feature = forest.feature[node]
+    if feature < 0:
+        return depth + float(average_path_length(forest.size[node]))
+    child = forest.right[node] if row[feature] >= forest.threshold[node] else forest.left[node]
+    return recursive_path(forest, row, child, depth + 1)
+
+
+@pytest.fixture
+def training() -> np.ndarray:
+    return np.random.default_rng(0).normal(size=(2000, 2))
+
+
+class TestIsolationForest:
+    """Tests for IsolationForest."""
+
+    def test_average_path_length(self) -> None:
+        """c(n) is 0 for a single point, 1 for two, and grows like 2 ln n."""
+        assert average_path_length(np.array([0, 1, 2])).tolist() == [0.0, 0.0, 1.0]
+        assert float(average_path_length(256)) == pytest.approx(10.24, abs=0.01)
+
+    def test_fit_layout(self, training: np.ndarray) -> None:
+        """Children come in pairs and trees stop at depth log2(sample_size)."""
+        forest = IsolationForest.fit(training, trees=20, sample_size=64)
+
+        internal = forest.feature >= 0
+        assert len(forest) == 20
+        assert (forest.right[internal] == forest.left[internal] + 1).all()
+        assert (forest.left[~internal] == -1).all()
+        assert forest.depth.max() == 6
+        assert (forest.size[forest.roots] == 64).all()
+        # Each split divides its node's samples between the children
+        assert (
+            forest.size[forest.left[internal]] + forest.size[forest.right[internal]]
+            == forest.size[internal]
+        ).all()
+
+    def test_level_wise_walk_matches_recursion(self, training: np.ndarray) -> None:
+        """The vectorized walk gives the same mean path as walking each tree."""
+        forest = IsolationForest.fit(training, trees=10, sample_size=128)
+        rows = np.vstack([training[:300], [[np.nan, 0.0], [50.0, -50.0]]])
+
+        expected = [
+            np.mean([recursive_path(forest, row, root) for root in forest.roots]) for row in rows
+        ]
+
+        assert forest.path_lengths(rows) == pytest.approx(expected)
+
+    def test_outliers_score_higher(self, training: np.ndarray) -> None:
+        """Points far from the training data are isolated sooner."""
+        forest = IsolationForest.fit(training, trees=50)
+
+        inlier, outlier = forest.scores(np.array([[0.0, 0.0], [6.0, -6.0]]))
+
+        assert inlier < 0.5 < outlier
+
+    def test_fit_rejects_bad_input(self) -> None:
+        """Training needs a 2-D matrix with finite rows."""
+        with pytest.raises(ValueError):
+            IsolationForest.fit(np.zeros(10))
+        with pytest.raises(ValueError):
+            IsolationForest.fit(np.full((5, 2), np.nan))
+
+
+class TestIsolationForestDetector:
+    """Tests for serving stored forests."""
+
+    def store(self, root: Path, training: np.ndarray) -> None:
+        forest = IsolationForest.fit(training, trees=50)
+        save_isolation_forest(
+            root, "forest", forest, ["value", "hour_sin"], forest.scores(training)
+        )
+
+    async def test_round_trip_through_registry(self, tmp_path: Path, training: np.ndarray) -> None:
+        """Stored forests load memory-mapped and flag outlying values."""
+        # Training events all at midnight, like the test batch (hour_sin == 0)
+        self.store(tmp_path, np.column_stack([training[:, 0], np.zeros(len(training))]))
+        detector = await ModelRegistry(tmp_path).get("forest")
+        assert isinstance(detector, IsolationForestDetector)
+        assert isinstance(detector.forest.table, np.memmap)
+        assert isinstance(detector.forest.leaf_path, np.memmap)
+
+        batch = FeatureBatch.from_arrays([0.1, 8.0], [("api", "latency")] * 2)
+        detections = detector.score_batch(batch, detector.threshold(0.5))
+
+        assert detections.is_anomaly.tolist() == [False, True]
+        assert detections.score[1] > 0.5
+        assert "isolated after" in detections.detection(1).explain(8.0)
+        assert detector.score("api", "latency", 8.0, detector.threshold(0.5)).is_anomaly
+
+    def test_inference_walks_the_mapped_arrays(self, tmp_path: Path, training: np.ndarray) -> None:
+        """Scoring reads the stored table and leaf paths, not copies made on load."""
+        self.store(tmp_path, training)
+        forest = IsolationForest.from_artifact(load_artifact(tmp_path, "forest"))
+        rows = training[:5]
+        assert not (forest.path_lengths(rows) == 3.0).all()
+
+        # Writes through another mapping of the file show up in the walk
+        stored = np.load(tmp_path / "forest" / "1" / "leaf_path.npy", mmap_mode="r+")
+        stored[:] = 3.0
+        stored.flush()
+
+        assert forest.path_lengths(rows) == pytest.approx(np.full(5, 3.0))
+
+    def test_versions_without_inference_arrays(self, tmp_path: Path, training: np.ndarray) -> None:
+        """Forests stored with only node arrays derive the inference arrays on load."""
+        forest = IsolationForest.fit(training, trees=10)
+        arrays = {name: getattr(forest, name) for name in IsolationForest.ARRAYS}
+        save_model(tmp_path, "old", "isolation_forest", arrays, {"sample_size": forest.sample_size})
+
+        loaded = IsolationForest.from_artifact(load_artifact(tmp_path, "old"))
+
+        assert loaded.path_lengths(training[:20]) == pytest.approx(
+            forest.path_lengths(training[:20])
+        )
+
+    def test_threshold_follows_sensitivity(self, training: np.ndarray) -> None:
+        """Higher sensitivity gives a lower score threshold."""
+        forest = IsolationForest.fit(training, trees=20)
+        detector = IsolationForestDetector(
+            forest, ["value", "signed_log"], np.sort(forest.scores(training))
+        )
+
+        assert detector.threshold(0.0) > detector.threshold(0.5) > detector.threshold(1.0)
+        assert len(detector) == 0
+
+    async def test_handler_selects_forest_by_model_name(
+        self, tmp_path: Path, training: np.ndarray
+    ) -> None:
+        """DetectAnomalies scores with the stored forest named in the request."""
+        batch = FeatureBatch.from_arrays(training[:, 0], [("api", "latency")] * len(training))
+        train_isolation_forest(str(tmp_path), "latency", batch, ["value"], trees=50)
+        handler = AnalyticsServiceHandler(models=ModelRegistry(tmp_path))
+        request = analytics_pb2.DetectAnomaliesRequest(
+            events=[common_pb2.Event(id="ok", value=0.2), common_pb2.Event(id="odd", value=9.0)],
+            model_name="latency",
+        )
+
+        response = await handler.DetectAnomalies(request, context=None)
+
+        assert [r.is_anomaly for r in response.results] == [False, True]
+        assert "isolated after" in response.results[1].explanation
+
+
+class TestTraining:
+    """Tests for offline training."""
+
+    async def test_fetch_events(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Query rows become a FeatureBatch."""
+        calls = []
+
+        async def execute(query: str, params: dict) -> list[dict]:
+            calls.append(params)
+            return [
+                {"source": "api", "event_type": "latency", "value": 1.5, "timestamp": 10},
+                {"source": "api", "event_type": "latency", "value": 2.5, "timestamp": 20},
+            ]
+
+        monkeypatch.setattr("telemetryx.db.postgres.execute", execute)
+
+        batch = await fetch_events(5, event_type="latency", limit=10)
+
+        assert calls == [{"since": 5, "source": None, "event_type": "latency", "limit": 10}]
+        assert batch.values.tolist() == [1.5, 2.5]
+        assert batch.timestamps.tolist() == [10, 20]
+        assert batch.keys == [("api", "latency")] * 2
+
+    def test_train_stores_new_versions(self, tmp_path: Path, training: np.ndarray) -> None:
+        """Each training run stores the next version with its parameters."""
+        batch = FeatureBatch.from_arrays(training[:, 0], [("api", "latency")] * len(training))
+
+        assert train_isolation_forest(str(tmp_path), "m", batch, ["value"], trees=5) == 1
+        assert train_isolation_forest(str(tmp_path), "m", batch, ["value"], trees=5) == 2
+        artifact = load_artifact(tmp_path, "m")
+        assert artifact.params["features"] == ["value"]
+        assert artifact.params["trees"] == 5
+        assert artifact.params["training_events"] == len(training)
@@ -1,7 +1,13 @@
 """Tests for gRPC service handlers."""
 
+import asyncio
+
+import grpc
 import pytest
+from structlog.testing import capture_logs
 
+from telemetryx.core.deadline import abandoned_counts
+from telemetryx.core.exceptions import AnomalyDetectionError
 from telemetryx.grpc_server.handlers import (
     AnalyticsServiceHandler,
     RulesServiceHandler,
@@ -9,6 +15,24 @@ from telemetryx.grpc_server.handlers import (
 from telemetryx.proto import analytics_pb2, common_pb2, rules_pb2
 
 
+class AbortCalled(Exception):
+    """Raised by ExpiredContext.abort, mirroring grpc.aio.AbortError."""
+
+
+class ExpiredContext:
+    """Servicer context whose deadline has already passed."""
+
+    def __init__(self) -> None:
+        self.code: grpc.StatusCode | None = None
+
+    def time_remaining(self) -> float:
+        return -0.5
+
+    async def abort(self, code: grpc.StatusCode, details: str = "", trailing_metadata=()) -> None:
+        self.code = code
+        raise AbortCalled(details)
+
+
 class TestRulesServiceHandler:
     """Tests for RulesServiceHandler."""
 
@@ -40,6 +64,7 @@ class TestRulesServiceHandler:
         # Verify response structure
         assert isinstance(response, rules_pb2.EvaluateResponse)
         assert response.evaluation_time_ms >= 0
+        assert response.evaluation_time_us >= response.evaluation_time_ms * 1000
 
     @pytest.mark.asyncio
     async def test_evaluate_error_event_matches_rule(
@@ -83,6 +108,25 @@ class TestRulesServiceHandler:
 
         assert len(response.matches) == 0
 
+    @pytest.mark.asyncio
+    async def test_evaluate_expired_deadline_is_dropped(
+        self,
+        handler: RulesServiceHandler,
+        sample_error_event_data: dict,
+    ) -> None:
+        """Requests whose deadline already passed are not evaluated."""
+        before = abandoned_counts().get("RulesService.EvaluateEvent", 0)
+        request = rules_pb2.EvaluateRequest(
+            event=common_pb2.Event(id=sample_error_event_data["id"], event_type="error")
+        )
+        context = ExpiredContext()
+
+        with pytest.raises(AbortCalled):
+            await handler.EvaluateEvent(request, context=context)
+
+        assert context.code == grpc.StatusCode.DEADLINE_EXCEEDED
+        assert abandoned_counts()["RulesService.EvaluateEvent"] == before + 1
+
 
 class TestAnalyticsServiceHandler:
     """Tests for AnalyticsServiceHandler."""
@@ -116,27 +160,170 @@ class TestAnalyticsServiceHandler:
         assert len(response.results) == 1
         assert response.results[0].event_id == sample_event_data["id"]
         assert response.inference_time_ms >= 0
+        assert response.inference_time_us >= response.inference_time_ms * 1000
 
     @pytest.mark.asyncio
-    async def test_detect_anomalies_flags_errors(
+    async def test_detect_anomalies_flags_spikes(
         self,
         handler: AnalyticsServiceHandler,
-        sample_error_event_data: dict,
     ) -> None:
-        """Error events should be flagged as anomalies (placeholder logic)."""
-        request = analytics_pb2.DetectAnomaliesRequest(
-            events=[
+        """A value far outside its series' history is flagged; the history is not."""
+        history = [
+            common_pb2.Event(id=f"evt-{i}", source="api", event_type="latency", value=100.0 + i % 5)
+            for i in range(50)
+        ]
+        spike = common_pb2.Event(id="spike", source="api", event_type="latency", value=500.0)
+        request = analytics_pb2.DetectAnomaliesRequest(events=[*history, spike])
+
+        response = await handler.DetectAnomalies(request, context=None)
+
+        assert not any(r.is_anomaly for r in response.results[:-1])
+        assert response.results[-1].is_anomaly is True
+        assert response.results[-1].anomaly_score > 0.5
+        assert "standard deviations" in response.results[-1].explanation
+
+    @pytest.mark.asyncio
+    async def test_detect_anomalies_quantile_model(
+        self,
+        handler: AnalyticsServiceHandler,
+    ) -> None:
+        """model_name selects the quantile detector (bands come from earlier batches)."""
+        history = [
+            common_pb2.Event(id=f"evt-{i}", source="api", event_type="latency", value=10.0 + i % 7)
+            for i in range(200)
+        ]
+        spike = common_pb2.Event(id="spike", source="api", event_type="latency", value=1000.0)
+        await handler.DetectAnomalies(
+            analytics_pb2.DetectAnomaliesRequest(events=history, model_name="quantile"),
+            context=None,
+        )
+
+        response = await handler.DetectAnomalies(
+            analytics_pb2.DetectAnomaliesRequest(events=[spike], model_name="quantile"),
+            context=None,
+        )
+
+        assert response.results[0].is_anomaly is True
+        assert "expected range" in response.results[0].explanation
+
+    @pytest.mark.asyncio
+    async def test_detect_anomalies_seasonal_model(
+        self,
+        handler: AnalyticsServiceHandler,
+    ) -> None:
+        """model_name selects the seasonal detector, which buckets by event time."""
+        hour_ms = 3_600_000
+        history = [
+            common_pb2.Event(
+                id=f"evt-{i}",
+                source="web",
+                event_type="requests",
+                timestamp=i * hour_ms,
+                value=100.0 + 50.0 * (i % 24 >= 9) + i % 3,
+            )
+            for i in range(24 * 7)
+        ]
+        spike = common_pb2.Event(
+            id="spike", source="web", event_type="requests", timestamp=24 * 7 * hour_ms, value=150.0
+        )
+
+        response = await handler.DetectAnomalies(
+            analytics_pb2.DetectAnomaliesRequest(events=[*history, spike], model_name="seasonal"),
+            context=None,
+        )
+
+        assert not any(r.is_anomaly for r in response.results[24 * 3 : -1])
+        assert response.results[-1].is_anomaly is True
+
+    @pytest.mark.asyncio
+    async def test_detect_anomalies_rate_model(
+        self,
+        handler: AnalyticsServiceHandler,
+    ) -> None:
+        """model_name "rate" reports windows whose event count dropped."""
+        minute_ms = 60_000
+
+        def minute(start: int, event_type: str, count: int) -> list[common_pb2.Event]:
+            return [
                 common_pb2.Event(
-                    id=sample_error_event_data["id"],
-                    event_type=sample_error_event_data["event_type"],
+                    id=f"{event_type}-{start}-{i}",
+                    source="web",
+                    event_type=event_type,
+                    timestamp=start * minute_ms + i * minute_ms // count,
                 )
-            ],
+                for i in range(count)
+            ]
+
+        events = []
+        for start in range(30):
+            events += minute(start, "heartbeat", 10)
+            if start != 25:
+                events += minute(start, "page_view", 40)
+        events.sort(key=lambda event: event.timestamp)
+
+        with capture_logs() as logs:
+            response = await handler.DetectAnomalies(
+                analytics_pb2.DetectAnomaliesRequest(events=events, model_name="rate"),
+                context=None,
+            )
+
+        assert len(response.results) == len(events)
+        # The window is counted once, apart from the events that report it
+        [complete] = [log for log in logs if log["event"] == "Detection complete"]
+        assert complete["window_anomaly_count"] == 1
+        flagged = sum(r.is_anomaly for r in response.results)
+        assert complete["anomaly_count"] == flagged
+        [anomaly] = response.rate_anomalies
+        assert (anomaly.event_type, anomaly.count) == ("page_view", 0)
+        assert anomaly.window_start == 25 * minute_ms
+        assert anomaly.window_end == 26 * minute_ms
+        assert anomaly.expected == pytest.approx(40.0)
+        assert "0 page_view events from web" in anomaly.explanation
+
+    @pytest.mark.asyncio
+    async def test_detect_anomalies_rate_backfill_yields(
+        self,
+        handler: AnalyticsServiceHandler,
+    ) -> None:
+        """A batch spanning hours of event time yields to the loop between parts."""
+        minute_ms = 60_000
+        events = [
+            common_pb2.Event(
+                id=f"e-{i}", source="web", event_type="page_view", timestamp=i * 30_000
+            )
+            for i in range(3 * 60 * 2)
+        ]
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker = asyncio.create_task(tick())
+        await asyncio.sleep(0)
+        before = ticks
+        response = await handler.DetectAnomalies(
+            analytics_pb2.DetectAnomaliesRequest(events=events, model_name="rate"),
+            context=None,
         )
+        ticker.cancel()
 
-        response = await handler.DetectAnomalies(request, context=None)
+        assert len(response.results) == len(events)
+        # 180 one-minute windows closed at most a few per part
+        assert ticks - before >= 180 * minute_ms // (8 * minute_ms)
 
-        assert response.results[0].is_anomaly is True
-        assert response.results[0].anomaly_score > 0.5
+    @pytest.mark.asyncio
+    async def test_detect_anomalies_unknown_model(
+        self,
+        handler: AnalyticsServiceHandler,
+    ) -> None:
+        """Unknown model names are rejected."""
+        request = analytics_pb2.DetectAnomaliesRequest(model_name="missing")
+
+        with pytest.raises(AnomalyDetectionError):
+            await handler.DetectAnomalies(request, context=None)
 
     @pytest.mark.asyncio
     async def test_detect_anomalies_empty_events(
@@ -149,3 +336,21 @@ class TestAnalyticsServiceHandler:
         response = await handler.DetectAnomalies(request, context=None)
 
         assert len(response.results) == 0
+
+    @pytest.mark.asyncio
+    async def test_detect_anomalies_expired_deadline_abandons_batch(
+        self,
+        handler: AnalyticsServiceHandler,
+    ) -> None:
+        """An expired batch is dropped and every event counted as abandoned."""
+        before = abandoned_counts().get("AnalyticsService.DetectAnomalies", 0)
+        request = analytics_pb2.DetectAnomaliesRequest(
+            events=[common_pb2.Event(id=f"evt-{i}") for i in range(5)],
+        )
+        context = ExpiredContext()
+
+        with pytest.raises(AbortCalled):
+            await handler.DetectAnomalies(request, context=context)
+
+        assert context.code == grpc.StatusCode.DEADLINE_EXCEEDED
+        assert abandoned_counts()["AnalyticsService.DetectAnomalies"] == before + 5
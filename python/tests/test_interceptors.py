@@ -0,0 +1,554 @@
+"""Tests for gRPC server interceptors."""
+
+import asyncio
+from typing import Any
+
+import grpc
+import pytest
+from structlog.testing import capture_logs
+
+from telemetryx.core.timing import SERVER_TIMING_KEY, stage
+from telemetryx.core.tracing import (
+    BatchSpanProcessor,
+    InMemorySpanExporter,
+    SpanKind,
+    Tracer,
+    current_span,
+    span,
+)
+from telemetryx.grpc_server.admission import AdaptiveConcurrencyLimiter, LimiterConfig
+from telemetryx.grpc_server.interceptors import (
+    RPC_DURATION,
+    RPC_IN_FLIGHT,
+    RPC_REQUESTS,
+    AdmissionControlInterceptor,
+    LoadReportingInterceptor,
+    LoggingInterceptor,
+    MetricsInterceptor,
+    SchedulingInterceptor,
+    TimingInterceptor,
+    TracingInterceptor,
+)
+from telemetryx.grpc_server.scheduler import Lane, LaneConfig, PriorityScheduler
+from telemetryx.proto import common_pb2, rules_pb2
+
+
+class AbortCalled(Exception):
+    """Raised by FakeContext.abort, mirroring grpc.aio.AbortError."""
+
+
+class FakeContext:
+    """Minimal stand-in for grpc.aio.ServicerContext."""
+
+    def __init__(self) -> None:
+        self._code: grpc.StatusCode | None = None
+        self._details = ""
+        self._trailing_metadata: tuple[tuple[str, str], ...] = ()
+
+    def code(self) -> grpc.StatusCode | None:
+        return self._code
+
+    def details(self) -> str:
+        return self._details
+
+    def trailing_metadata(self) -> tuple[tuple[str, str], ...]:
+        return self._trailing_metadata
+
+    def set_trailing_metadata(self, metadata: tuple[tuple[str, str], ...]) -> None:
+        self._trailing_metadata = tuple(metadata)
+
+    async def abort(
+        self,
+        code: grpc.StatusCode,
+        details: str = "",
+        trailing_metadata: tuple[tuple[str, str], ...] = (),
+    ) -> None:
+        self._code = code
+        self._details = details
+        self._trailing_metadata = trailing_metadata
+        raise AbortCalled(details)
+
+
+class FakeCallDetails:
+    """Minimal stand-in for grpc.HandlerCallDetails."""
+
+    def __init__(self, method: str, metadata: tuple[tuple[str, str], ...] = ()) -> None:
+        self.method = method
+        self.invocation_metadata = metadata
+
+
+async def intercept(
+    interceptor: grpc.aio.ServerInterceptor,
+    method: str,
+    behavior: Any,
+) -> grpc.RpcMethodHandler:
+    """Run an interceptor against a unary-unary behavior."""
+
+    async def continuation(details: Any) -> grpc.RpcMethodHandler:
+        return grpc.unary_unary_rpc_method_handler(behavior)
+
+    return await interceptor.intercept_service(continuation, FakeCallDetails(method))
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Tests for the gradient concurrency limiter."""
+
+    def test_rejects_beyond_limit(self) -> None:
+        """Calls beyond the current limit are rejected."""
+        limiter = AdaptiveConcurrencyLimiter(LimiterConfig(initial_limit=2, min_limit=1))
+
+        assert limiter.try_acquire() is True
+        assert limiter.try_acquire() is True
+        assert limiter.try_acquire() is False
+        assert limiter.rejected == 1
+
+        limiter.release(0.01)
+        assert limiter.try_acquire() is True
+
+    def test_limit_grows_under_stable_latency(self) -> None:
+        """A saturated method with stable latency gets a larger limit."""
+        limiter = AdaptiveConcurrencyLimiter(LimiterConfig(initial_limit=4, max_limit=64))
+
+        for _ in range(50):
+            while limiter.try_acquire():
+                pass
+            while limiter.in_flight:
+                limiter.release(0.01)
+
+        assert limiter.limit > 4
+        assert limiter.limit <= 64
+
+    def test_limit_shrinks_when_latency_rises(self) -> None:
+        """Latency far above the baseline reduces the limit."""
+        limiter = AdaptiveConcurrencyLimiter(LimiterConfig(initial_limit=32, min_limit=2))
+        for _ in range(20):
+            limiter.try_acquire()
+        for _ in range(20):
+            limiter.release(0.01)
+        before = limiter.limit
+
+        for _ in range(5):
+            while limiter.try_acquire():
+                pass
+            while limiter.in_flight:
+                limiter.release(1.0)
+
+        assert limiter.limit < before
+
+    def test_overload_backs_off(self) -> None:
+        """Overload errors trigger a multiplicative decrease."""
+        limiter = AdaptiveConcurrencyLimiter(LimiterConfig(initial_limit=20, backoff_ratio=0.5))
+
+        limiter.try_acquire()
+        limiter.release(0.01, overloaded=True)
+
+        assert limiter.limit == 10
+
+    def test_limit_never_below_minimum(self) -> None:
+        """The limit is clamped to min_limit."""
+        limiter = AdaptiveConcurrencyLimiter(LimiterConfig(initial_limit=8, min_limit=3))
+
+        for _ in range(20):
+            limiter.try_acquire()
+            limiter.release(0.01, overloaded=True)
+
+        assert limiter.limit == 3
+
+
+class TestAdmissionControlInterceptor:
+    """Tests for AdmissionControlInterceptor."""
+
+    async def test_admits_and_returns_response(self) -> None:
+        """Calls within the limit pass through unchanged."""
+        interceptor = AdmissionControlInterceptor()
+
+        async def behavior(request: Any, context: Any) -> str:
+            return f"echo:{request}"
+
+        handler = await intercept(interceptor, "/telemetryx.RulesService/EvaluateEvent", behavior)
+        response = await handler.unary_unary("ping", FakeContext())
+
+        assert response == "echo:ping"
+        assert interceptor.in_flight() == 0
+
+    async def test_rejects_with_resource_exhausted(self) -> None:
+        """Calls beyond the limit are aborted with retry pushback metadata."""
+        interceptor = AdmissionControlInterceptor(LimiterConfig(initial_limit=1, min_limit=1))
+        release = asyncio.Event()
+
+        async def behavior(request: Any, context: Any) -> str:
+            await release.wait()
+            return "done"
+
+        handler = await intercept(interceptor, "/telemetryx.RulesService/EvaluateEvent", behavior)
+        first = asyncio.create_task(handler.unary_unary("a", FakeContext()))
+        await asyncio.sleep(0)
+
+        context = FakeContext()
+        with pytest.raises(AbortCalled):
+            await handler.unary_unary("b", context)
+
+        assert context.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+        assert dict(context.trailing_metadata())["grpc-retry-pushback-ms"].isdigit()
+
+        release.set()
+        assert await first == "done"
+
+    async def test_health_checks_bypass_limiter(self) -> None:
+        """Health check methods are never wrapped."""
+        interceptor = AdmissionControlInterceptor(LimiterConfig(initial_limit=1, min_limit=1))
+
+        async def behavior(request: Any, context: Any) -> str:
+            return "SERVING"
+
+        for method in (
+            "/grpc.health.v1.Health/Check",
+            "/telemetryx.RulesService/HealthCheck",
+        ):
+            handler = await intercept(interceptor, method, behavior)
+            assert handler.unary_unary is behavior
+
+        assert interceptor.limiters == {}
+
+    async def test_limiters_are_per_method(self) -> None:
+        """Saturating one method does not affect another."""
+        interceptor = AdmissionControlInterceptor(LimiterConfig(initial_limit=1, min_limit=1))
+        release = asyncio.Event()
+
+        async def slow(request: Any, context: Any) -> str:
+            await release.wait()
+            return "slow"
+
+        async def fast(request: Any, context: Any) -> str:
+            return "fast"
+
+        slow_handler = await intercept(interceptor, "/svc/Slow", slow)
+        fast_handler = await intercept(interceptor, "/svc/Fast", fast)
+
+        pending = asyncio.create_task(slow_handler.unary_unary(None, FakeContext()))
+        await asyncio.sleep(0)
+
+        assert await fast_handler.unary_unary(None, FakeContext()) == "fast"
+
+        release.set()
+        await pending
+
+    async def test_handler_aborts_back_off_the_limit(self) -> None:
+        """A handler aborting with DEADLINE_EXCEEDED lowers the method's limit."""
+        interceptor = AdmissionControlInterceptor(LimiterConfig(initial_limit=20))
+
+        async def behavior(request: Any, context: Any) -> str:
+            await context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, "Deadline exceeded")
+            return "unreachable"
+
+        handler = await intercept(interceptor, "/svc/Abandoned", behavior)
+        with pytest.raises(AbortCalled):
+            await handler.unary_unary(None, FakeContext())
+
+        assert interceptor.limiters["/svc/Abandoned"].limit < 20
+        assert interceptor.in_flight() == 0
+
+
+class TestLoggingInterceptor:
+    """Tests for LoggingInterceptor."""
+
+    async def test_aborts_log_their_status(self) -> None:
+        """Aborted calls are logged with the abort's code and details."""
+        interceptor = LoggingInterceptor()
+
+        async def behavior(request: Any, context: Any) -> str:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Unknown model: missing")
+            return "unreachable"
+
+        handler = await intercept(interceptor, "/svc/Aborts", behavior)
+        with capture_logs() as logs, pytest.raises(AbortCalled):
+            await handler.unary_unary(None, FakeContext())
+
+        [failed] = [log for log in logs if log["event"] == "RPC failed"]
+        assert failed["status"] == "INVALID_ARGUMENT"
+        assert failed["error"] == "Unknown model: missing"
+
+    async def test_unhandled_errors_are_internal(self) -> None:
+        """Exceptions that set no status are logged as INTERNAL."""
+        interceptor = LoggingInterceptor()
+
+        async def behavior(request: Any, context: Any) -> str:
+            raise ValueError("boom")
+
+        handler = await intercept(interceptor, "/svc/Raises", behavior)
+        with capture_logs() as logs, pytest.raises(ValueError):
+            await handler.unary_unary(None, FakeContext())
+
+        [failed] = [log for log in logs if log["event"] == "RPC failed"]
+        assert (failed["status"], failed["error"]) == ("INTERNAL", "boom")
+
+
+class TestMetricsInterceptor:
+    """Tests for MetricsInterceptor."""
+
+    async def test_records_success(self) -> None:
+        """Successful calls count as OK and record latency."""
+        method = "/test.Metrics/Success"
+        interceptor = MetricsInterceptor()
+
+        async def behavior(request: Any, context: Any) -> str:
+            return "ok"
+
+        handler = await intercept(interceptor, method, behavior)
+        await handler.unary_unary(None, FakeContext())
+        await handler.unary_unary(None, FakeContext())
+
+        assert RPC_REQUESTS.labels(method, "OK").value == 2
+        assert RPC_DURATION.labels(method).count == 2
+        assert RPC_IN_FLIGHT.labels(method).value == 0
+
+    async def test_records_abort_status(self) -> None:
+        """Aborted calls are counted under the status code they set."""
+        method = "/test.Metrics/Abort"
+        interceptor = MetricsInterceptor()
+
+        async def behavior(request: Any, context: FakeContext) -> str:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "bad")
+            return "unreachable"
+
+        handler = await intercept(interceptor, method, behavior)
+        with pytest.raises(AbortCalled):
+            await handler.unary_unary(None, FakeContext())
+
+        assert RPC_REQUESTS.labels(method, "INVALID_ARGUMENT").value == 1
+        assert RPC_REQUESTS.labels(method, "OK").value == 0
+
+    async def test_counts_shed_load(self) -> None:
+        """Calls rejected by admission control show up as RESOURCE_EXHAUSTED."""
+        method = "/test.Metrics/Shed"
+        metrics_interceptor = MetricsInterceptor()
+        admission = AdmissionControlInterceptor(LimiterConfig(initial_limit=1, min_limit=1))
+        release = asyncio.Event()
+
+        async def behavior(request: Any, context: Any) -> str:
+            await release.wait()
+            return "done"
+
+        async def continuation(details: Any) -> grpc.RpcMethodHandler:
+            return await intercept(admission, method, behavior)
+
+        handler = await metrics_interceptor.intercept_service(continuation, FakeCallDetails(method))
+        first = asyncio.create_task(handler.unary_unary(None, FakeContext()))
+        await asyncio.sleep(0)
+        with pytest.raises(AbortCalled):
+            await handler.unary_unary(None, FakeContext())
+        release.set()
+        await first
+
+        assert RPC_REQUESTS.labels(method, "RESOURCE_EXHAUSTED").value == 1
+        assert RPC_REQUESTS.labels(method, "OK").value == 1
+
+
+class TestLoadReportingInterceptor:
+    """Tests for LoadReportingInterceptor."""
+
+    async def test_appends_load_report(self) -> None:
+        """Responses carry the load report without clobbering other trailers."""
+        interceptor = LoadReportingInterceptor(lambda: "TEXT application_utilization=0.5000")
+
+        async def behavior(request: Any, context: FakeContext) -> str:
+            context.set_trailing_metadata((("x-other", "1"),))
+            return "ok"
+
+        handler = await intercept(interceptor, "/svc/Method", behavior)
+        context = FakeContext()
+        await handler.unary_unary(None, context)
+
+        assert context.trailing_metadata() == (
+            ("x-other", "1"),
+            ("endpoint-load-metrics", "TEXT application_utilization=0.5000"),
+        )
+
+
+class TestSchedulingInterceptor:
+    """Tests for SchedulingInterceptor."""
+
+    async def test_releases_slot_after_call(self) -> None:
+        """Calls hold a lane slot only while running."""
+        scheduler = PriorityScheduler()
+        interceptor = SchedulingInterceptor(scheduler)
+
+        async def behavior(request: Any, context: Any) -> str:
+            assert scheduler.active(Lane.INTERACTIVE) == 1
+            return "ok"
+
+        handler = await intercept(interceptor, "/telemetryx.RulesService/EvaluateEvent", behavior)
+
+        assert await handler.unary_unary("a", FakeContext()) == "ok"
+        assert scheduler.active(Lane.INTERACTIVE) == 0
+
+    async def test_rejects_when_lane_full(self) -> None:
+        """Calls arriving at a full lane are aborted with RESOURCE_EXHAUSTED."""
+        scheduler = PriorityScheduler({Lane.INTERACTIVE: LaneConfig(concurrency=1, max_queue=0)})
+        interceptor = SchedulingInterceptor(scheduler)
+        release = asyncio.Event()
+
+        async def behavior(request: Any, context: Any) -> str:
+            await release.wait()
+            return "done"
+
+        handler = await intercept(interceptor, "/telemetryx.RulesService/EvaluateEvent", behavior)
+        first = asyncio.create_task(handler.unary_unary("a", FakeContext()))
+        await asyncio.sleep(0)
+
+        context = FakeContext()
+        with pytest.raises(AbortCalled):
+            await handler.unary_unary("b", context)
+
+        assert context.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+        assert "grpc-retry-pushback-ms" in dict(context.trailing_metadata())
+
+        release.set()
+        assert await first == "done"
+
+
+class TestTimingInterceptor:
+    """Tests for TimingInterceptor."""
+
+    async def _call(self, behavior: Any, context: FakeContext) -> bytes:
+        """Deserialize and handle one request the way grpc.aio does (one task per call)."""
+
+        async def continuation(details: Any) -> grpc.RpcMethodHandler:
+            return grpc.unary_unary_rpc_method_handler(
+                behavior,
+                request_deserializer=rules_pb2.EvaluateRequest.FromString,
+                response_serializer=rules_pb2.EvaluateResponse.SerializeToString,
+            )
+
+        handler = await TimingInterceptor().intercept_service(
+            continuation, FakeCallDetails("/telemetryx.RulesService/EvaluateEvent")
+        )
+        data = rules_pb2.EvaluateRequest(event=common_pb2.Event(id="e1")).SerializeToString()
+
+        async def rpc() -> bytes:
+            request = handler.request_deserializer(data)
+            response = await handler.unary_unary(request, context)
+            assert handler.response_serializer is None
+            return response  # type: ignore[no-any-return]
+
+        return await asyncio.create_task(rpc())
+
+    async def test_reports_stages_in_response_and_trailer(self) -> None:
+        """Stages recorded during the call appear in the response and the trailer."""
+
+        async def behavior(request: Any, context: Any) -> rules_pb2.EvaluateResponse:
+            assert request.event.id == "e1"
+            with stage("evaluate"):
+                await asyncio.sleep(0.002)
+            return rules_pb2.EvaluateResponse()
+
+        context = FakeContext()
+        response = rules_pb2.EvaluateResponse.FromString(await self._call(behavior, context))
+
+        assert set(response.stage_timings_us) == {"deserialize", "evaluate"}
+        assert response.stage_timings_us["evaluate"] >= 2000
+
+        server_timing = dict(context.trailing_metadata())[SERVER_TIMING_KEY]
+        names = [part.split(";")[0] for part in server_timing.split(", ")]
+        assert names == ["deserialize", "evaluate", "serialize", "total"]
+
+    async def test_keeps_other_trailers(self) -> None:
+        """The timing trailer is appended to trailers set by inner layers."""
+
+        async def behavior(request: Any, context: FakeContext) -> rules_pb2.EvaluateResponse:
+            context.set_trailing_metadata((("x-other", "1"),))
+            return rules_pb2.EvaluateResponse()
+
+        context = FakeContext()
+        await self._call(behavior, context)
+
+        keys = [key for key, _ in context.trailing_metadata()]
+        assert keys == ["x-other", SERVER_TIMING_KEY]
+
+    async def test_records_queue_wait(self) -> None:
+        """Time spent waiting for a lane slot is reported as the queue stage."""
+        scheduler = PriorityScheduler({Lane.INTERACTIVE: LaneConfig(concurrency=1, max_queue=1)})
+        await scheduler.acquire(Lane.INTERACTIVE)
+
+        async def behavior(request: Any, context: Any) -> rules_pb2.EvaluateResponse:
+            return rules_pb2.EvaluateResponse()
+
+        scheduled = await intercept(
+            SchedulingInterceptor(scheduler), "/telemetryx.RulesService/EvaluateEvent", behavior
+        )
+        call = asyncio.create_task(self._call(scheduled.unary_unary, FakeContext()))
+        await asyncio.sleep(0.005)
+        scheduler.release(Lane.INTERACTIVE)
+
+        response = rules_pb2.EvaluateResponse.FromString(await call)
+        assert response.stage_timings_us["queue"] >= 4000
+
+
+class TestTracingInterceptor:
+    """Tests for TracingInterceptor."""
+
+    TRACEPARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+    async def _run(
+        self, tracer: Tracer, metadata: tuple[tuple[str, str], ...], behavior: Any
+    ) -> None:
+        async def continuation(details: Any) -> grpc.RpcMethodHandler:
+            return grpc.unary_unary_rpc_method_handler(behavior)
+
+        handler = await TracingInterceptor(tracer).intercept_service(
+            continuation, FakeCallDetails("/telemetryx.RulesService/EvaluateEvent", metadata)
+        )
+        await asyncio.create_task(handler.unary_unary(None, FakeContext()))
+        tracer.processor.flush()
+
+    async def test_continues_callers_trace(self) -> None:
+        """The server span joins the caller's trace and parents inner spans."""
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(BatchSpanProcessor(exporter), sample_rate=0.0)
+
+        async def behavior(request: Any, context: Any) -> str:
+            with span("rules.evaluate"):
+                pass
+            return "ok"
+
+        await self._run(tracer, (("traceparent", self.TRACEPARENT),), behavior)
+
+        child, server = exporter.spans
+        assert server.kind == SpanKind.SERVER
+        assert server.context.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+        assert server.parent_span_id == "00f067aa0ba902b7"
+        assert server.attributes["rpc.method"] == "EvaluateEvent"
+        assert server.attributes["rpc.grpc.status_code"] == 0
+        assert child.parent_span_id == server.context.span_id
+
+    async def test_unsampled_calls_record_nothing(self) -> None:
+        """Calls the caller did not sample run without any span."""
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(BatchSpanProcessor(exporter), sample_rate=1.0)
+
+        async def behavior(request: Any, context: Any) -> str:
+            assert current_span() is None
+            return "ok"
+
+        await self._run(tracer, (("traceparent", self.TRACEPARENT[:-2] + "00"),), behavior)
+
+        assert exporter.spans == []
+
+    async def test_records_abort_status(self) -> None:
+        """Aborted calls end the span with the abort status and an error."""
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(BatchSpanProcessor(exporter), sample_rate=1.0)
+
+        async def behavior(request: Any, context: FakeContext) -> str:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "bad event")
+            return "unreachable"
+
+        with pytest.raises(AbortCalled):
+            await self._run(tracer, (), behavior)
+        tracer.processor.flush()
+
+        (server,) = exporter.spans
+        assert (
+            server.attributes["rpc.grpc.status_code"] == grpc.StatusCode.INVALID_ARGUMENT.value[0]
+        )
+        assert server.error == "AbortCalled: bad event"
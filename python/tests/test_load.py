@@ -0,0 +1,164 @@
+"""Tests for load-aware health status."""
+
+import asyncio
+
+import grpc
+import pytest
+from grpc_health.v1 import health_pb2, health_pb2_grpc
+
+from telemetryx.core import Settings
+from telemetryx.grpc_server.handlers import RulesServiceHandler
+from telemetryx.grpc_server.health import HealthState
+from telemetryx.grpc_server.load import LoadConfig, LoadMonitor, LoadSample
+from telemetryx.grpc_server.server import GrpcServer
+from telemetryx.grpc_server.startup import STARTING
+from telemetryx.proto import common_pb2
+
+
+class TestHealthState:
+    """Tests for HealthState."""
+
+    def test_serving_until_reason_set(self) -> None:
+        """The server is serving only while no reasons are set."""
+        health = HealthState()
+        changes: list[bool] = []
+        health.add_listener(changes.append)
+
+        health.set_not_serving("overload")
+        health.set_not_serving("warming_up")
+        health.clear("overload")
+        assert health.serving is False
+
+        health.clear("warming_up")
+        assert health.serving is True
+        assert changes == [False, True]
+
+
+class TestLoadMonitor:
+    """Tests for LoadMonitor."""
+
+    @pytest.fixture
+    def in_flight(self) -> list[int]:
+        """Mutable in-flight count read by the monitor."""
+        return [0]
+
+    @pytest.fixture
+    def monitor(self, in_flight: list[int]) -> tuple[LoadMonitor, HealthState]:
+        """Monitor with small capacities and a 3-sample overload window."""
+        health = HealthState()
+        monitor = LoadMonitor(
+            health,
+            LoadConfig(max_in_flight=10, max_loop_lag=0.1, overload_samples=3),
+            in_flight=lambda: in_flight[0],
+            db_utilization=lambda: 0.0,
+        )
+        return monitor, health
+
+    def test_utilization_is_most_saturated_signal(
+        self, monitor: tuple[LoadMonitor, HealthState], in_flight: list[int]
+    ) -> None:
+        """Utilization is the maximum of the normalized signals."""
+        load_monitor, _ = monitor
+        in_flight[0] = 5
+
+        sample = load_monitor.record(loop_lag=0.08)
+
+        assert sample.in_flight == 5
+        assert sample.utilization == pytest.approx(0.8)
+
+    def test_sustained_overload_flips_to_not_serving(
+        self, monitor: tuple[LoadMonitor, HealthState], in_flight: list[int]
+    ) -> None:
+        """Health flips only after overload_samples consecutive overloaded samples."""
+        load_monitor, health = monitor
+        in_flight[0] = 20
+
+        load_monitor.record(loop_lag=0.0)
+        load_monitor.record(loop_lag=0.0)
+        assert health.serving is True
+
+        load_monitor.record(loop_lag=0.0)
+        assert health.serving is False
+
+    def test_recovers_after_sustained_low_load(
+        self, monitor: tuple[LoadMonitor, HealthState], in_flight: list[int]
+    ) -> None:
+        """Health flips back once load stays below the recovery threshold."""
+        load_monitor, health = monitor
+        in_flight[0] = 20
+        for _ in range(3):
+            load_monitor.record(loop_lag=0.0)
+
+        in_flight[0] = 9  # between recover threshold and capacity: no change
+        for _ in range(5):
+            load_monitor.record(loop_lag=0.0)
+        assert health.serving is False
+
+        in_flight[0] = 1
+        for _ in range(3):
+            load_monitor.record(loop_lag=0.0)
+        assert health.serving is True
+
+    def test_report_is_orca_text(self, monitor: tuple[LoadMonitor, HealthState]) -> None:
+        """The cached report follows the ORCA TEXT format."""
+        load_monitor, _ = monitor
+        load_monitor.record(loop_lag=0.05)
+
+        report = load_monitor.report
+
+        assert report.startswith("TEXT application_utilization=0.5000")
+        assert "named_metrics.loop_lag_ms=50.00" in report
+
+    def test_orca_text_fields(self) -> None:
+        """All load signals appear in the ORCA report."""
+        text = LoadSample(in_flight=3, queue_depth=7, utilization=0.25).to_orca_text()
+
+        assert "named_metrics.in_flight=3" in text
+        assert "named_metrics.queue_depth=7" in text
+
+
+class TestHandlerHealthCheck:
+    """Handler HealthCheck follows the shared health state."""
+
+    async def test_not_serving_while_overloaded(self) -> None:
+        """HealthCheck reports NOT_SERVING while a reason is set."""
+        health = HealthState()
+        handler = RulesServiceHandler(health)
+        request = common_pb2.HealthCheckRequest()
+
+        health.set_not_serving("overload")
+        response = await handler.HealthCheck(request, context=None)
+        assert response.status == common_pb2.HealthCheckResponse.NOT_SERVING
+
+        health.clear("overload")
+        response = await handler.HealthCheck(request, context=None)
+        assert response.status == common_pb2.HealthCheckResponse.SERVING
+
+
+class TestStandardHealthCheck:
+    """grpc.health.v1 follows the shared health state through the interceptors."""
+
+    async def test_check_follows_health_state(self) -> None:
+        """Check answers through the full interceptor stack and tracks every flip."""
+        server = GrpcServer(Settings(grpc_host="127.0.0.1", grpc_port=0, metrics_enabled=False))
+        await server.start()
+        try:
+            async with grpc.aio.insecure_channel(f"127.0.0.1:{server.port}") as channel:
+                stub = health_pb2_grpc.HealthStub(channel)
+
+                async def status(service: str = "") -> int:
+                    await asyncio.sleep(0)  # Let the published update run
+                    request = health_pb2.HealthCheckRequest(service=service)
+                    return (await stub.Check(request, timeout=5)).status
+
+                assert await status() == health_pb2.HealthCheckResponse.NOT_SERVING
+                server.health.clear(STARTING)
+                assert await status() == health_pb2.HealthCheckResponse.SERVING
+                assert (
+                    await status("telemetryx.AnalyticsService")
+                    == health_pb2.HealthCheckResponse.SERVING
+                )
+                server.health.set_not_serving("overload")
+                assert await status() == health_pb2.HealthCheckResponse.NOT_SERVING
+        finally:
+            await server.stop(0)
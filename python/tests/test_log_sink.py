@@ -0,0 +1,67 @@
+"""Tests for the non-blocking async log sink."""
+
+import io
+import json
+from datetime import datetime
+
+from telemetryx.core.log_sink import AsyncLogSink, enqueue_renderer
+
+
+def read_lines(stream: io.BytesIO) -> list[dict]:
+    """Parse JSON lines written to a stream."""
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+class TestAsyncLogSink:
+    """Tests for AsyncLogSink."""
+
+    def test_writes_events_as_json_lines(self) -> None:
+        """Queued events are rendered as one JSON object per line."""
+        stream = io.BytesIO()
+        sink = AsyncLogSink(stream, flush_interval=0.01)
+        sink.start()
+
+        for i in range(3):
+            sink.enqueue({"event": "hello", "i": i})
+        sink.close()
+
+        assert read_lines(stream) == [{"event": "hello", "i": i} for i in range(3)]
+
+    def test_drops_when_queue_full(self) -> None:
+        """A full queue drops new events and counts them instead of blocking."""
+        stream = io.BytesIO()
+        sink = AsyncLogSink(stream, max_queue=2)
+
+        for i in range(5):
+            sink.enqueue({"event": "x", "i": i})
+
+        assert sink.queue_depth == 2
+        assert sink.dropped == 3
+
+        sink.close()
+        assert [line["i"] for line in read_lines(stream)] == [0, 1]
+
+    def test_unserializable_values_rendered(self) -> None:
+        """Values without a JSON representation fall back to strings."""
+        stream = io.BytesIO()
+        sink = AsyncLogSink(stream)
+
+        sink.enqueue({"event": "when", "at": datetime(2024, 1, 1), "obj": object()})
+        sink.close()
+
+        (line,) = read_lines(stream)
+        assert line["event"] == "when"
+        assert line["at"].startswith("2024-01-01")
+        assert "object" in line["obj"]
+
+    def test_logger_factory_enqueues(self) -> None:
+        """Loggers from the factory enqueue the dict produced by enqueue_renderer."""
+        stream = io.BytesIO()
+        sink = AsyncLogSink(stream)
+        logger = sink.logger_factory()
+
+        args, kwargs = enqueue_renderer(logger, "info", {"event": "rendered"})
+        logger.info(*args, **kwargs)
+        sink.close()
+
+        assert read_lines(stream) == [{"event": "rendered"}]
@@ -0,0 +1,107 @@
+"""Tests for sampled and rate-limited logging."""
+
+import pytest
+import structlog
+
+from telemetryx.core import logging as tx_logging
+from telemetryx.core.logging import LogSampler, RateLimitProcessor, take_dropped_counts
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLogSampler:
+    """Tests for per-call-site sampling."""
+
+    def test_logs_one_in_n(self) -> None:
+        """Only every Nth call is logged, starting with the first."""
+        sampler = LogSampler("test-one-in-n", every=10, slow_ms=1000)
+
+        decisions = [sampler.should_log(duration_ms=1.0) for _ in range(30)]
+
+        assert decisions.count(True) == 3
+        assert decisions[0] is True
+        assert decisions[10] is True
+        assert sampler.dropped == 27
+
+    def test_errors_always_logged(self) -> None:
+        """Errors bypass sampling."""
+        sampler = LogSampler("test-errors", every=1000, slow_ms=1000)
+        sampler.should_log()
+
+        assert all(sampler.should_log(error=True) for _ in range(5))
+
+    def test_slow_calls_always_logged(self) -> None:
+        """Calls over the latency threshold bypass sampling."""
+        sampler = LogSampler("test-slow", every=1000, slow_ms=50)
+        sampler.should_log()
+
+        assert sampler.should_log(duration_ms=10) is False
+        assert sampler.should_log(duration_ms=75) is True
+
+
+class TestRateLimitProcessor:
+    """Tests for the per-logger token bucket."""
+
+    def test_drops_beyond_burst(self) -> None:
+        """Events beyond the burst are dropped until tokens refill."""
+        clock = FakeClock()
+        limiter = RateLimitProcessor(rate=10, burst=3, clock=clock)
+
+        for _ in range(3):
+            limiter(None, "info", {"logger": "hot"})
+        with pytest.raises(structlog.DropEvent):
+            limiter(None, "info", {"logger": "hot"})
+
+        clock.now += 0.1  # one token refilled
+        limiter(None, "info", {"logger": "hot"})
+
+        assert limiter.dropped["hot"] == 1
+
+    def test_buckets_are_per_logger(self) -> None:
+        """Exhausting one logger's bucket does not affect another."""
+        limiter = RateLimitProcessor(rate=1, burst=1, clock=FakeClock())
+
+        limiter(None, "info", {"logger": "a"})
+        with pytest.raises(structlog.DropEvent):
+            limiter(None, "info", {"logger": "a"})
+
+        assert limiter(None, "info", {"logger": "b"}) == {"logger": "b"}
+
+    def test_errors_never_dropped(self) -> None:
+        """Error-level events pass even with an empty bucket."""
+        limiter = RateLimitProcessor(rate=1, burst=1, clock=FakeClock())
+        limiter(None, "info", {"logger": "a"})
+
+        for level in ("error", "exception", "critical"):
+            assert limiter(None, level, {"logger": "a"}) == {"logger": "a"}
+
+
+class TestDropSummary:
+    """Tests for dropped-count summaries."""
+
+    def test_take_dropped_counts_resets(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Counts from samplers and the rate limiter are reported then reset."""
+        limiter = RateLimitProcessor(rate=1, burst=1, clock=FakeClock())
+        monkeypatch.setattr(tx_logging, "_rate_limiter", limiter)
+        take_dropped_counts()
+
+        sampler = LogSampler("test-summary", every=5, slow_ms=1000)
+        for _ in range(5):
+            sampler.should_log()
+        limiter(None, "info", {"logger": "noisy"})
+        with pytest.raises(structlog.DropEvent):
+            limiter(None, "info", {"logger": "noisy"})
+
+        counts = take_dropped_counts()
+
+        assert counts["sampler:test-summary"] == 4
+        assert counts["rate_limit:noisy"] == 1
+        assert take_dropped_counts() == {}
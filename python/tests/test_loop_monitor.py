@@ -0,0 +1,93 @@
+"""Tests for the event-loop lag monitor."""
+
+import asyncio
+import time
+from typing import Any
+
+import grpc
+
+from telemetryx.grpc_server.interceptors import RpcContextInterceptor
+from telemetryx.grpc_server.loop_monitor import LOOP_LAG, LoopMonitor, LoopMonitorConfig
+from telemetryx.grpc_server.rpc_context import current_method
+
+
+class FakeCallDetails:
+    """Minimal stand-in for grpc.HandlerCallDetails."""
+
+    def __init__(self, method: str) -> None:
+        self.method = method
+        self.invocation_metadata = ()
+
+
+def blocking_regex_stand_in(seconds: float) -> None:
+    """Block the event loop (like a pathological regex would)."""
+    time.sleep(seconds)
+
+
+async def run_monitor(monitor: LoopMonitor, body: Any) -> None:
+    task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)
+    try:
+        await body()
+        await asyncio.sleep(0.05)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+class TestLoopMonitor:
+    """Tests for LoopMonitor."""
+
+    async def test_captures_blocking_stack_with_rpc_method(self) -> None:
+        """A blocking call inside an RPC is captured with its stack and method."""
+        monitor = LoopMonitor(LoopMonitorConfig(interval=0.01, stall_threshold=0.05))
+
+        async def behavior(request: Any, context: Any) -> str:
+            assert current_method() == "/telemetryx.RulesService/EvaluateEvent"
+            blocking_regex_stand_in(0.3)
+            return "ok"
+
+        async def continuation(details: Any) -> grpc.RpcMethodHandler:
+            return grpc.unary_unary_rpc_method_handler(behavior)
+
+        handler = await RpcContextInterceptor().intercept_service(
+            continuation, FakeCallDetails("/telemetryx.RulesService/EvaluateEvent")
+        )
+
+        async def body() -> None:
+            await asyncio.create_task(handler.unary_unary(None, None))
+
+        await run_monitor(monitor, body)
+
+        (stall,) = monitor.stalls
+        assert stall.method == "/telemetryx.RulesService/EvaluateEvent"
+        assert stall.blocked_for >= 0.05
+        assert "in blocking_regex_stand_in" in stall.stack[-1]
+        assert current_method() is None
+
+    async def test_stall_outside_rpc_has_no_method(self) -> None:
+        """Blocking code outside any RPC is still captured."""
+        monitor = LoopMonitor(LoopMonitorConfig(interval=0.01, stall_threshold=0.05))
+
+        async def body() -> None:
+            blocking_regex_stand_in(0.2)
+
+        await run_monitor(monitor, body)
+
+        assert len(monitor.stalls) == 1
+        assert monitor.stalls[0].method is None
+
+    async def test_no_stall_when_loop_is_responsive(self) -> None:
+        """Short callbacks are measured as lag but not reported."""
+        monitor = LoopMonitor(LoopMonitorConfig(interval=0.01, stall_threshold=0.2))
+        observations_before = LOOP_LAG.labels().count
+
+        async def body() -> None:
+            for _ in range(5):
+                blocking_regex_stand_in(0.005)
+                await asyncio.sleep(0.01)
+
+        await run_monitor(monitor, body)
+
+        assert monitor.stalls == []
+        assert LOOP_LAG.labels().count > observations_before
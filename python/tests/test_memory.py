@@ -0,0 +1,143 @@
+"""Tests for memory accounting and the memory admin API."""
+
+import gc
+import json
+from typing import Any
+
+import pytest
+
+from telemetryx.core.memory import (
+    GC_PAUSE,
+    AllocationTracker,
+    GcMonitor,
+    approximate_size,
+    register_size_provider,
+    resident_memory_bytes,
+    structure_sizes,
+    unregister_size_provider,
+)
+from telemetryx.grpc_server.memory import memory_routes
+
+# Kept alive at module level so the snapshot diff sees it
+_retained: list[Any] = []
+
+
+def allocate_in_test_module(count: int) -> None:
+    _retained.extend(bytearray(1024) for _ in range(count))
+
+
+class TestGcMonitor:
+    """Tests for GcMonitor."""
+
+    def test_times_collections(self) -> None:
+        """Collections are counted and their pauses recorded in the histogram."""
+        monitor = GcMonitor()
+        before = GC_PAUSE.labels("2").count
+        monitor.install()
+        try:
+            gc.collect()
+        finally:
+            monitor.uninstall()
+
+        stats = monitor.generations[2]
+        assert stats.collections >= 1
+        assert stats.pause_max > 0
+        assert GC_PAUSE.labels("2").count > before
+
+        report = monitor.report()
+        assert report["generations"][2]["collections"] == stats.collections
+        assert len(report["counts"]) == 3
+
+    def test_uninstall_stops_timing(self) -> None:
+        """No collections are recorded after uninstalling."""
+        monitor = GcMonitor()
+        monitor.install()
+        monitor.uninstall()
+        gc.collect()
+        assert monitor.generations[2].collections == 0
+
+
+class TestStructureSizes:
+    """Tests for the size provider registry."""
+
+    def test_reports_registered_providers(self) -> None:
+        """Registered structures are reported; failing providers report 0."""
+        register_size_provider("test.fixed", lambda: 4096)
+        register_size_provider("test.broken", lambda: 1 // 0)
+        try:
+            sizes = structure_sizes()
+        finally:
+            unregister_size_provider("test.fixed")
+            unregister_size_provider("test.broken")
+
+        assert sizes["test.fixed"] == 4096
+        assert sizes["test.broken"] == 0
+        assert "test.fixed" not in structure_sizes()
+
+    def test_approximate_size_grows_with_contents(self) -> None:
+        """Deep size counts nested containers."""
+        small = {"a": [1, 2, 3]}
+        large = {"a": [str(i) * 10 for i in range(1000)]}
+        assert approximate_size(large) > approximate_size(small) + 1000 * 40
+
+    def test_resident_memory(self) -> None:
+        """RSS is a plausible positive number."""
+        assert resident_memory_bytes() > 1024 * 1024
+
+
+class TestAllocationTracker:
+    """Tests for AllocationTracker."""
+
+    def test_diff_groups_growth_by_module(self) -> None:
+        """Allocations made between snapshots are attributed to their module."""
+        tracker = AllocationTracker()
+        try:
+            base = tracker.snapshot()
+            allocate_in_test_module(500)
+            entries = tracker.diff(base)
+        finally:
+            tracker.stop()
+            _retained.clear()
+
+        by_module = {entry.module: entry for entry in entries}
+        assert by_module[__name__].size_diff > 500 * 1024
+        assert not tracker.tracing
+
+    def test_keeps_bounded_snapshots(self) -> None:
+        """Old snapshots are discarded beyond the limit."""
+        tracker = AllocationTracker(max_snapshots=2)
+        try:
+            ids = [tracker.snapshot() for _ in range(3)]
+            assert tracker.snapshot_ids == ids[1:]
+            with pytest.raises(KeyError):
+                tracker.diff(ids[0])
+        finally:
+            tracker.stop()
+
+
+class TestMemoryRoutes:
+    """Tests for the /debug/memory routes."""
+
+    async def test_report_and_snapshot_diff(self) -> None:
+        """The report, snapshot and diff routes return JSON."""
+        tracker = AllocationTracker()
+        routes = memory_routes(GcMonitor(), tracker)
+        try:
+            report = json.loads((await routes["/debug/memory"]({})).body)
+            assert report["rss_bytes"] > 0
+            assert "structures" in report and "gc" in report
+
+            snapshot = json.loads((await routes["/debug/memory/snapshot"]({})).body)
+            diff = await routes["/debug/memory/diff"]({"base": [str(snapshot["snapshot"])]})
+            assert diff.status == 200
+            assert json.loads(diff.body)["base"] == snapshot["snapshot"]
+
+            assert (await routes["/debug/memory/diff"]({})).status == 400
+            assert (await routes["/debug/memory/diff"]({"base": ["999"]})).status == 404
+            for top in ("0", "-3"):
+                assert (await routes["/debug/memory/snapshot"]({"top": [top]})).status == 400
+                query = {"base": [str(snapshot["snapshot"])], "top": [top]}
+                assert (await routes["/debug/memory/diff"](query)).status == 400
+        finally:
+            await routes["/debug/memory/stop"]({})
+        assert not tracker.tracing
@@ -0,0 +1,164 @@
+"""Tests for the metrics subsystem and /metrics endpoint."""
+
+import asyncio
+import math
+
+import pytest
+
+from telemetryx.core import metrics
+from telemetryx.grpc_server.http import HttpResponse, HttpServer, metrics_route
+
+
+@pytest.fixture
+def registry() -> metrics.Registry:
+    """Create an isolated registry."""
+    return metrics.Registry()
+
+
+class TestMetrics:
+    """Tests for counters, gauges and histograms."""
+
+    def test_counter_labels(self, registry: metrics.Registry) -> None:
+        """Counter children are cached per label set."""
+        counter = metrics.counter("requests_total", "Requests", ["method"], registry=registry)
+
+        child = counter.labels("Evaluate")
+        child.inc()
+        counter.labels("Evaluate").inc(2)
+
+        assert counter.labels("Evaluate") is child
+        assert child.value == 3
+
+    def test_wrong_label_count_raises(self, registry: metrics.Registry) -> None:
+        """Label values must match the declared label names."""
+        counter = metrics.counter("bad_total", "Bad", ["a", "b"], registry=registry)
+
+        with pytest.raises(ValueError):
+            counter.labels("only-one")
+
+    def test_get_or_create_returns_same_metric(self, registry: metrics.Registry) -> None:
+        """Registering the same name twice returns the existing metric."""
+        first = metrics.gauge("depth", "Depth", registry=registry)
+        second = metrics.gauge("depth", "Depth", registry=registry)
+
+        assert first is second
+        with pytest.raises(ValueError):
+            metrics.counter("depth", "Depth", registry=registry)
+
+    def test_gauge_function(self, registry: metrics.Registry) -> None:
+        """Gauges can be computed lazily at collection time."""
+        gauge = metrics.gauge("queue_depth", "Queue depth", registry=registry)
+        items = [1, 2, 3]
+        gauge.set_function(lambda: len(items))
+
+        assert "queue_depth 3.0" in registry.render()
+
+    def test_histogram_buckets_preallocated(self, registry: metrics.Registry) -> None:
+        """Observations land in fixed buckets without growing state."""
+        histogram = metrics.histogram(
+            "latency_seconds", "Latency", buckets=(0.01, 0.1, 1.0), registry=registry
+        )
+        child = histogram.labels()
+        slots = len(child.counts)
+
+        for value in (0.005, 0.05, 0.05, 0.5, 5.0):
+            child.observe(value)
+
+        assert len(child.counts) == slots
+        assert child.counts == [1, 2, 1, 1]
+        assert child.count == 5
+        assert math.isclose(child.sum, 5.605)
+
+    def test_histogram_quantile(self, registry: metrics.Registry) -> None:
+        """Quantiles interpolate within the containing bucket."""
+        histogram = metrics.histogram(
+            "q_seconds", "Q", buckets=(1.0, 2.0, 3.0, 4.0), registry=registry
+        )
+        child = histogram.labels()
+        for value in (0.5, 1.5, 2.5, 3.5):
+            child.observe(value)
+
+        assert child.quantile(0.5) == pytest.approx(2.0)
+        assert 3.0 <= child.quantile(0.99) <= 4.0
+
+    def test_render_prometheus_text(self, registry: metrics.Registry) -> None:
+        """Rendered output follows the Prometheus text format."""
+        counter = metrics.counter("rpc_total", "RPCs", ["method", "code"], registry=registry)
+        counter.labels("Evaluate", "OK").inc()
+        histogram = metrics.histogram(
+            "rpc_seconds", "RPC latency", ["method"], buckets=(0.1, 1.0), registry=registry
+        )
+        histogram.labels("Evaluate").observe(0.5)
+
+        text = registry.render()
+
+        assert "# TYPE rpc_total counter" in text
+        assert 'rpc_total{method="Evaluate",code="OK"} 1.0' in text
+        assert "# TYPE rpc_seconds histogram" in text
+        assert 'rpc_seconds_bucket{method="Evaluate",le="0.1"} 0' in text
+        assert 'rpc_seconds_bucket{method="Evaluate",le="1.0"} 1' in text
+        assert 'rpc_seconds_bucket{method="Evaluate",le="+Inf"} 1' in text
+        assert 'rpc_seconds_count{method="Evaluate"} 1' in text
+
+    def test_label_values_escaped(self, registry: metrics.Registry) -> None:
+        """Quotes in label values are escaped."""
+        counter = metrics.counter("escaped_total", "Escaped", ["name"], registry=registry)
+        counter.labels('a"b').inc()
+
+        assert 'escaped_total{name="a\\"b"} 1.0' in registry.render()
+
+
+class TestHttpServer:
+    """Tests for the HTTP metrics endpoint."""
+
+    async def _get(self, port: int, path: str) -> tuple[str, str]:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        data = (await reader.read()).decode()
+        writer.close()
+        head, _, body = data.partition("\r\n\r\n")
+        return head.split("\r\n")[0], body
+
+    async def test_serves_metrics(self) -> None:
+        """GET /metrics returns the default registry."""
+        metrics.counter("telemetryx_test_http_total", "HTTP test").inc()
+        server = HttpServer("127.0.0.1", 0)
+        server.add_route("/metrics", metrics_route)
+        await server.start()
+        try:
+            status, body = await self._get(server.port, "/metrics")
+        finally:
+            await server.stop()
+
+        assert status == "HTTP/1.1 200 OK"
+        assert "telemetryx_test_http_total 1.0" in body
+
+    async def test_unknown_path_returns_404(self) -> None:
+        """Unregistered paths are not found."""
+        server = HttpServer("127.0.0.1", 0)
+        await server.start()
+        try:
+            status, _ = await self._get(server.port, "/nope")
+        finally:
+            await server.stop()
+
+        assert status == "HTTP/1.1 404 Not Found"
+
+    async def test_route_receives_query(self) -> None:
+        """Route handlers get the parsed query string."""
+        received: dict[str, list[str]] = {}
+
+        async def route(query: dict[str, list[str]]) -> HttpResponse:
+            received.update(query)
+            return HttpResponse("ok")
+
+        server = HttpServer("127.0.0.1", 0)
+        server.add_route("/debug", route)
+        await server.start()
+        try:
+            await self._get(server.port, "/debug?seconds=5")
+        finally:
+            await server.stop()
+
+        assert received == {"seconds": ["5"]}
@@ -0,0 +1,139 @@
+"""Tests for the sampling profiler."""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any
+
+import grpc
+import pytest
+
+from telemetryx.core import Settings
+from telemetryx.grpc_server.interceptors import RpcContextInterceptor
+from telemetryx.grpc_server.profiler import (
+    Profile,
+    ProfilerBusyError,
+    SamplingProfiler,
+    profile_route,
+    write_profile,
+)
+from telemetryx.grpc_server.server import GrpcServer
+
+
+class FakeCallDetails:
+    """Minimal stand-in for grpc.HandlerCallDetails."""
+
+    def __init__(self, method: str) -> None:
+        self.method = method
+        self.invocation_metadata = ()
+
+
+def busy_work(seconds: float) -> None:
+    """Keep the event loop thread busy."""
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+class TestSamplingProfiler:
+    """Tests for SamplingProfiler."""
+
+    async def test_tags_loop_stacks_with_rpc_method(self) -> None:
+        """Stacks sampled inside an RPC carry an rpc:<method> frame."""
+        profiler = SamplingProfiler(interval=0.002)
+
+        async def behavior(request: Any, context: Any) -> str:
+            busy_work(0.2)
+            return "ok"
+
+        async def continuation(details: Any) -> grpc.RpcMethodHandler:
+            return grpc.unary_unary_rpc_method_handler(behavior)
+
+        handler = await RpcContextInterceptor().intercept_service(
+            continuation, FakeCallDetails("/telemetryx.AnalyticsService/DetectAnomalies")
+        )
+        profiling = asyncio.create_task(profiler.profile(0.15))
+        await asyncio.sleep(0.01)
+        await handler.unary_unary(None, None)
+        profile = await profiling
+
+        rpc_stacks = {
+            stack: count
+            for stack, count in profile.stacks.items()
+            if ";rpc:/telemetryx.AnalyticsService/DetectAnomalies;" in stack
+        }
+        assert rpc_stacks
+        assert all(stack.split(";")[-1].startswith("busy_work ") for stack in rpc_stacks)
+        assert sum(rpc_stacks.values()) > profile.samples / 2
+
+    async def test_collapsed_output_format(self) -> None:
+        """Output lines are ``frame;frame;... count`` sorted by count."""
+        profile = await SamplingProfiler(interval=0.002).profile(0.02)
+
+        lines = profile.collapsed().splitlines()
+        assert lines
+        counts = [int(line.rsplit(" ", 1)[1]) for line in lines]
+        assert counts == sorted(counts, reverse=True)
+        assert all(";" in line.rsplit(" ", 1)[0] for line in lines)
+
+    async def test_one_profile_at_a_time(self) -> None:
+        """A second concurrent profile is refused."""
+        profiler = SamplingProfiler(interval=0.002)
+        first = asyncio.create_task(profiler.profile(0.05))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(ProfilerBusyError):
+            await profiler.profile(0.01)
+        await first
+        assert not profiler.running
+
+    async def test_cancel_stops_sampling(self) -> None:
+        """Cancelling stops the sampler, which then frees the profiler itself."""
+        profiler = SamplingProfiler(interval=0.002)
+        task = asyncio.create_task(profiler.profile(30.0))
+        await asyncio.sleep(0.02)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        for _ in range(100):
+            if not profiler.running:
+                break
+            await asyncio.sleep(0.005)
+        assert not profiler.running
+
+
+class TestProfileOutput:
+    """Tests for the profile route and file output."""
+
+    async def test_route_validates_and_returns_stacks(self) -> None:
+        """The route caps the duration and returns collapsed stacks."""
+        route = profile_route(SamplingProfiler(interval=0.002), max_seconds=1.0)
+
+        assert (await route({"seconds": ["abc"]})).status == 400
+        assert (await route({"seconds": ["5"]})).status == 400
+
+        response = await route({"seconds": ["0.02"]})
+        assert response.status == 200
+        assert int(response.headers["X-Profile-Samples"]) > 0
+        assert isinstance(response.body, str) and response.body.endswith("\n")
+
+    def test_write_profile(self, tmp_path: Path) -> None:
+        """Profiles are written as .folded files."""
+        profile = Profile(samples=2)
+        profile.stacks["MainThread;main (app.py:1)"] = 2
+
+        path = write_profile(profile, tmp_path / "profiles")
+
+        assert path.suffix == ".folded"
+        assert path.read_text() == "MainThread;main (app.py:1) 2\n"
+
+    async def test_unwritable_output_dir_is_logged(self, tmp_path: Path) -> None:
+        """A failed SIGUSR1 profile write is logged instead of killing the task."""
+        blocker = tmp_path / "not-a-directory"
+        blocker.write_text("")
+        server = GrpcServer(Settings(profiler_output_dir=str(blocker / "profiles")))
+
+        await server.profile_to_file(0.01)
+
+        assert not server.profiler.running
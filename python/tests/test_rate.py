@@ -0,0 +1,214 @@
+"""Tests for the event-rate detector."""
+
+import numpy as np
+import pytest
+
+from telemetryx.ml.anomaly import EwmaDetector, WindowedDetector
+from telemetryx.ml.features import FeatureBatch
+from telemetryx.ml.rate import RATE_FUTURE_EVENTS, RATE_LATE_EVENTS, RateDetector
+
+SECOND_MS = 1000
+
+
+def events(rng: np.random.Generator, window: int, rates: dict[str, float]) -> FeatureBatch:
+    """Poisson-many events per series spread over one 1 s window, in time order."""
+    timestamps: list[int] = []
+    keys: list[tuple[str, str]] = []
+    for event_type, rate in rates.items():
+        count = int(rng.poisson(rate))
+        timestamps.extend((window * SECOND_MS + rng.integers(0, SECOND_MS, count)).tolist())
+        keys.extend([("web", event_type)] * count)
+    order = np.argsort(timestamps, kind="stable")
+    return FeatureBatch.from_arrays(
+        np.zeros(len(keys)), [keys[i] for i in order], np.asarray(timestamps)[order]
+    )
+
+
+def detector(**kwargs: int) -> RateDetector:
+    """1 s windows, 1 s lateness, a 24 s "day" of 1 s season buckets."""
+    options = {"window": SECOND_MS, "lateness": SECOND_MS, "period": 24 * SECOND_MS, "buckets": 24}
+    return RateDetector(**(options | kwargs))
+
+
+class TestRateDetector:
+    """Tests for RateDetector."""
+
+    def test_windows_close_after_lateness(self) -> None:
+        """Late events are counted until the watermark passes window end + lateness."""
+        rate = detector(warmup=1)
+        late = RATE_LATE_EVENTS.labels()
+        before = late.value
+        batch = FeatureBatch.from_arrays([0.0] * 3, [("a", "b")] * 3, [500, 1500, 2500])
+        rate.observe(batch, 3.0)
+        assert rate.watermark == 2500
+
+        # Window 1 is still open (closes at 3000); window 0 is not
+        batch = FeatureBatch.from_arrays([0.0] * 3, [("a", "b")] * 3, [900, 1200, 1900])
+        rate.observe(batch, 3.0)
+        assert late.value == before + 1
+
+        # Closing window 1 learns its 3 events (the series' partial first
+        # window, 0, is skipped); nothing was expected yet, so nothing is scored
+        batch = FeatureBatch.from_arrays([0.0], [("a", "b")], [3000])
+        detections, _ = rate.observe(batch, 3.0)
+        assert not detections.is_anomaly.any()
+        assert detections.score[0] == 0.0
+        assert rate.expected("a", "b", 1000) == pytest.approx(3.0)
+
+    def test_future_events_do_not_move_the_watermark(self) -> None:
+        """Events too far ahead of the clock are dropped instead of closing every window."""
+        rate = detector(warmup=1, max_skew=SECOND_MS, clock=lambda: 10.0)
+        future = RATE_FUTURE_EVENTS.labels()
+        late = RATE_LATE_EVENTS.labels()
+        before, late_before = future.value, late.value
+        timestamps = [500, 4_000_000_000_000, 1500, 11_000, 11_001]
+        batch = FeatureBatch.from_arrays([0.0] * 5, [("a", "b")] * 5, timestamps)
+
+        rate.observe(batch, 3.0)
+
+        assert future.value == before + 2
+        assert rate.watermark == 11_000
+        rate.observe(FeatureBatch.from_arrays([0.0], [("a", "b")], [10_500]), 3.0)
+        assert late.value == late_before
+
+    def test_out_of_order_within_a_batch(self) -> None:
+        """A batch that closes windows counts its own earlier events into them."""
+        rate = detector(warmup=1)
+        first = FeatureBatch.from_arrays([0.0], [("a", "b")], [0])
+        rate.observe(first, 3.0)
+        timestamps = [1100, 1200, 2100, 1300, 5000]
+        batch = FeatureBatch.from_arrays([0.0] * 5, [("a", "b")] * 5, timestamps)
+
+        rate.observe(batch, 3.0)
+
+        assert rate.expected("a", "b", 1000) == pytest.approx(3.0)
+        assert rate.expected("a", "b", 2000) == pytest.approx(1.0)
+        assert rate.expected("a", "b", 3000) is None  # No event anywhere in window 3
+
+    def test_drop_and_spike(self) -> None:
+        """Silent series and bursts are flagged once the rate is learned."""
+        rng = np.random.default_rng(0)
+        rate = detector()
+        threshold = rate.threshold(0.5)
+        flagged: dict[int, list[tuple[str, int]]] = {}
+        for window in range(24 * 5):
+            rates = {"page_view": 100.0, "error": 5.0, "heartbeat": 50.0}
+            if 100 <= window < 103:
+                rates["page_view"] = 0.0
+            if window == 110:
+                rates["error"] = 60.0
+            _, windows = rate.observe(events(rng, window, rates), threshold)
+            for i in range(len(windows)):
+                start = int(windows.start[i]) // SECOND_MS
+                flagged.setdefault(start, []).append((windows.keys[i][1], int(windows.count[i])))
+
+        assert flagged[100] == [("page_view", 0)]
+        assert flagged[101] == [("page_view", 0)]
+        assert flagged[102] == [("page_view", 0)]
+        assert flagged[110][0][0] == "error"
+        # Poisson noise alone rarely crosses 3 deviations
+        assert sum(len(v) for v in flagged.values()) <= 4 + 3
+
+    def test_learns_the_daily_cycle(self) -> None:
+        """A busy half of the "day" is expected; its rate at night is not."""
+        rng = np.random.default_rng(1)
+        rate = detector()
+        threshold = rate.threshold(0.5)
+        flagged = []
+        for window in range(24 * 20):
+            busy = window % 24 >= 12
+            count = 200.0 if busy else 20.0
+            if window == 24 * 19 + 5:  # A night window with daytime traffic
+                count = 200.0
+            _, windows = rate.observe(events(rng, window, {"requests": count}), threshold)
+            flagged.extend(int(start) // SECOND_MS for start in windows.start.tolist())
+
+        assert 24 * 19 + 5 in flagged
+        assert len([w for w in flagged if w >= 24 * 10]) <= 3
+
+    def test_events_report_the_latest_window(self) -> None:
+        """Per-event detections carry their series' latest closed window."""
+        rng = np.random.default_rng(2)
+        rate = detector(warmup=3)
+        threshold = rate.threshold(0.5)
+        for window in range(30):
+            rate.observe(events(rng, window, {"a": 50.0}), threshold)
+        rate.observe(events(rng, 30, {"a": 400.0}), threshold)
+
+        detections, _ = rate.observe(events(rng, 32, {"a": 50.0}), threshold)
+
+        assert detections.count is not None
+        assert detections.is_anomaly.all()
+        assert (detections.count > 300).all()
+        assert detections.expected == pytest.approx(50.0, rel=0.3)
+        assert "events in the latest window" in detections.detection(0).explain(0.0)
+
+    def test_new_series_wait_for_a_full_window(self) -> None:
+        """A series' first (partial) window is neither scored nor learned."""
+        rate = detector(warmup=1)
+        keys = [("a", "x"), ("a", "x"), ("a", "y"), ("a", "x"), ("a", "x")]
+        batch = FeatureBatch.from_arrays([0.0] * 5, keys, [0, 1500, 1900, 2500, 3500])
+        rate.observe(batch, 3.0)
+        rate.observe(FeatureBatch.from_arrays([0.0], [("a", "x")], [4500]), 3.0)
+
+        assert rate.expected("a", "y", 1000) is None
+        assert rate.expected("a", "y", 2000) == pytest.approx(0.0)
+        assert rate.expected("a", "x", 0) is None
+        assert rate.expected("a", "x", 1000) == pytest.approx(1.0)
+
+    def test_capacity_and_clear(self) -> None:
+        """Series beyond capacity are not counted; clear forgets the watermark too."""
+        rate = detector(max_series=1)
+        batch = FeatureBatch.from_arrays([0.0, 0.0], [("a", "b"), ("c", "d")], [0, 1])
+
+        rate.observe(batch, 3.0)
+
+        assert len(rate) == 1
+        assert rate.expected("c", "d", 0) is None
+        assert rate.nbytes > 0
+        rate.clear()
+        assert len(rate) == 0
+        assert rate.watermark is None
+
+    def test_parts_bound_the_windows_each_observe_closes(self) -> None:
+        """A backfill observed in its parts matches observing it whole."""
+        rng = np.random.default_rng(3)
+        batch = events(rng, 0, {"a": 20.0})
+        for window in range(1, 60):
+            more = events(rng, window, {"a": 20.0, "b": 5.0 if window != 40 else 60.0})
+            batch = FeatureBatch(
+                np.concatenate([batch.values, more.values]),
+                np.concatenate([batch.timestamps, more.timestamps]),
+                batch.keys + more.keys,
+            )
+        whole = detector(warmup=3, max_windows=4)
+        split = detector(warmup=3, max_windows=4)
+
+        ends = split.parts(batch)
+        _, windows = whole.observe(batch, 3.0)
+        begin = 0
+        flagged = []
+        for end in ends:
+            before = split.watermark
+            _, part_windows = split.observe(batch[begin:end], 3.0)
+            if before is not None:
+                assert (split.watermark - before) // SECOND_MS <= 4 + 1
+            flagged.extend(part_windows.start.tolist())
+            begin = end
+
+        assert len(ends) >= 60 // 5
+        assert ends[-1] == len(batch)
+        assert flagged == windows.start.tolist()
+        assert 40 * SECOND_MS in flagged
+        assert split.expected("web", "b", 0) == pytest.approx(whole.expected("web", "b", 0))
+        assert split.parts(FeatureBatch.from_arrays([], [])) == []
+
+    def test_reports_windows_through_the_protocol(self) -> None:
+        """Callers find window reporting through WindowedDetector, not the class."""
+        assert isinstance(detector(), WindowedDetector)
+        assert not isinstance(EwmaDetector(), WindowedDetector)
+
+    def test_rejects_windows_that_do_not_tile_buckets(self) -> None:
+        """Season buckets must be whole numbers of windows."""
+        with pytest.raises(ValueError):
+            RateDetector(window=7_000)
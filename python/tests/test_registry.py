@@ -0,0 +1,278 @@
+"""Tests for the model registry."""
+
+import asyncio
+from pathlib import Path
+
+import grpc
+import numpy as np
+import pytest
+
+from telemetryx.core.exceptions import AnomalyDetectionError, ModelNotFoundError
+from telemetryx.grpc_server.handlers import AnalyticsServiceHandler
+from telemetryx.ml.anomaly import NOT_SCORED, BatchDetections, Detection
+from telemetryx.ml.features import FeatureBatch
+from telemetryx.ml.registry import (
+    ModelArtifact,
+    ModelRegistry,
+    load_artifact,
+    model_versions,
+    parse_model_name,
+    register_model_kind,
+    save_model,
+)
+from telemetryx.proto import analytics_pb2, common_pb2
+
+
+class LimitDetector:
+    """Stateless test model: flags values above a stored limit."""
+
+    name = "limit"
+
+    def __init__(self, artifact: ModelArtifact) -> None:
+        self.version = artifact.version
+        self.limit = artifact.array("limit")
+
+    def __len__(self) -> int:
+        return 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.limit.nbytes
+
+    def threshold(self, sensitivity: float) -> float:
+        return float(self.limit[0])
+
+    def score(self, source: str, event_type: str, value: float, threshold: float) -> Detection:
+        if value <= threshold:
+            return NOT_SCORED
+        return Detection(score=1.0, is_anomaly=True, expected=threshold)
+
+    def score_batch(self, batch: FeatureBatch, threshold: float) -> BatchDetections:
+        result = BatchDetections.empty(len(batch))
+        result.is_anomaly[:] = batch.values > threshold
+        result.score[:] = result.is_anomaly
+        return result
+
+    def clear(self) -> None:
+        pass
+
+
+register_model_kind("limit", LimitDetector)
+
+
+class AbortCalled(Exception):
+    """Raised by AbortContext.abort, mirroring grpc.aio.AbortError."""
+
+
+class AbortContext:
+    """Servicer context with no deadline that records aborts."""
+
+    def __init__(self) -> None:
+        self.code: grpc.StatusCode | None = None
+        self.details = ""
+
+    def time_remaining(self) -> None:
+        return None
+
+    async def abort(self, code: grpc.StatusCode, details: str = "") -> None:
+        self.code, self.details = code, details
+        raise AbortCalled(details)
+
+
+def save_limit(root: Path, name: str, limit: float, version: int | None = None) -> int:
+    return save_model(root, name, "limit", {"limit": np.array([limit])}, version=version)
+
+
+class TestStorage:
+    """Tests for saving and loading model versions."""
+
+    def test_save_assigns_increasing_versions(self, tmp_path: Path) -> None:
+        """Versions count up and staging directories do not look like versions."""
+        assert save_limit(tmp_path, "m", 1.0) == 1
+        assert save_limit(tmp_path, "m", 2.0) == 2
+        assert model_versions(tmp_path, "m") == [1, 2]
+        assert [p.name for p in (tmp_path / "m").iterdir() if p.name.startswith(".")] == []
+
+    def test_load_memory_maps_arrays(self, tmp_path: Path) -> None:
+        """Arrays come back as read-only memory maps, latest version by default."""
+        save_model(tmp_path, "m", "limit", {"limit": np.array([1.0]), "w": np.arange(4.0)})
+        save_model(tmp_path, "m", "limit", {"limit": np.array([2.0])}, {"trees": 3})
+        artifact = load_artifact(tmp_path, "m")
+        assert artifact.version == 2
+        assert artifact.params == {"trees": 3}
+        limit = artifact.array("limit")
+        assert isinstance(limit, np.memmap)
+        assert not limit.flags.writeable
+        assert load_artifact(tmp_path, "m", 1).array("w").tolist() == [0.0, 1.0, 2.0, 3.0]
+
+    def test_missing_models_and_arrays(self, tmp_path: Path) -> None:
+        """Unknown names and versions raise ModelNotFoundError."""
+        with pytest.raises(ModelNotFoundError):
+            load_artifact(tmp_path, "missing")
+        save_limit(tmp_path, "m", 1.0)
+        with pytest.raises(ModelNotFoundError):
+            load_artifact(tmp_path, "m", 7)
+        with pytest.raises(AnomalyDetectionError):
+            load_artifact(tmp_path, "m").array("weights")
+
+    def test_parse_model_name(self) -> None:
+        """``name@version`` pins a version; path-like names are rejected."""
+        assert parse_model_name("m") == ("m", None)
+        assert parse_model_name("m@3") == ("m", 3)
+        for invalid in ("../etc", "a/b", ".hidden", "m@x", ""):
+            with pytest.raises(ModelNotFoundError):
+                parse_model_name(invalid)
+
+
+class TestModelRegistry:
+    """Tests for ModelRegistry."""
+
+    async def test_get_loads_once_and_caches(self, tmp_path: Path) -> None:
+        """Concurrent cold requests share one load; later ones hit the cache."""
+        save_limit(tmp_path, "m", 5.0)
+        registry = ModelRegistry(tmp_path)
+        first, second = await asyncio.gather(registry.get("m"), registry.get("m"))
+        assert first is second
+        assert await registry.get("m") is first
+        assert registry.loaded() == {"m": 1}
+        assert registry.nbytes == 8
+
+    async def test_unknown_model(self, tmp_path: Path) -> None:
+        """Unknown names raise ModelNotFoundError and are not cached."""
+        registry = ModelRegistry(tmp_path)
+        with pytest.raises(ModelNotFoundError):
+            await registry.get("missing")
+        assert len(registry) == 0
+
+    async def test_unknown_names_fail_fast_until_ttl(self, tmp_path: Path) -> None:
+        """A name found missing is not looked up again until missing_ttl passes."""
+        now = [0.0]
+        registry = ModelRegistry(tmp_path, missing_ttl=5.0, clock=lambda: now[0])
+        with pytest.raises(ModelNotFoundError):
+            await registry.get("m")
+        save_limit(tmp_path, "m", 1.0)
+
+        with pytest.raises(ModelNotFoundError):
+            await registry.get("m")
+        now[0] = 5.0
+        assert (await registry.get("m")).threshold(0.5) == 1.0
+
+    async def test_unknown_kind(self, tmp_path: Path) -> None:
+        """Models of unregistered kinds fail to load."""
+        save_model(tmp_path, "m", "no-such-kind", {})
+        with pytest.raises(AnomalyDetectionError, match="Unknown kind"):
+            await ModelRegistry(tmp_path).get("m")
+
+    async def test_lru_eviction(self, tmp_path: Path) -> None:
+        """The least recently used model is dropped beyond max_models."""
+        for name in ("a", "b", "c"):
+            save_limit(tmp_path, name, 1.0)
+        registry = ModelRegistry(tmp_path, max_models=2)
+        await registry.get("a")
+        await registry.get("b")
+        await registry.get("a")
+        await registry.get("c")
+        assert list(registry.loaded()) == ["a", "c"]
+
+    async def test_byte_budget_keeps_newest(self, tmp_path: Path) -> None:
+        """max_bytes evicts older models but always keeps the latest one."""
+        save_model(tmp_path, "big", "limit", {"limit": np.array([1.0]), "w": np.zeros(100)})
+        save_limit(tmp_path, "small", 1.0)
+        registry = ModelRegistry(tmp_path, max_bytes=100)
+        await registry.get("big")
+        assert list(registry.loaded()) == ["big"]
+        await registry.get("small")
+        assert list(registry.loaded()) == ["small"]
+
+    async def test_refresh_swaps_new_versions(self, tmp_path: Path) -> None:
+        """New versions replace loaded ones; pinned versions stay put."""
+        save_limit(tmp_path, "m", 1.0)
+        registry = ModelRegistry(tmp_path)
+        old = await registry.get("m")
+        pinned = await registry.get("m@1")
+        assert await registry.refresh() == []
+
+        save_limit(tmp_path, "m", 2.0)
+        assert await registry.refresh() == ["m"]
+        new = await registry.get("m")
+        assert new is not old
+        assert new.threshold(0.5) == 2.0
+        # Requests holding the old detector can keep scoring with it
+        assert old.threshold(0.5) == 1.0
+        assert await registry.get("m@1") is pinned
+
+    async def test_refresh_keeps_model_when_new_version_is_broken(self, tmp_path: Path) -> None:
+        """A version that fails to load is skipped and the loaded one kept."""
+        save_limit(tmp_path, "m", 1.0)
+        registry = ModelRegistry(tmp_path)
+        old = await registry.get("m")
+        save_model(tmp_path, "m", "limit", {})  # No "limit" array
+        assert await registry.refresh() == []
+        assert await registry.get("m") is old
+
+    async def test_refresh_respects_byte_budget(self, tmp_path: Path) -> None:
+        """A larger new version evicts older models to stay within max_bytes."""
+        save_limit(tmp_path, "a", 1.0)
+        save_limit(tmp_path, "b", 1.0)
+        registry = ModelRegistry(tmp_path, max_bytes=16)
+        await registry.get("a")
+        await registry.get("b")
+        assert list(registry.loaded()) == ["a", "b"]
+
+        save_model(tmp_path, "b", "limit", {"limit": np.array([2.0]), "w": np.zeros(4)})
+        assert await registry.refresh() == ["b"]
+
+        assert registry.loaded() == {"b": 2}
+
+    async def test_preload_skips_broken_models(self, tmp_path: Path) -> None:
+        """Models that fail to load are logged and skipped, not fatal."""
+        save_limit(tmp_path, "a", 1.0)
+        save_model(tmp_path, "b", "unknown-kind", {"limit": np.array([1.0])})
+        save_model(tmp_path, "c", "limit", {})  # No "limit" array
+        (tmp_path / "d").mkdir()
+        save_limit(tmp_path, "e", 1.0)
+        registry = ModelRegistry(tmp_path)
+
+        await registry.preload()
+
+        assert list(registry.loaded()) == ["a", "e"]
+
+    async def test_preload(self, tmp_path: Path) -> None:
+        """preload loads stored models up to max_models."""
+        for name in ("a", "b", "c"):
+            save_limit(tmp_path, name, 1.0)
+        registry = ModelRegistry(tmp_path, max_models=2)
+        await registry.preload()
+        assert list(registry.loaded()) == ["a", "b"]
+        await ModelRegistry(tmp_path / "missing").preload()
+
+    async def test_handler_rejects_unloadable_models(self, tmp_path: Path) -> None:
+        """Stored models that cannot be loaded fail with FAILED_PRECONDITION."""
+        save_model(tmp_path, "m", "no-such-kind", {})
+        handler = AnalyticsServiceHandler(models=ModelRegistry(tmp_path))
+        context = AbortContext()
+
+        with pytest.raises(AbortCalled):
+            await handler.DetectAnomalies(
+                analytics_pb2.DetectAnomaliesRequest(model_name="m"), context=context
+            )
+
+        assert context.code == grpc.StatusCode.FAILED_PRECONDITION
+        assert "Unknown kind" in context.details
+
+    async def test_handler_serves_stored_models(self, tmp_path: Path) -> None:
+        """DetectAnomalies resolves unknown detector names through the registry."""
+        save_limit(tmp_path, "m", 10.0)
+        handler = AnalyticsServiceHandler(models=ModelRegistry(tmp_path))
+        request = analytics_pb2.DetectAnomaliesRequest(
+            events=[common_pb2.Event(id="low", value=1.0), common_pb2.Event(id="high", value=50.0)],
+            model_name="m",
+        )
+
+        response = await handler.DetectAnomalies(request, context=None)
+
+        assert [r.is_anomaly for r in response.results] == [False, True]
+        with pytest.raises(AnomalyDetectionError):
+            await handler.DetectAnomalies(
+                analytics_pb2.DetectAnomaliesRequest(model_name="missing"), context=None
+            )
@@ -0,0 +1,109 @@
+"""Tests for priority lane scheduling."""
+
+import asyncio
+
+import pytest
+
+from telemetryx.grpc_server.scheduler import Lane, LaneConfig, LaneFullError, PriorityScheduler
+from telemetryx.proto import analytics_pb2, common_pb2, rules_pb2
+
+
+def small_lanes() -> dict[Lane, LaneConfig]:
+    """One slot and one queue entry per lane."""
+    return {lane: LaneConfig(concurrency=1, max_queue=1) for lane in Lane}
+
+
+class TestClassify:
+    """Tests for lane classification."""
+
+    def test_health_checks(self) -> None:
+        """Standard and service-level health checks use the health lane."""
+        scheduler = PriorityScheduler()
+
+        assert scheduler.classify("/grpc.health.v1.Health/Check", None) is Lane.HEALTH
+        assert scheduler.classify("/telemetryx.RulesService/HealthCheck", None) is Lane.HEALTH
+
+    def test_single_event_is_interactive(self) -> None:
+        """Single-event calls use the interactive lane."""
+        scheduler = PriorityScheduler()
+        request = rules_pb2.EvaluateRequest(event=common_pb2.Event(id="e"))
+
+        assert scheduler.classify("/telemetryx.RulesService/EvaluateEvent", request) is (
+            Lane.INTERACTIVE
+        )
+
+    def test_batch_size_threshold(self) -> None:
+        """Batches at or above bulk_min_events use the bulk lane."""
+        scheduler = PriorityScheduler(bulk_min_events=3)
+        method = "/telemetryx.AnalyticsService/DetectAnomalies"
+        small = analytics_pb2.DetectAnomaliesRequest(events=[common_pb2.Event()] * 2)
+        large = analytics_pb2.DetectAnomaliesRequest(events=[common_pb2.Event()] * 3)
+
+        assert scheduler.classify(method, small) is Lane.INTERACTIVE
+        assert scheduler.classify(method, large) is Lane.BULK
+
+
+class TestPriorityScheduler:
+    """Tests for per-lane budgets and queues."""
+
+    async def test_full_bulk_lane_does_not_block_other_lanes(self) -> None:
+        """A saturated bulk lane leaves health and interactive slots free."""
+        scheduler = PriorityScheduler(small_lanes())
+        await scheduler.acquire(Lane.BULK)
+        queued = asyncio.create_task(scheduler.acquire(Lane.BULK))
+        await asyncio.sleep(0)
+
+        await asyncio.wait_for(scheduler.acquire(Lane.HEALTH), timeout=1)
+        await asyncio.wait_for(scheduler.acquire(Lane.INTERACTIVE), timeout=1)
+
+        assert scheduler.queue_depth() == 1
+        scheduler.release(Lane.BULK)
+        await queued
+        assert scheduler.active(Lane.BULK) == 1
+
+    async def test_waiters_are_served_in_order(self) -> None:
+        """Released slots go to waiters in FIFO order."""
+        scheduler = PriorityScheduler({Lane.BULK: LaneConfig(concurrency=1, max_queue=10)})
+        order: list[int] = []
+
+        async def worker(n: int) -> None:
+            await scheduler.acquire(Lane.BULK)
+            order.append(n)
+
+        await scheduler.acquire(Lane.BULK)
+        tasks = [asyncio.create_task(worker(n)) for n in range(3)]
+        await asyncio.sleep(0)
+        for _ in range(3):
+            scheduler.release(Lane.BULK)
+            await asyncio.sleep(0)
+
+        await asyncio.gather(*tasks)
+        assert order == [0, 1, 2]
+        assert scheduler.active(Lane.BULK) == 1
+
+    async def test_rejects_when_queue_full(self) -> None:
+        """Calls arriving at a full queue are rejected immediately."""
+        scheduler = PriorityScheduler(small_lanes())
+        await scheduler.acquire(Lane.BULK)
+        queued = asyncio.create_task(scheduler.acquire(Lane.BULK))
+        await asyncio.sleep(0)
+
+        with pytest.raises(LaneFullError):
+            await scheduler.acquire(Lane.BULK)
+
+        queued.cancel()
+
+    async def test_cancelled_waiter_leaves_queue(self) -> None:
+        """Cancelling a waiting call frees its queue entry without leaking a slot."""
+        scheduler = PriorityScheduler(small_lanes())
+        await scheduler.acquire(Lane.BULK)
+        queued = asyncio.create_task(scheduler.acquire(Lane.BULK))
+        await asyncio.sleep(0)
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+        assert scheduler.queue_depth() == 0
+        scheduler.release(Lane.BULK)
+        assert scheduler.active(Lane.BULK) == 0
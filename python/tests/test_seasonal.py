@@ -0,0 +1,161 @@
+"""Tests for the seasonal (Holt-Winters) detector."""
+
+import math
+
+import numpy as np
+import pytest
+
+from telemetryx.ml.anomaly import NOT_SCORED
+from telemetryx.ml.features import FeatureBatch
+from telemetryx.ml.seasonal import SeasonalDetector
+
+HOUR_MS = 3_600_000
+
+
+def daily_cycle(days: int, per_hour: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Timestamps and values of a metric ramping between 100 at night and 500 by day."""
+    rng = np.random.default_rng(seed)
+    timestamps = np.arange(days * 24 * per_hour, dtype=np.int64) * (HOUR_MS // per_hour)
+    hour = timestamps % (24 * HOUR_MS) / HOUR_MS
+    values = 300.0 - 200.0 * np.cos(2 * np.pi * hour / 24) + rng.normal(0.0, 5.0, len(hour))
+    return timestamps, values
+
+
+class TestSeasonalDetector:
+    """Tests for SeasonalDetector."""
+
+    def test_buckets_follow_event_time(self) -> None:
+        """Buckets come from the timestamp's position in the period (UTC)."""
+        detector = SeasonalDetector(buckets=24)
+
+        assert detector.bucket(0) == 0
+        assert detector.bucket(13 * HOUR_MS + 59_999) == 13
+        assert detector.bucket(3 * 24 * HOUR_MS + 5 * HOUR_MS) == 5
+
+    def test_daily_ramp_is_not_flagged(self) -> None:
+        """After a few cycles the morning ramp is expected, but a spike is not."""
+        detector = SeasonalDetector(warmup=50)
+        threshold = detector.threshold(0.5)
+        timestamps, values = daily_cycle(days=14, per_hour=2)
+        for timestamp, value in zip(timestamps.tolist(), values.tolist(), strict=True):
+            detector.score("web", "page_load", value, threshold, timestamp)
+
+        day = 14 * 24 * HOUR_MS
+        flags = [
+            detector.score("web", "page_load", value, threshold, day + timestamp).is_anomaly
+            for timestamp, value in zip(*daily_cycle(days=1, per_hour=2, seed=1), strict=True)
+        ]
+        spike = detector.score("web", "page_load", 300.0, threshold, day + 24 * HOUR_MS)
+
+        assert not any(flags)
+        assert spike.is_anomaly
+        assert spike.expected == pytest.approx(100.0, abs=20.0)
+
+    def test_first_value_of_a_bucket_is_not_scored(self) -> None:
+        """Buckets are not scored until they have been seen."""
+        detector = SeasonalDetector(warmup=1)
+        threshold = detector.threshold(0.5)
+        for i in range(10):
+            detector.score("a", "b", 10.0, threshold, i * 1000)
+
+        detection = detector.score("a", "b", 1000.0, threshold, 5 * HOUR_MS)
+
+        assert not detection.is_anomaly
+        count, level, trend, season = detector.state("a", "b")
+        assert count == 11
+        assert season[0] == pytest.approx(0.0, abs=1e-6)
+        assert season[5] == pytest.approx(990.0)
+        assert all(math.isnan(offset) for offset in season[6:])
+
+    @pytest.mark.parametrize("series", [3, 200])
+    def test_score_batch_matches_sequential(self, series: int) -> None:
+        """Batch scoring (layers and scalar tails) equals per-event scoring."""
+        rng = np.random.default_rng(series)
+        count = 6000
+        timestamps = np.sort(rng.integers(0, 4 * 24 * HOUR_MS, count))
+        values = 50 * np.sin(timestamps * 2 * np.pi / (24 * HOUR_MS)) + rng.normal(0, 1, count)
+        values[::997] += 40.0
+        keys = [("svc", f"metric-{i % series}") for i in range(count)]
+        sequential = SeasonalDetector(warmup=20)
+        batched = SeasonalDetector(warmup=20)
+        threshold = sequential.threshold(0.5)
+
+        expected = [
+            sequential.score(key[0], key[1], value, threshold, timestamp)
+            for key, value, timestamp in zip(
+                keys, values.tolist(), timestamps.tolist(), strict=True
+            )
+        ]
+        detections = [
+            batched.score_batch(
+                FeatureBatch.from_arrays(
+                    values[start : start + 1000],
+                    keys[start : start + 1000],
+                    timestamps[start : start + 1000],
+                ),
+                threshold,
+            )
+            for start in range(0, count, 1000)
+        ]
+
+        z = np.concatenate([d.z for d in detections])
+        flags = np.concatenate([d.is_anomaly for d in detections])
+        assert z == pytest.approx([d.z for d in expected], abs=1e-3)
+        assert flags.tolist() == [d.is_anomaly for d in expected]
+        assert any(flags)
+        state = batched.state("svc", "metric-0")
+        assert state[:3] == pytest.approx(sequential.state("svc", "metric-0")[:3], rel=1e-6)
+
+    def test_non_finite_values_are_skipped(self) -> None:
+        """NaN and infinite values are not scored and leave the series untouched."""
+        rng = np.random.default_rng(7)
+        count = 4000
+        timestamps = np.sort(rng.integers(0, 2 * 24 * HOUR_MS, count))
+        values = 50 * np.sin(timestamps * 2 * np.pi / (24 * HOUR_MS)) + rng.normal(0, 1, count)
+        keys = [("svc", f"metric-{i % 40}") for i in range(count)]
+        poisoned = values.copy()
+        poisoned[::13] = math.nan
+        poisoned[5::29] = math.inf
+        poisoned[9::31] = -math.inf
+        finite = np.isfinite(poisoned)
+        clean = SeasonalDetector(warmup=20)
+        detector = SeasonalDetector(warmup=20)
+        threshold = detector.threshold(0.5)
+
+        # 40 series run through both the vectorized layers and the scalar tails
+        result = detector.score_batch(FeatureBatch.from_arrays(poisoned, keys, timestamps), 3.0)
+        clean.score_batch(
+            FeatureBatch.from_arrays(
+                values[finite],
+                [k for k, f in zip(keys, finite, strict=True) if f],
+                timestamps[finite],
+            ),
+            3.0,
+        )
+
+        assert not result.is_anomaly[~finite].any()
+        assert (result.score[~finite] == 0.0).all()
+        for i in range(40):
+            state = detector.state("svc", f"metric-{i}")
+            assert state[:3] == pytest.approx(clean.state("svc", f"metric-{i}")[:3])
+        assert detector.score("svc", "metric-0", math.nan, threshold, count) == NOT_SCORED
+        assert detector.state("svc", "metric-0")[0] == clean.state("svc", "metric-0")[0]
+
+    def test_capacity_and_clear(self) -> None:
+        """Series beyond capacity are not scored; clear forgets everything."""
+        detector = SeasonalDetector(max_series=1)
+        batch = FeatureBatch.from_arrays([1.0, 2.0], [("a", "b"), ("c", "d")])
+
+        detector.score_batch(batch, 3.0)
+
+        assert len(detector) == 1
+        assert detector.state("c", "d") is None
+        assert detector.nbytes > 24 * 4
+        detector.clear()
+        assert len(detector) == 0
+        assert detector.state("a", "b") is None
+
+    def test_rejects_uneven_buckets(self) -> None:
+        """The period must split evenly into buckets."""
+        with pytest.raises(ValueError):
+            SeasonalDetector(period=1000, buckets=7)
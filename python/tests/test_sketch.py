@@ -0,0 +1,124 @@
+"""Tests for the DDSketch quantile sketch."""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from telemetryx.ml.sketch import DDSketch
+
+
+def exact_quantile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class TestDDSketch:
+    """Tests for DDSketch."""
+
+    def test_quantiles_within_relative_accuracy(self) -> None:
+        """Quantiles of a heavy-tailed distribution are within the relative error bound."""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(3.0, 1.5) for _ in range(20_000)]
+        sketch = DDSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        for q, estimate in zip(
+            (0.01, 0.5, 0.99, 0.999), sketch.quantiles((0.01, 0.5, 0.99, 0.999))
+        ):
+            assert estimate == pytest.approx(exact_quantile(values, q), rel=0.011)
+
+    def test_negative_and_zero_values(self) -> None:
+        """Negative values, zeros and positive values are ordered correctly."""
+        sketch = DDSketch()
+        for value in [-100.0, -10.0, 0.0, 0.0, 10.0, 100.0]:
+            sketch.add(value)
+
+        low, median, high = sketch.quantiles((0.0, 0.5, 1.0))
+        assert low == pytest.approx(-100.0, rel=0.01)
+        assert median == 0.0
+        assert high == pytest.approx(100.0, rel=0.01)
+
+    def test_empty_sketch_is_nan(self) -> None:
+        """An empty sketch has no quantiles."""
+        assert math.isnan(DDSketch().quantile(0.5))
+
+    def test_bins_bounded_and_upper_quantiles_kept(self) -> None:
+        """Past max_bins the lowest bins collapse, keeping the high quantiles accurate."""
+        sketch = DDSketch(relative_accuracy=0.01, max_bins=64)
+        values = [1.5**i for i in range(200)]
+        for value in values:
+            sketch.add(value)
+
+        assert len(sketch) <= 64
+        assert sketch.count == 200
+        assert sketch.quantile(0.99) == pytest.approx(exact_quantile(values, 0.99), rel=0.011)
+
+    def test_merge_matches_single_sketch(self) -> None:
+        """Merging sketches of two halves equals sketching all values."""
+        rng = random.Random(3)
+        values = [rng.expovariate(0.01) for _ in range(5_000)]
+        whole, left, right = DDSketch(), DDSketch(), DDSketch()
+        for i, value in enumerate(values):
+            whole.add(value)
+            (left if i % 2 else right).add(value)
+
+        left.merge(right)
+
+        assert left.count == whole.count
+        assert left.quantiles((0.1, 0.5, 0.9)) == whole.quantiles((0.1, 0.5, 0.9))
+
+    def test_add_many_matches_add(self) -> None:
+        """Vectorized adds give the same bins as adding values one by one."""
+        rng = random.Random(9)
+        values = [rng.choice((-1, 1)) * rng.lognormvariate(0.0, 4.0) for _ in range(2_000)]
+        values += [0.0] * 10
+        one_by_one, vectorized = DDSketch(max_bins=64), DDSketch(max_bins=64)
+        for value in values:
+            one_by_one.add(value)
+        vectorized.add_many(np.array(values[:1_000]))
+        vectorized.add_many(np.array(values[1_000:]))
+
+        qs = (0.0, 0.1, 0.5, 0.9, 1.0)
+        assert vectorized.count == one_by_one.count
+        assert len(vectorized) == len(one_by_one)
+        assert vectorized.quantiles(qs) == pytest.approx(one_by_one.quantiles(qs))
+
+    def test_non_finite_values_are_ignored(self) -> None:
+        """NaN and infinities are neither binned nor counted, scalar or vectorized."""
+        values = [1.0, math.nan, math.inf, -math.inf, 2.0] * 20
+        one_by_one, vectorized = DDSketch(), DDSketch()
+        for value in values:
+            one_by_one.add(value)
+        vectorized.add_many(np.array(values))
+
+        for sketch in (one_by_one, vectorized):
+            assert sketch.count == 40
+            assert sketch.zero_count == 0
+            assert (sketch.min, sketch.max) == (1.0, 2.0)
+            assert sketch.quantile(1.0) == pytest.approx(2.0, rel=0.01)
+
+    def test_merge_rejects_different_accuracy(self) -> None:
+        """Only sketches with the same bin mapping can merge."""
+        with pytest.raises(ValueError):
+            DDSketch(0.01).merge(DDSketch(0.02))
+
+    def test_bytes_round_trip(self) -> None:
+        """Serialized sketches rebuild with identical quantiles."""
+        sketch = DDSketch(relative_accuracy=0.02, max_bins=128)
+        for value in [-3.0, 0.0, 1.0, 2.5, 1000.0]:
+            sketch.add(value)
+
+        restored = DDSketch.from_bytes(sketch.to_bytes())
+
+        assert restored.count == sketch.count
+        assert restored.quantiles((0.0, 0.5, 1.0)) == sketch.quantiles((0.0, 0.5, 1.0))
+
+    def test_from_bytes_rejects_garbage(self) -> None:
+        """Truncated or foreign data is refused."""
+        with pytest.raises(ValueError):
+            DDSketch.from_bytes(b"nope")
+        with pytest.raises(ValueError):
+            DDSketch.from_bytes(DDSketch().to_bytes()[:-1] + b"x" * 100)
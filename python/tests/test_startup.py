@@ -0,0 +1,135 @@
+"""Tests for the startup pipeline."""
+
+import asyncio
+from pathlib import Path
+
+import grpc
+import pytest
+from grpc_health.v1 import health_pb2, health_pb2_grpc
+
+from telemetryx.core import Settings, metrics
+from telemetryx.grpc_server.handlers import AnalyticsServiceHandler, RulesServiceHandler
+from telemetryx.grpc_server.health import HealthState
+from telemetryx.grpc_server.import_profile import SERVER_MODULE, format_report, profile_imports
+from telemetryx.grpc_server.server import GrpcServer
+from telemetryx.grpc_server.startup import STARTING, StartupPipeline, warm_handlers
+
+
+class TestStartupPipeline:
+    """Tests for StartupPipeline."""
+
+    async def test_not_serving_until_complete(self) -> None:
+        """Health reports NOT_SERVING while phases are running."""
+        health = HealthState()
+        pipeline = StartupPipeline(health)
+        observed: list[bool] = []
+
+        async def phase() -> None:
+            observed.append(health.serving)
+
+        pipeline.add_phase("check", phase)
+
+        assert health.reasons == {STARTING}
+        await pipeline.run()
+
+        assert observed == [False]
+        assert health.serving is True
+
+    async def test_phases_run_in_order_and_are_timed(self) -> None:
+        """Each phase is timed and exported as a gauge."""
+        pipeline = StartupPipeline(HealthState())
+        order: list[str] = []
+
+        for name in ("first", "second"):
+
+            async def phase(name: str = name) -> None:
+                order.append(name)
+
+            pipeline.add_phase(name, phase)
+
+        timings = await pipeline.run()
+
+        assert order == ["first", "second"]
+        assert set(timings) == {"first", "second"}
+        assert 'telemetryx_startup_phase_seconds{phase="total"}' in metrics.REGISTRY.render()
+
+    async def test_failed_phase_keeps_not_serving(self) -> None:
+        """A failing phase propagates and the server stays out of rotation."""
+        health = HealthState()
+        pipeline = StartupPipeline(health)
+
+        async def broken() -> None:
+            raise RuntimeError("boom")
+
+        pipeline.add_phase("broken", broken)
+
+        with pytest.raises(RuntimeError):
+            await pipeline.run()
+        assert health.serving is False
+
+
+class TestServerWarmUp:
+    """Startup gating as seen by grpc.health.v1 clients."""
+
+    async def test_not_serving_until_warmed_up(self, tmp_path: Path) -> None:
+        """Orchestrators see NOT_SERVING during warm-up and SERVING once it finishes."""
+        settings = Settings(
+            grpc_host="127.0.0.1",
+            grpc_port=0,
+            metrics_enabled=False,
+            models_dir=str(tmp_path),
+        )
+        server = GrpcServer(settings)
+        release = asyncio.Event()
+
+        async def hold() -> None:
+            await release.wait()
+
+        server.startup.add_phase("hold", hold)
+        await server.start()
+        try:
+            async with grpc.aio.insecure_channel(f"127.0.0.1:{server.port}") as channel:
+                stub = health_pb2_grpc.HealthStub(channel)
+                request = health_pb2.HealthCheckRequest()
+                warm_up = asyncio.create_task(server.warm_up())
+
+                before = await stub.Check(request, timeout=5)
+                release.set()
+                await warm_up
+                await asyncio.sleep(0)  # Let the published update run
+                after = await stub.Check(request, timeout=5)
+
+            assert before.status == health_pb2.HealthCheckResponse.NOT_SERVING
+            assert after.status == health_pb2.HealthCheckResponse.SERVING
+        finally:
+            await server.stop(0)
+
+
+class TestWarmHandlers:
+    """Tests for handler warmup."""
+
+    async def test_runs_synthetic_requests(self) -> None:
+        """Warmup drives both handlers without a network."""
+        await warm_handlers(RulesServiceHandler(), AnalyticsServiceHandler(), rounds=4)
+
+
+class TestImportBudget:
+    """Startup import regressions (fresh interpreter per test)."""
+
+    # Generous enough for slow CI machines; today's cost is a few hundred ms
+    IMPORT_BUDGET_S = 2.0
+
+    def test_server_import_within_budget(self) -> None:
+        """Importing the server stays within the startup budget."""
+        profile = profile_imports()
+
+        assert profile.total < self.IMPORT_BUDGET_S, format_report(profile, {})
+
+    def test_optional_subsystems_are_lazy(self) -> None:
+        """DB drivers and reflection are not imported with the server."""
+        imported = profile_imports().modules()
+
+        assert SERVER_MODULE in imported
+        # grpc itself imports the (empty) top-level grpc_reflection package
+        lazy = {"psycopg_pool", "psycopg", "redis", "grpc_reflection.v1alpha.reflection"}
+        assert not lazy & imported
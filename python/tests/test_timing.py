@@ -0,0 +1,61 @@
+"""Tests for per-request stage timing."""
+
+import asyncio
+
+from telemetryx.core.timing import StageTimer, current_timer, record_stage, stage, start_timer
+
+
+class TestStageTimer:
+    """Tests for StageTimer."""
+
+    def test_accumulates_per_stage(self) -> None:
+        """Repeated stages add up; durations convert to whole microseconds."""
+        timer = StageTimer(start_ns=0)
+        timer.add("evaluate", 1_500)
+        timer.add("evaluate", 2_600)
+        timer.add("queue", 999)
+
+        assert timer.as_us() == {"evaluate": 4, "queue": 0}
+
+    def test_server_timing_format(self) -> None:
+        """Stages render as Server-Timing entries in milliseconds, plus a total."""
+        timer = StageTimer()
+        timer.add("deserialize", 12_000)
+        timer.add("evaluate", 1_250_000)
+
+        parts = timer.server_timing().split(", ")
+        assert parts[:2] == ["deserialize;dur=0.012", "evaluate;dur=1.250"]
+        assert parts[2].startswith("total;dur=")
+
+
+class TestStageContext:
+    """Tests for the context-local timer helpers."""
+
+    async def test_noop_without_timer(self) -> None:
+        """Stages outside a timed request are ignored."""
+
+        async def untimed() -> None:
+            assert current_timer() is None
+            with stage("evaluate"):
+                pass
+            record_stage("queue", 10)
+            assert current_timer() is None
+
+        await asyncio.create_task(untimed())
+
+    async def test_timer_is_task_local(self) -> None:
+        """Concurrent requests each see only their own timer."""
+
+        async def request(name: str) -> dict[str, int]:
+            timer = start_timer()
+            await asyncio.sleep(0)
+            record_stage(name, 5_000)
+            with stage("evaluate"):
+                await asyncio.sleep(0)
+            return timer.as_us()
+
+        first, second = await asyncio.gather(request("a"), request("b"))
+
+        assert set(first) == {"a", "evaluate"}
+        assert set(second) == {"b", "evaluate"}
+        assert first["a"] == 5
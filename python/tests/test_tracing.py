@@ -0,0 +1,251 @@
+"""Tests for distributed tracing."""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any
+
+import pytest
+
+from telemetryx.core.config import Settings
+from telemetryx.core.exceptions import ConfigurationError
+from telemetryx.core.tracing import (
+    BatchSpanProcessor,
+    FileSpanExporter,
+    InMemorySpanExporter,
+    OtlpHttpExporter,
+    SpanContext,
+    SpanKind,
+    Tracer,
+    activate,
+    current_span,
+    parse_traceparent,
+    span,
+    tracer_from_settings,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+def make_tracer(sample_rate: float = 1.0) -> tuple[Tracer, InMemorySpanExporter]:
+    exporter = InMemorySpanExporter()
+    return Tracer(BatchSpanProcessor(exporter), sample_rate=sample_rate), exporter
+
+
+class TestTraceparent:
+    """Tests for W3C traceparent parsing."""
+
+    def test_parses_sampled_flag(self) -> None:
+        """The sampled bit of the flags is honoured."""
+        sampled = parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01")
+        unsampled = parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-00")
+
+        assert sampled == SpanContext(TRACE_ID, PARENT_ID, sampled=True)
+        assert unsampled is not None and not unsampled.sampled
+
+    def test_round_trip(self) -> None:
+        """A parsed context renders back to the same header."""
+        header = f"00-{TRACE_ID}-{PARENT_ID}-01"
+        context = parse_traceparent(header)
+        assert context is not None
+        assert context.traceparent == header
+
+    @pytest.mark.parametrize(
+        "header",
+        [
+            None,
+            "",
+            "garbage",
+            f"ff-{TRACE_ID}-{PARENT_ID}-01",
+            f"00-{'0' * 32}-{PARENT_ID}-01",
+            f"00-{TRACE_ID}-{'0' * 16}-01",
+            f"00-{TRACE_ID.upper()}-{PARENT_ID}-01",
+            f"00-{TRACE_ID}-{PARENT_ID}-01-extra",
+        ],
+    )
+    def test_rejects_malformed(self, header: str | None) -> None:
+        """Invalid headers are ignored rather than raising."""
+        assert parse_traceparent(header) is None
+
+
+class TestTracer:
+    """Tests for head sampling and span creation."""
+
+    def test_follows_parent_decision(self) -> None:
+        """Calls with a traceparent follow the caller, whatever the sample rate."""
+        tracer, _ = make_tracer(sample_rate=0.0)
+        parent = SpanContext(TRACE_ID, PARENT_ID, sampled=True)
+
+        root = tracer.start_span("rpc", parent)
+
+        assert root is not None
+        assert root.context.trace_id == TRACE_ID
+        assert root.parent_span_id == PARENT_ID
+        assert tracer.start_span("rpc", SpanContext(TRACE_ID, PARENT_ID, sampled=False)) is None
+
+    def test_samples_new_traces_at_rate(self) -> None:
+        """Calls without a traceparent start a trace at the sample rate."""
+        never, _ = make_tracer(sample_rate=0.0)
+        always, _ = make_tracer(sample_rate=1.0)
+
+        assert never.start_span("rpc") is None
+        root = always.start_span("rpc")
+        assert root is not None and root.parent_span_id is None
+
+    def test_child_spans_nest(self) -> None:
+        """Spans opened inside an active span become its children."""
+        tracer, exporter = make_tracer()
+        root = tracer.start_span("rpc")
+        assert root is not None
+
+        with activate(root):
+            with span("db", {"db.system": "redis"}, kind=SpanKind.CLIENT) as child:
+                assert current_span() is child
+            assert current_span() is root
+        tracer.processor.flush()
+
+        assert child is not None
+        assert [s.name for s in exporter.spans] == ["db", "rpc"]
+        assert child.parent_span_id == root.context.span_id
+        assert child.context.trace_id == root.context.trace_id
+        assert child.kind == SpanKind.CLIENT
+
+    def test_span_is_noop_when_not_traced(self) -> None:
+        """Without an active span nothing is recorded."""
+        with span("db") as child:
+            assert child is None
+        assert current_span() is None
+
+    def test_exception_marks_error(self) -> None:
+        """Exceptions escaping a span set an error status and propagate."""
+        tracer, exporter = make_tracer()
+        root = tracer.start_span("rpc")
+
+        with pytest.raises(ValueError):
+            with activate(root):
+                raise ValueError("boom")
+        tracer.processor.flush()
+
+        assert exporter.spans[0].to_otlp()["status"] == {"code": 2, "message": "ValueError: boom"}
+
+    async def test_spans_are_task_local(self) -> None:
+        """Concurrent requests build separate traces."""
+        tracer, exporter = make_tracer()
+
+        async def request(name: str) -> str:
+            root = tracer.start_span(name)
+            assert root is not None
+            with activate(root):
+                await asyncio.sleep(0)
+                with span(f"{name}.child"):
+                    await asyncio.sleep(0)
+            return root.context.trace_id
+
+        first, second = await asyncio.gather(request("a"), request("b"))
+        tracer.processor.flush()
+
+        traces = {s.name: s.context.trace_id for s in exporter.spans}
+        assert traces["a.child"] == first
+        assert traces["b.child"] == second
+        assert first != second
+
+
+class TestBatchSpanProcessor:
+    """Tests for BatchSpanProcessor."""
+
+    def test_drops_when_queue_full(self) -> None:
+        """Spans beyond the queue bound are dropped and counted."""
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(BatchSpanProcessor(exporter, max_queue=2), sample_rate=1.0)
+
+        for _ in range(3):
+            root = tracer.start_span("rpc")
+            assert root is not None
+            root.end()
+        tracer.processor.flush()
+
+        assert len(exporter.spans) == 2
+        assert tracer.processor.dropped == 1
+
+    def test_exports_in_background(self) -> None:
+        """The export thread sends queued spans and close() flushes the rest."""
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(BatchSpanProcessor(exporter, flush_interval=0.01), sample_rate=1.0)
+        tracer.start()
+
+        for _ in range(10):
+            root = tracer.start_span("rpc")
+            assert root is not None
+            root.end()
+        tracer.shutdown()
+
+        assert len(exporter.spans) == 10
+        assert tracer.processor.queue_depth == 0
+
+
+class TestExporters:
+    """Tests for span exporters."""
+
+    def test_file_exporter_writes_otlp_json_lines(self, tmp_path: Any) -> None:
+        """Each batch is one OTLP/JSON export request."""
+        path = tmp_path / "traces.jsonl"
+        tracer = Tracer(BatchSpanProcessor(FileSpanExporter(path)), sample_rate=1.0)
+        root = tracer.start_span("rpc", attributes={"rpc.method": "EvaluateEvent", "n": 3})
+        assert root is not None
+        root.end()
+        tracer.shutdown()
+
+        request = json.loads(path.read_text().splitlines()[0])
+        resource_spans = request["resourceSpans"][0]
+        otlp_span = resource_spans["scopeSpans"][0]["spans"][0]
+        assert resource_spans["resource"]["attributes"][0]["key"] == "service.name"
+        assert otlp_span["name"] == "rpc"
+        assert otlp_span["kind"] == SpanKind.SERVER
+        assert {"key": "n", "value": {"intValue": "3"}} in otlp_span["attributes"]
+
+    def test_otlp_exporter_posts_to_collector(self) -> None:
+        """Batches are POSTed to the collector's /v1/traces endpoint."""
+        received: list[tuple[str, dict[str, Any]]] = []
+
+        class Collector(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802 - http.server naming
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                received.append((self.path, json.loads(body)))
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Collector)
+        thread = threading.Thread(target=server.handle_request)
+        thread.start()
+        try:
+            exporter = OtlpHttpExporter(f"http://127.0.0.1:{server.server_port}")
+            tracer = Tracer(BatchSpanProcessor(exporter), sample_rate=1.0)
+            root = tracer.start_span("rpc")
+            assert root is not None
+            root.end()
+            tracer.shutdown()
+            thread.join(5)
+        finally:
+            server.server_close()
+
+        path, request = received[0]
+        assert path == "/v1/traces"
+        assert request["resourceSpans"][0]["scopeSpans"][0]["spans"][0]["name"] == "rpc"
+
+
+class TestTracerFromSettings:
+    """Tests for building a tracer from settings."""
+
+    def test_disabled_by_default(self) -> None:
+        """No tracer is built unless an exporter is configured."""
+        assert tracer_from_settings(Settings()) is None
+
+    def test_rejects_unknown_exporter(self) -> None:
+        """Typos in the exporter name fail loudly."""
+        with pytest.raises(ConfigurationError):
+            tracer_from_settings(Settings(tracing_exporter="jaeger"))